@@ -6,10 +6,12 @@ that indicate infinite loops or repetitive behavior.
 """
 
 import json
+import os
 import time
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Hashable
 from dataclasses import dataclass, asdict
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
+from itertools import islice
 from pathlib import Path
 
 
@@ -31,6 +33,10 @@ class Action:
     
     def get_signature(self) -> str:
         """Get unique signature for this action"""
+        cached = self.__dict__.get('_signature')
+        if cached is not None:
+            return cached
+        
         # Create signature from tool + key args
         key_args = []
         if self.file_path:
@@ -46,34 +52,166 @@ class Action:
             content = str(self.args['content'])[:50]
             key_args.append(f"content:{content}")
         
-        return f"{self.tool}({','.join(key_args)})"
+        signature = f"{self.tool}({','.join(key_args)})"
+        self.__dict__['_signature'] = signature
+        return signature
+    
+    def get_state_key(self) -> Tuple[str, str, str]:
+        """(phase, file, tool) state used for state cycle detection"""
+        return (self.phase, self.file_path or 'none', self.tool)
+
+
+class PeriodTracker:
+    """
+    Streaming detector for a repeating tail in a sequence of keys.
+    
+    For every period p it keeps the length of the current run of keys equal
+    to the key p positions earlier. A tail made of c copies of a p-long
+    pattern is a run of at least (c - 1) * p, so each push costs
+    O(max_period) regardless of how long the sequence is.
+    """
+    
+    def __init__(self, min_period: int = 2, max_period: int = 15):
+        self.min_period = min_period
+        self.max_period = max_period
+        self.length = 0
+        self._recent: deque = deque(maxlen=max_period)
+        self._runs = [0] * (max_period + 1)
+    
+    def push(self, key: Hashable):
+        """Append a key to the sequence."""
+        recent = self._recent
+        for period in range(self.min_period, self.max_period + 1):
+            if len(recent) >= period and recent[-period] == key:
+                self._runs[period] += 1
+            else:
+                self._runs[period] = 0
+        recent.append(key)
+        self.length += 1
+    
+    def pattern(self, window: int, min_cycles: int) -> Optional[Tuple[List, int]]:
+        """
+        Shortest pattern repeating at the end of the last ``window`` keys.
+        
+        Args:
+            window: Number of most recent keys to consider
+            min_cycles: Minimum number of complete repetitions
+        
+        Returns:
+            Tuple of (pattern, cycles) if found, None otherwise
+        """
+        for period in range(self.min_period, min(self.max_period, window // 2) + 1):
+            span = min(self._runs[period] + period, window, self.length)
+            cycles = span // period
+            if cycles >= min_cycles:
+                return list(self._recent)[-period:], cycles
+        return None
+    
+    def reset(self):
+        """Forget the sequence."""
+        self.length = 0
+        self._recent.clear()
+        self._runs = [0] * (self.max_period + 1)
 
 
 class ActionTracker:
     """
     Tracks all AI actions to detect loops and patterns.
     
-    Maintains a history of actions with timestamps, allowing detection of:
+    Maintains a bounded window of recent actions with timestamps, allowing
+    detection of:
     - Repeated identical actions
     - Cyclic patterns
     - Modification loops
     - Conversation loops
+    
+    Loop checks are streaming: every tracked action updates rolling
+    counters (run length of the current action, per-signature counts in the
+    frequency window, totals by phase/tool/file) and period trackers for
+    repeating patterns in O(1), so checks don't depend on how long the
+    pipeline has been running. Only the most recent ``max_actions`` actions
+    are kept in memory and loaded from the history file.
     """
     
-    def __init__(self, history_file: Optional[Path] = None):
+    MAX_PATTERN_LENGTH = 15
+    
+    def __init__(self, history_file: Optional[Path] = None, max_actions: int = 1000,
+                 frequency_window: float = 300.0):
         """
         Initialize action tracker.
         
         Args:
             history_file: Optional file to persist action history
+            max_actions: Number of recent actions kept in memory
+            frequency_window: Time window (seconds) of the rolling frequency counts
         """
-        self.actions: List[Action] = []
+        self.actions: deque = deque(maxlen=max_actions)
         self.history_file = history_file
+        self.max_actions = max_actions
+        self.frequency_window = frequency_window
+        self._reset_counters()
         
-        # Load existing history if available
+        # Load the tail of the existing history if available
         if history_file and history_file.exists():
             self._load_history()
     
+    def _reset_counters(self):
+        self.total_actions = 0
+        self.successful_actions = 0
+        self.first_timestamp: Optional[float] = None
+        self.by_phase: Counter = Counter()
+        self.by_tool: Counter = Counter()
+        self.by_file: Counter = Counter()
+        
+        # Run of identical consecutive signatures
+        self._repeat_signature: Optional[str] = None
+        self._repeat_count = 0
+        
+        # Signatures inside the frequency window
+        self._window: deque = deque()
+        self._window_counts: Counter = Counter()
+        
+        # Repeating tails of signatures and (phase, file, tool) states
+        self.signature_periods = PeriodTracker(2, self.MAX_PATTERN_LENGTH)
+        self.state_periods = PeriodTracker(3, self.MAX_PATTERN_LENGTH)
+    
+    def _index(self, action: Action):
+        """Update rolling counters with a new action (O(1))."""
+        signature = action.get_signature()
+        
+        self.actions.append(action)
+        self.total_actions += 1
+        if action.success:
+            self.successful_actions += 1
+        if self.first_timestamp is None:
+            self.first_timestamp = action.timestamp
+        self.by_phase[action.phase] += 1
+        self.by_tool[action.tool] += 1
+        if action.file_path:
+            self.by_file[action.file_path] += 1
+        
+        if signature == self._repeat_signature:
+            self._repeat_count += 1
+        else:
+            self._repeat_signature = signature
+            self._repeat_count = 1
+        
+        self._window.append((action.timestamp, signature))
+        self._window_counts[signature] += 1
+        self._expire(action.timestamp)
+        
+        self.signature_periods.push(signature)
+        self.state_periods.push(action.get_state_key())
+    
+    def _expire(self, now: float):
+        """Drop signatures older than the frequency window."""
+        cutoff = now - self.frequency_window
+        while self._window and self._window[0][0] < cutoff:
+            _, signature = self._window.popleft()
+            self._window_counts[signature] -= 1
+            if not self._window_counts[signature]:
+                del self._window_counts[signature]
+    
     def track_action(
         self,
         phase: str,
@@ -110,7 +248,7 @@ class ActionTracker:
             success=success
         )
         
-        self.actions.append(action)
+        self._index(action)
         
         # Persist if history file configured
         if self.history_file:
@@ -139,18 +277,19 @@ class ActionTracker:
         Returns:
             List of recent actions matching filters
         """
-        filtered = self.actions
-        
-        if phase:
-            filtered = [a for a in filtered if a.phase == phase]
-        if agent:
-            filtered = [a for a in filtered if a.agent == agent]
-        if tool:
-            filtered = [a for a in filtered if a.tool == tool]
-        if file_path:
-            filtered = [a for a in filtered if a.file_path == file_path]
-        
-        return filtered[-count:]
+        if count <= 0:
+            return []
+        
+        def matches(action: Action) -> bool:
+            return ((not phase or action.phase == phase) and
+                    (not agent or action.agent == agent) and
+                    (not tool or action.tool == tool) and
+                    (not file_path or action.file_path == file_path))
+        
+        # Walk back from the newest action only as far as needed
+        recent = list(islice((a for a in reversed(self.actions) if matches(a)), count))
+        recent.reverse()
+        return recent
     
     def get_action_sequence(
         self,
@@ -165,8 +304,7 @@ class ActionTracker:
         Returns:
             List of action signatures
         """
-        recent = self.actions[-window_size:]
-        return [action.get_signature() for action in recent]
+        return [action.get_signature() for action in self.get_recent_actions(window_size)]
     
     def get_file_modifications(
         self,
@@ -196,22 +334,27 @@ class ActionTracker:
     
     def get_action_frequency(
         self,
-        time_window: float = 300.0
+        time_window: Optional[float] = None
     ) -> Dict[str, int]:
         """
         Get frequency of each action type in time window.
         
         Args:
-            time_window: Time window in seconds
+            time_window: Time window in seconds (default: the rolling
+                frequency window, answered from counters)
             
         Returns:
             Dictionary mapping action signatures to counts
         """
-        cutoff = time.time() - time_window
-        recent = [a for a in self.actions if a.timestamp >= cutoff]
+        if time_window is None or time_window == self.frequency_window:
+            self._expire(time.time())
+            return dict(self._window_counts)
         
+        cutoff = time.time() - time_window
         frequency = defaultdict(int)
-        for action in recent:
+        for action in reversed(self.actions):
+            if action.timestamp < cutoff:
+                break
             frequency[action.get_signature()] += 1
         
         return dict(frequency)
@@ -252,15 +395,8 @@ class ActionTracker:
         Returns:
             Tuple of (action_signature, count) if detected, None otherwise
         """
-        if len(self.actions) < threshold:
-            return None
-        
-        recent = self.actions[-threshold:]
-        signatures = [a.get_signature() for a in recent]
-        
-        # Check if all signatures are identical
-        if len(set(signatures)) == 1:
-            return (signatures[0], threshold)
+        if self._repeat_count >= threshold:
+            return (self._repeat_signature, threshold)
         
         return None
     
@@ -272,6 +408,9 @@ class ActionTracker:
         """
         Detect alternating patterns (A-B-A-B or A-B-C-A-B-C).
         
+        Looks for the shortest pattern (up to MAX_PATTERN_LENGTH actions)
+        repeating at the end of the last ``window_size`` actions.
+        
         Args:
             window_size: Size of window to analyze
             min_cycles: Minimum number of complete cycles to detect
@@ -279,27 +418,10 @@ class ActionTracker:
         Returns:
             Tuple of (pattern, cycle_count) if detected, None otherwise
         """
-        if len(self.actions) < window_size:
+        if self.total_actions < window_size:
             return None
         
-        sequence = self.get_action_sequence(window_size)
-        
-        # Try pattern lengths from 2 to window_size/2
-        for pattern_len in range(2, window_size // 2 + 1):
-            pattern = sequence[:pattern_len]
-            
-            # Check if pattern repeats
-            cycles = 0
-            for i in range(0, len(sequence) - pattern_len + 1, pattern_len):
-                if sequence[i:i+pattern_len] == pattern:
-                    cycles += 1
-                else:
-                    break
-            
-            if cycles >= min_cycles:
-                return (pattern, cycles)
-        
-        return None
+        return self.signature_periods.pattern(window_size, min_cycles)
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -308,44 +430,29 @@ class ActionTracker:
         Returns:
             Dictionary with statistics
         """
-        if not self.actions:
+        if not self.total_actions:
             return {
                 'total_actions': 0,
                 'time_span': 0,
                 'actions_per_minute': 0
             }
         
-        time_span = self.actions[-1].timestamp - self.actions[0].timestamp
-        
-        # Count by phase
-        by_phase = defaultdict(int)
-        for action in self.actions:
-            by_phase[action.phase] += 1
-        
-        # Count by tool
-        by_tool = defaultdict(int)
-        for action in self.actions:
-            by_tool[action.tool] += 1
-        
-        # Count by file
-        by_file = defaultdict(int)
-        for action in self.actions:
-            if action.file_path:
-                by_file[action.file_path] += 1
+        time_span = self.actions[-1].timestamp - self.first_timestamp
         
         return {
-            'total_actions': len(self.actions),
+            'total_actions': self.total_actions,
             'time_span': time_span,
-            'actions_per_minute': len(self.actions) / (time_span / 60) if time_span > 0 else 0,
-            'by_phase': dict(by_phase),
-            'by_tool': dict(by_tool),
-            'by_file': dict(by_file),
-            'success_rate': sum(1 for a in self.actions if a.success) / len(self.actions)
+            'actions_per_minute': self.total_actions / (time_span / 60) if time_span > 0 else 0,
+            'by_phase': dict(self.by_phase),
+            'by_tool': dict(self.by_tool),
+            'by_file': dict(self.by_file),
+            'success_rate': self.successful_actions / self.total_actions
         }
     
     def clear_history(self):
         """Clear all tracked actions"""
         self.actions.clear()
+        self._reset_counters()
         if self.history_file and self.history_file.exists():
             self.history_file.unlink()
     
@@ -359,13 +466,29 @@ class ActionTracker:
             f.write(json.dumps(action.to_dict()) + '\n')
     
     def _load_history(self):
-        """Load action history from file"""
+        """Load the most recent ``max_actions`` actions from the history file"""
         if not self.history_file or not self.history_file.exists():
             return
         
-        with open(self.history_file, 'r') as f:
-            for line in f:
-                if line.strip():
-                    data = json.loads(line)
-                    action = Action(**data)
-                    self.actions.append(action)
\ No newline at end of file
+        for line in self._tail_lines(self.history_file, self.max_actions):
+            if line.strip():
+                data = json.loads(line)
+                self._index(Action(**data))
+    
+    @staticmethod
+    def _tail_lines(path: Path, count: int, block_size: int = 65536) -> List[str]:
+        """Last ``count`` lines of a file, reading backwards in blocks."""
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = b''
+            while position > 0 and data.count(b'\n') <= count:
+                read_size = min(block_size, position)
+                position -= read_size
+                f.seek(position)
+                data = f.read(read_size) + data
+        
+        lines = data.decode('utf-8', errors='replace').splitlines()
+        if position > 0:
+            lines = lines[1:]  # First line may be partial
+        return lines[-count:] if count else []
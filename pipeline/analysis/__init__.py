@@ -13,6 +13,8 @@ from .import_graph import ImportGraphBuilder, ImportNode, CircularDependency
 from .import_impact import ImportImpactAnalyzer, ImpactReport, RiskLevel
 from .import_updater import ImportUpdater, UpdateResult
 from .file_placement import FilePlacementAnalyzer, MisplacedFile
+from .runner import AnalysisRunner, AnalysisRunResult, AnalyzerTiming
+from .visitor import FileVisitor, MultiVisitor
 
 __all__ = [
     'ComplexityAnalyzer',
@@ -33,4 +35,9 @@ __all__ = [
     'UpdateResult',
     'FilePlacementAnalyzer',
     'MisplacedFile',
+    'AnalysisRunner',
+    'AnalysisRunResult',
+    'AnalyzerTiming',
+    'FileVisitor',
+    'MultiVisitor',
 ]
\ No newline at end of file
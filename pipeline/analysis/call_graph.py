@@ -14,6 +14,7 @@ from dataclasses import dataclass, field
 import logging
 
 from pipeline.logging_setup import get_logger
+from .visitor import FileVisitor
 
 
 @dataclass
@@ -73,7 +74,7 @@ class CallGraphResult:
         }
 
 
-class CallGraphVisitor(ast.NodeVisitor):
+class CallGraphVisitor(FileVisitor):
     """AST visitor for building call graph."""
     
     def __init__(self, filepath: str):
@@ -82,8 +83,10 @@ class CallGraphVisitor(ast.NodeVisitor):
         self.calls: Dict[str, Set[str]] = defaultdict(set)
         self.current_function: Optional[str] = None
         self.current_class: Optional[str] = None
+        self.function_stack: List[Optional[str]] = []
+        self.class_stack: List[Optional[str]] = []
     
-    def visit_FunctionDef(self, node: ast.FunctionDef):
+    def enter_FunctionDef(self, node: ast.FunctionDef):
         """Visit function definition."""
         if self.current_class:
             func_name = f"{self.current_class}.{node.name}"
@@ -92,23 +95,27 @@ class CallGraphVisitor(ast.NodeVisitor):
         
         self.functions[func_name] = node.lineno
         
-        old_function = self.current_function
+        self.function_stack.append(self.current_function)
         self.current_function = func_name
-        self.generic_visit(node)
-        self.current_function = old_function
     
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
-        """Visit async function definition."""
-        self.visit_FunctionDef(node)
+    enter_AsyncFunctionDef = enter_FunctionDef
     
-    def visit_ClassDef(self, node: ast.ClassDef):
+    def leave_FunctionDef(self, node: ast.FunctionDef):
+        """Close function definition."""
+        self.current_function = self.function_stack.pop()
+    
+    leave_AsyncFunctionDef = leave_FunctionDef
+    
+    def enter_ClassDef(self, node: ast.ClassDef):
         """Visit class definition."""
-        old_class = self.current_class
+        self.class_stack.append(self.current_class)
         self.current_class = node.name
-        self.generic_visit(node)
-        self.current_class = old_class
     
-    def visit_Call(self, node: ast.Call):
+    def leave_ClassDef(self, node: ast.ClassDef):
+        """Close class definition."""
+        self.current_class = self.class_stack.pop()
+    
+    def enter_Call(self, node: ast.Call):
         """Visit function/method call."""
         if self.current_function:
             pass
@@ -120,8 +127,6 @@ class CallGraphVisitor(ast.NodeVisitor):
                 # Method call
                 method_name = node.func.attr
                 self.calls[self.current_function].add(method_name)
-        
-        self.generic_visit(node)
 
 
 class CallGraphGenerator:
@@ -167,21 +172,43 @@ class CallGraphGenerator:
                 tree = ast.parse(f.read(), filename=str(filepath))
             
             relative_path = str(filepath.relative_to(self.project_dir))
-            visitor = CallGraphVisitor(relative_path)
-            visitor.visit(tree)
-            
-            # Aggregate results
-            for func_name, line in visitor.functions.items():
-                self.all_functions[func_name] = (relative_path, line)
-            
-            for caller, callees in visitor.calls.items():
-                self.all_calls[caller].update(callees)
+            self.merge_file(relative_path, self.collect_file(tree, relative_path))
         
         except SyntaxError as e:
             self.logger.warning(f"Syntax error in {filepath}: {e}")
         except Exception as e:
             self.logger.error(f"Error analyzing {filepath}: {e}")
     
+    @staticmethod
+    def collect_file(tree: ast.AST, relative_path: str, source: str = "") -> CallGraphVisitor:
+        """
+        Run the per-file visitor over an already parsed module.
+        
+        Args:
+            tree: Parsed module
+            relative_path: File path relative to project_dir
+            source: Module source (unused)
+        
+        Returns:
+            Visitor holding the file's functions and calls
+        """
+        visitor = CallGraphVisitor(relative_path)
+        visitor.visit(tree)
+        return visitor
+    
+    @staticmethod
+    def file_visitor(relative_path: str, source: str = "") -> CallGraphVisitor:
+        """Per-file visitor for a traversal shared with other analyzers (``AnalysisRunner``)."""
+        return CallGraphVisitor(relative_path)
+    
+    def merge_file(self, relative_path: str, visitor: CallGraphVisitor):
+        """Aggregate the per-file visitor returned by ``collect_file``."""
+        for func_name, line in visitor.functions.items():
+            self.all_functions[func_name] = (relative_path, line)
+        
+        for caller, callees in visitor.calls.items():
+            self.all_calls[caller].update(callees)
+    
     def analyze(self, target: Optional[str] = None) -> CallGraphResult:
         """
         Analyze call graph in Python files.
@@ -192,9 +219,7 @@ class CallGraphGenerator:
         Returns:
             CallGraphResult with all findings
         """
-        # Reset state
-        self.all_functions.clear()
-        self.all_calls.clear()
+        self.reset()
         
         if target:
             target_path = self.project_dir / target
@@ -222,6 +247,15 @@ class CallGraphGenerator:
                         filepath = Path(root) / file
                         self.analyze_file(filepath)
         
+        return self.build_result()
+    
+    def reset(self):
+        """Clear state from a previous analysis."""
+        self.all_functions.clear()
+        self.all_calls.clear()
+    
+    def build_result(self) -> CallGraphResult:
+        """Reduce the merged per-file state into the analysis result."""
         # Build called_by mapping
         called_by: Dict[str, Set[str]] = defaultdict(set)
         for caller, callees in self.all_calls.items():
@@ -13,6 +13,7 @@ from dataclasses import dataclass, field
 import logging
 
 from pipeline.logging_setup import get_logger
+from .visitor import FileVisitor
 
 
 @dataclass
@@ -97,37 +98,20 @@ class ComplexityAnalysisResult:
         }
 
 
-class ComplexityVisitor(ast.NodeVisitor):
-    """AST visitor for calculating complexity."""
+class ComplexityVisitor(FileVisitor):
+    """
+    AST visitor for calculating complexity.
+    
+    Decision points are counted as they are visited, for every function
+    they are nested in, instead of walking each function's body again.
+    """
     
     def __init__(self, filepath: str):
         self.filepath = filepath
         self.results: List[ComplexityResult] = []
         self.current_class = None
-    
-    def calculate_complexity(self, node: ast.AST) -> int:
-        """Calculate cyclomatic complexity for a function/method."""
-        complexity = 1  # Base complexity
-        
-        for child in ast.walk(node):
-            pass
-            # Decision points
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                complexity += 1
-            elif isinstance(child, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(child, (ast.With, ast.AsyncWith)):
-                complexity += 1
-            elif isinstance(child, ast.Assert):
-                complexity += 1
-            # Logical operators
-            elif isinstance(child, ast.BoolOp):
-                complexity += len(child.values) - 1
-            # Comprehensions
-            elif isinstance(child, (ast.ListComp, ast.DictComp, ast.SetComp, ast.GeneratorExp)):
-                complexity += 1
-        
-        return complexity
+        self.class_stack: List[Optional[str]] = []
+        self.open_functions: List[ComplexityResult] = []
     
     def count_lines(self, node: ast.AST) -> int:
         """Count lines of code in a function."""
@@ -135,9 +119,8 @@ class ComplexityVisitor(ast.NodeVisitor):
             return node.end_lineno - node.lineno + 1
         return 0
     
-    def visit_FunctionDef(self, node: ast.FunctionDef):
+    def enter_FunctionDef(self, node: ast.FunctionDef):
         """Visit function definition."""
-        complexity = self.calculate_complexity(node)
         lines = self.count_lines(node)
         
         if self.current_class:
@@ -149,23 +132,46 @@ class ComplexityVisitor(ast.NodeVisitor):
             name=name,
             file=self.filepath,
             line=node.lineno,
-            complexity=complexity,
+            complexity=1,  # Base complexity; decision points add to it
             lines=lines
         )
         self.results.append(result)
+        self.open_functions.append(result)
         
-        self.generic_visit(node)
+    enter_AsyncFunctionDef = enter_FunctionDef
+    
+    def leave_FunctionDef(self, node: ast.FunctionDef):
+        """Close function definition."""
+        self.open_functions.pop()
     
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
-        """Visit async function definition."""
-        self.visit_FunctionDef(node)
+    leave_AsyncFunctionDef = leave_FunctionDef
     
-    def visit_ClassDef(self, node: ast.ClassDef):
+    def _add_decision(self, node: ast.AST):
+        """Count a decision point in every enclosing function."""
+        for result in self.open_functions:
+            result.complexity += 1
+    
+    enter_If = enter_While = enter_For = enter_AsyncFor = _add_decision
+    enter_ExceptHandler = enter_With = enter_AsyncWith = enter_Assert = _add_decision
+    enter_ListComp = enter_DictComp = enter_SetComp = enter_GeneratorExp = _add_decision
+    
+    def enter_BoolOp(self, node: ast.BoolOp):
+        """Count the extra operands of a logical operator."""
+        for result in self.open_functions:
+            result.complexity += len(node.values) - 1
+    
+    def enter_ClassDef(self, node: ast.ClassDef):
         """Visit class definition."""
-        old_class = self.current_class
+        self.class_stack.append(self.current_class)
         self.current_class = node.name
-        self.generic_visit(node)
-        self.current_class = old_class
+    
+    def leave_ClassDef(self, node: ast.ClassDef):
+        """Close class definition."""
+        self.current_class = self.class_stack.pop()
+    
+    def result(self) -> List[ComplexityResult]:
+        """The file's complexity results."""
+        return self.results
 
 
 class ComplexityAnalyzer:
@@ -209,10 +215,7 @@ class ComplexityAnalyzer:
             with open(filepath, 'r', encoding='utf-8') as f:
                 tree = ast.parse(f.read(), filename=str(filepath))
             
-            visitor = ComplexityVisitor(str(filepath.relative_to(self.project_dir)))
-            visitor.visit(tree)
-            
-            return visitor.results
+            return self.collect_file(tree, str(filepath.relative_to(self.project_dir)))
         
         except SyntaxError as e:
             self.logger.warning(f"Syntax error in {filepath}: {e}")
@@ -221,6 +224,47 @@ class ComplexityAnalyzer:
             self.logger.error(f"Error analyzing {filepath}: {e}")
             return []
     
+    @staticmethod
+    def collect_file(tree: ast.AST, relative_path: str, source: str = "") -> List[ComplexityResult]:
+        """
+        Run the per-file visitor over an already parsed module.
+        
+        Used by ``AnalysisRunner`` so the tree is parsed once for all analyzers.
+        
+        Args:
+            tree: Parsed module
+            relative_path: File path relative to project_dir
+            source: Module source (unused)
+        
+        Returns:
+            List of complexity results
+        """
+        visitor = ComplexityVisitor(relative_path)
+        visitor.visit(tree)
+        return visitor.results
+    
+    @staticmethod
+    def file_visitor(relative_path: str, source: str = "") -> ComplexityVisitor:
+        """
+        Per-file visitor for a traversal shared with other analyzers.
+        
+        Used by ``AnalysisRunner``; ``visitor.result()`` is what
+        ``collect_file`` returns.
+        """
+        return ComplexityVisitor(relative_path)
+    
+    def reset(self):
+        """Clear results from a previous analysis."""
+        self.results = []
+    
+    def merge_file(self, relative_path: str, results: List[ComplexityResult]):
+        """Add the per-file results returned by ``collect_file``."""
+        self.results.extend(results)
+    
+    def build_result(self) -> ComplexityAnalysisResult:
+        """Reduce the merged per-file results into the analysis result."""
+        return self._calculate_statistics()
+    
     def analyze(self, target: Optional[str] = None) -> ComplexityAnalysisResult:
         """
         Analyze complexity of Python files.
@@ -17,6 +17,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from collections import defaultdict
 
+from .visitor import FileVisitor
+
 
 @dataclass
 class DataFlowReport:
@@ -38,16 +40,96 @@ class DataFlowReport:
         }
 
 
-class DataFlowAnalyzer(ast.NodeVisitor):
-    """Analyzes data flow in Python code"""
+class DataFlowVisitor(FileVisitor):
+    """Tracks variable loads and stores per scope in one file"""
+    
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.variables = defaultdict(list)
+        self.current_scope = 'module'
+        self.scope_stack = ['module']
+    
+    def enter_FunctionDef(self, node):
+        """Enter function scope"""
+        self.scope_stack.append(node.name)
+        self.current_scope = node.name
+    
+    enter_AsyncFunctionDef = enter_ClassDef = enter_FunctionDef
+    
+    def leave_FunctionDef(self, node):
+        """Leave function scope"""
+        self.scope_stack.pop()
+        self.current_scope = self.scope_stack[-1] if self.scope_stack else 'module'
+    
+    leave_AsyncFunctionDef = leave_ClassDef = leave_FunctionDef
+    
+    def enter_Name(self, node):
+        """Track variable usage"""
+        var_name = f"{self.current_scope}.{node.id}"
+        
+        if isinstance(node.ctx, ast.Store):
+            self.variables[var_name].append(('store', node.lineno))
+        elif isinstance(node.ctx, ast.Load):
+            self.variables[var_name].append(('load', node.lineno))
+        elif isinstance(node.ctx, ast.Del):
+            self.variables[var_name].append(('del', node.lineno))
+    
+    def enter_AugAssign(self, node):
+        """Track augmented assignments (+=, -=, etc.)"""
+        if isinstance(node.target, ast.Name):
+            var_name = f"{self.current_scope}.{node.target.id}"
+            # Augmented assignment is both load and store
+            self.variables[var_name].append(('load', node.lineno))
+            self.variables[var_name].append(('store', node.lineno))
+    
+    def result(self) -> DataFlowReport:
+        """Data flow report of the file"""
+        # Find uninitialized variables (used before defined)
+        uninitialized = []
+        for var, actions in self.variables.items():
+            if actions and actions[0][0] == 'load':
+                uninitialized.append(var)
+        
+        # Find unused assignments (assigned but never read)
+        unused_assignments = []
+        for var, actions in self.variables.items():
+            if len(actions) > 0:
+                pass
+                # Check if last action is store and never followed by load
+                for i, (action, line) in enumerate(actions):
+                    if action == 'store':
+                        pass
+                        # Check if there's a load after this store
+                        has_load_after = any(a[0] == 'load' for a in actions[i+1:])
+                        if not has_load_after and i == len(actions) - 1:
+                            unused_assignments.append({
+                                'variable': var,
+                                'line': line,
+                                'message': f'Variable "{var}" assigned but never used'
+                            })
+        
+        return DataFlowReport(
+            filepath=self.filepath,
+            variables=dict(self.variables),
+            uninitialized_vars=uninitialized,
+            unused_assignments=unused_assignments
+        )
+
+
+class DataFlowAnalyzer:
+    """
+    Analyzes data flow in Python code
+    
+    ``analyze`` reports on one file; through ``AnalysisRunner`` (as
+    ``'dataflow'``) the result is a report per file of the run.
+    """
     
     def __init__(self, project_root: str, logger=None):
         self.project_root = Path(project_root)
         self.logger = logger
         self.variables = defaultdict(list)
-        self.current_scope = 'module'
-        self.scope_stack = ['module']
         self.current_file = None
+        self.reports: Dict[str, DataFlowReport] = {}
         
     def analyze(self, filepath: str) -> DataFlowReport:
         """
@@ -60,90 +142,53 @@ class DataFlowAnalyzer(ast.NodeVisitor):
             DataFlowReport with data flow analysis
         """
         self.current_file = filepath
-        self.variables = defaultdict(list)
-        self.scope_stack = ['module']
         
         try:
             full_path = self.project_root / filepath
             content = full_path.read_text()
             tree = ast.parse(content, filename=filepath)
-            self.visit(tree)
-            
-            # Find uninitialized variables (used before defined)
-            uninitialized = []
-            for var, actions in self.variables.items():
-                if actions and actions[0][0] == 'load':
-                    uninitialized.append(var)
-            
-            # Find unused assignments (assigned but never read)
-            unused_assignments = []
-            for var, actions in self.variables.items():
-                if len(actions) > 0:
-                    pass
-                    # Check if last action is store and never followed by load
-                    for i, (action, line) in enumerate(actions):
-                        if action == 'store':
-                            pass
-                            # Check if there's a load after this store
-                            has_load_after = any(a[0] == 'load' for a in actions[i+1:])
-                            if not has_load_after and i == len(actions) - 1:
-                                unused_assignments.append({
-                                    'variable': var,
-                                    'line': line,
-                                    'message': f'Variable "{var}" assigned but never used'
-                                })
-            
-            return DataFlowReport(
-                filepath=filepath,
-                variables=dict(self.variables),
-                uninitialized_vars=uninitialized,
-                unused_assignments=unused_assignments
-            )
+            report = self.collect_file(tree, filepath, content)
+            self.variables = defaultdict(list, report.variables)
+            return report
             
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Data flow analysis failed for {filepath}: {e}")
             raise
     
-    def visit_FunctionDef(self, node):
-        """Enter function scope"""
-        self.scope_stack.append(node.name)
-        self.current_scope = node.name
-        self.generic_visit(node)
-        self.scope_stack.pop()
-        self.current_scope = self.scope_stack[-1] if self.scope_stack else 'module'
+    @staticmethod
+    def collect_file(tree: ast.AST, relative_path: str, source: str = "") -> DataFlowReport:
+        """
+        Run the per-file visitor over an already parsed module.
     
-    visit_AsyncFunctionDef = visit_FunctionDef
+        Args:
+            tree: Parsed module
+            relative_path: File path relative to project root
+            source: Module source (unused)
     
-    def visit_ClassDef(self, node):
-        """Enter class scope"""
-        self.scope_stack.append(node.name)
-        self.current_scope = node.name
-        self.generic_visit(node)
-        self.scope_stack.pop()
-        self.current_scope = self.scope_stack[-1] if self.scope_stack else 'module'
+        Returns:
+            DataFlowReport of the file
+        """
+        visitor = DataFlowVisitor(relative_path)
+        visitor.visit(tree)
+        return visitor.result()
     
-    def visit_Name(self, node):
-        """Track variable usage"""
-        var_name = f"{self.current_scope}.{node.id}"
+    @staticmethod
+    def file_visitor(relative_path: str, source: str = "") -> DataFlowVisitor:
+        """Per-file visitor for a traversal shared with other analyzers (``AnalysisRunner``)."""
+        return DataFlowVisitor(relative_path)
         
-        if isinstance(node.ctx, ast.Store):
-            self.variables[var_name].append(('store', node.lineno))
-        elif isinstance(node.ctx, ast.Load):
-            self.variables[var_name].append(('load', node.lineno))
-        elif isinstance(node.ctx, ast.Del):
-            self.variables[var_name].append(('del', node.lineno))
+    def reset(self):
+        """Clear reports from a previous run."""
+        self.reports = {}
         
-        self.generic_visit(node)
+    def merge_file(self, relative_path: str, report: DataFlowReport):
+        """Add the per-file report returned by ``collect_file``."""
+        self.reports[relative_path] = report
     
-    def visit_AugAssign(self, node):
-        """Track augmented assignments (+=, -=, etc.)"""
-        if isinstance(node.target, ast.Name):
-            var_name = f"{self.current_scope}.{node.target.id}"
-            # Augmented assignment is both load and store
-            self.variables[var_name].append(('load', node.lineno))
-            self.variables[var_name].append(('store', node.lineno))
-        self.generic_visit(node)
+    def build_result(self) -> Dict[str, DataFlowReport]:
+        """Reports by file (relative path)."""
+        return dict(self.reports)
     
     def generate_report(self, result: DataFlowReport) -> str:
         """Generate human-readable report"""
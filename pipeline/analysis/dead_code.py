@@ -14,6 +14,7 @@ from dataclasses import dataclass, field
 import logging
 
 from pipeline.logging_setup import get_logger
+from .visitor import FileVisitor
 
 
 @dataclass
@@ -91,7 +92,7 @@ class DeadCodeResult:
         }
 
 
-class DeadCodeVisitor(ast.NodeVisitor):
+class DeadCodeVisitor(FileVisitor):
     """AST visitor for detecting dead code."""
     
     def __init__(self, filepath: str):
@@ -105,8 +106,9 @@ class DeadCodeVisitor(ast.NodeVisitor):
         self.imports_used: Set[str] = set()
         self.inheritance: Dict[str, str] = {}
         self.current_class: Optional[str] = None
+        self.class_stack: List[Optional[str]] = []
     
-    def visit_FunctionDef(self, node: ast.FunctionDef):
+    def enter_FunctionDef(self, node: ast.FunctionDef):
         """Visit function definition."""
         if self.current_class:
             pass
@@ -118,13 +120,9 @@ class DeadCodeVisitor(ast.NodeVisitor):
             # Function definition
             self.functions_defined[node.name] = node.lineno
         
-        self.generic_visit(node)
+    enter_AsyncFunctionDef = enter_FunctionDef
     
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
-        """Visit async function definition."""
-        self.visit_FunctionDef(node)
-    
-    def visit_ClassDef(self, node: ast.ClassDef):
+    def enter_ClassDef(self, node: ast.ClassDef):
         """Visit class definition."""
         self.classes_defined[node.name] = node.lineno
         
@@ -133,12 +131,14 @@ class DeadCodeVisitor(ast.NodeVisitor):
             if isinstance(base, ast.Name):
                 self.inheritance[node.name] = base.id
         
-        old_class = self.current_class
+        self.class_stack.append(self.current_class)
         self.current_class = node.name
-        self.generic_visit(node)
-        self.current_class = old_class
     
-    def visit_Call(self, node: ast.Call):
+    def leave_ClassDef(self, node: ast.ClassDef):
+        """Close class definition."""
+        self.current_class = self.class_stack.pop()
+    
+    def enter_Call(self, node: ast.Call):
         """Visit function/method call."""
         if isinstance(node.func, ast.Name):
             self.functions_called.add(node.func.id)
@@ -148,21 +148,18 @@ class DeadCodeVisitor(ast.NodeVisitor):
             if isinstance(node.func.value, ast.Name):
                 self.imports_used.add(node.func.value.id)
         
-        self.generic_visit(node)
-    
-    def visit_Attribute(self, node: ast.Attribute):
+    def enter_Attribute(self, node: ast.Attribute):
         """Visit attribute access."""
         if isinstance(node.value, ast.Name):
             self.imports_used.add(node.value.id)
-        self.generic_visit(node)
     
-    def visit_Import(self, node: ast.Import):
+    def enter_Import(self, node: ast.Import):
         """Visit import statement."""
         for alias in node.names:
             name = alias.asname if alias.asname else alias.name
             self.imports.append((name, node.lineno, 'import'))
     
-    def visit_ImportFrom(self, node: ast.ImportFrom):
+    def enter_ImportFrom(self, node: ast.ImportFrom):
         """Visit from-import statement."""
         for alias in node.names:
             name = alias.asname if alias.asname else alias.name
@@ -227,34 +224,56 @@ class DeadCodeDetector:
                 tree = ast.parse(f.read(), filename=str(filepath))
             
             relative_path = str(filepath.relative_to(self.project_dir))
-            visitor = DeadCodeVisitor(relative_path)
-            visitor.visit(tree)
-            
-            # Aggregate results
-            for func_name, line in visitor.functions_defined.items():
-                self.all_functions_defined[func_name] = (relative_path, line)
-            
-            self.all_functions_called.update(visitor.functions_called)
-            
-            for class_name, line in visitor.classes_defined.items():
-                self.all_classes_defined[class_name] = (relative_path, line)
-            
-            # Track class usage from function calls (instantiation)
-            self.all_classes_used.update(visitor.functions_called)
-            
-            for method_key, line in visitor.methods_defined.items():
-                self.all_methods_defined[method_key] = (relative_path, line)
-            
-            self.all_methods_called.update(visitor.methods_called)
-            
-            self.all_imports[relative_path].extend(visitor.imports)
-            self.all_imports_used[relative_path].update(visitor.imports_used)
+            self.merge_file(relative_path, self.collect_file(tree, relative_path))
         
         except SyntaxError as e:
             self.logger.warning(f"Syntax error in {filepath}: {e}")
         except Exception as e:
             self.logger.error(f"Error analyzing {filepath}: {e}")
     
+    @staticmethod
+    def collect_file(tree: ast.AST, relative_path: str, source: str = "") -> DeadCodeVisitor:
+        """
+        Run the per-file visitor over an already parsed module.
+        
+        Args:
+            tree: Parsed module
+            relative_path: File path relative to project_dir
+            source: Module source (unused)
+        
+        Returns:
+            Visitor holding the file's definitions and usages
+        """
+        visitor = DeadCodeVisitor(relative_path)
+        visitor.visit(tree)
+        return visitor
+    
+    @staticmethod
+    def file_visitor(relative_path: str, source: str = "") -> DeadCodeVisitor:
+        """Per-file visitor for a traversal shared with other analyzers (``AnalysisRunner``)."""
+        return DeadCodeVisitor(relative_path)
+    
+    def merge_file(self, relative_path: str, visitor: DeadCodeVisitor):
+        """Aggregate the per-file visitor returned by ``collect_file``."""
+        for func_name, line in visitor.functions_defined.items():
+            self.all_functions_defined[func_name] = (relative_path, line)
+        
+        self.all_functions_called.update(visitor.functions_called)
+        
+        for class_name, line in visitor.classes_defined.items():
+            self.all_classes_defined[class_name] = (relative_path, line)
+        
+        # Track class usage from function calls (instantiation)
+        self.all_classes_used.update(visitor.functions_called)
+        
+        for method_key, line in visitor.methods_defined.items():
+            self.all_methods_defined[method_key] = (relative_path, line)
+        
+        self.all_methods_called.update(visitor.methods_called)
+        
+        self.all_imports[relative_path].extend(visitor.imports)
+        self.all_imports_used[relative_path].update(visitor.imports_used)
+    
     def is_template_method(self, method_name: str, class_name: str) -> bool:
         """Check if method is likely a template method."""
         template_patterns = ['execute', 'run', 'process', 'handle', 'validate']
@@ -325,15 +344,7 @@ class DeadCodeDetector:
         Returns:
             DeadCodeResult with all findings
         """
-        # Reset state
-        self.all_functions_defined.clear()
-        self.all_functions_called.clear()
-        self.all_methods_defined.clear()
-        self.all_methods_called.clear()
-        self.all_classes_defined.clear()
-        self.all_classes_used.clear()
-        self.all_imports.clear()
-        self.all_imports_used.clear()
+        self.reset()
         
         if target:
             target_path = self.project_dir / target
@@ -361,7 +372,21 @@ class DeadCodeDetector:
                         filepath = Path(root) / file
                         self.analyze_file(filepath)
         
-        # Get results
+        return self.build_result()
+    
+    def reset(self):
+        """Clear state from a previous analysis."""
+        self.all_functions_defined.clear()
+        self.all_functions_called.clear()
+        self.all_methods_defined.clear()
+        self.all_methods_called.clear()
+        self.all_classes_defined.clear()
+        self.all_classes_used.clear()
+        self.all_imports.clear()
+        self.all_imports_used.clear()
+    
+    def build_result(self) -> DeadCodeResult:
+        """Reduce the merged per-file state into the analysis result."""
         result = DeadCodeResult(
             unused_functions=self.get_unused_functions(),
             unused_methods=self.get_unused_methods(),
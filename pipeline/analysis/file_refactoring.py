@@ -14,6 +14,18 @@ from collections import defaultdict
 import logging
 
 from pipeline.logging_setup import get_logger
+from pipeline.analysis.minhash import (
+    LSHIndex, SignatureStore, ast_tokens, decode_signature, default_hasher,
+    encode_signature, estimate_similarity, lsh_params, shingles, signature_store
+)
+
+
+# Common functions whose MinHash estimate is below this are reported with the
+# estimate rather than a difflib ratio (both far below the 0.95 merge cutoff)
+DIFF_MIN_ESTIMATE = 0.5
+
+# Feature keys compared by DuplicateDetector
+_FEATURE_KEYS = ('functions', 'classes', 'imports')
 
 
 @dataclass
@@ -188,9 +200,13 @@ class FileFeatureExtractor(ast.NodeVisitor):
 class DuplicateDetector:
     """Detect duplicate and similar file implementations."""
     
-    def __init__(self, project_dir: Path, logger: Optional[logging.Logger] = None):
+    def __init__(self, project_dir: Path, logger: Optional[logging.Logger] = None,
+                 signatures: Optional[SignatureStore] = None, state_dir: Optional[str] = None):
         self.project_dir = Path(project_dir)
         self.logger = logger or get_logger()
+        self.signatures = signatures if signatures is not None else signature_store(self.project_dir, state_dir)
+        self._collected: Dict[str, Dict] = {}  # Features merged by AnalysisRunner
+        self.pairs_compared = 0  # Exact comparisons in the last search
     
     def find_duplicates(self, similarity_threshold: float = 0.75,
                        scope: str = "project",
@@ -220,21 +236,97 @@ class DuplicateDetector:
             except Exception as e:
                 self.logger.warning(f"  Failed to analyze {filepath}: {e}")
         
-        # Compare all pairs
+        duplicate_sets = self._find_duplicate_sets(files, file_features, similarity_threshold)
+        self.signatures.save(prune=scope == "project")
+        
+        self.logger.info(f"  Found {len(duplicate_sets)} duplicate sets")
+        return duplicate_sets
+    
+    def _find_duplicate_sets(self, files: List[str], file_features: Dict[str, Dict],
+                             similarity_threshold: float,
+                             exhaustive: bool = False) -> List[DuplicateSet]:
+        """
+        Score pairs of files and group the similar ones.
+        
+        Only LSH candidate pairs are scored, unless ``exhaustive`` is set or
+        the threshold is too low for banding, where every pair is.
+        """
+        files = [f for f in files if f in file_features]
+        if exhaustive or lsh_params(similarity_threshold) is None:
+            pairs = [(file1, file2) for i, file1 in enumerate(files) for file2 in files[i+1:]]
+        else:
+            pairs = self._candidate_pairs(files, file_features, similarity_threshold)
+        
         similarities = []
-        for i, file1 in enumerate(files):
-            for file2 in files[i+1:]:
-                if file1 in file_features and file2 in file_features:
-                    score = self._calculate_similarity(
-                        file_features[file1],
-                        file_features[file2]
-                    )
-                    if score >= similarity_threshold:
-                        similarities.append((file1, file2, score))
+        for file1, file2 in pairs:
+            score = self._calculate_similarity(file_features[file1], file_features[file2])
+            if score >= similarity_threshold:
+                similarities.append((file1, file2, score))
+        self.pairs_compared = len(pairs)
         
         # Group into duplicate sets
-        duplicate_sets = self._group_duplicates(similarities, file_features)
+        return self._group_duplicates(similarities, file_features)
+    
+    def _candidate_pairs(self, files: List[str], file_features: Dict[str, Dict],
+                         similarity_threshold: float) -> List[Tuple[str, str]]:
+        """Pairs of files whose signatures share an LSH band."""
+        index = LSHIndex(similarity_threshold)
+        for filepath in files:
+            features = file_features[filepath]
+            # Files without features score 0.0 against everything
+            if any(features[key] for key in _FEATURE_KEYS):
+                index.add(filepath, features.get('signature') or self._signature(features))
+        return index.candidate_pairs()
+    
+    @staticmethod
+    def _signature(features: Dict) -> Tuple[int, ...]:
+        """MinHash of the feature names ``_calculate_similarity`` compares."""
+        return default_hasher().signature(features['functions'] | features['classes'] | features['imports'])
+        
+    def reset(self):
+        """Clear features collected for a previous ``AnalysisRunner`` pass."""
+        self._collected = {}
+    
+    def accepts(self, relative_path: str, include_tests: bool = False) -> bool:
+        """Whether a project file takes part in duplicate detection."""
+        path = Path(relative_path)
+        if any(part.startswith('.') or part == '__pycache__' for part in path.parts):
+            return False
+        if not include_tests and ('test' in path.name.lower() or 'test' in str(path.parent).lower()):
+            return False
+        return True
+    
+    @staticmethod
+    def collect_file(tree: ast.AST, relative_path: str, source: str = "") -> Dict:
+        """
+        Extract comparison features from an already parsed module.
+        
+        Args:
+            tree: Parsed module
+            relative_path: File path relative to project_dir
+            source: Module source, used for the line count
+        
+        Returns:
+            Feature dict as produced by ``_extract_features``
+        """
+        extractor = FileFeatureExtractor(relative_path)
+        extractor.visit(tree)
         
+        return {
+            'functions': set(extractor.functions.keys()),
+            'classes': set(extractor.classes.keys()),
+            'imports': extractor.imports,
+            'lines': len(source.splitlines())
+        }
+    
+    def merge_file(self, relative_path: str, features: Dict):
+        """Record the features returned by ``collect_file``."""
+        self._collected[relative_path] = features
+    
+    def build_result(self, similarity_threshold: float = 0.75) -> List[DuplicateSet]:
+        """Group the collected files into duplicate sets."""
+        files = list(self._collected)
+        duplicate_sets = self._find_duplicate_sets(files, self._collected, similarity_threshold)
         self.logger.info(f"  Found {len(duplicate_sets)} duplicate sets")
         return duplicate_sets
     
@@ -264,28 +356,33 @@ class DuplicateDetector:
         return files
     
     def _extract_features(self, filepath: str) -> Dict:
-        """Extract features from a file."""
+        """Extract features and their signature from a file, reusing stored ones for unchanged content."""
         full_path = self.project_dir / filepath
         content = full_path.read_text()
+        key = self.signatures.content_hash(content)
+        
+        record = self.signatures.get(key)
+        if record and 'features' in record:
+            features = {name: set(record['features'][name]) for name in _FEATURE_KEYS}
+            features['lines'] = record['features']['lines']
+            features['signature'] = decode_signature(record['signature'])
+            return features
         
         try:
-            tree = ast.parse(content)
-            extractor = FileFeatureExtractor(filepath)
-            extractor.visit(tree)
-            
-            return {
-                'functions': set(extractor.functions.keys()),
-                'classes': set(extractor.classes.keys()),
-                'imports': extractor.imports,
-                'lines': len(content.splitlines())
-            }
+            features = self.collect_file(ast.parse(content), filepath, content)
         except SyntaxError:
-            return {
+            features = {
                 'functions': set(),
                 'classes': set(),
                 'imports': set(),
                 'lines': 0
             }
+        features['signature'] = self._signature(features)
+        
+        stored = {name: sorted(features[name]) for name in _FEATURE_KEYS}
+        stored['lines'] = features['lines']
+        self.signatures.update(key, features=stored, signature=encode_signature(features['signature']))
+        return features
     
     def _calculate_similarity(self, features1: Dict, features2: Dict) -> float:
         """Calculate Jaccard similarity between two feature sets."""
@@ -399,9 +496,11 @@ class DuplicateDetector:
 class FileComparator:
     """Compare two files in detail."""
     
-    def __init__(self, project_dir: Path, logger: Optional[logging.Logger] = None):
+    def __init__(self, project_dir: Path, logger: Optional[logging.Logger] = None,
+                 signatures: Optional[SignatureStore] = None, state_dir: Optional[str] = None):
         self.project_dir = Path(project_dir)
         self.logger = logger or get_logger()
+        self.signatures = signatures if signatures is not None else signature_store(self.project_dir, state_dir)
     
     def compare(self, file1: str, file2: str,
                comparison_type: str = "full") -> FileComparison:
@@ -434,6 +533,7 @@ class FileComparator:
         # Compare classes
         if comparison_type in ["classes", "full"]:
             self._compare_classes(features1, features2, common, unique1, unique2, conflicts)
+        self.signatures.save()
         
         # Calculate overall similarity
         total_features = len(common) + len(unique1) + len(unique2)
@@ -472,7 +572,8 @@ class FileComparator:
                 'functions': extractor.functions,
                 'classes': extractor.classes,
                 'imports': extractor.imports,
-                'content': content
+                'content': content,
+                'content_hash': self.signatures.content_hash(content)
             }
         except SyntaxError as e:
             self.logger.error(f"Syntax error in {filepath}: {e}")
@@ -480,9 +581,37 @@ class FileComparator:
                 'functions': {},
                 'classes': {},
                 'imports': set(),
-                'content': content
+                'content': content,
+                'content_hash': self.signatures.content_hash(content)
             }
     
+    def _function_signature(self, features: Dict, name: str) -> Tuple[int, ...]:
+        """MinHash of a function's normalized AST token shingles, stored with its file's content."""
+        key = features['content_hash']
+        stored = (self.signatures.get(key) or {}).get('functions', {})
+        if name in stored:
+            return decode_signature(stored[name])
+        
+        signature = default_hasher().signature(shingles(ast_tokens(features['functions'][name])))
+        self.signatures.update(key, functions={**stored, name: encode_signature(signature)})
+        return signature
+    
+    def _function_similarity(self, features1: Dict, features2: Dict, name: str,
+                             code1: str, code2: str) -> float:
+        """
+        Similarity of two implementations of a function.
+        
+        The difflib ratio, run only when the MinHash estimate says the
+        implementations are close enough for it to matter.
+        """
+        if code1 == code2:
+            return 1.0
+        estimate = estimate_similarity(self._function_signature(features1, name),
+                                       self._function_signature(features2, name))
+        if estimate < DIFF_MIN_ESTIMATE:
+            return estimate
+        return difflib.SequenceMatcher(None, code1, code2).ratio()
+    
     def _compare_functions(self, features1: Dict, features2: Dict,
                           common: List, unique1: List, unique2: List,
                           conflicts: List):
@@ -498,7 +627,7 @@ class FileComparator:
             code1 = ast.unparse(node1)
             code2 = ast.unparse(node2)
             
-            similarity = difflib.SequenceMatcher(None, code1, code2).ratio()
+            similarity = self._function_similarity(features1, features2, name, code1, code2)
             
             comparison = FeatureComparison(
                 name=name,
@@ -3,14 +3,25 @@ Import Graph Builder
 
 Builds and maintains a complete import graph for the project.
 Tracks import relationships, detects circular dependencies, and finds orphaned files.
+
+Circular dependencies are the strongly connected components of the graph
+(iterative Tarjan, so deep import chains cannot hit the recursion limit),
+each reported with one shortest cycle through its members. After the first
+build, ``build_graph`` re-parses only files that changed and patches their
+reverse edges in place.
 """
 
 import ast
 import os
 from pathlib import Path
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Dict, Iterable, List, Set, Tuple, Optional
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import defaultdict, deque
+
+
+# Components up to this size are searched from every member for the
+# shortest cycle; larger ones only from their first member
+_EXACT_CYCLE_SEARCH_LIMIT = 64
 
 
 @dataclass
@@ -29,6 +40,7 @@ class CircularDependency:
     """Represents a circular dependency chain."""
     cycle: List[str]
     severity: str  # 'high', 'medium', 'low'
+    component: List[str] = field(default_factory=list)  # Every file in the cycle's SCC
     
     def __str__(self):
         return " -> ".join(self.cycle + [self.cycle[0]])
@@ -52,25 +64,45 @@ class ImportGraphBuilder:
         self.nodes: Dict[str, ImportNode] = {}
         self.circular_dependencies: List[CircularDependency] = []
         self._cache_valid = False
+        self._built = False
+        self._file_stamps: Dict[str, Tuple[int, int]] = {}  # filepath -> (mtime_ns, size)
+        self._dirty: Set[str] = set()
         
-    def build_graph(self, force_rebuild: bool = False) -> Dict[str, ImportNode]:
+    def build_graph(self, force_rebuild: bool = False,
+                    changed_files: Optional[Iterable[str]] = None) -> Dict[str, ImportNode]:
         """
         Build complete import graph for the project.
         
+        The first call (or ``force_rebuild``) parses every file. Later calls
+        update the graph in place: files passed in ``changed_files`` or to
+        ``invalidate_cache(filepath)`` are re-parsed, and after a plain
+        ``invalidate_cache()`` the files whose mtime or size changed are.
+        
         Args:
             force_rebuild: Force rebuild even if cache is valid
+            changed_files: Files known to have changed (added, edited or deleted)
             
         Returns:
             Dictionary mapping file paths to ImportNode objects
         """
-        if self._cache_valid and not force_rebuild:
+        if self._built and not force_rebuild:
+            changed = set(self._dirty)
+            if changed_files is not None:
+                changed.update(self._normalize(filepath) for filepath in changed_files)
+            if not self._cache_valid:
+                changed.update(self._changed_on_disk())
+            if changed:
+                self._update_files(changed)
+            self._cache_valid = True
             return self.nodes
         
         self.nodes = {}
         self.circular_dependencies = []
+        self._dirty = set()
         
         # Find all Python files
-        python_files = self._find_python_files()
+        self._file_stamps = self._scan_files()
+        python_files = list(self._file_stamps)
         
         if self.logger:
             self.logger.info(f"Building import graph for {len(python_files)} Python files...")
@@ -89,6 +121,7 @@ class ImportGraphBuilder:
         self._find_orphaned_files()
         
         self._cache_valid = True
+        self._built = True
         
         if self.logger:
             self.logger.info(f"Import graph built: {len(self.nodes)} nodes, "
@@ -117,6 +150,103 @@ class ImportGraphBuilder:
         
         return python_files
     
+    def _scan_files(self) -> Dict[str, Tuple[int, int]]:
+        """Find all Python files with their (mtime_ns, size) stamps."""
+        stamps = {}
+        for filepath in self._find_python_files():
+            stamp = self._stamp(filepath)
+            if stamp:
+                stamps[filepath] = stamp
+        return stamps
+    
+    def _stamp(self, filepath: str) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of a file, or None if it does not exist."""
+        try:
+            stat = (self.project_root / filepath).stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _normalize(self, filepath) -> str:
+        """Project-relative form of a path, as used for node keys."""
+        path = Path(filepath)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.project_root)
+            except ValueError:
+                pass
+        return str(path)
+    
+    def _changed_on_disk(self) -> Set[str]:
+        """Files added, removed or modified since they were last parsed."""
+        current = self._scan_files()
+        changed = {filepath for filepath, stamp in current.items()
+                   if self._file_stamps.get(filepath) != stamp}
+        changed.update(set(self._file_stamps) - set(current))
+        return changed
+    
+    @staticmethod
+    def _module_name(filepath: str) -> str:
+        """Dotted module name a file is imported by ('pkg/__init__.py' -> 'pkg')."""
+        parts = list(Path(filepath).with_suffix('').parts)
+        if parts and parts[-1] == '__init__':
+            parts.pop()
+        return '.'.join(parts)
+    
+    def _update_files(self, changed: Set[str]):
+        """Re-parse changed files, patch reverse edges and refresh derived results."""
+        changed = {filepath for filepath in changed if filepath.endswith('.py')}
+        
+        # Adding or removing a file changes how other files' imports resolve
+        added = {filepath for filepath in changed
+                 if filepath not in self.nodes and self._stamp(filepath)}
+        removed = {filepath for filepath in changed
+                   if filepath in self.nodes and not self._stamp(filepath)}
+        for filepath in removed:
+            changed |= self.nodes[filepath].imported_by
+        if added:
+            names = {self._module_name(filepath) for filepath in added}
+            changed |= {filepath for filepath, node in self.nodes.items()
+                        if node.external_imports & names}
+        
+        for filepath in sorted(changed):
+            self._reparse_file(filepath)
+        self._dirty = set()
+        
+        self._detect_circular_dependencies()
+        self._find_orphaned_files()
+        
+        if self.logger:
+            self.logger.debug(f"Import graph updated: {len(changed)} files re-parsed, "
+                              f"{len(self.circular_dependencies)} circular dependencies")
+    
+    def _reparse_file(self, filepath: str):
+        """Replace one file's node and update the imported_by sets it touches."""
+        old = self.nodes.pop(filepath, None)
+        stamp = self._stamp(filepath)
+        if stamp:
+            self._file_stamps[filepath] = stamp
+            self._parse_file(filepath)
+        else:
+            self._file_stamps.pop(filepath, None)
+        new = self.nodes.get(filepath)
+        
+        old_imports = old.imports if old else set()
+        new_imports = new.imports if new else set()
+        for imported_file in old_imports - new_imports:
+            if imported_file in self.nodes:
+                self.nodes[imported_file].imported_by.discard(filepath)
+        for imported_file in new_imports:
+            if imported_file in self.nodes:
+                self.nodes[imported_file].imported_by.add(filepath)
+        
+        if new:
+            if old:
+                new.imported_by = old.imported_by
+            else:
+                new.imported_by = {importer for importer, node in self.nodes.items()
+                                   if filepath in node.imports}
+    
     def _parse_file(self, filepath: str):
         """Parse a Python file and extract import information."""
         full_path = self.project_root / filepath
@@ -204,66 +334,115 @@ class ImportGraphBuilder:
                 if imported_file in self.nodes:
                     self.nodes[imported_file].imported_by.add(filepath)
     
-    def _detect_circular_dependencies(self):
-        """Detect circular dependencies using DFS."""
-        visited = set()
-        rec_stack = set()
+    def _internal_imports(self, filepath: str) -> List[str]:
+        """Project files imported by a file, in a stable order."""
+        return sorted(imported_file for imported_file in self.nodes[filepath].imports
+                      if imported_file in self.nodes)
+    
+    def _strongly_connected_components(self) -> List[List[str]]:
+        """
+        Strongly connected components of the import graph.
         
-        def dfs(filepath: str, path: List[str]) -> List[List[str]]:
-            """DFS to find cycles."""
-            cycles = []
-            
-            if filepath in rec_stack:
-                pass
-                # Found a cycle
-                cycle_start = path.index(filepath)
-                cycle = path[cycle_start:]
-                cycles.append(cycle)
-                return cycles
-            
-            if filepath in visited:
-                return cycles
-            
-            visited.add(filepath)
-            rec_stack.add(filepath)
-            path.append(filepath)
-            
-            if filepath in self.nodes:
-                for imported_file in self.nodes[filepath].imports:
-                    if imported_file in self.nodes:
-                        cycles.extend(dfs(imported_file, path[:]))
-            
-            rec_stack.remove(filepath)
-            
-            return cycles
+        Iterative Tarjan: one pass over nodes and edges, with an explicit
+        work stack instead of recursion.
+        """
+        index_of: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components = []
         
-        # Find all cycles
-        all_cycles = []
-        for filepath in self.nodes:
-            if filepath not in visited:
-                cycles = dfs(filepath, [])
-                all_cycles.extend(cycles)
+        for root in sorted(self.nodes):
+            if root in index_of:
+                continue
+            index_of[root] = lowlink[root] = len(index_of)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self._internal_imports(root)))]
+            
+            while work:
+                filepath, imported_files = work[-1]
+                for imported_file in imported_files:
+                    if imported_file not in index_of:
+                        index_of[imported_file] = lowlink[imported_file] = len(index_of)
+                        stack.append(imported_file)
+                        on_stack.add(imported_file)
+                        work.append((imported_file, iter(self._internal_imports(imported_file))))
+                        break
+                    if imported_file in on_stack:
+                        lowlink[filepath] = min(lowlink[filepath], index_of[imported_file])
+                else:
+                    # All imports explored
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[filepath])
+                    if lowlink[filepath] == index_of[filepath]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == filepath:
+                                break
+                        components.append(component)
         
-        # Deduplicate cycles (same cycle can be found from different starting points)
-        unique_cycles = []
-        seen_cycles = set()
+        return components
+    
+    def _shortest_cycle_through(self, start: str, members: Set[str]) -> Optional[List[str]]:
+        """Shortest import cycle from ``start`` back to itself within ``members`` (BFS)."""
+        parents: Dict[str, Optional[str]] = {start: None}
+        queue = deque([start])
+        while queue:
+            filepath = queue.popleft()
+            for imported_file in sorted(self.nodes[filepath].imports & members):
+                if imported_file == start:
+                    cycle = [filepath]
+                    while parents[cycle[-1]] is not None:
+                        cycle.append(parents[cycle[-1]])
+                    return cycle[::-1]
+                if imported_file not in parents:
+                    parents[imported_file] = filepath
+                    queue.append(imported_file)
+        return None
+    
+    def _shortest_cycle(self, component: List[str]) -> Optional[List[str]]:
+        """A shortest cycle inside a strongly connected component."""
+        members = set(component)
+        starts = sorted(members)
+        if len(starts) > _EXACT_CYCLE_SEARCH_LIMIT:
+            starts = starts[:1]
         
-        for cycle in all_cycles:
-            pass
-            # Normalize cycle (start from smallest element)
-            normalized = tuple(sorted(cycle))
-            if normalized not in seen_cycles:
-                seen_cycles.add(normalized)
-                
-                # Determine severity
-                severity = 'high' if len(cycle) == 2 else 'medium' if len(cycle) <= 4 else 'low'
-                
-                unique_cycles.append(CircularDependency(
-                    cycle=cycle,
-                    severity=severity
-                ))
+        best = None
+        for start in starts:
+            cycle = self._shortest_cycle_through(start, members)
+            if cycle and (best is None or len(cycle) < len(best)):
+                best = cycle
+                if len(best) <= 2:
+                    break
+        return best
+    
+    def _detect_circular_dependencies(self):
+        """Detect circular dependencies: one shortest cycle per strongly connected component."""
+        circular_dependencies = []
         
-        self.circular_dependencies = unique_cycles
+        for component in self._strongly_connected_components():
+            if len(component) == 1 and component[0] not in self.nodes[component[0]].imports:
+                continue
+            cycle = self._shortest_cycle(component)
+            if not cycle:
+                continue
+            
+            # Determine severity
+            severity = 'high' if len(cycle) == 2 else 'medium' if len(cycle) <= 4 else 'low'
+            
+            circular_dependencies.append(CircularDependency(
+                cycle=cycle,
+                severity=severity,
+                component=sorted(component)
+            ))
+            
+        self.circular_dependencies = circular_dependencies
     
     def _find_orphaned_files(self):
         """Find files that are not imported by anyone."""
@@ -271,7 +450,8 @@ class ImportGraphBuilder:
         # Orphaned files are files that neither import nor are imported
         
         for filepath, node in self.nodes.items():
-            pass
+            node.is_entry_point = False
+            node.is_orphaned = False
             # Check if this file is imported by anyone
             if not node.imported_by:
                 pass
@@ -345,9 +525,19 @@ class ImportGraphBuilder:
         """Get all entry point files."""
         return [filepath for filepath, node in self.nodes.items() if node.is_entry_point]
     
-    def invalidate_cache(self):
-        """Invalidate the cache, forcing a rebuild on next build_graph call."""
-        self._cache_valid = False
+    def invalidate_cache(self, filepath: Optional[str] = None):
+        """
+        Invalidate the cache.
+        
+        Args:
+            filepath: File that changed; it alone is re-parsed on the next
+                build_graph call. Without it, the next call re-parses every
+                file whose mtime or size changed.
+        """
+        if filepath is not None:
+            self._dirty.add(self._normalize(filepath))
+        else:
+            self._cache_valid = False
     
     def to_dict(self) -> Dict:
         """Export graph to dictionary format."""
@@ -365,7 +555,8 @@ class ImportGraphBuilder:
             'circular_dependencies': [
                 {
                     'cycle': dep.cycle,
-                    'severity': dep.severity
+                    'severity': dep.severity,
+                    'component': dep.component
                 }
                 for dep in self.circular_dependencies
             ],
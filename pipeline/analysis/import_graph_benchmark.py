@@ -0,0 +1,211 @@
+"""
+Import Graph Benchmark
+
+Times ``ImportGraphBuilder`` on a synthetic project with planted import
+cycles:
+
+- cycle detection alone, on the graph held in memory
+- the full build (walk, parse, resolve) of the project written to disk
+- an incremental rebuild after one file gains an import that closes a new cycle
+
+and checks that exactly the planted cycles (plus the new one) are found.
+
+Usage:
+    python -m pipeline.analysis.import_graph_benchmark --modules 20000 --cycles 50
+    python -m pipeline.analysis.import_graph_benchmark --in-memory -o import_graph.json
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .import_graph import ImportGraphBuilder, ImportNode
+
+
+DEFAULT_MODULES = 20000
+DEFAULT_CYCLES = 50
+
+# Modules per synthetic package
+_PACKAGE_SIZE = 100
+
+# Lengths of the planted cycles, used in turn
+_CYCLE_LENGTHS = (2, 3, 4, 5, 6)
+
+
+def _module_path(index: int) -> str:
+    return f"pkg_{index // _PACKAGE_SIZE}/mod_{index}.py"
+
+
+def synthetic_import_graph(modules: int = DEFAULT_MODULES, cycles: int = DEFAULT_CYCLES,
+                           seed: int = 0) -> Tuple[Dict[str, List[str]], List[List[str]]]:
+    """
+    Generate a deterministic import graph with planted cycles.
+    
+    Every module imports its predecessor (one chain through the whole
+    project) and up to two random earlier modules, so the graph is acyclic
+    apart from the planted cycles: blocks of 2-6 consecutive modules that
+    import each other in a ring and otherwise only the module before the
+    block.
+    
+    Args:
+        modules: Number of modules
+        cycles: Number of planted cycles
+        seed: Random seed
+    
+    Returns:
+        (imports by file path, planted cycles as lists of file paths)
+    """
+    rng = random.Random(seed)
+    spacing = modules // (cycles + 1) if cycles else modules
+    if cycles and spacing <= max(_CYCLE_LENGTHS):
+        raise ValueError(f"{modules} modules are too few for {cycles} planted cycles")
+    
+    ring_of: Dict[int, Tuple[int, int]] = {}
+    planted = []
+    for number in range(cycles):
+        start = (number + 1) * spacing
+        length = _CYCLE_LENGTHS[number % len(_CYCLE_LENGTHS)]
+        for offset in range(length):
+            ring_of[start + offset] = (start, length)
+        planted.append([_module_path(start + offset) for offset in range(length)])
+    
+    graph = {}
+    for index in range(modules):
+        if index in ring_of:
+            start, length = ring_of[index]
+            targets = {start + (index - start + 1) % length, start - 1}
+        else:
+            targets = {index - 1} if index else set()
+            for _ in range(rng.randint(0, 2)):
+                if index > 1:
+                    targets.add(rng.randrange(index - 1))
+        graph[_module_path(index)] = sorted(_module_path(target) for target in targets)
+    return graph, planted
+
+
+def write_synthetic_project(project_dir: Path, graph: Dict[str, List[str]]) -> Path:
+    """Write one small module per graph entry, importing its targets."""
+    for filepath, imports in graph.items():
+        path = project_dir / filepath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [f"import {target[:-3].replace('/', '.')}" for target in imports]
+        lines.append("")
+        lines.append(f"VALUE = {len(imports)}")
+        path.write_text("\n".join(lines) + "\n")
+    return project_dir
+
+
+def _found_cycles(builder: ImportGraphBuilder) -> set:
+    return {frozenset(dep.cycle) for dep in builder.get_circular_dependencies()}
+
+
+def run_benchmark(modules: int = DEFAULT_MODULES, cycles: int = DEFAULT_CYCLES,
+                  seed: int = 0, in_memory: bool = False,
+                  project_dir: Optional[Path] = None) -> Dict:
+    """
+    Run the benchmark.
+    
+    Args:
+        modules: Number of synthetic modules
+        cycles: Number of planted cycles
+        seed: Random seed of the graph
+        in_memory: Only time cycle detection (no files written)
+        project_dir: Where to write the project (default: a temporary directory)
+    
+    Returns:
+        Report dict with timings and whether the planted cycles were found
+    """
+    graph, planted = synthetic_import_graph(modules, cycles, seed)
+    expected = {frozenset(cycle) for cycle in planted}
+    report = {
+        "modules": modules,
+        "edges": sum(len(imports) for imports in graph.values()),
+        "planted_cycles": len(planted),
+    }
+    
+    builder = ImportGraphBuilder(tempfile.gettempdir())
+    builder.nodes = {filepath: ImportNode(filepath=filepath, imports=set(imports))
+                     for filepath, imports in graph.items()}
+    builder._build_reverse_relationships()
+    start = time.perf_counter()
+    builder._detect_circular_dependencies()
+    report["detect_seconds"] = round(time.perf_counter() - start, 4)
+    report["found_cycles"] = len(builder.get_circular_dependencies())
+    report["planted_found"] = _found_cycles(builder) == expected
+    if in_memory:
+        return report
+    
+    temp_dir = None
+    if project_dir is None:
+        temp_dir = project_dir = Path(tempfile.mkdtemp(prefix="import_graph_bench_"))
+    try:
+        start = time.perf_counter()
+        write_synthetic_project(project_dir, graph)
+        report["write_seconds"] = round(time.perf_counter() - start, 3)
+        
+        builder = ImportGraphBuilder(str(project_dir))
+        start = time.perf_counter()
+        builder.build_graph()
+        report["full_build_seconds"] = round(time.perf_counter() - start, 3)
+        report["full_build_planted_found"] = _found_cycles(builder) == expected
+        
+        # Close a new 2-cycle: a chain module imports its successor
+        in_cycles = {path for cycle in planted for path in cycle}
+        index = modules // 2 + 7
+        while {_module_path(index), _module_path(index + 1)} & in_cycles:
+            index += 1
+        edited = project_dir / _module_path(index)
+        edited.write_text(edited.read_text() + f"import {_module_path(index + 1)[:-3].replace('/', '.')}\n")
+        
+        start = time.perf_counter()
+        builder.build_graph(changed_files=[_module_path(index)])
+        report["incremental_seconds"] = round(time.perf_counter() - start, 4)
+        report["incremental_found"] = _found_cycles(builder) == expected | {
+            frozenset({_module_path(index), _module_path(index + 1)})}
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    return report
+
+
+def format_report(report: Dict) -> str:
+    """Plain-text summary of a benchmark report."""
+    lines = [f"{report['modules']} modules, {report['edges']} imports, "
+             f"{report['planted_cycles']} planted cycles",
+             f"  cycle detection   {report['detect_seconds']:.4f}s "
+             f"({report['found_cycles']} found, planted found: {report['planted_found']})"]
+    if "full_build_seconds" in report:
+        lines.append(f"  full build        {report['full_build_seconds']:.3f}s "
+                     f"(planted found: {report['full_build_planted_found']}, "
+                     f"writing files {report['write_seconds']:.3f}s)")
+        lines.append(f"  one-file update   {report['incremental_seconds']:.4f}s "
+                     f"(new cycle found: {report['incremental_found']})")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark import graph building and cycle detection")
+    parser.add_argument("--modules", type=int, default=DEFAULT_MODULES,
+                        help=f"Synthetic modules (default: {DEFAULT_MODULES})")
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES,
+                        help=f"Planted cycles (default: {DEFAULT_CYCLES})")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--in-memory", action="store_true", help="Only time cycle detection")
+    parser.add_argument("-o", "--output", type=Path, help="Write the report as JSON")
+    args = parser.parse_args(argv)
+    
+    report = run_benchmark(args.modules, args.cycles, seed=args.seed, in_memory=args.in_memory)
+    print(format_report(report))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,17 +3,37 @@ Import Updater
 
 Automatically updates import statements when files are moved or renamed.
 Handles both 'import' and 'from...import' statements.
+
+``update_imports_for_moves`` applies many moves at once: the import graph is
+built once, import statements are located with ``ast`` (so parenthesised
+multi-line and relative imports are found too), every affected span of a
+file is rewritten in one pass, and the files are written only if all of
+them still parse.
 """
 
 import ast
+import io
+import os
 import re
+import tempfile
+import tokenize
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple, Optional
+from dataclasses import dataclass, field
 
 from .import_graph import ImportGraphBuilder
 
 
+@dataclass
+class ImportEdit:
+    """One rewritten span of an import statement."""
+    line: int  # 1-based line the span starts on
+    start: int  # Character offsets of the span in the file
+    end: int
+    old_text: str
+    new_text: str
+
+
 @dataclass
 class UpdateResult:
     """Result of updating imports in a file."""
@@ -23,6 +43,7 @@ class UpdateResult:
     old_content: str
     new_content: str
     error: Optional[str] = None
+    edits: List[ImportEdit] = field(default_factory=list)
 
 
 class ImportUpdater:
@@ -112,6 +133,329 @@ class ImportUpdater:
             dry_run
         )
     
+    def update_imports_for_moves(
+        self,
+        moves: Iterable[Tuple[str, str]],
+        dry_run: bool = False
+    ) -> List[UpdateResult]:
+        """
+        Update all imports for a batch of moves at once.
+        
+        Works before or after the files themselves are moved: a file found
+        at either its old or its new path is rewritten in place, and the
+        relative imports of moved files are re-expressed from their new
+        package. Nothing is written unless every rewritten file parses.
+        
+        Args:
+            moves: (old_path, new_path) pairs, relative to project root
+            dry_run: If True, don't actually modify files
+        
+        Returns:
+            List of UpdateResult objects, one per file with import changes
+        """
+        path_moves = {self._relative(old): self._relative(new) for old, new in moves}
+        if not path_moves:
+            return []
+        module_moves = {self._path_to_module(old): self._path_to_module(new)
+                        for old, new in path_moves.items()}
+        moved_from = {new: old for old, new in path_moves.items()}
+        
+        # One graph build for the whole batch
+        self.graph_builder.build_graph()
+        files = set(self.graph_builder.nodes) | set(path_moves) | set(moved_from)
+        
+        leaves = sorted({module.rsplit('.', 1)[-1] for module in module_moves})
+        mentions = re.compile(r'\b(?:' + '|'.join(map(re.escape, leaves)) + r')\b')
+        
+        if self.logger:
+            self.logger.info(f"Updating imports for {len(path_moves)} moves across {len(files)} files...")
+        
+        results = []
+        for file_path in sorted(files):
+            full_path = self.project_root / file_path
+            if not full_path.is_file():
+                continue
+            # Resolve imports from where the file was, write them for where it goes
+            context_old = moved_from.get(file_path, file_path)
+            context_new = path_moves.get(context_old, file_path)
+            try:
+                with open(full_path, 'r', encoding='utf-8') as f:
+                    old_content = f.read()
+                if context_old == context_new and not mentions.search(old_content):
+                    continue
+                edits = self._plan_import_edits(old_content, context_old, context_new, module_moves)
+            except SyntaxError:
+                continue
+            except Exception as e:
+                results.append(UpdateResult(file=file_path, success=False, changes_made=0,
+                                            old_content='', new_content='', error=str(e)))
+                continue
+            if not edits:
+                continue
+            
+            new_content = self._apply_edits(old_content, edits)
+            error = None
+            try:
+                ast.parse(new_content)
+            except SyntaxError as e:
+                error = f"Syntax error after update: {e}"
+            results.append(UpdateResult(
+                file=file_path,
+                success=error is None,
+                changes_made=len(edits) if error is None else 0,
+                old_content=old_content,
+                new_content=new_content,
+                error=error,
+                edits=edits
+            ))
+        
+        failed = [result.file for result in results if not result.success]
+        if failed:
+            for result in results:
+                if result.success:
+                    result.success = False
+                    result.changes_made = 0
+                    result.error = f"Batch not applied: {len(failed)} file(s) failed ({failed[0]})"
+            if self.logger:
+                self.logger.warning(f"Import update not applied: {len(failed)} file(s) failed")
+            return results
+        
+        if not dry_run:
+            self._write_all_or_rollback(results)
+        return results
+    
+    def _relative(self, file_path: str) -> str:
+        """Project-relative form of a path."""
+        path = Path(file_path)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.project_root)
+            except ValueError:
+                pass
+        return str(path)
+    
+    def _plan_import_edits(
+        self,
+        content: str,
+        context_old: str,
+        context_new: str,
+        module_moves: Dict[str, str]
+    ) -> List[ImportEdit]:
+        """
+        Locate the import spans of a file that need rewriting.
+        
+        Args:
+            content: File content
+            context_old: Path relative imports resolve against (before the moves)
+            context_new: Path relative imports are written for (after the moves)
+            module_moves: Old module name -> new module name
+        
+        Returns:
+            Non-overlapping edits, in file order
+        """
+        tree = ast.parse(content)
+        lines = content.splitlines(keepends=True)
+        line_starts = [0]
+        for line in lines:
+            line_starts.append(line_starts[-1] + len(line))
+        
+        def offset(lineno: int, col_offset: int) -> int:
+            # ast columns are UTF-8 byte offsets
+            line = lines[lineno - 1]
+            return line_starts[lineno - 1] + len(line.encode('utf-8')[:col_offset].decode('utf-8', errors='ignore'))
+        
+        package_old = Path(context_old).parent.parts
+        package_new = Path(context_new).parent.parts
+        edits = []
+        
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    new_module = module_moves.get(alias.name)
+                    start = offset(alias.lineno, alias.col_offset)
+                    if new_module and content.startswith(alias.name, start):
+                        edits.append(ImportEdit(alias.lineno, start, start + len(alias.name),
+                                                alias.name, new_module))
+            
+            elif isinstance(node, ast.ImportFrom):
+                edits.extend(self._plan_from_import(node, content, offset, package_old,
+                                                    package_new, module_moves))
+        
+        return sorted(edits, key=lambda edit: edit.start)
+    
+    def _plan_from_import(self, node: ast.ImportFrom, content: str, offset, package_old: Tuple[str, ...],
+                          package_new: Tuple[str, ...], module_moves: Dict[str, str]) -> List[ImportEdit]:
+        """Edits for one 'from...import' statement."""
+        base = self._absolute_module(node, package_old)
+        if base is None:
+            return []
+        stmt_start = offset(node.lineno, node.col_offset)
+        stmt_end = offset(node.end_lineno, node.end_col_offset)
+        span = self._from_module_span(content, stmt_start, stmt_end)
+        if span is None:
+            return []
+        
+        def module_edit(target: Tuple[str, ...]) -> List[ImportEdit]:
+            new_text = self._render_module(target, node.level, package_new)
+            old_text = content[span[0]:span[1]]
+            return [] if new_text == old_text else [ImportEdit(node.lineno, span[0], span[1], old_text, new_text)]
+        
+        base_name = '.'.join(base)
+        if base_name in module_moves:
+            # The module itself moved
+            return module_edit(tuple(module_moves[base_name].split('.')))
+        
+        # Submodules imported by name: from package import module
+        moving = []
+        for alias in node.names:
+            full_name = '.'.join(base + (alias.name,))
+            if alias.name != '*' and full_name in module_moves:
+                moving.append((alias, tuple(module_moves[full_name].split('.'))))
+        if not moving:
+            return module_edit(base) if node.level else []
+        
+        parents = {target[:-1] for _, target in moving}
+        if len(moving) == len(node.names) and len(parents) == 1 and next(iter(parents)):
+            alias_edits = []
+            for alias, target in moving:
+                start = offset(alias.lineno, alias.col_offset)
+                if not content.startswith(alias.name, start):
+                    break
+                new_text = target[-1]
+                if new_text != alias.name and not alias.asname:
+                    new_text += f" as {alias.name}"
+                if new_text != alias.name:
+                    alias_edits.append(ImportEdit(alias.lineno, start, start + len(alias.name), alias.name, new_text))
+            else:
+                return module_edit(next(iter(parents))) + alias_edits
+        
+        # Aliases go to different modules: rewrite the statement as one import per module
+        def names(pairs) -> str:
+            return ', '.join(name if name == bound else f"{name} as {bound}" for name, bound in pairs)
+        
+        statements = []
+        staying = [(alias.name, alias.asname or alias.name) for alias in node.names
+                   if alias not in {moved for moved, _ in moving}]
+        if staying:
+            statements.append(f"from {self._render_module(base, node.level, package_new)} import {names(staying)}")
+        groups: Dict[Tuple[str, ...], List[Tuple[str, str]]] = {}
+        for alias, target in moving:
+            groups.setdefault(target[:-1], []).append((target[-1], alias.asname or alias.name))
+        for parent, pairs in groups.items():
+            if parent:
+                statements.append(f"from {self._render_module(parent, node.level, package_new)} import {names(pairs)}")
+            else:
+                statements.extend(f"import {names([pair])}" for pair in pairs)
+        
+        line_prefix = content[content.rfind('\n', 0, stmt_start) + 1:stmt_start]
+        separator = '\n' + line_prefix if not line_prefix.strip() else '; '
+        return [ImportEdit(node.lineno, stmt_start, stmt_end, content[stmt_start:stmt_end],
+                           separator.join(statements))]
+    
+    @staticmethod
+    def _absolute_module(node: ast.ImportFrom, package: Tuple[str, ...]) -> Optional[Tuple[str, ...]]:
+        """Absolute module parts a 'from...import' refers to, resolved from a package."""
+        module = tuple(node.module.split('.')) if node.module else ()
+        if not node.level:
+            return module or None
+        if node.level - 1 > len(package):
+            return None
+        return package[:len(package) - (node.level - 1)] + module
+    
+    @staticmethod
+    def _render_module(target: Tuple[str, ...], level: int, package: Tuple[str, ...]) -> str:
+        """Module text of a 'from...import', relative from a package if the original was."""
+        if not level:
+            return '.'.join(target)
+        common = 0
+        while common < min(len(package), len(target)) and package[common] == target[common]:
+            common += 1
+        if common == 0 and target:
+            # No shared package to be relative to
+            return '.'.join(target)
+        return '.' * (len(package) - common + 1) + '.'.join(target[common:])
+    
+    @staticmethod
+    def _from_module_span(content: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+        """Character span of the dots and module name between 'from' and 'import'."""
+        text = content[start:end]
+        local_starts = [0]
+        for line in text.splitlines(keepends=True):
+            local_starts.append(local_starts[-1] + len(line))
+        
+        span_start = span_end = None
+        seen_from = False
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(text).readline):
+                if token.type == tokenize.NAME and token.string == 'from' and not seen_from:
+                    seen_from = True
+                elif token.type == tokenize.NAME and token.string == 'import':
+                    break
+                elif seen_from and token.type in (tokenize.NAME, tokenize.OP):
+                    if span_start is None:
+                        span_start = local_starts[token.start[0] - 1] + token.start[1]
+                    span_end = local_starts[token.end[0] - 1] + token.end[1]
+        except tokenize.TokenError:
+            return None
+        if span_start is None:
+            return None
+        return start + span_start, start + span_end
+    
+    @staticmethod
+    def _apply_edits(content: str, edits: List[ImportEdit]) -> str:
+        """Apply non-overlapping edits in one pass."""
+        parts = []
+        position = 0
+        for edit in edits:
+            parts.append(content[position:edit.start])
+            parts.append(edit.new_text)
+            position = edit.end
+        parts.append(content[position:])
+        return ''.join(parts)
+    
+    def _write_all_or_rollback(self, results: List[UpdateResult]):
+        """
+        Write every updated file with a backup, restoring all of them if one
+        write fails. Each file is replaced atomically (temp file + rename).
+        """
+        written = []
+        try:
+            for result in results:
+                full_path = self.project_root / result.file
+                with open(full_path.with_suffix('.py.bak'), 'w', encoding='utf-8') as f:
+                    f.write(result.old_content)
+                self._replace_file(full_path, result.new_content)
+                written.append(result)
+        except Exception as e:
+            for result in written:
+                self._replace_file(self.project_root / result.file, result.old_content)
+            for result in results:
+                result.success = False
+                result.changes_made = 0
+                result.error = f"Batch not applied: {e}"
+            if self.logger:
+                self.logger.error(f"Import update rolled back: {e}")
+            return
+        
+        self.graph_builder.invalidate_cache()
+        if self.logger:
+            self.logger.debug(f"Updated imports in {len(results)} files "
+                              f"({sum(result.changes_made for result in results)} changes)")
+    
+    @staticmethod
+    def _replace_file(path: Path, content: str):
+        """Replace a file's content via a temporary file in the same directory, keeping its mode."""
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+    
     def _update_file_imports(
         self,
         file_path: str,
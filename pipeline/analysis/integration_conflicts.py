@@ -114,10 +114,7 @@ class IntegrationConflictDetector:
         Returns:
             IntegrationConflictResult with all findings
         """
-        # Reset state
-        self.classes.clear()
-        self.functions.clear()
-        self.modules.clear()
+        self.reset()
         
         if target:
             target_path = self.project_dir / target
@@ -150,7 +147,21 @@ class IntegrationConflictDetector:
                         filepath = Path(root) / file
                         self._analyze_file(filepath)
         
-        # Detect conflicts
+        return self.build_result()
+    
+    def reset(self):
+        """Clear state from a previous analysis."""
+        self.classes.clear()
+        self.functions.clear()
+        self.modules.clear()
+    
+    def accepts(self, relative_path: str) -> bool:
+        """Whether a project file takes part in the analysis (backups are skipped)."""
+        parts = Path(relative_path).parts[:-1]
+        return '.autonomy' not in parts and 'backups' not in parts
+    
+    def build_result(self) -> IntegrationConflictResult:
+        """Detect conflicts across the merged per-file definitions."""
         conflicts = []
         conflicts.extend(self._detect_duplicate_classes())
         conflicts.extend(self._detect_duplicate_functions())
@@ -169,27 +180,49 @@ class IntegrationConflictDetector:
             
             # Get relative path
             rel_path = str(filepath.relative_to(self.project_dir))
-            
-            # Extract classes and functions
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    if node.name not in self.classes:
-                        self.classes[node.name] = []
-                    self.classes[node.name].append((rel_path, node.lineno))
-                
-                elif isinstance(node, ast.FunctionDef):
-                    if node.name not in self.functions:
-                        self.functions[node.name] = []
-                    self.functions[node.name].append((rel_path, node.lineno))
-            
-            # Extract module docstring for purpose detection
-            docstring = ast.get_docstring(tree)
-            if docstring:
-                self.modules[rel_path] = docstring.split('\n')[0]  # First line
+            self.merge_file(rel_path, self.collect_file(tree, rel_path))
         
         except Exception as e:
             self.logger.warning(f"Error analyzing {filepath}: {e}")
     
+    @staticmethod
+    def collect_file(tree: ast.AST, relative_path: str, source: str = "") -> Dict:
+        """
+        Extract class and function definitions from an already parsed module.
+        
+        Args:
+            tree: Parsed module
+            relative_path: File path relative to project_dir
+            source: Module source (unused)
+        
+        Returns:
+            Dict with 'classes', 'functions' ([(name, line)]) and 'purpose'
+        """
+        classes = []
+        functions = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef):
+                classes.append((node.name, node.lineno))
+            elif isinstance(node, ast.FunctionDef):
+                functions.append((node.name, node.lineno))
+        
+        # Extract module docstring for purpose detection
+        docstring = ast.get_docstring(tree)
+        return {
+            'classes': classes,
+            'functions': functions,
+            'purpose': docstring.split('\n')[0] if docstring else None  # First line
+        }
+    
+    def merge_file(self, relative_path: str, definitions: Dict):
+        """Aggregate the per-file definitions returned by ``collect_file``."""
+        for name, line in definitions['classes']:
+            self.classes.setdefault(name, []).append((relative_path, line))
+        for name, line in definitions['functions']:
+            self.functions.setdefault(name, []).append((relative_path, line))
+        if definitions['purpose']:
+            self.modules[relative_path] = definitions['purpose']
+    
     def _detect_duplicate_classes(self) -> List[IntegrationConflict]:
         """Detect classes with same name in different files."""
         conflicts = []
@@ -14,6 +14,7 @@ from dataclasses import dataclass, field
 import logging
 
 from pipeline.logging_setup import get_logger
+from .visitor import FileVisitor
 
 
 @dataclass
@@ -55,7 +56,7 @@ class IntegrationGapResult:
         }
 
 
-class IntegrationGapVisitor(ast.NodeVisitor):
+class IntegrationGapVisitor(FileVisitor):
     """AST visitor for finding integration gaps."""
     
     def __init__(self, filepath: str):
@@ -66,12 +67,13 @@ class IntegrationGapVisitor(ast.NodeVisitor):
         self.methods_called: Dict[str, Set[str]] = defaultdict(set)
         self.imports: Set[str] = set()
         self.current_class: Optional[str] = None
+        self.class_stack: List[Optional[str]] = []
     
-    def visit_ClassDef(self, node: ast.ClassDef):
+    def enter_ClassDef(self, node: ast.ClassDef):
         """Visit class definition."""
         self.classes_defined[node.name] = node.lineno
         
-        old_class = self.current_class
+        self.class_stack.append(self.current_class)
         self.current_class = node.name
         
         # Collect all methods in this class
@@ -79,10 +81,11 @@ class IntegrationGapVisitor(ast.NodeVisitor):
             if isinstance(item, ast.FunctionDef):
                 self.methods_defined[node.name].append(item.name)
         
-        self.generic_visit(node)
-        self.current_class = old_class
+    def leave_ClassDef(self, node: ast.ClassDef):
+        """Close class definition."""
+        self.current_class = self.class_stack.pop()
     
-    def visit_Call(self, node: ast.Call):
+    def enter_Call(self, node: ast.Call):
         """Visit function/method call."""
         # Track class instantiation
         if isinstance(node.func, ast.Name):
@@ -99,15 +102,13 @@ class IntegrationGapVisitor(ast.NodeVisitor):
                 # Could be a class method call
                 pass
         
-        self.generic_visit(node)
-    
-    def visit_Import(self, node: ast.Import):
+    def enter_Import(self, node: ast.Import):
         """Visit import statement."""
         for alias in node.names:
             name = alias.name.split('.')[-1]  # Get last part
             self.imports.add(name)
     
-    def visit_ImportFrom(self, node: ast.ImportFrom):
+    def enter_ImportFrom(self, node: ast.ImportFrom):
         """Visit from-import statement."""
         for alias in node.names:
             self.imports.add(alias.name)
@@ -159,25 +160,47 @@ class IntegrationGapFinder:
                 tree = ast.parse(f.read(), filename=str(filepath))
             
             relative_path = str(filepath.relative_to(self.project_dir))
-            visitor = IntegrationGapVisitor(relative_path)
-            visitor.visit(tree)
-            
-            # Aggregate results
-            for class_name, line in visitor.classes_defined.items():
-                self.all_classes_defined[class_name] = (relative_path, line)
-            
-            self.all_classes_instantiated.update(visitor.classes_instantiated)
-            
-            for class_name, methods in visitor.methods_defined.items():
-                self.all_methods_defined[class_name].extend(methods)
-            
-            self.all_imports[relative_path].update(visitor.imports)
+            self.merge_file(relative_path, self.collect_file(tree, relative_path))
         
         except SyntaxError as e:
             self.logger.warning(f"Syntax error in {filepath}: {e}")
         except Exception as e:
             self.logger.error(f"Error analyzing {filepath}: {e}")
     
+    @staticmethod
+    def collect_file(tree: ast.AST, relative_path: str, source: str = "") -> IntegrationGapVisitor:
+        """
+        Run the per-file visitor over an already parsed module.
+        
+        Args:
+            tree: Parsed module
+            relative_path: File path relative to project_dir
+            source: Module source (unused)
+        
+        Returns:
+            Visitor holding the file's classes, instantiations and imports
+        """
+        visitor = IntegrationGapVisitor(relative_path)
+        visitor.visit(tree)
+        return visitor
+    
+    @staticmethod
+    def file_visitor(relative_path: str, source: str = "") -> IntegrationGapVisitor:
+        """Per-file visitor for a traversal shared with other analyzers (``AnalysisRunner``)."""
+        return IntegrationGapVisitor(relative_path)
+    
+    def merge_file(self, relative_path: str, visitor: IntegrationGapVisitor):
+        """Aggregate the per-file visitor returned by ``collect_file``."""
+        for class_name, line in visitor.classes_defined.items():
+            self.all_classes_defined[class_name] = (relative_path, line)
+        
+        self.all_classes_instantiated.update(visitor.classes_instantiated)
+        
+        for class_name, methods in visitor.methods_defined.items():
+            self.all_methods_defined[class_name].extend(methods)
+        
+        self.all_imports[relative_path].update(visitor.imports)
+    
     def get_unused_classes(self) -> List[Tuple[str, str, int]]:
         """Get classes that are defined but never instantiated."""
         from pipeline.analysis.integration_points import is_integration_point
@@ -240,12 +263,7 @@ class IntegrationGapFinder:
         Returns:
             IntegrationGapResult with all findings
         """
-        # Reset state
-        self.all_classes_defined.clear()
-        self.all_classes_instantiated.clear()
-        self.all_methods_defined.clear()
-        self.all_methods_called.clear()
-        self.all_imports.clear()
+        self.reset()
         
         if target:
             target_path = self.project_dir / target
@@ -273,7 +291,18 @@ class IntegrationGapFinder:
                         filepath = Path(root) / file
                         self.analyze_file(filepath)
         
-        # Get results
+        return self.build_result()
+    
+    def reset(self):
+        """Clear state from a previous analysis."""
+        self.all_classes_defined.clear()
+        self.all_classes_instantiated.clear()
+        self.all_methods_defined.clear()
+        self.all_methods_called.clear()
+        self.all_imports.clear()
+    
+    def build_result(self) -> IntegrationGapResult:
+        """Reduce the merged per-file state into the analysis result."""
         return IntegrationGapResult(
             unused_classes=self.get_unused_classes(),
             classes_with_unused_methods=self.get_classes_with_unused_methods(),
@@ -0,0 +1,324 @@
+"""
+MinHash Signatures and LSH Banding
+
+Near-duplicate search without comparing every pair of items. The MinHash
+signature of a token set is ``NUM_PERM`` minimum hash values, and the
+fraction of positions where two signatures agree estimates the Jaccard
+similarity of the sets. LSH banding cuts signatures into bands of
+``rows`` values and makes two items a candidate pair when any band
+matches exactly: pairs above the similarity threshold become candidates
+with high probability, dissimilar pairs rarely do.
+
+``SignatureStore`` persists per-file records (extracted features and
+signatures) keyed by content hash, so unchanged files are not parsed or
+hashed again.
+
+Example:
+    hasher = default_hasher()
+    index = LSHIndex(threshold=0.75)
+    for path, tokens in token_sets.items():
+        index.add(path, hasher.signature(tokens))
+    for path1, path2 in index.candidate_pairs():
+        ...  # exact comparison
+"""
+
+import ast
+import base64
+import hashlib
+import json
+import random
+import struct
+import threading
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from pipeline.atomic_file import atomic_write
+from pipeline.config import PipelineConfig
+from pipeline.logging_setup import get_logger
+
+
+NUM_PERM = 128
+
+# Signature store file, in the configured state directory
+SIGNATURES_FILE = "duplicate_signatures.json"
+
+# Probability with which a pair exactly at the threshold becomes a candidate
+TARGET_RECALL = 0.99
+
+# Tokens per AST shingle
+SHINGLE_SIZE = 4
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class MinHasher:
+    """
+    MinHash over a fixed family of hash permutations ``(a * h + b) mod p``.
+    
+    Tokens are hashed with CRC32, so signatures are stable across processes
+    and can be persisted. Uses NumPy when available; the pure-Python path
+    computes the same values.
+    """
+    
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        """
+        Initialize the permutations.
+        
+        Args:
+            num_perm: Signature length
+            seed: Seed of the permutation coefficients
+        """
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        # a, b < 2**31 and h < 2**32, so a * h + b fits in 64 bits
+        self._a = [rng.randrange(1, 1 << 31) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, 1 << 31) for _ in range(num_perm)]
+        if NUMPY_AVAILABLE:
+            self._a_array = np.array(self._a, dtype=np.uint64)
+            self._b_array = np.array(self._b, dtype=np.uint64)
+    
+    def signature(self, tokens: Iterable[str]) -> Tuple[int, ...]:
+        """MinHash signature of a token set (all maximal for an empty set)."""
+        hashes = {zlib.crc32(token.encode()) for token in tokens}
+        if not hashes:
+            return (_MAX_HASH,) * self.num_perm
+        
+        if NUMPY_AVAILABLE:
+            values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+            permuted = (np.outer(values, self._a_array) + self._b_array) % np.uint64(_MERSENNE_PRIME)
+            return tuple((permuted & np.uint64(_MAX_HASH)).min(axis=0).tolist())
+        
+        return tuple(min(((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH for value in hashes)
+                     for a, b in zip(self._a, self._b))
+
+
+_default_hasher: Optional[MinHasher] = None
+
+
+def default_hasher() -> MinHasher:
+    """The shared hasher whose signatures ``SignatureStore`` persists."""
+    global _default_hasher
+    if _default_hasher is None:
+        _default_hasher = MinHasher()
+    return _default_hasher
+
+
+def estimate_similarity(signature1: Sequence[int], signature2: Sequence[int]) -> float:
+    """Jaccard similarity estimated from two signatures."""
+    if not signature1:
+        return 0.0
+    return sum(1 for x, y in zip(signature1, signature2) if x == y) / len(signature1)
+
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM,
+               target_recall: float = TARGET_RECALL) -> Optional[Tuple[int, int]]:
+    """
+    Banding for a similarity threshold.
+    
+    Picks the most rows per band (the fewest spurious candidates) for which
+    a pair at ``threshold`` still becomes a candidate with probability
+    ``target_recall``.
+    
+    Returns:
+        (bands, rows), or None when no banding reaches the target recall
+        (thresholds near zero, where every pair has to be compared anyway)
+    """
+    if threshold <= 0:
+        return None
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if 1 - (1 - min(threshold, 1.0) ** rows) ** bands >= target_recall:
+            return bands, rows
+    return None
+
+
+class LSHIndex:
+    """Banded LSH index producing candidate pairs for a similarity threshold."""
+    
+    def __init__(self, threshold: float, num_perm: int = NUM_PERM):
+        """
+        Initialize the index.
+        
+        Args:
+            threshold: Jaccard similarity the candidates should cover
+            num_perm: Length of the signatures added
+        
+        Raises:
+            ValueError: If no banding reaches the target recall for the threshold
+        """
+        params = lsh_params(threshold, num_perm)
+        if params is None:
+            raise ValueError(f"No LSH banding reaches {TARGET_RECALL:.0%} recall at threshold {threshold}")
+        self.bands, self.rows = params
+        self.keys: List[str] = []
+        self._buckets = [defaultdict(list) for _ in range(self.bands)]
+    
+    def add(self, key: str, signature: Sequence[int]):
+        """Index an item's signature."""
+        number = len(self.keys)
+        self.keys.append(key)
+        for band, buckets in enumerate(self._buckets):
+            start = band * self.rows
+            buckets[tuple(signature[start:start + self.rows])].append(number)
+    
+    def candidate_pairs(self) -> List[Tuple[str, str]]:
+        """Pairs sharing at least one band, in the order items were added."""
+        pairs: Set[Tuple[int, int]] = set()
+        for buckets in self._buckets:
+            for members in buckets.values():
+                for position, first in enumerate(members):
+                    for second in members[position + 1:]:
+                        pairs.add((first, second))
+        return [(self.keys[first], self.keys[second]) for first, second in sorted(pairs)]
+
+
+def ast_tokens(node: ast.AST) -> List[str]:
+    """
+    Node types of a syntax tree in source order, with identifiers and
+    literals normalized away (renamed copies produce the same tokens).
+    Attribute names are kept, as they name the API a piece of code uses.
+    """
+    tokens = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, ast.Constant):
+            tokens.append(f"Constant:{type(current.value).__name__}")
+        elif isinstance(current, ast.Attribute):
+            tokens.append(f"Attribute:{current.attr}")
+        else:
+            tokens.append(type(current).__name__)
+        stack.extend(reversed([child for child in ast.iter_child_nodes(current)
+                               if not isinstance(child, ast.expr_context)]))
+    return tokens
+
+
+def shingles(tokens: Sequence[str], size: int = SHINGLE_SIZE) -> Set[str]:
+    """Overlapping runs of ``size`` tokens (one shorter run for short inputs)."""
+    return {" ".join(tokens[start:start + size]) for start in range(max(1, len(tokens) - size + 1))}
+
+
+def encode_signature(signature: Sequence[int]) -> str:
+    """Compact text form of a signature for JSON."""
+    return base64.b64encode(struct.pack(f"<{len(signature)}I", *signature)).decode("ascii")
+
+
+def decode_signature(text: str) -> Tuple[int, ...]:
+    """Signature from ``encode_signature`` text."""
+    data = base64.b64decode(text)
+    return struct.unpack(f"<{len(data) // 4}I", data)
+
+
+class SignatureStore:
+    """
+    Analysis records per file content, persisted as JSON.
+    
+    A record is a dict of JSON values (features, encoded signatures) stored
+    under the SHA256 of the file content, so a record stays valid exactly as
+    long as the content it was computed from; identical files share one.
+    """
+    
+    def __init__(self, path: Path):
+        """
+        Initialize the store.
+        
+        Args:
+            path: JSON file the records are kept in
+        """
+        self.path = Path(path)
+        self.logger = get_logger()
+        self.hits = 0
+        self.misses = 0
+        self._records: Dict[str, Dict] = {}
+        self._used: Set[str] = set()
+        self._dirty = False
+        self._lock = threading.RLock()
+        self._load()
+    
+    def _load(self):
+        """Load records from disk"""
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+                self._records = data.get("records", {}) if data.get("num_perm") == NUM_PERM else {}
+            except (json.JSONDecodeError, IOError, AttributeError) as e:
+                self.logger.warning(f"Failed to load signatures: {e}")
+                self._records = {}
+    
+    def save(self, prune: bool = False):
+        """
+        Write the records to disk if they changed.
+        
+        Args:
+            prune: Drop records not used since the store was loaded
+                (content that no longer exists in the project)
+        """
+        with self._lock:
+            if prune and len(self._used) < len(self._records):
+                self._records = {key: record for key, record in self._records.items() if key in self._used}
+                self._dirty = True
+            if not self._dirty:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write(self.path, json.dumps({"num_perm": NUM_PERM, "records": self._records}))
+                self._dirty = False
+            except IOError as e:
+                self.logger.error(f"Failed to save signatures: {e}")
+    
+    @staticmethod
+    def content_hash(content: Union[str, bytes]) -> str:
+        """SHA256 of a file's content"""
+        if isinstance(content, str):
+            content = content.encode()
+        return hashlib.sha256(content).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """The record of a content hash, if any (counts a hit or miss)."""
+        with self._lock:
+            self._used.add(key)
+            record = self._records.get(key)
+            if record is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return record
+    
+    def update(self, key: str, **fields):
+        """Set fields of a content hash's record."""
+        with self._lock:
+            self._used.add(key)
+            self._records.setdefault(key, {}).update(fields)
+            self._dirty = True
+    
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+_stores: Dict[Path, SignatureStore] = {}
+_stores_lock = threading.Lock()
+
+
+def signature_store(project_dir: Path, state_dir: Optional[str] = None) -> SignatureStore:
+    """
+    The project's shared ``SignatureStore`` (one per store file and process).
+    
+    Args:
+        project_dir: Project root
+        state_dir: State directory relative to the project (default: the
+            ``PipelineConfig`` default)
+    """
+    path = (Path(project_dir) / (state_dir or PipelineConfig.state_dir) / SIGNATURES_FILE).resolve()
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = SignatureStore(path)
+        return _stores[path]
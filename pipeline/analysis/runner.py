@@ -0,0 +1,402 @@
+"""
+Unified Analysis Runner
+
+Runs several project-wide analyzers over a single walk of the project:
+each file is read and parsed once, the per-file visitors of all requested
+analyzers run on that tree in one traversal (fanned out across a process
+pool for large projects), and the cross-file reductions run afterwards in
+the parent.
+
+Analyzers plug in through a small protocol:
+
+- ``collect_file(tree, relative_path, source)`` (staticmethod, runs in workers)
+- optional ``file_visitor(relative_path, source)`` (staticmethod) returning a
+  ``FileVisitor``; the visitors of all such analyzers share one traversal of
+  the tree, and ``visitor.result()`` takes the place of ``collect_file``
+- ``reset()``, ``merge_file(relative_path, record)`` and ``build_result(**options)``
+- optional ``accepts(relative_path)`` to restrict the files an analyzer sees
+"""
+
+import ast
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+from pipeline.logging_setup import get_logger
+from pipeline.tracing import get_tracer
+from .visitor import MultiVisitor
+
+
+# Directories skipped by every analyzer's own walk
+SKIP_DIRS = ['__pycache__', '.git', 'venv', '.venv', 'node_modules']
+
+
+@dataclass
+class AnalyzerTiming:
+    """Timing of one analyzer in a run."""
+    name: str
+    files: int = 0
+    collect_seconds: float = 0.0  # Summed over workers (CPU time)
+    reduce_seconds: float = 0.0
+    skipped: bool = False
+    reason: str = ""
+    
+    @property
+    def total_seconds(self) -> float:
+        return self.collect_seconds + self.reduce_seconds
+    
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'files': self.files,
+            'collect_seconds': round(self.collect_seconds, 4),
+            'reduce_seconds': round(self.reduce_seconds, 4),
+            'total_seconds': round(self.total_seconds, 4),
+            'skipped': self.skipped,
+            'reason': self.reason
+        }
+
+
+@dataclass
+class AnalysisRunResult:
+    """Results and timings of an ``AnalysisRunner`` run."""
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, AnalyzerTiming] = field(default_factory=dict)
+    files_parsed: int = 0
+    parse_errors: List[Tuple[str, str]] = field(default_factory=list)
+    parse_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    workers: int = 1
+    options: Dict[str, Dict] = field(default_factory=dict)  # build_result options used
+    
+    @property
+    def skipped(self) -> List[str]:
+        return [name for name, timing in self.timings.items() if timing.skipped]
+    
+    def ran(self, name: str) -> bool:
+        """Whether an analyzer produced a result in this run."""
+        return name in self.results
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.results.get(name, default)
+    
+    def timing_report(self) -> str:
+        """Per-analyzer timing table."""
+        lines = [
+            f"Analysis run: {self.files_parsed} files, {self.workers} worker(s), "
+            f"parse {self.parse_seconds:.2f}s, wall {self.wall_seconds:.2f}s",
+            f"{'analyzer':<24} {'files':>6} {'collect':>9} {'reduce':>9} {'total':>9}"
+        ]
+        for timing in self.timings.values():
+            if timing.skipped:
+                lines.append(f"{timing.name:<24} {'skipped':>6}  ({timing.reason})")
+            else:
+                lines.append(
+                    f"{timing.name:<24} {timing.files:>6} {timing.collect_seconds:>8.3f}s "
+                    f"{timing.reduce_seconds:>8.3f}s {timing.total_seconds:>8.3f}s"
+                )
+        return "\n".join(lines)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'files_parsed': self.files_parsed,
+            'parse_errors': [{'file': f, 'error': e} for f, e in self.parse_errors],
+            'parse_seconds': round(self.parse_seconds, 4),
+            'wall_seconds': round(self.wall_seconds, 4),
+            'workers': self.workers,
+            'timings': {name: timing.to_dict() for name, timing in self.timings.items()},
+            'skipped': self.skipped
+        }
+
+
+def _collect_files(project_dir: str, items: List[Tuple[str, List[str]]],
+                   collectors: Dict[str, Callable],
+                   visitor_factories: Optional[Dict[str, Callable]] = None) -> List[Tuple]:
+    """
+    Parse files and run the per-file collectors (process pool worker).
+    
+    Analyzers with a visitor factory share one traversal per file; its time
+    is split evenly between them. If the shared traversal fails, they run
+    one at a time, so the failure is attributed to a single analyzer.
+    
+    Returns:
+        List of (relative_path, records, collect_seconds, parse_seconds, error)
+    """
+    visitor_factories = visitor_factories or {}
+    output = []
+    for relative_path, names in items:
+        start = time.perf_counter()
+        try:
+            filepath = Path(project_dir) / relative_path
+            with open(filepath, 'r', encoding='utf-8') as f:
+                source = f.read()
+            tree = ast.parse(source, filename=str(filepath))
+        except Exception as e:
+            output.append((relative_path, {}, {}, time.perf_counter() - start, f"{type(e).__name__}: {e}"))
+            continue
+        parse_seconds = time.perf_counter() - start
+        
+        records = {}
+        seconds = {}
+        error = None
+        shared = [name for name in names if name in visitor_factories]
+        if shared:
+            start = time.perf_counter()
+            try:
+                visitors = [visitor_factories[name](relative_path, source) for name in shared]
+                MultiVisitor(visitors).walk(tree)
+                for name, visitor in zip(shared, visitors):
+                    records[name] = visitor.result()
+            except Exception:
+                records = {}
+                shared = []
+            else:
+                elapsed = (time.perf_counter() - start) / len(shared)
+                seconds.update((name, elapsed) for name in shared)
+        
+        for name in names:
+            if name in shared:
+                continue
+            start = time.perf_counter()
+            try:
+                records[name] = collectors[name](tree, relative_path, source)
+            except Exception as e:
+                error = f"{name}: {type(e).__name__}: {e}"
+            seconds[name] = time.perf_counter() - start
+        output.append((relative_path, records, seconds, parse_seconds, error))
+    return output
+
+
+class AnalysisRunner:
+    """
+    Runs multiple analyzers with one parse per file.
+    
+    Per-file work is spread over at most ``max_workers`` processes (small
+    runs stay in-process). With a ``budget`` (seconds), analyzers whose cost
+    in previous runs would overrun the remaining budget are skipped, and
+    reductions stop once the budget is spent. Costs are remembered on the
+    runner, so keep one instance per phase.
+    
+    Example:
+        runner = AnalysisRunner('/project')
+        run = runner.run(['complexity', 'dead_code'], budget=5.0)
+        print(run.timing_report())
+        complexity = run.get('complexity')
+    """
+    
+    # Run order; cheaper, higher-signal analyzers first
+    DEFAULT_ANALYZERS = [
+        'complexity', 'dead_code', 'integration_gaps',
+        'integration_conflicts', 'call_graph', 'duplicates'
+    ]
+    
+    def __init__(self, project_dir: str, logger: Optional[logging.Logger] = None,
+                 analyzers: Optional[Dict[str, Any]] = None,
+                 max_workers: Optional[int] = None, chunk_size: int = 32,
+                 options: Optional[Dict[str, Dict]] = None, state_dir: Optional[str] = None):
+        """
+        Initialize analysis runner.
+        
+        Args:
+            project_dir: Project root directory
+            logger: Optional logger instance
+            analyzers: Analyzer instances by name (defaults are created lazily)
+            max_workers: Maximum worker processes (default: min(4, cpu count))
+            chunk_size: Files per worker task; smaller runs stay in-process
+            options: Per-analyzer keyword arguments for ``build_result``
+            state_dir: State directory for persisted analysis data (duplicate signatures)
+        """
+        self.project_dir = Path(project_dir)
+        self.state_dir = state_dir
+        self.logger = logger or get_logger()
+        self.analyzers: Dict[str, Any] = dict(analyzers or {})
+        self.max_workers = max_workers if max_workers is not None else min(4, os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.options: Dict[str, Dict] = {'duplicates': {'similarity_threshold': 0.75}}
+        self.options.update(options or {})
+        self.cost_history: Dict[str, float] = {}  # name -> last observed cost (seconds)
+    
+    def get_analyzer(self, name: str) -> Any:
+        """Get (or create) the analyzer registered under a name."""
+        if name not in self.analyzers:
+            self.analyzers[name] = self._create_analyzer(name)
+        return self.analyzers[name]
+    
+    def _create_analyzer(self, name: str) -> Any:
+        project_dir = str(self.project_dir)
+        if name == 'complexity':
+            from .complexity import ComplexityAnalyzer
+            return ComplexityAnalyzer(project_dir, self.logger)
+        if name == 'dead_code':
+            from .dead_code import DeadCodeDetector
+            return DeadCodeDetector(project_dir, self.logger)
+        if name == 'integration_gaps':
+            from .integration_gaps import IntegrationGapFinder
+            return IntegrationGapFinder(project_dir, self.logger)
+        if name == 'integration_conflicts':
+            from .integration_conflicts import IntegrationConflictDetector
+            return IntegrationConflictDetector(project_dir, self.logger)
+        if name == 'call_graph':
+            from .call_graph import CallGraphGenerator
+            return CallGraphGenerator(project_dir, self.logger)
+        if name == 'duplicates':
+            from .file_refactoring import DuplicateDetector
+            return DuplicateDetector(self.project_dir, self.logger, state_dir=self.state_dir)
+        if name == 'dataflow':
+            from .dataflow import DataFlowAnalyzer
+            return DataFlowAnalyzer(project_dir, self.logger)
+        raise ValueError(f"Unknown analyzer: {name}")
+    
+    def discover_files(self, target: Optional[str] = None) -> List[str]:
+        """Python files under target (relative to project_dir), in walk order."""
+        target_path = self.project_dir / target if target else self.project_dir
+        if not target_path.exists():
+            self.logger.error(f"Target not found: {target_path}")
+            return []
+        
+        if target_path.is_file():
+            if target_path.suffix == '.py':
+                return [str(target_path.relative_to(self.project_dir))]
+            return []
+        
+        files = []
+        for root, dirs, filenames in os.walk(target_path):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for filename in filenames:
+                if filename.endswith('.py'):
+                    files.append(str((Path(root) / filename).relative_to(self.project_dir)))
+        return files
+    
+    def _estimate(self, name: str, workers: int) -> float:
+        return self.cost_history.get(name, 0.0) / max(1, workers)
+    
+    def run(self, analyzers: Optional[List[str]] = None, target: Optional[str] = None,
+            budget: Optional[float] = None, files: Optional[List[str]] = None) -> AnalysisRunResult:
+        """
+        Run analyzers over the project (or a target file/directory).
+        
+        Args:
+            analyzers: Analyzer names to run (default: DEFAULT_ANALYZERS)
+            target: Optional specific file or directory (relative to project_dir)
+            budget: Optional latency budget in seconds
+            files: Optional explicit file set (relative to project_dir), used
+                instead of target; non-Python and missing files are ignored
+        
+        Returns:
+            AnalysisRunResult with per-analyzer results and timings
+        """
+        tracer = get_tracer()
+        with tracer.span("analysis.run", category="analysis") as span:
+            run = self._run(analyzers, target, budget, files, tracer)
+            span.set(files=run.files_parsed, workers=run.workers)
+        return run
+    
+    def _run(self, analyzers, target, budget, files, tracer) -> AnalysisRunResult:
+        run_start = time.perf_counter()
+        names = list(analyzers or self.DEFAULT_ANALYZERS)
+        run = AnalysisRunResult(
+            timings={name: AnalyzerTiming(name) for name in names},
+            options={name: dict(self.options.get(name, {})) for name in names}
+        )
+        
+        if files is not None:
+            files = [path for path in dict.fromkeys(files)
+                     if path.endswith('.py') and (self.project_dir / path).is_file()]
+        else:
+            files = self.discover_files(target)
+        chunks = [files[i:i + self.chunk_size] for i in range(0, len(files), self.chunk_size)]
+        workers = min(self.max_workers, len(chunks)) if len(chunks) > 1 else 1
+        run.workers = workers
+        
+        # Skip analyzers that previously cost more than the budget allows
+        selected = []
+        remaining = budget
+        for name in names:
+            estimate = self._estimate(name, workers)
+            if remaining is not None and selected and estimate > remaining:
+                run.timings[name].skipped = True
+                run.timings[name].reason = f"estimated {estimate:.2f}s exceeds budget"
+                continue
+            selected.append(name)
+            if remaining is not None:
+                remaining -= estimate
+        
+        active = {name: self.get_analyzer(name) for name in selected}
+        for analyzer in active.values():
+            analyzer.reset()
+        collectors = {name: type(analyzer).collect_file for name, analyzer in active.items()}
+        visitor_factories = {name: type(analyzer).file_visitor for name, analyzer in active.items()
+                             if hasattr(analyzer, 'file_visitor')}
+        
+        def accepted(relative_path: str) -> List[str]:
+            return [
+                name for name, analyzer in active.items()
+                if not hasattr(analyzer, 'accepts') or analyzer.accepts(relative_path)
+            ]
+        
+        work = [[(path, accepted(path)) for path in chunk] for chunk in chunks]
+        
+        # Merge per-file records in walk order so results match serial analysis
+        for chunk_output in self._map(work, collectors, visitor_factories, workers):
+            for relative_path, records, seconds, parse_seconds, error in chunk_output:
+                run.parse_seconds += parse_seconds
+                if not records and error:
+                    run.parse_errors.append((relative_path, error))
+                    self.logger.warning(f"Skipping {relative_path}: {error}")
+                    continue
+                run.files_parsed += 1
+                if error:
+                    self.logger.error(f"Error analyzing {relative_path}: {error}")
+                for name, record in records.items():
+                    active[name].merge_file(relative_path, record)
+                    run.timings[name].files += 1
+                for name, elapsed in seconds.items():
+                    run.timings[name].collect_seconds += elapsed
+        
+        # Cross-file reductions
+        for name, analyzer in active.items():
+            timing = run.timings[name]
+            if budget is not None and time.perf_counter() - run_start > budget and run.results:
+                timing.skipped = True
+                timing.reason = "budget exhausted"
+                continue
+            start = time.perf_counter()
+            try:
+                with tracer.span(f"analyzer.{name}.reduce", category="analysis"):
+                    run.results[name] = analyzer.build_result(**self.options.get(name, {}))
+            except Exception as e:
+                self.logger.error(f"{name} analysis failed: {e}")
+            timing.reduce_seconds = time.perf_counter() - start
+            self.cost_history[name] = timing.total_seconds
+        
+        # Per-file work ran in workers; report it as summed durations
+        tracer.record("analysis.parse", run.parse_seconds)
+        for name, timing in run.timings.items():
+            if not timing.skipped:
+                tracer.record(f"analyzer.{name}.collect", timing.collect_seconds)
+        
+        run.wall_seconds = time.perf_counter() - run_start
+        self.logger.debug(run.timing_report())
+        return run
+    
+    def _map(self, work: List[List[Tuple[str, List[str]]]], collectors: Dict[str, Callable],
+             visitor_factories: Dict[str, Callable], workers: int):
+        """Yield collector output per chunk, in chunk order."""
+        project_dir = str(self.project_dir)
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(_collect_files, project_dir, chunk, collectors, visitor_factories)
+                               for chunk in work]
+                    outputs = [future.result() for future in futures]
+                yield from outputs
+                return
+            except Exception as e:
+                self.logger.warning(f"Process pool unavailable ({e}), analyzing in-process")
+        
+        for chunk in work:
+            yield _collect_files(project_dir, chunk, collectors, visitor_factories)
@@ -0,0 +1,118 @@
+"""
+Composable Per-File Visitors
+
+Lets several analyzers share one traversal of a parsed module. Each
+analyzer's per-file part is a ``FileVisitor`` that registers callbacks by
+node type (``enter_Call``, ``leave_ClassDef``, ...); ``MultiVisitor`` walks
+the tree once and dispatches every node to the visitors interested in its
+type:
+
+- ``enter_<Type>(node)`` runs before the node's children are visited
+- ``leave_<Type>(node)`` runs after them (for scope tracking)
+
+Nodes are visited depth-first in ``ast.iter_child_nodes`` order, the order
+``ast.NodeVisitor`` uses, so a ``visit_X`` method that does its work and
+then calls ``generic_visit`` becomes an ``enter_X`` method unchanged.
+
+Example:
+    visitors = [ComplexityVisitor(path), CallGraphVisitor(path)]
+    MultiVisitor(visitors).walk(tree)
+    results = [visitor.result() for visitor in visitors]
+"""
+
+import ast
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Type
+
+
+@lru_cache(maxsize=None)
+def _callback_names(visitor_class: Type) -> Tuple[Tuple[Tuple[type, str], ...], Tuple[Tuple[type, str], ...]]:
+    """(node type, method name) pairs of a visitor class's enter and leave callbacks."""
+    enter, leave = [], []
+    for name in dir(visitor_class):
+        prefix, _, node_name = name.partition('_')
+        node_type = getattr(ast, node_name, None)
+        if prefix not in ('enter', 'leave') or not (isinstance(node_type, type) and issubclass(node_type, ast.AST)):
+            continue
+        (enter if prefix == 'enter' else leave).append((node_type, name))
+    return tuple(enter), tuple(leave)
+
+
+@lru_cache(maxsize=None)
+def _reversed_fields(node_type: type) -> Tuple[str, ...]:
+    """Field names of a node type, last first."""
+    return tuple(reversed(node_type._fields))
+
+
+class FileVisitor:
+    """
+    Per-file part of an analyzer.
+    
+    Subclasses define ``enter_<Type>`` / ``leave_<Type>`` methods and hold
+    the file's findings. Visitors are returned from worker processes, so
+    they should keep plain data only.
+    """
+    
+    def visit(self, tree: ast.AST):
+        """Walk a tree with this visitor alone."""
+        MultiVisitor([self]).walk(tree)
+    
+    def result(self) -> Any:
+        """Per-file record handed to the analyzer's ``merge_file`` (the visitor itself by default)."""
+        return self
+
+
+class MultiVisitor:
+    """Single traversal dispatching each node to several ``FileVisitor``s."""
+    
+    def __init__(self, visitors: Sequence[FileVisitor]):
+        """
+        Initialize the dispatch tables.
+        
+        Args:
+            visitors: Visitors in the order their callbacks run for a node
+        """
+        self.visitors = list(visitors)
+        self._enter: Dict[type, List[Callable]] = {}
+        self._leave: Dict[type, List[Callable]] = {}
+        for visitor in self.visitors:
+            enter, leave = _callback_names(type(visitor))
+            for node_type, name in enter:
+                self._enter.setdefault(node_type, []).append(getattr(visitor, name))
+            for node_type, name in leave:
+                self._leave.setdefault(node_type, []).append(getattr(visitor, name))
+        # Leave callbacks run in reverse, so nested scopes unwind like nested calls
+        for callbacks in self._leave.values():
+            callbacks.reverse()
+    
+    def walk(self, tree: ast.AST):
+        """Visit every node of a tree once."""
+        enter = self._enter
+        leave = self._leave
+        AST = ast.AST
+        stack: List[Any] = [tree]
+        while stack:
+            node = stack.pop()
+            if type(node) is tuple:  # (leave callbacks, node) after the node's children
+                callbacks, node = node
+                for callback in callbacks:
+                    callback(node)
+                continue
+            
+            node_type = type(node)
+            callbacks = enter.get(node_type)
+            if callbacks:
+                for callback in callbacks:
+                    callback(node)
+            callbacks = leave.get(node_type)
+            if callbacks:
+                stack.append((callbacks, node))
+            # Children pushed last-first, so they pop in ``ast.iter_child_nodes`` order
+            for field in _reversed_fields(node_type):
+                value = getattr(node, field, None)
+                if isinstance(value, list):
+                    for item in reversed(value):
+                        if isinstance(item, AST):
+                            stack.append(item)
+                elif isinstance(value, AST):
+                    stack.append(value)
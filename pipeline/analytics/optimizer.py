@@ -57,6 +57,7 @@ class OptimizationEngine:
         self.resource_usage: Dict[str, List[Dict[str, float]]] = defaultdict(list)
         self.quality_metrics: Dict[str, List[float]] = defaultdict(list)
         self.task_completion_times: Dict[str, List[float]] = defaultdict(list)
+        self.model_usage: Dict[str, List[Dict[str, float]]] = defaultdict(list)
         self.optimization_history: List[Optimization] = []
         
     def record_phase_performance(self, phase_name: str, duration: float, 
@@ -80,6 +81,11 @@ class OptimizationEngine:
     def record_task_completion(self, task_type: str, duration: float):
         """Record task completion time for analysis"""
         self.task_completion_times[task_type].append(duration)
+    
+    def record_model_usage(self, phase_name: str, usage: Dict[str, float]):
+        """Record model token/timing totals of one phase execution for analysis"""
+        if usage.get('calls'):
+            self.model_usage[phase_name].append(dict(usage))
         
     def generate_performance_optimizations(self) -> List[Optimization]:
         """Generate performance optimization recommendations"""
@@ -254,6 +260,76 @@ class OptimizationEngine:
                 
         return optimizations
         
+    def generate_model_optimizations(self) -> List[Optimization]:
+        """Generate model usage recommendations from token counts and load times"""
+        optimizations = []
+        
+        for phase_name, records in self.model_usage.items():
+            if len(records) < 5:
+                continue
+            
+            calls = sum(r['calls'] for r in records)
+            reloads = sum(r['reloads'] for r in records)
+            prompt_tokens = sum(r['prompt_tokens'] for r in records)
+            eval_tokens = sum(r['eval_tokens'] for r in records)
+            load_seconds = sum(r['load_seconds'] for r in records)
+            total_seconds = sum(r['total_seconds'] for r in records)
+            
+            # Check for models being reloaded between calls
+            reload_rate = reloads / calls
+            if reload_rate > 0.2:
+                optimizations.append(Optimization(
+                    optimization_id=f"model_reload_{phase_name}",
+                    category='resource',
+                    priority='HIGH',
+                    title=f"Keep {phase_name} Model Resident",
+                    description=f"{reload_rate:.0%} of {phase_name} model calls reloaded the model "
+                                f"({load_seconds:.0f}s of {total_seconds:.0f}s spent loading).",
+                    expected_benefit=f"Up to {load_seconds:.0f}s less model load time",
+                    implementation_effort='LOW',
+                    steps=[
+                        "Raise Ollama keep_alive for this model",
+                        "Avoid alternating models on the same server",
+                        "Pin the phase to a server that keeps the model loaded"
+                    ],
+                    metrics_to_track=[
+                        'model_reloads',
+                        'load_duration'
+                    ],
+                    estimated_impact={
+                        'time_saved_seconds': load_seconds,
+                        'reload_rate': reload_rate
+                    }
+                ))
+            
+            # Check for prompt-dominated token spend
+            mean_prompt = prompt_tokens / calls
+            if mean_prompt > 4000 and prompt_tokens > 20 * max(eval_tokens, 1):
+                optimizations.append(Optimization(
+                    optimization_id=f"model_prompt_{phase_name}",
+                    category='performance',
+                    priority='MEDIUM',
+                    title=f"Trim {phase_name} Prompt Context",
+                    description=f"{phase_name} sends {mean_prompt:.0f} prompt tokens per call on average, "
+                                f"{prompt_tokens / max(eval_tokens, 1):.0f}x the tokens it generates.",
+                    expected_benefit="Lower prompt processing time per call",
+                    implementation_effort='MEDIUM',
+                    steps=[
+                        "Review which context sections the phase needs",
+                        "Summarize or truncate conversation history",
+                        "Send only the relevant parts of large files"
+                    ],
+                    metrics_to_track=[
+                        'prompt_tokens',
+                        'prompt_eval_duration'
+                    ],
+                    estimated_impact={
+                        'mean_prompt_tokens': mean_prompt
+                    }
+                ))
+        
+        return optimizations
+    
     def generate_quality_optimizations(self) -> List[Optimization]:
         """Generate quality optimization recommendations"""
         optimizations = []
@@ -415,6 +491,7 @@ class OptimizationEngine:
         # Collect all optimizations
         all_optimizations.extend(self.generate_performance_optimizations())
         all_optimizations.extend(self.generate_resource_optimizations())
+        all_optimizations.extend(self.generate_model_optimizations())
         all_optimizations.extend(self.generate_quality_optimizations())
         all_optimizations.extend(self.generate_scheduling_optimizations())
         
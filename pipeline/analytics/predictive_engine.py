@@ -26,6 +26,7 @@ class PhasePrediction:
     confidence: float  # 0.0 to 1.0
     risk_factors: List[str] = field(default_factory=list)
     recommendations: List[str] = field(default_factory=list)
+    estimated_tokens: Optional[float] = None  # prompt + generated, per execution
 
 @dataclass
 class TaskPrediction:
@@ -86,13 +87,15 @@ class PredictiveAnalyticsEngine:
         self.objective_history: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
         
     def record_phase_execution(self, phase_name: str, success: bool, 
-                               duration: float, context: Dict[str, Any]):
-        """Record phase execution for learning"""
+                               duration: float, context: Dict[str, Any],
+                               model_usage: Optional[Dict[str, float]] = None):
+        """Record phase execution (and its model token/timing totals) for learning"""
         self.phase_history[phase_name].append({
             'timestamp': datetime.now(),
             'success': success,
             'duration': duration,
-            'context': context
+            'context': context,
+            'model_usage': model_usage
         })
         
     def record_task_completion(self, task_id: str, success: bool, 
@@ -204,13 +207,25 @@ class PredictiveAnalyticsEngine:
         if not similar_contexts:
             recommendations.append('Context differs from history - monitor closely')
             
+        # Model token spend and reloads
+        usages = [h['model_usage'] for h in history if h.get('model_usage')]
+        estimated_tokens = None
+        if usages:
+            estimated_tokens = statistics.mean(u['prompt_tokens'] + u['eval_tokens'] for u in usages)
+            load_seconds = sum(u['load_seconds'] for u in usages)
+            model_seconds = sum(u['total_seconds'] for u in usages)
+            if model_seconds > 0 and load_seconds / model_seconds > 0.2:
+                risk_factors.append('Model reloads take a large share of model time')
+                recommendations.append('Keep the phase model loaded between calls')
+        
         return PhasePrediction(
             phase_name=phase_name,
             success_probability=success_probability,
             estimated_duration=estimated_duration,
             confidence=confidence,
             risk_factors=risk_factors,
-            recommendations=recommendations
+            recommendations=recommendations,
+            estimated_tokens=estimated_tokens
         )
         
     def predict_task_completion(self, task_id: str, 
@@ -518,6 +533,10 @@ class PredictiveAnalyticsEngine:
         return {
             'phases_tracked': len(self.phase_history),
             'total_phase_executions': sum(len(h) for h in self.phase_history.values()),
+            'total_model_tokens': sum(
+                h['model_usage']['prompt_tokens'] + h['model_usage']['eval_tokens']
+                for history in self.phase_history.values() for h in history if h.get('model_usage')
+            ),
             'tasks_tracked': len(self.task_history),
             'total_task_completions': sum(len(h) for h in self.task_history.values()),
             'issues_recorded': len(self.issue_history),
@@ -0,0 +1,447 @@
+"""
+Async Ollama Client
+
+An asyncio-native counterpart of ``OllamaClient.chat`` for issuing many
+model requests at once (orchestrator waves, specialist fan-out) without a
+thread per in-flight call.
+
+All requests go through one process-wide ``AsyncTransport``: a single
+event loop running in a daemon thread, a keep-alive HTTP/1.1 connection
+pool per server and a semaphore per server bounding in-flight requests
+(``config.max_requests_per_host``). The transport speaks just enough
+HTTP/1.1 for the Ollama JSON API (Content-Length and chunked bodies) on top
+of asyncio streams, so there is no extra dependency.
+
+Every request can carry its own timeout; cancelling the awaiting task (or
+the ``concurrent.futures.Future`` returned by ``submit``) abandons the
+request and drops its connection.
+
+Example:
+    client = OllamaClient(config)
+    results = client.async_client.chat_many([
+        {"host": host, "model": model, "messages": messages_a},
+        {"host": host, "model": model, "messages": messages_b, "timeout": 60},
+    ])
+    
+    async def wave():
+        return await asyncio.gather(*(client.async_client.chat(**r) for r in requests))
+    client.async_client.run(wave())
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .config import PipelineConfig
+from .logging_setup import get_logger
+from .model_metrics import CallMetrics, ModelMetricsStore
+from .tool_schema import encode_request_body
+
+
+DEFAULT_PORT = 11434
+
+# Idle keep-alive connections kept per server
+MAX_IDLE_CONNECTIONS = 8
+
+
+class HTTPError(Exception):
+    """Malformed or truncated HTTP response."""
+
+
+def chat_payload(model: str, messages: List[Dict], tools: List[Dict] = None,
+                 temperature: float = 0.3, keep_alive=None) -> Dict:
+    """
+    Body of an /api/chat request, shared by ``OllamaClient.chat`` and
+    ``AsyncOllamaClient.chat``.
+    
+    The context window is sized from the model name: 16k for 32b/70b
+    models, 4k for 3b/7b models, 8k otherwise.
+    """
+    num_ctx = 8192  # Default for most models
+    if "32b" in model or "70b" in model:
+        num_ctx = 16384  # Larger context for bigger models
+    elif "7b" in model or "3b" in model:
+        num_ctx = 4096  # Smaller context for smaller models
+    
+    payload = {
+        "model": model,
+        "messages": messages,
+        "stream": False,
+        "options": {
+            "temperature": temperature,
+            "num_ctx": num_ctx
+        }
+    }
+    if tools:
+        payload["tools"] = tools
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    return payload
+
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection."""
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+    
+    @property
+    def closed(self) -> bool:
+        return self.writer.is_closing() or self.reader.at_eof()
+    
+    def close(self):
+        self.reusable = False
+        self.writer.close()
+    
+    async def request(self, method: str, host: str, path: str, body: bytes) -> Tuple[int, bytes]:
+        head = (f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {host}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: keep-alive\r\n\r\n")
+        self.writer.write(head.encode("latin-1") + body)
+        await self.writer.drain()
+        
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise HTTPError("connection closed before response")
+        parts = status_line.decode("latin-1").split(None, 2)
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise HTTPError(f"bad status line: {status_line!r}")
+        status = int(parts[1])
+        
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            payload = await self._read_chunked()
+        elif "content-length" in headers:
+            payload = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            payload = await self.reader.read()
+            self.reusable = False
+        
+        keep_alive = headers.get("connection", "").lower()
+        if keep_alive == "close" or (parts[0] == "HTTP/1.0" and keep_alive != "keep-alive"):
+            self.reusable = False
+        return status, payload
+    
+    async def _read_chunked(self) -> bytes:
+        chunks = []
+        while True:
+            size_line = await self.reader.readline()
+            if not size_line:
+                raise HTTPError("truncated chunked body")
+            size = int(size_line.split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                # Trailer section ends with an empty line
+                while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readline()
+
+
+class _HostPool:
+    """Idle connections and the in-flight limit of one server."""
+    
+    def __init__(self, host: str, port: int, limit: int, ssl: bool = False):
+        self.host = host
+        self.port = port
+        self.limit = limit
+        self.ssl = ssl
+        self.semaphore = asyncio.Semaphore(limit)
+        self.idle: List[_Connection] = []
+        self.in_flight = 0
+        self.opened = 0
+    
+    async def acquire(self) -> Tuple[_Connection, bool]:
+        """An open connection and whether it was reused from the idle pool."""
+        while self.idle:
+            connection = self.idle.pop()
+            if not connection.closed:
+                return connection, True
+            connection.close()
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=True if self.ssl else None)
+        self.opened += 1
+        return _Connection(reader, writer), False
+    
+    def release(self, connection: _Connection):
+        if connection.reusable and not connection.closed and len(self.idle) < MAX_IDLE_CONNECTIONS:
+            self.idle.append(connection)
+        else:
+            connection.close()
+    
+    def close(self):
+        for connection in self.idle:
+            connection.close()
+        self.idle.clear()
+
+
+class AsyncTransport:
+    """
+    Process-wide event loop thread plus per-server connection pools.
+    
+    Use ``get_async_transport()`` rather than creating instances, so all
+    clients share the pools and per-server limits.
+    """
+    
+    def __init__(self):
+        self.logger = get_logger()
+        self.pools: Dict[Tuple[str, int], _HostPool] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The transport's event loop, started on first use."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name="ollama-async", daemon=True)
+                self._thread.start()
+            return self._loop
+    
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+    
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the transport loop (cancel the future to cancel it)."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    def run(self, coro, timeout: Optional[float] = None):
+        """
+        Run a coroutine on the transport loop and wait for its result.
+        
+        On timeout the coroutine is cancelled and ``TimeoutError`` raised.
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("AsyncTransport.run() called from the transport loop; await instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"async requests did not finish within {timeout}s")
+        except BaseException:
+            future.cancel()
+            raise
+    
+    async def post_json(self, host: str, port: int, path: str, payload: Dict,
+                        limit: int, ssl: bool = False) -> Tuple[int, bytes]:
+        """POST JSON to a server (over TLS with ``ssl``), waiting for a free slot of its in-flight limit."""
+        pool = self.pools.get((host, port))
+        if pool is None:
+            pool = self.pools[(host, port)] = _HostPool(host, port, limit, ssl)
+        body = encode_request_body(payload)
+        
+        async with pool.semaphore:
+            pool.in_flight += 1
+            connection = None
+            try:
+                connection, reused = await pool.acquire()
+                try:
+                    return await connection.request("POST", f"{host}:{port}", path, body)
+                except (HTTPError, ConnectionError, asyncio.IncompleteReadError):
+                    if not reused:
+                        raise
+                    # The server closed the idle connection; retry once on a fresh one
+                    connection.close()
+                    connection, _ = await pool.acquire()
+                    return await connection.request("POST", f"{host}:{port}", path, body)
+            except BaseException:
+                if connection is not None:
+                    connection.close()
+                raise
+            finally:
+                pool.in_flight -= 1
+                if connection is not None:
+                    pool.release(connection)
+    
+    def close(self):
+        """Close pooled connections and stop the loop thread."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        
+        async def shutdown():
+            for pool in self.pools.values():
+                pool.close()
+            self.pools.clear()
+        
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+        loop.close()
+
+
+_transport = AsyncTransport()
+
+
+def get_async_transport() -> AsyncTransport:
+    """The process-wide transport."""
+    return _transport
+
+
+class AsyncOllamaClient:
+    """
+    Asyncio chat client for the servers of one configuration.
+    
+    Cheap to create: the event loop, connections and per-server limits live
+    in the shared ``AsyncTransport``. Calls are recorded in ``metrics`` with
+    the phase/task attribution of the thread that scheduled them.
+    """
+    
+    def __init__(self, config: PipelineConfig, metrics: Optional[ModelMetricsStore] = None,
+                 transport: Optional[AsyncTransport] = None, residency=None):
+        """
+        Initialize async client.
+        
+        Args:
+            config: Pipeline configuration (servers, per-host limit)
+            metrics: Store for call metrics (shared with the sync client)
+            transport: Transport to use (default: the process-wide one)
+            residency: ResidencyPlanner for keep_alive pins (shared with the sync client)
+        """
+        self.config = config
+        self.metrics = metrics if metrics is not None else ModelMetricsStore()
+        self.transport = transport or get_async_transport()
+        self.residency = residency
+        self.max_requests_per_host = max(1, getattr(config, 'max_requests_per_host', 2))
+        self.logger = get_logger()
+    
+    def _address(self, host: str) -> Tuple[str, int, bool]:
+        """
+        Resolve a host name or URL to (hostname, port, use TLS), like
+        ``OllamaClient.chat``.
+        
+        Raises:
+            ValueError: For URLs with a scheme other than http or https
+        """
+        for server in self.config.servers:
+            if server.host == host:
+                return server.host, server.port, False
+        if "://" in host:
+            parsed = urlparse(host)
+            if parsed.scheme not in ("http", "https"):
+                raise ValueError(f"Unsupported URL scheme for {host}")
+            return parsed.hostname, parsed.port or DEFAULT_PORT, parsed.scheme == "https"
+        hostname, _, port = host.partition(":")
+        return hostname, int(port) if port.isdigit() else DEFAULT_PORT, False
+    
+    async def chat(self, host: str, model: str, messages: List[Dict], tools: List[Dict] = None,
+                   temperature: float = 0.3, timeout: Optional[float] = None) -> Dict:
+        """
+        Send a chat request; same payload and result shape as ``OllamaClient.chat``.
+        
+        Errors (HTTP status, timeout, connection failure) are returned as
+        ``{"error": ...}``; cancellation propagates.
+        """
+        keep_alive = self.residency.keep_alive_for(model) if self.residency else None
+        payload = chat_payload(model, messages, tools, temperature, keep_alive)
+        
+        hostname, port, ssl = self._address(host)
+        start_time = time.perf_counter()
+        try:
+            status, body = await asyncio.wait_for(
+                self.transport.post_json(hostname, port, "/api/chat", payload, self.max_requests_per_host, ssl),
+                timeout,
+            )
+            if status == 200:
+                result = json.loads(body)
+            else:
+                self.logger.error(f"API error: HTTP {status} from {hostname}")
+                result = {"error": f"HTTP {status}"}
+        except asyncio.TimeoutError:
+            self.logger.error(f"Request to {hostname} timed out after {timeout}s")
+            result = {"error": "timeout"}
+        except (OSError, HTTPError, asyncio.IncompleteReadError, json.JSONDecodeError) as e:
+            self.logger.error(f"Request to {hostname} failed: {e}")
+            result = {"error": str(e)}
+        
+        call = CallMetrics.from_response(result, model=model, host=host,
+                                         wall_seconds=time.perf_counter() - start_time)
+        self.metrics.record(call)
+        if self.residency and not call.error:
+            self.residency.observe_call(host, model, call.load_seconds, keep_alive)
+        return result
+    
+    async def load(self, host: str, model: str, keep_alive=None, timeout: Optional[float] = None) -> Dict:
+        """
+        Load a model without generating (a generate request without a prompt),
+        e.g. to warm it before it is needed. Not recorded in the call metrics.
+        """
+        payload = {"model": model}
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        hostname, port, ssl = self._address(host)
+        try:
+            status, body = await asyncio.wait_for(
+                self.transport.post_json(hostname, port, "/api/generate", payload, self.max_requests_per_host, ssl),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            return {"error": "timeout"}
+        except (OSError, HTTPError, asyncio.IncompleteReadError) as e:
+            return {"error": str(e)}
+        if status != 200:
+            return {"error": f"HTTP {status}"}
+        try:
+            return json.loads(body)
+        except json.JSONDecodeError as e:
+            return {"error": str(e)}
+    
+    def _attributed(self, coro):
+        """Carry the calling thread's phase/task attribution into the loop."""
+        phase, task = self.metrics.current_attribution()
+        
+        async def run():
+            with self.metrics.attribute(phase=phase, task=task):
+                return await coro
+        return run()
+    
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine; cancel the returned future to cancel its requests."""
+        return self.transport.submit(self._attributed(coro))
+    
+    def run(self, coro, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine (e.g. a gather of chats) and wait for its result."""
+        return self.transport.run(self._attributed(coro), timeout)
+    
+    def chat_many(self, requests: List[Dict], timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Send several chat requests concurrently.
+        
+        Args:
+            requests: ``chat`` keyword arguments per request (each may set its own timeout)
+            timeout: Overall limit; unfinished requests are cancelled and return {"error": "timeout"}
+        
+        Returns:
+            Results in request order
+        """
+        async def fan_out():
+            tasks = [asyncio.ensure_future(self.chat(**request)) for request in requests]
+            done, pending = await asyncio.wait(tasks, timeout=timeout) if tasks else (set(), set())
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+            return [task.result() if task in done and not task.cancelled() else {"error": "timeout"}
+                    for task in tasks]
+        return self.run(fan_out())
@@ -0,0 +1,407 @@
+"""
+Pipeline Benchmark
+
+Runs ``PhaseCoordinator`` end to end against the mock Ollama server and a
+synthetic project, and reports what the orchestration layer itself costs:
+
+- per phase: runs, wall time, time waiting on the model and the rest
+  (non-LLM overhead)
+- state I/O: StateManager load/save counts and time
+- loop overhead outside phase execution and coordinator start-up
+- peak RSS of the process
+
+Usage:
+    python -m pipeline.benchmark --sizes 10 100 1000 --iterations 20
+    python -m pipeline.benchmark --sizes 100 --latency 0.2 --tokens-per-second 40 -o bench.json
+
+Each size runs in its own process (``--no-isolate`` to disable) so peak RSS
+is per project size rather than the maximum so far.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from contextlib import contextmanager
+from pathlib import Path
+from queue import Empty
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from .client import OllamaClient
+from .config import PipelineConfig
+from .mock_ollama import MockOllamaServer
+from .state.manager import StateManager
+
+
+DEFAULT_SIZES = (10, 100, 1000)
+
+# Modules per synthetic package
+_PACKAGE_SIZE = 25
+
+# Seconds between liveness checks of an isolated benchmark process
+_POLL_SECONDS = 1.0
+
+
+def create_synthetic_project(project_dir: Path, files: int) -> Path:
+    """
+    Write a deterministic Python project with ``files`` modules.
+    
+    Modules are grouped in packages of 25, each defines a class and two
+    functions and imports its predecessor, so import and call analysis have
+    real edges to follow.
+    
+    Args:
+        project_dir: Directory to populate (created if missing)
+        files: Number of modules
+    
+    Returns:
+        The project directory
+    """
+    project_dir = Path(project_dir)
+    project_dir.mkdir(parents=True, exist_ok=True)
+    
+    for index in range(files):
+        package = project_dir / "src" / f"pkg_{index // _PACKAGE_SIZE:03d}"
+        package.mkdir(parents=True, exist_ok=True)
+        init = package / "__init__.py"
+        if not init.exists():
+            init.write_text("")
+        
+        lines = ['"""Synthetic module {0}."""'.format(index), ""]
+        if index % _PACKAGE_SIZE:
+            lines.append(f"from .module_{index - 1:04d} import helper_{index - 1}")
+            lines.append("")
+        lines += [
+            "",
+            f"class Component{index}:",
+            f'    """Component {index}."""',
+            "",
+            "    def __init__(self, value=0):",
+            "        self.value = value",
+            "",
+            "    def compute(self, factor):",
+            f"        return helper_{index}(self.value) * factor",
+            "",
+            "",
+            f"def helper_{index}(value):",
+            f"    return value + {index}",
+            "",
+            "",
+            f"def run_{index}():",
+        ]
+        if index % _PACKAGE_SIZE:
+            lines.append(f"    return Component{index}(helper_{index - 1}(1)).compute(2)")
+        else:
+            lines.append(f"    return Component{index}(1).compute(2)")
+        (package / f"module_{index:04d}.py").write_text("\n".join(lines) + "\n")
+    
+    (project_dir / "MASTER_PLAN.md").write_text(
+        "# Master Plan\n\n"
+        "## Objectives\n\n"
+        f"Maintain a synthetic project of {files} modules.\n"
+    )
+    return project_dir
+
+
+class _PhaseStats:
+    """Accumulated timings of one phase."""
+    
+    def __init__(self):
+        self.runs = 0
+        self.wall = 0.0
+        self.model = 0.0
+        self.state_io = 0.0
+    
+    def to_dict(self) -> Dict:
+        overhead = self.wall - self.model
+        return {
+            "runs": self.runs,
+            "wall_seconds": round(self.wall, 4),
+            "model_seconds": round(self.model, 4),
+            "state_io_seconds": round(self.state_io, 4),
+            "overhead_seconds": round(overhead, 4),
+            "overhead_per_run": round(overhead / self.runs, 4) if self.runs else 0.0,
+        }
+
+
+class PipelineBenchmark:
+    """
+    One benchmark run: synthetic project, mock server, N coordinator iterations.
+    
+    Example:
+        report = PipelineBenchmark(files=100, iterations=20).run()
+        print(report["phases"]["coding"]["overhead_per_run"])
+    """
+    
+    def __init__(self, files: int, iterations: int = 20, latency: float = 0.0,
+                 tokens_per_second: Optional[float] = None, work_dir: Optional[Path] = None,
+                 quiet: bool = True):
+        """
+        Initialize benchmark.
+        
+        Args:
+            files: Modules in the synthetic project
+            iterations: Coordinator iterations (max_iterations)
+            latency: Mock server delay per chat request, seconds
+            tokens_per_second: Mock generation rate (None = instant)
+            work_dir: Where to create the project (default: a temp dir, removed afterwards)
+            quiet: Silence pipeline logging below ERROR during the run
+        """
+        self.files = files
+        self.iterations = iterations
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.work_dir = Path(work_dir) if work_dir else None
+        self.quiet = quiet
+        
+        self.phases: Dict[str, _PhaseStats] = {}
+        self.state_loads = 0
+        self.state_saves = 0
+        self.state_io = 0.0
+        self.model_calls = 0
+        self.model_time = 0.0
+        self._current_phase: Optional[str] = None
+    
+    def run(self) -> Dict:
+        """Run the benchmark and return its report."""
+        project_dir = self.work_dir or Path(tempfile.mkdtemp(prefix="pipeline_bench_"))
+        try:
+            create_synthetic_project(project_dir, self.files)
+            with MockOllamaServer(latency=self.latency, tokens_per_second=self.tokens_per_second) as server:
+                config = server.configure(PipelineConfig(
+                    project_dir=project_dir,
+                    max_iterations=self.iterations,
+                    git_enabled=False,
+                ))
+                with self._quiet(), self._instrumented():
+                    return self._run(config, server)
+        finally:
+            if self.work_dir is None:
+                shutil.rmtree(project_dir, ignore_errors=True)
+    
+    def _run(self, config: PipelineConfig, server: MockOllamaServer) -> Dict:
+        from .coordinator import PhaseCoordinator
+        
+        start = time.perf_counter()
+        coordinator = PhaseCoordinator(config)
+        startup = time.perf_counter() - start
+        
+        for name, phase in coordinator.phases.items():
+            phase.run = self._timed_phase(name, phase.run)
+        
+        start = time.perf_counter()
+        coordinator.run(resume=False)
+        total = time.perf_counter() - start
+        
+        phase_wall = sum(stats.wall for stats in self.phases.values())
+        return {
+            "files": self.files,
+            "iterations": self.iterations,
+            "startup_seconds": round(startup, 4),
+            "run_seconds": round(total, 4),
+            "loop_overhead_seconds": round(total - phase_wall, 4),
+            "model_calls": self.model_calls,
+            "model_seconds": round(self.model_time, 4),
+            "server_requests": len(server.requests),
+            "state_io": {
+                "loads": self.state_loads,
+                "saves": self.state_saves,
+                "seconds": round(self.state_io, 4),
+            },
+            "phases": {name: stats.to_dict() for name, stats in sorted(self.phases.items())},
+            "peak_rss_mb": peak_rss_mb(),
+        }
+    
+    def _timed_phase(self, name: str, run):
+        def timed_run(*args, **kwargs):
+            stats = self.phases.setdefault(name, _PhaseStats())
+            previous, self._current_phase = self._current_phase, name
+            start = time.perf_counter()
+            try:
+                return run(*args, **kwargs)
+            finally:
+                stats.runs += 1
+                stats.wall += time.perf_counter() - start
+                self._current_phase = previous
+        return timed_run
+    
+    def _account(self, kind: str, seconds: float):
+        if kind == "model":
+            self.model_calls += 1
+            self.model_time += seconds
+        else:
+            self.state_io += seconds
+            if kind == "load":
+                self.state_loads += 1
+            else:
+                self.state_saves += 1
+        if self._current_phase:
+            stats = self.phases[self._current_phase]
+            if kind == "model":
+                stats.model += seconds
+            else:
+                stats.state_io += seconds
+    
+    @contextmanager
+    def _instrumented(self):
+        """Time every StateManager load/save and OllamaClient chat for the run."""
+        originals = {
+            (StateManager, "load"): StateManager.load,
+            (StateManager, "save"): StateManager.save,
+            (OllamaClient, "chat"): OllamaClient.chat,
+        }
+        kinds = {"load": "load", "save": "save", "chat": "model"}
+        
+        def wrap(kind, method):
+            def timed(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    self._account(kind, time.perf_counter() - start)
+            return timed
+        
+        for (owner, name), method in originals.items():
+            setattr(owner, name, wrap(kinds[name], method))
+        try:
+            yield
+        finally:
+            for (owner, name), method in originals.items():
+                setattr(owner, name, method)
+    
+    @contextmanager
+    def _quiet(self):
+        if not self.quiet:
+            yield
+            return
+        logging.disable(logging.WARNING)
+        try:
+            yield
+        finally:
+            logging.disable(logging.NOTSET)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def _run_isolated(kwargs: Dict, queue) -> None:
+    try:
+        queue.put(("report", PipelineBenchmark(**kwargs).run()))
+    except BaseException:
+        queue.put(("error", traceback.format_exc()))
+        raise
+
+
+def _wait_isolated(process: multiprocessing.Process, queue, files: int) -> Dict:
+    """
+    Wait for the report of an isolated run.
+    
+    Raises:
+        RuntimeError: If the run failed, or the process died without a report
+    """
+    while True:
+        try:
+            kind, payload = queue.get(timeout=_POLL_SECONDS)
+            break
+        except Empty:
+            if process.is_alive():
+                continue
+            # The report may have been put just before the process exited
+            try:
+                kind, payload = queue.get(timeout=_POLL_SECONDS)
+                break
+            except Empty:
+                raise RuntimeError(f"Benchmark process for {files} files exited with code "
+                                   f"{process.exitcode} without a report") from None
+    process.join()
+    if kind == "error":
+        raise RuntimeError(f"Benchmark for {files} files failed:\n{payload}")
+    return payload
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, isolate: bool = True, **kwargs) -> List[Dict]:
+    """
+    Run the benchmark for each project size.
+    
+    Args:
+        sizes: Synthetic project sizes (number of modules)
+        isolate: Run each size in a fresh process
+        **kwargs: PipelineBenchmark options
+    
+    Returns:
+        One report per size
+    
+    Raises:
+        RuntimeError: If an isolated run fails or its process dies
+    """
+    reports = []
+    for files in sizes:
+        options = dict(kwargs, files=files)
+        if not isolate:
+            reports.append(PipelineBenchmark(**options).run())
+            continue
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=_run_isolated, args=(options, queue))
+        process.start()
+        reports.append(_wait_isolated(process, queue, files))
+    return reports
+
+
+def format_report(reports: List[Dict]) -> str:
+    """Plain-text table of benchmark reports."""
+    lines = []
+    for report in reports:
+        state_io = report["state_io"]
+        lines.append(f"\n{report['files']} files, {report['iterations']} iterations")
+        lines.append(f"  startup {report['startup_seconds']:.3f}s, run {report['run_seconds']:.3f}s, "
+                     f"loop overhead {report['loop_overhead_seconds']:.3f}s, "
+                     f"model {report['model_seconds']:.3f}s ({report['model_calls']} calls)")
+        lines.append(f"  state I/O {state_io['seconds']:.3f}s "
+                     f"({state_io['loads']} loads, {state_io['saves']} saves), "
+                     f"peak RSS {report['peak_rss_mb']} MB")
+        lines.append(f"  {'phase':<20} {'runs':>5} {'wall s':>9} {'model s':>9} {'state s':>9} {'overhead/run':>13}")
+        for name, stats in report["phases"].items():
+            lines.append(f"  {name:<20} {stats['runs']:>5} {stats['wall_seconds']:>9.3f} "
+                         f"{stats['model_seconds']:>9.3f} {stats['state_io_seconds']:>9.3f} "
+                         f"{stats['overhead_per_run']:>13.4f}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline orchestration overhead against a mock Ollama server")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Synthetic project sizes in modules (default: 10 100 1000)")
+    parser.add_argument("-i", "--iterations", type=int, default=20, help="Coordinator iterations per run")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock latency per request, seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=None, help="Mock generation rate")
+    parser.add_argument("--no-isolate", action="store_true", help="Run every size in this process")
+    parser.add_argument("-o", "--output", type=Path, help="Write the reports as JSON")
+    args = parser.parse_args(argv)
+    
+    reports = run_benchmarks(args.sizes, isolate=not args.no_isolate, iterations=args.iterations,
+                             latency=args.latency, tokens_per_second=args.tokens_per_second)
+    print(format_report(reports))
+    if args.output:
+        args.output.write_text(json.dumps(reports, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,15 +3,61 @@ Change History Analysis System for Application Troubleshooting Phase.
 
 This module provides tools to analyze git history and identify changes that
 may have introduced issues.
+
+Commits and per-file change counts and churn come from a single
+``git log --raw --numstat`` stream parsed as it arrives, blame from
+``git blame --incremental`` runs on a small pool of workers. Results are
+cached per repository and HEAD commit, so analyzing an unchanged repository
+again runs no git commands.
 """
 
+import copy
 import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import re
 
 
+# Files whose blame is summarized
+CRITICAL_FILES = [
+    'server.py', 'main.py', 'app.py', 'config.py',
+    'settings.py', 'run.py', '__init__.py'
+]
+
+# Concurrent ``git blame`` processes
+BLAME_WORKERS = 4
+
+# Seconds before a git command is abandoned
+GIT_TIMEOUT = 30
+
+# Analyses kept per process, keyed by (repository, HEAD, since date)
+_CACHE_SIZE = 16
+_analysis_cache: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Separators of the log format (control characters, absent from names and subjects)
+_COMMIT_MARKER = '\x1e'
+_FIELD_SEPARATOR = '\x1f'
+
+_SKIP_DIRS = {'.git', 'node_modules', '__pycache__', '.venv', 'venv'}
+
+
+def _numstat_path(text: str) -> str:
+    """Pre-rename path of a numstat entry (``old => new`` or ``dir/{old => new}/file``)."""
+    if ' => ' not in text:
+        return text
+    if '{' in text and '}' in text:
+        prefix, rest = text.split('{', 1)
+        renamed, suffix = rest.split('}', 1)
+        path = prefix + renamed.split(' => ')[0] + suffix
+        return path.replace('//', '/').lstrip('/')
+    return text.split(' => ')[0]
+
+
 class ChangeHistoryAnalyzer:
     """Analyzes git history to identify problematic changes."""
     
@@ -23,6 +69,7 @@ class ChangeHistoryAnalyzer:
             project_root: Root directory of the project
         """
         self.project_root = Path(project_root)
+        self.git_dir: Optional[Path] = None
         self.git_available = self._check_git_available()
         
     def _check_git_available(self) -> bool:
@@ -35,14 +82,48 @@ class ChangeHistoryAnalyzer:
                 text=True,
                 timeout=5
             )
+            if result.returncode == 0:
+                self.git_dir = self.project_root / result.stdout.strip()
             return result.returncode == 0
         except:
             return False
     
+    def _head_sha(self) -> Optional[str]:
+        """HEAD commit, read from the git directory when possible (no subprocess)."""
+        try:
+            head = (self.git_dir / 'HEAD').read_text().strip()
+            if not head.startswith('ref: '):
+                return head
+            ref = head[5:]
+            ref_file = self.git_dir / ref
+            if ref_file.exists():
+                return ref_file.read_text().strip()
+            for line in (self.git_dir / 'packed-refs').read_text().splitlines():
+                if line.endswith(' ' + ref):
+                    return line.split(' ', 1)[0]
+        except (OSError, TypeError):
+            pass
+        
+        # Worktrees, unusual layouts, unborn branches
+        try:
+            result = subprocess.run(
+                ['git', 'rev-parse', '--verify', '--quiet', 'HEAD'],
+                cwd=self.project_root,
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+            return (result.stdout.strip() or None) if result.returncode == 0 else None
+        except Exception:
+            return None
+    
     def analyze(self, days: int = 7) -> Dict[str, Any]:
         """
         Analyze recent changes in the repository.
         
+        Results are cached by HEAD commit: analyzing an unchanged repository
+        again (same HEAD, same day) returns a copy of the earlier results.
+        
         Args:
             days: Number of days to look back
             
@@ -57,102 +138,94 @@ class ChangeHistoryAnalyzer:
                 'risky_changes': []
             }
         
+        since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        head = self._head_sha()
+        key = (str(self.project_root.resolve()), head, since_date)
+        if head:
+            with _cache_lock:
+                if key in _analysis_cache:
+                    _analysis_cache.move_to_end(key)
+                    return copy.deepcopy(_analysis_cache[key])
+        
+        commits, file_changes = self._read_history(since_date)
         results = {
-            'commits': self._get_recent_commits(days),
-            'file_changes': self._analyze_file_changes(days),
-            'risky_changes': self._identify_risky_changes(days),
+            'commits': commits,
+            'file_changes': file_changes,
+            'risky_changes': self._identify_risky_changes(days, commits),
             'blame_analysis': self._analyze_blame()
         }
         
+        if head:
+            with _cache_lock:
+                _analysis_cache[key] = copy.deepcopy(results)
+                while len(_analysis_cache) > _CACHE_SIZE:
+                    _analysis_cache.popitem(last=False)
         return results
     
-    def _get_recent_commits(self, days: int) -> List[Dict[str, Any]]:
-        """Get recent commits from git history."""
+    def _read_history(self, since_date: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Read commits and per-file changes since a date from one ``git log`` stream.
+        
+        Returns:
+            (commits, newest first; the 20 most changed files with status
+            counts and lines added/deleted)
+        """
+        fields = _FIELD_SEPARATOR.join(['%H', '%an', '%ae', '%ad', '%s'])
         try:
-            since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-            
-            result = subprocess.run(
+            process = subprocess.Popen(
                 [
                     'git', 'log',
                     f'--since={since_date}',
-                    '--pretty=format:%H|%an|%ae|%ad|%s',
-                    '--date=iso'
+                    f'--pretty=format:{_COMMIT_MARKER}{fields}',
+                    '--date=iso',
+                    '--raw',
+                    '--numstat'
                 ],
                 cwd=self.project_root,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                timeout=30
+                errors='replace'
             )
-            
-            if result.returncode != 0:
-                return []
-            
-            commits = []
-            for line in result.stdout.strip().split('\n'):
-                if not line:
-                    continue
-                
-                parts = line.split('|')
-                if len(parts) >= 5:
-                    commits.append({
-                        'hash': parts[0],
-                        'author': parts[1],
-                        'email': parts[2],
-                        'date': parts[3],
-                        'message': '|'.join(parts[4:])
-                    })
-            
-            return commits
-            
         except Exception as e:
-            return []
-    
-    def _analyze_file_changes(self, days: int) -> List[Dict[str, Any]]:
-        """Analyze which files have changed recently."""
-        try:
-            since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+            return [], []
             
-            result = subprocess.run(
-                [
-                    'git', 'log',
-                    f'--since={since_date}',
-                    '--name-status',
-                    '--pretty=format:%H'
-                ],
-                cwd=self.project_root,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                return []
-            
-            file_changes = {}
-            current_commit = None
-            
-            for line in result.stdout.strip().split('\n'):
+        timer = threading.Timer(GIT_TIMEOUT, process.kill)
+        timer.start()
+        commits = []
+        file_changes = {}
+        try:
+            for line in process.stdout:
+                line = line.rstrip('\n')
                 if not line:
                     continue
                 
-                # Check if it's a commit hash
-                if len(line) == 40 and all(c in '0123456789abcdef' for c in line):
-                    current_commit = line
+                if line.startswith(_COMMIT_MARKER):
+                    parts = line[1:].split(_FIELD_SEPARATOR)
+                    if len(parts) >= 5:
+                        commits.append({
+                            'hash': parts[0],
+                            'author': parts[1],
+                            'email': parts[2],
+                            'date': parts[3],
+                            'message': _FIELD_SEPARATOR.join(parts[4:])
+                        })
                     continue
                 
-                # Parse file change
-                parts = line.split('\t')
-                if len(parts) >= 2:
-                    status = parts[0]
-                    file_path = parts[1]
-                    
+                if line.startswith(':'):
+                    # Raw entry: ":<modes> <shas> <status>\t<path>[\t<new path>]"
+                    meta, _, paths = line.partition('\t')
+                    status = meta.rsplit(' ', 1)[-1]
+                    file_path = paths.split('\t')[0]
                     if file_path not in file_changes:
                         file_changes[file_path] = {
                             'path': file_path,
                             'modifications': 0,
                             'additions': 0,
                             'deletions': 0,
-                            'renames': 0
+                            'renames': 0,
+                            'lines_added': 0,
+                            'lines_deleted': 0
                         }
                     
                     if status == 'M':
@@ -163,24 +236,48 @@ class ChangeHistoryAnalyzer:
                         file_changes[file_path]['deletions'] += 1
                     elif status.startswith('R'):
                         file_changes[file_path]['renames'] += 1
+                    continue
             
-            # Sort by total changes
-            sorted_changes = sorted(
-                file_changes.values(),
-                key=lambda x: x['modifications'] + x['additions'] + x['deletions'],
-                reverse=True
-            )
+                # Numstat entry: "<added>\t<deleted>\t<path>" ("-" for binary files)
+                parts = line.split('\t', 2)
+                if len(parts) == 3:
+                    change = file_changes.get(_numstat_path(parts[2]))
+                    if change is not None:
+                        change['lines_added'] += int(parts[0]) if parts[0].isdigit() else 0
+                        change['lines_deleted'] += int(parts[1]) if parts[1].isdigit() else 0
             
-            return sorted_changes[:20]  # Top 20 most changed files
+            if process.wait() != 0:
+                return [], []
+        finally:
+            timer.cancel()
+            process.stdout.close()
             
-        except Exception as e:
-            return []
+        # Sort by total changes
+        sorted_changes = sorted(
+            file_changes.values(),
+            key=lambda x: x['modifications'] + x['additions'] + x['deletions'],
+            reverse=True
+        )
+    
+        return commits, sorted_changes[:20]  # Top 20 most changed files
+            
+    def _get_recent_commits(self, days: int) -> List[Dict[str, Any]]:
+        """Get recent commits from git history."""
+        since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        return self._read_history(since_date)[0]
+    
+    def _analyze_file_changes(self, days: int) -> List[Dict[str, Any]]:
+        """Analyze which files have changed recently."""
+        since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        return self._read_history(since_date)[1]
     
-    def _identify_risky_changes(self, days: int) -> List[Dict[str, Any]]:
+    def _identify_risky_changes(self, days: int,
+                                commits: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
         """Identify potentially risky changes."""
         risky_changes = []
         
-        commits = self._get_recent_commits(days)
+        if commits is None:
+            commits = self._get_recent_commits(days)
         
         # Patterns that indicate risky changes
         risky_patterns = [
@@ -213,69 +310,94 @@ class ChangeHistoryAnalyzer:
         return risky_changes
     
     def _analyze_blame(self) -> Dict[str, Any]:
-        """Analyze git blame for critical files."""
-        critical_files = [
-            'server.py', 'main.py', 'app.py', 'config.py',
-            'settings.py', 'run.py', '__init__.py'
-        ]
-        
+        """Analyze git blame (as of HEAD) for critical files."""
         blame_analysis = {
             'files_analyzed': [],
             'recent_authors': {}
         }
         
-        for file_name in critical_files:
-            file_path = self._find_file(file_name)
-            if file_path:
-                blame_info = self._get_file_blame(file_path)
-                if blame_info:
-                    blame_analysis['files_analyzed'].append({
-                        'file': str(file_path.relative_to(self.project_root)),
-                        'authors': blame_info
-                    })
+        tracked = self._tracked_files()
+        file_paths = [path for path in (self._find_file(name, tracked) for name in CRITICAL_FILES) if path]
+        if not file_paths:
+            return blame_analysis
+                    
+        with ThreadPoolExecutor(max_workers=min(BLAME_WORKERS, len(file_paths))) as pool:
+            blames = list(pool.map(self._get_file_blame, file_paths))
+        
+        for file_path, blame_info in zip(file_paths, blames):
+            if blame_info:
+                blame_analysis['files_analyzed'].append({
+                    'file': str(file_path.relative_to(self.project_root)),
+                    'authors': blame_info
+                })
                     
-                    # Aggregate author statistics
-                    for author, lines in blame_info.items():
-                        if author not in blame_analysis['recent_authors']:
-                            blame_analysis['recent_authors'][author] = 0
-                        blame_analysis['recent_authors'][author] += lines
+                # Aggregate author statistics
+                for author, lines in blame_info.items():
+                    if author not in blame_analysis['recent_authors']:
+                        blame_analysis['recent_authors'][author] = 0
+                    blame_analysis['recent_authors'][author] += lines
         
         return blame_analysis
     
-    def _find_file(self, file_name: str) -> Optional[Path]:
-        """Find a file in the project."""
-        for file_path in self.project_root.rglob(file_name):
-            pass
-            # Skip common non-source directories
-            skip_dirs = {'.git', 'node_modules', '__pycache__', '.venv', 'venv'}
-            if not any(skip_dir in file_path.parts for skip_dir in skip_dirs):
-                return file_path
-        return None
+    def _tracked_files(self) -> List[str]:
+        """Files in the HEAD tree under the project root, relative to it."""
+        try:
+            result = subprocess.run(
+                ['git', 'ls-tree', '-r', '--name-only', 'HEAD'],
+                cwd=self.project_root,
+                capture_output=True,
+                text=True,
+                timeout=GIT_TIMEOUT
+            )
+            return result.stdout.splitlines() if result.returncode == 0 else []
+        except Exception:
+            return []
+    
+    def _find_file(self, file_name: str, tracked: List[str]) -> Optional[Path]:
+        """Find a tracked file by name (the shallowest match)."""
+        matches = [
+            path for path in tracked
+            if Path(path).name == file_name and not _SKIP_DIRS.intersection(Path(path).parts)
+        ]
+        if not matches:
+            return None
+        return self.project_root / min(matches, key=lambda path: (path.count('/'), path))
     
     def _get_file_blame(self, file_path: Path) -> Optional[Dict[str, int]]:
-        """Get git blame information for a file."""
+        """Get git blame information (lines per author at HEAD) for a file."""
         try:
             result = subprocess.run(
-                ['git', 'blame', '--line-porcelain', str(file_path)],
+                ['git', 'blame', '--incremental', 'HEAD', '--', str(file_path)],
                 cwd=self.project_root,
                 capture_output=True,
                 text=True,
-                timeout=30
+                errors='replace',
+                timeout=GIT_TIMEOUT
             )
             
             if result.returncode != 0:
                 return None
             
+            # Groups of "<sha> <orig line> <final line> <lines>", then headers
+            # ("author" only the first time a commit appears), then "filename"
             authors = {}
-            current_author = None
+            commit_authors = {}
+            current_commit = None
+            group_lines = 0
             
             for line in result.stdout.split('\n'):
-                if line.startswith('author '):
-                    current_author = line[7:]
-                elif line.startswith('\t') and current_author:
-                    if current_author not in authors:
-                        authors[current_author] = 0
-                    authors[current_author] += 1
+                if not line:
+                    continue
+                if current_commit is None:
+                    fields = line.split(' ')
+                    current_commit, group_lines = fields[0], int(fields[3])
+                elif line.startswith('author '):
+                    commit_authors[current_commit] = line[7:]
+                elif line.startswith('filename '):
+                    author = commit_authors.get(current_commit)
+                    if author is not None:
+                        authors[author] = authors.get(author, 0) + group_lines
+                    current_commit = None
             
             return authors
             
@@ -360,7 +482,8 @@ class ChangeHistoryAnalyzer:
                             f"(M:{change['modifications']} " +
                             f"A:{change['additions']} " +
                             f"D:{change['deletions']} " +
-                            f"R:{change['renames']})")
+                            f"R:{change['renames']}), " +
+                            f"+{change.get('lines_added', 0)}/-{change.get('lines_deleted', 0)} lines")
                 report.append("")
         else:
             report.append("  No file changes found")
@@ -7,22 +7,55 @@ Includes fallback parsing for models that return tool calls as text.
 
 import json
 import re
+import time
 from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
 import requests
 
 from .config import PipelineConfig, ServerConfig
 from .logging_setup import get_logger
+from .model_metrics import CallMetrics, ModelMetricsStore
+from .async_client import AsyncOllamaClient, chat_payload
+from .speculative import SpeculativeDrafter
+from .tool_retrieval import ToolSelector
+from .tool_schema import JSON_HEADERS, encode_request_body
+from .model_residency import ResidencyPlanner
 
 
 class OllamaClient:
     """Client for Ollama API with tool calling support"""
     
-    def __init__(self, config: PipelineConfig):
+    def __init__(self, config: PipelineConfig, metrics: Optional[ModelMetricsStore] = None):
         self.config = config
         self.servers: Dict[str, ServerConfig] = {}
         self.available_models: Dict[str, List[str]] = {}
         self.logger = get_logger()
         self.verbose = getattr(config, 'verbose', False)
+        # Token counts and timings of every chat call (see model_metrics)
+        self.metrics = metrics if metrics is not None else ModelMetricsStore()
+        # Which models are loaded where, warm-ups and keep_alive pins (see model_residency)
+        self.residency = ResidencyPlanner(self)
+        # Concurrent requests over the shared async transport (see async_client)
+        self.async_client = AsyncOllamaClient(config, metrics=self.metrics, residency=self.residency)
+        # Small-model drafts of simple tool calls (see speculative)
+        self.drafter = SpeculativeDrafter(self)
+        # Relevance-ranked tool subsets per phase turn (see tool_retrieval)
+        self.tool_selector = ToolSelector(config)
+    
+    def for_config(self, config: PipelineConfig) -> 'OllamaClient':
+        """
+        Client for a variant of this client's config (e.g. one worker slot's
+        model assignments).
+        
+        The new client has its own residency planner, drafter, tool selector
+        and async client bound to ``config``; only the metrics store and the
+        discovered servers and models are carried over.
+        """
+        client = OllamaClient(config, metrics=self.metrics)
+        client.servers = dict(self.servers)
+        client.available_models = dict(self.available_models)
+        return client
     
     def discover_servers(self) -> Dict[str, List[str]]:
         """Discover available models on all configured servers"""
@@ -58,6 +91,12 @@ class OllamaClient:
             model, preferred_host = self.config.model_assignments[task_type]
             selection_log.append(f"Preferred: {model} on {preferred_host}")
             
+            # Avoid a reload when another host already has the model loaded
+            resident = self.residency.prefer_resident_host(model, preferred_host)
+            if resident:
+                self.logger.debug(f"  Model selection: Using resident {resident[1]} on {resident[0]}")
+                return resident
+            
             # CRITICAL FIX: Check if preferred host is actually available
             if preferred_host in self.available_models and self.available_models[preferred_host]:
                 for avail in self.available_models[preferred_host]:
@@ -125,25 +164,8 @@ class OllamaClient:
         Send a chat request with optional tool calling.
         """
         
-        # Determine context window size based on model
-        num_ctx = 8192  # Default for most models
-        if "32b" in model or "70b" in model:
-            num_ctx = 16384  # Larger context for bigger models
-        elif "7b" in model or "3b" in model:
-            num_ctx = 4096  # Smaller context for smaller models
-        
-        payload = {
-            "model": model,
-            "messages": messages,
-            "stream": False,
-            "options": {
-                "temperature": temperature,
-                "num_ctx": num_ctx
-            }
-        }
-        
-        if tools:
-            payload["tools"] = tools
+        keep_alive = self.residency.keep_alive_for(model)
+        payload = chat_payload(model, messages, tools, temperature, keep_alive)
         
         # VERBOSE: Log the prompt being sent
         self.logger.debug(f"═══ REQUEST TO {host}/{model} ═══")
@@ -156,41 +178,63 @@ class OllamaClient:
             preview = content[:500] + "..." if len(content) > 500 else content
             self.logger.debug(f"  [{i}] {role}: {preview}")
         
+        start_time = None
         try:
             pass
             # Parse host to handle both "hostname" and "http://hostname:port" formats
-            if host.startswith("http://") or host.startswith("https://"):
+            if host in self.servers:
+                # Discovered server - honour its configured port
+                base_url = self.servers[host].base_url
+            elif host.startswith("http://") or host.startswith("https://"):
                 pass
                 # Host already includes protocol and possibly port
-                base_url = host
-                if ":11434" not in host and not host.endswith("/"):
-                    base_url = f"{host}:11434"
+                base_url = host.rstrip("/")
+                if urlparse(base_url).port is None:
+                    base_url = f"{base_url}:11434"
             else:
                 pass
                 # Host is just hostname, add protocol and port
                 base_url = f"http://{host}:11434"
             
+            start_time = time.perf_counter()
             response = requests.post(
                 f"{base_url}/api/chat",
-                json=payload,
+                data=encode_request_body(payload),  # Frozen tool lists are spliced in pre-serialized
+                headers=JSON_HEADERS,
                 timeout=timeout
             )
             
             if response.status_code == 200:
                 result = response.json()
                 self._log_response_verbose(result)
+                self._record_metrics(result, host, model, start_time)
+                self.residency.observe_call(host, model, (result.get("load_duration") or 0) / 1e9, keep_alive)
                 return result
             else:
                 self.logger.error(f"API error: HTTP {response.status_code}")
                 self.logger.error(f"Response body: {response.text[:500]}")
-                return {"error": f"HTTP {response.status_code}"}
+                result = {"error": f"HTTP {response.status_code}"}
                 
         except requests.Timeout:
             self.logger.error(f"Request timed out after {timeout}s")
-            return {"error": "timeout"}
+            result = {"error": "timeout"}
         except Exception as e:
             self.logger.error(f"Request failed: {e}")
-            return {"error": str(e)}
+            result = {"error": str(e)}
+        
+        self._record_metrics(result, host, model, start_time)
+        return result
+    
+    def _record_metrics(self, result: Dict, host: str, model: str, start_time: Optional[float]):
+        """Record the call's token counts and timings from Ollama's response metadata"""
+        wall_seconds = time.perf_counter() - start_time if start_time is not None else 0.0
+        call = CallMetrics.from_response(result, model=model, host=host, wall_seconds=wall_seconds)
+        self.metrics.record(call)
+        if call.reloaded:
+            self.logger.info(f"  Model {model} was loaded on {host} for this call ({call.load_seconds:.1f}s)")
+        if call.eval_rate is not None:
+            self.logger.debug(f"  Tokens: {call.prompt_tokens} prompt, {call.eval_tokens} generated "
+                              f"({call.eval_rate:.1f} tok/s)")
     
     def _log_response_verbose(self, response: Dict):
         """Log detailed response information"""
@@ -0,0 +1,209 @@
+"""
+Code Matcher
+
+Locates a block of code inside a file when the model's ``original_code`` is
+not an exact substring (different indentation, collapsed whitespace, a line
+or two that drifted).
+
+The file's lines are normalised once and indexed in a hash map from
+normalised line to line numbers. Matching then works from anchors instead of
+sliding a window over the whole file:
+
+- Exact (normalised) matches start from the rarest target line and only
+  verify the few windows it anchors.
+- Similar matches let every target line vote for the window start it
+  implies; only the best-voted windows are scored with ``SequenceMatcher``.
+
+Both are linear in the size of the file; the old sliding-window scan ran a
+full ``SequenceMatcher`` at every offset.
+"""
+
+import difflib
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+
+# Lines occurring more often than this (``)``, ``pass``, ``return``...) are
+# poor anchors and are only used when nothing rarer is available
+COMMON_LINE_LIMIT = 50
+
+# Identifiers used as anchors when no whole line matches
+_TOKEN_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]{2,}')
+
+
+def normalize_line(line: str) -> str:
+    """Line with leading/trailing whitespace removed and inner runs collapsed."""
+    return ' '.join(line.split())
+
+
+@dataclass
+class CodeMatch:
+    """A located block: 1-based inclusive line range and match confidence."""
+    start_line: int
+    end_line: int
+    confidence: float
+    code: str
+    exact: bool = False
+    
+    def location(self) -> str:
+        """Human readable line range."""
+        if self.start_line == self.end_line:
+            return f"line {self.start_line}"
+        return f"lines {self.start_line}-{self.end_line}"
+    
+    def to_dict(self) -> Dict:
+        """Serializable form reported back to the model."""
+        return asdict(self)
+
+
+class CodeMatcher:
+    """
+    Line-hash index over one file's content.
+    
+    Example:
+        matcher = CodeMatcher(content)
+        match = matcher.find_exact(original_code)
+        if match is None:
+            candidates = matcher.find_similar(original_code)
+    """
+    
+    def __init__(self, content: str):
+        """
+        Index a file's content.
+        
+        Args:
+            content: Full file text
+        """
+        self.lines = content.split('\n')
+        self.normalized = [normalize_line(line) for line in self.lines]
+        
+        self.line_index: Dict[str, List[int]] = defaultdict(list)
+        for number, line in enumerate(self.normalized):
+            if line:
+                self.line_index[line].append(number)
+        
+        self._token_index: Optional[Dict[str, List[int]]] = None
+    
+    @staticmethod
+    def target_lines(target: str) -> List[str]:
+        """Normalised, non-blank lines of a code block."""
+        return [line for line in (normalize_line(l) for l in target.strip().split('\n')) if line]
+    
+    def find_exact(self, target: str) -> Optional[CodeMatch]:
+        """
+        First block whose consecutive lines equal the target's after
+        normalisation.
+        
+        Args:
+            target: Code block to find
+        
+        Returns:
+            CodeMatch with confidence 1.0, or None
+        """
+        wanted = self.target_lines(target)
+        if not wanted:
+            return None
+        
+        # Anchor on the rarest target line; every other candidate start
+        # would fail on that line anyway
+        offset = min(range(len(wanted)), key=lambda j: len(self.line_index.get(wanted[j], ())))
+        count = len(wanted)
+        
+        for position in self.line_index.get(wanted[offset], ()):
+            start = position - offset
+            if start < 0 or start + count > len(self.lines):
+                continue
+            if self.normalized[start:start + count] == wanted:
+                return self._match(start, count, 1.0, exact=True)
+        return None
+    
+    def find_similar(self, target: str, threshold: float = 0.6, limit: int = 5,
+                     max_candidates: int = 20) -> List[CodeMatch]:
+        """
+        Blocks similar to the target, best first.
+        
+        Args:
+            target: Code block to find
+            threshold: Minimum similarity ratio (0-1)
+            limit: Maximum number of matches returned
+            max_candidates: Number of anchored windows scored
+        
+        Returns:
+            Non-overlapping matches at or above the threshold
+        """
+        wanted = self.target_lines(target)
+        if not wanted:
+            return []
+        count = len(wanted)
+        
+        votes = self._vote(wanted, self.line_index, lambda line: [line])
+        if not votes:
+            votes = self._vote(wanted, self._tokens(), _TOKEN_PATTERN.findall)
+        
+        target_text = '\n'.join(wanted)
+        scorer = difflib.SequenceMatcher(None, autojunk=False)
+        scorer.set_seq2(target_text)
+        
+        scored = []
+        for start, _ in votes.most_common(max_candidates):
+            window = '\n'.join(line for line in self.normalized[start:start + count] if line)
+            scorer.set_seq1(window)
+            if scorer.real_quick_ratio() < threshold or scorer.quick_ratio() < threshold:
+                continue
+            ratio = scorer.ratio()
+            if ratio >= threshold:
+                scored.append((ratio, start))
+        
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        matches: List[CodeMatch] = []
+        taken = []
+        for ratio, start in scored:
+            if any(abs(start - other) < count for other in taken):
+                continue
+            taken.append(start)
+            matches.append(self._match(start, count, round(ratio, 3)))
+            if len(matches) >= limit:
+                break
+        return matches
+    
+    def _vote(self, wanted: List[str], index: Dict[str, List[int]], keys) -> Counter:
+        """Count, per implied window start, how many target lines anchor it."""
+        votes: Counter = Counter()
+        last_start = max(len(self.lines) - len(wanted), 0)
+        
+        anchors = []
+        for offset, line in enumerate(wanted):
+            for key in set(keys(line)):
+                positions = index.get(key)
+                if positions:
+                    anchors.append((len(positions), offset, positions))
+        if not anchors:
+            return votes
+        
+        rare = [anchor for anchor in anchors if anchor[0] <= COMMON_LINE_LIMIT]
+        for _, offset, positions in rare or [min(anchors, key=lambda anchor: anchor[0])]:
+            for position in positions:
+                start = min(max(position - offset, 0), last_start)
+                votes[start] += 1
+        return votes
+    
+    def _tokens(self) -> Dict[str, List[int]]:
+        """Identifier -> line numbers, built on first use."""
+        if self._token_index is None:
+            self._token_index = defaultdict(list)
+            for number, line in enumerate(self.normalized):
+                for token in set(_TOKEN_PATTERN.findall(line)):
+                    self._token_index[token].append(number)
+        return self._token_index
+    
+    def _match(self, start: int, count: int, confidence: float, exact: bool = False) -> CodeMatch:
+        end = min(start + count, len(self.lines))
+        return CodeMatch(
+            start_line=start + 1,
+            end_line=end,
+            confidence=confidence,
+            code='\n'.join(self.lines[start:end]),
+            exact=exact,
+        )
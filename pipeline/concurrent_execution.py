@@ -0,0 +1,411 @@
+"""
+Concurrent Task Execution
+
+Runs several coding or QA tasks at once when they cannot interfere with
+each other, one worker per server slot:
+
+- Tasks are only batched when their target files and dependency sets are
+  pairwise disjoint, so no two workers touch the same file.
+- Each worker runs its own phase instance bound to one Ollama server and a
+  private view of the pipeline state; nothing it saves reaches disk.
+- The coordinator thread is the single writer: once every worker finished
+  it merges their state changes, in task priority order, into the real
+  state with a three-way merge against the snapshot the workers started
+  from.
+
+With ``concurrent_tasks = 1`` (the default) nothing is batched and the
+coordinator runs phases exactly as before.
+"""
+
+import copy
+import dataclasses
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .config import PipelineConfig, ServerConfig
+from .logging_setup import get_logger
+from .state.manager import PipelineState, StateManager, TaskState, TaskStatus
+
+
+# Task statuses each phase can take in a batch
+BATCH_STATUSES = {
+    "coding": (TaskStatus.NEW, TaskStatus.IN_PROGRESS),
+    "qa": (TaskStatus.QA_PENDING,),
+}
+
+# Integer fields that count events, so increments made by two workers add up.
+# Other integers (iteration markers, high-water marks, priorities) are values:
+# when both sides change them, the last writer wins.
+ADDITIVE_COUNTERS = frozenset({
+    "attempts",         # TaskState
+    "runs",             # PhaseState
+    "successes",
+    "failures",
+    "expansion_count",  # PipelineState
+})
+
+_MISSING = object()
+
+
+def _list_tail(base: List, value: List) -> Optional[List]:
+    """
+    Items appended to ``base`` to obtain ``value``.
+    
+    Handles histories trimmed from the front (``value`` = ``base[d:]`` +
+    new items). Returns None when ``value`` is not an extension of ``base``.
+    """
+    for dropped in range(len(base) + 1):
+        kept = len(base) - dropped
+        if value[:kept] == base[dropped:]:
+            return value[kept:]
+    return None
+
+
+def _merge_value(base: Any, ours: Any, theirs: Any, key: Optional[str] = None) -> Any:
+    """Three-way merge of one JSON value (``_MISSING`` = key absent) stored under ``key``."""
+    if theirs == base:
+        return ours
+    if ours == base:
+        return theirs
+    if any(value is _MISSING for value in (base, ours, theirs)):
+        return theirs
+    
+    if isinstance(base, dict) and isinstance(ours, dict) and isinstance(theirs, dict):
+        return merge_state_dicts(base, ours, theirs)
+    
+    if isinstance(base, list) and isinstance(ours, list) and isinstance(theirs, list):
+        our_tail = _list_tail(base, ours)
+        their_tail = _list_tail(base, theirs)
+        if our_tail is not None and their_tail is not None:
+            return ours + their_tail
+        # Reordered lists (e.g. the sorted task queue): merge as sets of items
+        return ([item for item in ours if item in theirs or item not in base] +
+                [item for item in theirs if item not in base and item not in ours])
+    
+    # Counters changed by both sides: apply both increments
+    if key in ADDITIVE_COUNTERS and all(
+            isinstance(value, int) and not isinstance(value, bool) for value in (base, ours, theirs)):
+        return ours + theirs - base
+    
+    # Conflicting values: the last writer wins (``theirs`` when both agree)
+    return theirs
+
+
+def merge_state_dicts(base: Dict, ours: Dict, theirs: Dict) -> Dict:
+    """
+    Three-way merge of serialized pipeline state.
+    
+    Args:
+        base: State the worker started from
+        ours: Current state (already holding earlier merges)
+        theirs: State saved by the worker
+    
+    Returns:
+        ``ours`` with the worker's changes applied. Keys only the worker
+        changed take its value, appended list items are appended, counters
+        changed on both sides add up (``ADDITIVE_COUNTERS`` only), reordered
+        lists are merged item by item and other conflicts go to the worker.
+    """
+    merged = dict(ours)
+    for key in list(base.keys()) + [key for key in theirs.keys() if key not in base]:
+        value = _merge_value(base.get(key, _MISSING), ours.get(key, _MISSING), theirs.get(key, _MISSING), key)
+        if value is _MISSING:
+            merged.pop(key, None)
+        else:
+            merged[key] = value
+    return merged
+
+
+class SerializedProxy:
+    """
+    Shares an object that is not thread-safe between worker threads.
+    
+    Every method called through the proxy runs under ``lock``; plain
+    attributes are read directly. Objects that call into each other should
+    share one lock so a call through one proxy cannot race a call through
+    another.
+    """
+    
+    def __init__(self, target: Any, lock: Optional[threading.RLock] = None):
+        self._target = target
+        self._lock = lock or threading.RLock()
+    
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if not callable(value):
+            return value
+        lock = self._lock
+        
+        @functools.wraps(value)
+        def locked(*args, **kwargs):
+            with lock:
+                return value(*args, **kwargs)
+        return locked
+    
+    def __bool__(self) -> bool:
+        return bool(self._target)
+
+
+class WorkerStateManager(StateManager):
+    """
+    Private state view for one worker.
+    
+    ``load`` returns a fresh copy of the worker's latest state and ``save``
+    keeps the state in memory instead of writing it. Phase markdown files are
+    still written, serialized through the shared lock.
+    """
+    
+    def __init__(self, base: StateManager, lock: threading.Lock):
+        super().__init__(base.project_dir)
+        self.base = base
+        self.lock = lock
+        self.snapshot: Dict = {}
+        self.saved: Optional[Dict] = None
+    
+    def begin(self, snapshot: Dict):
+        """Start a new task from a serialized state snapshot."""
+        self.snapshot = snapshot
+        self.saved = None
+    
+    def load(self) -> PipelineState:
+        return PipelineState.from_dict(copy.deepcopy(self.saved if self.saved is not None else self.snapshot))
+    
+    def save(self, state: PipelineState):
+        self.saved = state.to_dict()
+    
+    def write_phase_state(self, phase: str, content: str):
+        with self.lock:
+            self.base.write_phase_state(phase, content)
+
+
+@dataclass
+class ServerSlot:
+    """A worker bound to one Ollama server."""
+    index: int
+    server: ServerConfig
+    config: PipelineConfig
+    client: Any
+    state_manager: WorkerStateManager
+
+
+@dataclass
+class TaskOutcome:
+    """Result of one task in a concurrent batch."""
+    task_id: str
+    slot: int
+    result: Any
+    saved: Optional[Dict]
+    duration: float
+
+
+class ConcurrentTaskExecutor:
+    """
+    Runs batches of independent coding/QA tasks on parallel server slots.
+    
+    Example:
+        executor = ConcurrentTaskExecutor(config, client, state_manager, phase_factory)
+        if executor.enabled_for(phase_name, task):
+            result = executor.run(phase_name, state, task)
+    """
+    
+    def __init__(self, config: PipelineConfig, client: Any, state_manager: StateManager,
+                 phase_factory: Callable[[str, PipelineConfig, Any, StateManager], Any],
+                 task_filter: Optional[Callable[[PipelineState, TaskState], bool]] = None,
+                 max_tasks: Optional[int] = None):
+        """
+        Initialize concurrent task executor.
+        
+        Args:
+            config: Pipeline configuration
+            client: Ollama client shared by the coordinator
+            state_manager: Real state manager (only used by the merging thread)
+            phase_factory: Builds a phase from (name, config, client, state_manager)
+            task_filter: Extra check a task must pass to join a batch
+            max_tasks: Tasks per batch (default: ``config.concurrent_tasks``)
+        """
+        self.config = config
+        self.client = client
+        self.state_manager = state_manager
+        self.phase_factory = phase_factory
+        self.task_filter = task_filter
+        self.max_tasks = max(1, max_tasks if max_tasks is not None else getattr(config, 'concurrent_tasks', 1))
+        self.logger = get_logger()
+        
+        self._lock = threading.Lock()
+        self._slots: List[ServerSlot] = []
+        self._phases: Dict[tuple, Any] = {}
+        self.last_batch: List[TaskOutcome] = []
+    
+    def enabled_for(self, phase_name: str, task: Optional[TaskState]) -> bool:
+        """Whether a phase run may be widened to a concurrent batch."""
+        return self.max_tasks > 1 and phase_name in BATCH_STATUSES and task is not None
+    
+    @staticmethod
+    def footprint(task: TaskState) -> Set[str]:
+        """Files a task writes or depends on."""
+        paths = [task.target_file] + list(task.dependencies or [])
+        footprint = set()
+        for path in paths:
+            if isinstance(path, str) and path.strip():
+                path = path.strip().rstrip('/')
+                footprint.add(path[2:] if path.startswith('./') else path)
+        return footprint
+    
+    def select_batch(self, phase_name: str, state: PipelineState, primary: TaskState) -> List[TaskState]:
+        """
+        Pick tasks to run alongside the task chosen by the coordinator.
+        
+        Candidates are taken in priority order and kept only when their
+        footprint is disjoint from every task already in the batch.
+        """
+        batch = [primary]
+        claimed = self.footprint(primary)
+        statuses = BATCH_STATUSES.get(phase_name, ())
+        
+        for task in sorted(state.tasks.values(), key=lambda t: t.priority):
+            if len(batch) >= self.max_tasks:
+                break
+            if task.task_id == primary.task_id or task.status not in statuses:
+                continue
+            if not task.target_file or not task.target_file.strip():
+                continue
+            if self.task_filter and not self.task_filter(state, task):
+                continue
+            footprint = self.footprint(task)
+            if footprint & claimed:
+                continue
+            batch.append(task)
+            claimed |= footprint
+        
+        return batch
+    
+    def _servers(self) -> List[ServerConfig]:
+        servers = list(self.config.servers)
+        return [server for server in servers if server.online] or servers
+    
+    def _slot(self, index: int) -> ServerSlot:
+        """Worker slot ``index``, created on first use."""
+        while len(self._slots) <= index:
+            servers = self._servers()
+            slot_index = len(self._slots)
+            server = servers[slot_index % len(servers)]
+            
+            # Prefer the slot's server for every task type; the client still
+            # falls back to other hosts when the model isn't available there
+            assignments = {task_type: (model, server.host)
+                           for task_type, (model, _) in self.config.model_assignments.items()}
+            slot_config = dataclasses.replace(self.config, model_assignments=assignments)
+            slot_client = self.client.for_config(slot_config)
+            
+            self._slots.append(ServerSlot(
+                index=slot_index,
+                server=server,
+                config=slot_config,
+                client=slot_client,
+                state_manager=WorkerStateManager(self.state_manager, self._lock),
+            ))
+        return self._slots[index]
+    
+    def _phase(self, phase_name: str, slot: ServerSlot):
+        key = (phase_name, slot.index)
+        if key not in self._phases:
+            self._phases[key] = self.phase_factory(phase_name, slot.config, slot.client, slot.state_manager)
+        return self._phases[key]
+    
+    def _run_task(self, phase_name: str, slot: ServerSlot, snapshot: Dict,
+                  task: TaskState, kwargs: Dict) -> TaskOutcome:
+        """Worker body: run one task against a private state view."""
+        slot.state_manager.begin(snapshot)
+        start = time.time()
+        try:
+            result = self._phase(phase_name, slot).run(task=task, **kwargs)
+        except Exception as e:
+            from .phases.base import PhaseResult
+            self.logger.error(f"  ❌ Worker {slot.index} failed on {task.task_id}: {e}")
+            result = PhaseResult(
+                success=False,
+                phase=phase_name,
+                task_id=task.task_id,
+                message=str(e),
+                errors=[{"type": type(e).__name__, "message": str(e)}]
+            )
+        return TaskOutcome(
+            task_id=task.task_id,
+            slot=slot.index,
+            result=result,
+            saved=slot.state_manager.saved,
+            duration=time.time() - start,
+        )
+    
+    def run(self, phase_name: str, state: PipelineState, task: TaskState,
+            objective: Any = None, run_phase: Optional[Callable[[], Any]] = None):
+        """
+        Run ``task`` and any independent tasks that can join it.
+        
+        Args:
+            phase_name: 'coding' or 'qa'
+            state: Coordinator's current state (already saved)
+            task: Task selected by the coordinator
+            objective: Objective passed to tasks belonging to it
+            run_phase: Sequential fallback used when no other task can join
+        
+        Returns:
+            PhaseResult of ``task``. Results of the other tasks are recorded
+            in the merged state's phase history.
+        """
+        batch = self.select_batch(phase_name, state, task)
+        if len(batch) == 1 and run_phase is not None:
+            self.last_batch = []
+            return run_phase()
+        
+        self.logger.info(f"  ⚡ Running {len(batch)} {phase_name} tasks concurrently: "
+                         f"{', '.join(t.task_id for t in batch)}")
+        
+        snapshot = self.state_manager.load().to_dict()
+        objective_id = getattr(objective, 'objective_id', None) if objective else None
+        
+        with ThreadPoolExecutor(max_workers=len(batch)) as pool:
+            futures = []
+            for index, batch_task in enumerate(batch):
+                kwargs = {}
+                if objective and (batch_task is task or batch_task.objective_id == objective_id):
+                    kwargs['objective'] = objective
+                futures.append(pool.submit(self._run_task, phase_name, self._slot(index),
+                                           snapshot, batch_task, kwargs))
+            outcomes = [future.result() for future in futures]
+        
+        self.last_batch = outcomes
+        self._merge(phase_name, snapshot, outcomes)
+        
+        for outcome in outcomes:
+            status = "✓" if outcome.result.success else "✗"
+            self.logger.info(f"    {status} {outcome.task_id} on {self._slots[outcome.slot].server.name} "
+                             f"({outcome.duration:.1f}s)")
+        return outcomes[0].result
+    
+    def _merge(self, phase_name: str, snapshot: Dict, outcomes: List[TaskOutcome]):
+        """Apply every worker's state changes to the real state (single writer)."""
+        merged = self.state_manager.load().to_dict()
+        for outcome in outcomes:
+            if outcome.saved is not None:
+                merged = merge_state_dicts(snapshot, merged, outcome.saved)
+        
+        state = PipelineState.from_dict(merged)
+        state.queue.sort(key=lambda item: item.get("priority", 0))
+        
+        # The coordinator records the primary task's run itself
+        if phase_name in state.phases:
+            for outcome in outcomes[1:]:
+                result = outcome.result
+                state.phases[phase_name].record_run(
+                    success=result.success,
+                    task_id=result.task_id or outcome.task_id,
+                    files_created=result.files_created,
+                    files_modified=result.files_modified
+                )
+        
+        self.state_manager.save(state)
@@ -16,6 +16,7 @@ class ServerConfig:
     capabilities: List[str] = field(default_factory=list)
     models: List[str] = field(default_factory=list)
     online: bool = False
+    memory_gb: Optional[float] = None  # Memory for loaded models (None = unknown)
     
     @property
     def base_url(self) -> str:
@@ -62,6 +63,35 @@ class PipelineConfig:
     state_dir: str = ".pipeline"
     auto_save_state: bool = True
     
+    # Project-wide analysis (refactoring and QA phases)
+    analysis_workers: Optional[int] = None  # Worker processes, None = min(4, cpu count)
+    analysis_budget: Optional[float] = None  # Seconds, None = run every analyzer
+    
+    # Concurrent coding/QA tasks (independent files, one worker per server slot)
+    concurrent_tasks: int = 1  # 1 = sequential
+    
+    # In-flight requests per Ollama server for concurrent (async) model calls;
+    # match the servers' OLLAMA_NUM_PARALLEL
+    max_requests_per_host: int = 2
+    
+    # Let the small routing model draft simple tool calls (read_file,
+    # list_directory, arbiter decisions) before calling the large model
+    speculative_drafting: bool = False
+    draft_confidence_threshold: float = 0.8  # Minimum self-reported draft confidence
+    
+    # Keep the models of the current and likely next phases loaded: pin them
+    # with keep_alive and warm them ahead of phase switches (see model_residency)
+    model_residency: bool = False
+    pinned_keep_alive: str = "30m"
+    
+    # Offer each phase turn only its own tools plus the top-k others ranked
+    # for the prompt (see tool_retrieval); full list again if the model needs it
+    tool_retrieval: bool = False
+    tool_retrieval_top_k: int = 8
+    
+    # Span tracing of hot paths (.pipeline/traces/), summarized at the end of a run
+    trace: bool = False
+    
     # Model assignments by task type
     # Format: (model_name, preferred_host)
     # 
@@ -5,6 +5,7 @@ Orchestrates the pipeline phases and determines the next action to take.
 This is the main control loop that NEVER exits - it continuously finds work to do.
 """
 
+import threading
 import time
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -14,6 +15,8 @@ from .config import PipelineConfig
 from .client import OllamaClient
 from .state.manager import StateManager, PipelineState, TaskState, TaskStatus
 from .logging_setup import get_logger, setup_logging
+from .tracing import get_tracer, NULL_SPAN
+from .model_metrics import MODEL_METRICS_FILE, ModelMetricsStore
 
 
 class PhaseCoordinator:
@@ -39,6 +42,7 @@ class PhaseCoordinator:
         self.project_dir = Path(config.project_dir)
         self.logger = get_logger()
         self.verbose = verbose
+        self.tracer = get_tracer()
         
         # Initialize client
         self.client = OllamaClient(config)
@@ -83,9 +87,11 @@ class PhaseCoordinator:
         )
         
         # Create unified model tools (using config for server URLs)
-        self.coding_tool = UnifiedModelTool("qwen2.5-coder:32b", "http://ollama02:11434")
-        self.reasoning_tool = UnifiedModelTool("qwen2.5:32b", "http://ollama02:11434")
-        self.analysis_tool = UnifiedModelTool("qwen2.5:14b", "http://ollama01.thiscluster.net:11434")
+        coding_url = self._server_url(config.model_assignments.get('coding', ('', 'ollama02.thiscluster.net'))[1])
+        analysis_url = self._server_url(config.model_assignments.get('routing', ('', 'ollama01.thiscluster.net'))[1])
+        self.coding_tool = UnifiedModelTool("qwen2.5-coder:32b", coding_url)
+        self.reasoning_tool = UnifiedModelTool("qwen2.5:32b", coding_url)
+        self.analysis_tool = UnifiedModelTool("qwen2.5:14b", analysis_url)
         
         # Create specialists (shared across all phases)
         self.coding_specialist = create_coding_specialist(self.coding_tool)
@@ -141,6 +147,14 @@ class PhaseCoordinator:
         # Initialize phases (lazy import to avoid circular deps)
         self.phases = self._init_phases()
         
+        # Independent coding/QA tasks run concurrently, one per server slot
+        from .concurrent_execution import ConcurrentTaskExecutor
+        self.task_executor = ConcurrentTaskExecutor(
+            config, self.client, self.state_manager,
+            phase_factory=self._create_worker_phase,
+            task_filter=self._can_run_concurrently
+        )
+        
         # ============================================================================
         # ARBITER INTEGRATION (Week 1 Enhancement #3)
         # ============================================================================
@@ -234,6 +248,8 @@ class PhaseCoordinator:
             'analytics': self.analytics,
             'pattern_optimizer': self.pattern_optimizer,
         }
+        self._phase_kwargs = shared_kwargs
+        self._worker_kwargs = None
         
         return {
             "planning": PlanningPhase(self.config, self.client, **shared_kwargs),
@@ -984,11 +1000,32 @@ class PhaseCoordinator:
         else:
             self.logger.info(f"  Starting new pipeline run: {state.run_id}")
         
+        # Model call metrics accumulate across resumed runs
+        metrics_file = self.project_dir / self.config.state_dir / MODEL_METRICS_FILE
+        if resume and metrics_file.exists():
+            self.client.metrics.replace_with(ModelMetricsStore.load(metrics_file))
+        
+        # Span tracing (written under .pipeline/traces/)
+        if self.config.trace:
+            trace_file = self.tracer.start(self.project_dir / self.config.state_dir / "traces", run_id=state.run_id)
+            self.logger.info(f"  Tracing to {trace_file}")
+        
         # Run the main loop
         try:
             return self._run_loop()
         except KeyboardInterrupt:
             return False
+        finally:
+            chrome_trace = self.tracer.stop()
+            if chrome_trace:
+                self.logger.info(f"  Trace written: {chrome_trace}")
+    
+    def _save_model_metrics(self):
+        """Persist model call metrics for `run.py --status` and later runs."""
+        try:
+            self.client.metrics.save(self.project_dir / self.config.state_dir / MODEL_METRICS_FILE)
+        except OSError as e:
+            self.logger.debug(f"  Could not save model metrics: {e}")
     
     def _detect_failure_loop(self, state: PipelineState) -> Optional[Dict[str, Any]]:
         """
@@ -1340,10 +1377,13 @@ class PhaseCoordinator:
         # Track current iteration for cooldown logic
         self._current_iteration = 0
         
+        iteration_span = NULL_SPAN
         while iteration < max_iter:
             pass
             # No rate limiting - removed per user request
             last_iteration_time = time.time()
+            iteration_span.end()
+            iteration_span = self.tracer.begin("iteration", category="coordinator", iteration=iteration + 1)
             
             # Load current state
             state = self.state_manager.load()
@@ -1352,7 +1392,8 @@ class PhaseCoordinator:
             self._validate_architecture_before_iteration(state)
             
             # Determine next phase decision (NEVER returns None)
-            phase_decision = self._determine_next_action(state)
+            with self.tracer.span("decision", category="coordinator"):
+                phase_decision = self._determine_next_action(state)
             
             # Log iteration
             iteration += 1
@@ -1466,6 +1507,9 @@ class PhaseCoordinator:
             
             self.state_manager.save(state)
             
+            # Pin this phase's model and warm the likely next phases' models meanwhile
+            self.client.residency.prepare(phase_name, state.phase_history, self.polytope['edges'])
+            
             # Execute the phase
             task = phase_decision.get("task")
             objective = phase_decision.get("objective")
@@ -1496,9 +1540,16 @@ class PhaseCoordinator:
                     if prediction_info:
                         self.logger.debug(f"Analytics prediction: {prediction_info}")
                 
-                # Track execution time
+                # Track execution time and model usage
                 phase_start_time = time.time()
-                result = phase.run(**phase_kwargs)
+                usage_before = self.client.metrics.snapshot("phase", phase.phase_name)
+                if self.task_executor.enabled_for(phase_name, task):
+                    result = self.task_executor.run(
+                        phase_name, state, task, objective=objective,
+                        run_phase=lambda: phase.run(**phase_kwargs)
+                    )
+                else:
+                    result = phase.run(**phase_kwargs)
                 phase_duration = time.time() - phase_start_time
                 
                 # WEEK 2 PHASE 2: Record phase execution for correlation analysis
@@ -1518,12 +1569,15 @@ class PhaseCoordinator:
                         pass
                 
                 # Analytics: After phase execution
+                model_usage = self.client.metrics.usage_since("phase", phase.phase_name, usage_before)
+                self._save_model_metrics()
                 if self.analytics:
                     analytics_info = self.analytics.after_phase_execution(
                         phase_name, 
                         duration=phase_duration, 
                         success=result.success, 
-                        context=analytics_context
+                        context=analytics_context,
+                        model_usage=model_usage
                     )
                     if analytics_info and analytics_info.get('anomalies'):
                         self.logger.warning(f"Analytics detected anomalies: {analytics_info['anomalies']}")
@@ -1570,16 +1624,20 @@ class PhaseCoordinator:
                         
                         # Track retry execution time
                         retry_start_time = time.time()
+                        usage_before = self.client.metrics.snapshot("phase", phase.phase_name)
                         result = phase.run(task=task)
                         retry_duration = time.time() - retry_start_time
                         
                         # Analytics: After retry execution
+                        model_usage = self.client.metrics.usage_since("phase", phase.phase_name, usage_before)
+                        self._save_model_metrics()
                         if self.analytics:
                             self.analytics.after_phase_execution(
                                 phase_name,
                                 duration=retry_duration,
                                 success=result.success,
-                                context=retry_context
+                                context=retry_context,
+                                model_usage=model_usage
                             )
 
                 
@@ -1686,6 +1744,7 @@ class PhaseCoordinator:
                 self.state_manager.save(state)
         
         # Reached max iterations
+        iteration_span.end()
         return self._summarize_run()
     
     def _determine_next_action(self, state: PipelineState) -> Dict:
@@ -2786,6 +2845,60 @@ class PhaseCoordinator:
         # All improvement phases have been run at least once
         return None
     
+    def _server_url(self, host: str) -> str:
+        """Base URL of a configured server host (default Ollama port otherwise)."""
+        for server in self.config.servers:
+            if server.host == host:
+                return server.base_url
+        return f"http://{host}:11434"
+    
+    def _worker_phase_kwargs(self) -> Dict:
+        """
+        Collaborators for phases run by concurrent worker slots.
+        
+        Only coding and QA run concurrently, and the coordinator thread waits
+        while they do, so the workers are the only concurrent users:
+        
+        - Shared as-is: file_tracker and message_bus (both lock internally),
+          prompt/tool/role registries (only registered into by the design
+          phases, which never run concurrently)
+        - Shared behind one lock (mutable learning state; they call into each
+          other): adaptive_prompts, pattern_recognition, correlation_engine,
+          analytics, pattern_optimizer
+        - Per slot: state_manager (a private state view) and the specialists,
+          left unset so each phase builds its own bound to the slot's server
+        """
+        if self._worker_kwargs is None:
+            from .concurrent_execution import SerializedProxy
+            
+            lock = threading.RLock()
+            kwargs = dict(self._phase_kwargs)
+            for name in ('adaptive_prompts', 'pattern_recognition', 'correlation_engine',
+                         'analytics', 'pattern_optimizer'):
+                if kwargs[name] is not None:
+                    kwargs[name] = SerializedProxy(kwargs[name], lock)
+            for name in ('state_manager', 'coding_specialist', 'reasoning_specialist', 'analysis_specialist'):
+                kwargs.pop(name)
+            self._worker_kwargs = kwargs
+        return self._worker_kwargs
+    
+    def _create_worker_phase(self, phase_name: str, config: PipelineConfig,
+                             client: OllamaClient, state_manager: StateManager):
+        """Build a phase instance for a concurrent worker slot"""
+        kwargs = dict(self._worker_phase_kwargs(), state_manager=state_manager)
+        return type(self.phases[phase_name])(config, client, **kwargs)
+    
+    def _can_run_concurrently(self, state: PipelineState, task: TaskState) -> bool:
+        """Check if a task may join a concurrent batch (same routing as sequential mode)"""
+        if task.target_file.endswith('.md'):
+            return False
+        if task.description:
+            doc_keywords = ['documentation', 'write docs', 'create docs', 'document', 'readme', 'guide']
+            desc_lower = task.description.lower()
+            if any(keyword in desc_lower for keyword in doc_keywords):
+                return False
+        return self._dependencies_met(state, task)
+    
     def _dependencies_met(self, state: PipelineState, task: TaskState) -> bool:
         """Check if all dependencies for a task are completed"""
         if not task.dependencies:
@@ -2968,6 +3081,40 @@ class PhaseCoordinator:
             except Exception as e:
                 pass  # Silently ignore if space summary fails
         
+        # Where the tokens went
+        report = self.client.metrics.format_report()
+        if report:
+            self.logger.info(f"\n  🔢 Model Usage:")
+            for line in report:
+                self.logger.info(line)
+        
+        # Model warm-ups and loads (when planning residency)
+        residency = self.client.residency.format_report()
+        if residency:
+            self.logger.info(f"\n  🔥 Model Residency:")
+            for line in residency:
+                self.logger.info(line)
+        
+        # How often small-model drafts replaced large-model calls
+        drafts = self.client.drafter.format_report()
+        if drafts:
+            self.logger.info(f"\n  ⚡ Speculative Drafts:")
+            for line in drafts:
+                self.logger.info(line)
+        
+        # Tool schemas left out of phase turns (when retrieving tool subsets)
+        retrieval = self.client.tool_selector.format_report()
+        if retrieval:
+            self.logger.info(f"\n  🧰 Tool Retrieval:")
+            for line in retrieval:
+                self.logger.info(line)
+        
+        # Where the iterations' time went (when tracing)
+        if self.tracer.enabled:
+            self.logger.info(f"\n  ⏱️  Span Timings (self time, largest first):")
+            for line in self.tracer.format_summary().splitlines():
+                self.logger.info(line)
+        
         self.logger.info(f"{'='*70}")
         
         return completed > 0 or total == 0
@@ -81,6 +81,8 @@ class AnalyticsIntegration:
             self.logger.info(f"  Success probability: {prediction.success_probability:.1%}")
             self.logger.info(f"  Estimated duration: {prediction.estimated_duration:.0f}s")
             self.logger.info(f"  Confidence: {prediction.confidence:.1%}")
+            if prediction.estimated_tokens is not None:
+                self.logger.info(f"  Estimated model tokens: {prediction.estimated_tokens:.0f}")
             
             if prediction.risk_factors:
                 self.logger.warning(f"  Risk factors: {', '.join(prediction.risk_factors)}")
@@ -99,11 +101,13 @@ class AnalyticsIntegration:
             return {}
             
     def after_phase_execution(self, phase_name: str, duration: float, 
-                             success: bool, context: Dict[str, Any]) -> Dict[str, Any]:
+                             success: bool, context: Dict[str, Any],
+                             model_usage: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
         """
         Called after phase execution.
         
-        Records metrics and detects anomalies.
+        Records metrics (including the phase's model token counts and
+        timings, when given) and detects anomalies.
         """
         if not self.enabled:
             return {}
@@ -115,7 +119,8 @@ class AnalyticsIntegration:
                 phase_name,
                 success=success,
                 duration=duration,
-                context=context
+                context=context,
+                model_usage=model_usage
             )
             
             # Record for anomaly detector
@@ -132,6 +137,8 @@ class AnalyticsIntegration:
                 duration=duration,
                 success=success
             )
+            if model_usage:
+                self.optimizer.record_model_usage(phase_name, model_usage)
             
             # Detect anomalies
             anomalies = self.anomaly_detector.detect_phase_anomalies(phase_name)
@@ -98,6 +98,9 @@ class CustomToolRegistry:
         self._last_scan: float = 0.0
         self._scan_interval: float = 5.0  # Rescan every 5 seconds
         
+        # Bumped whenever the set of tools changes (keys cached tool lists)
+        self.version = 0
+        
         self.logger.info(f"CustomToolRegistry initialized with tools_dir: {self.tools_dir}")
     
     def discover_tools(self, force: bool = False) -> int:
@@ -147,6 +150,7 @@ class CustomToolRegistry:
                 self.logger.warning(f"Failed to extract metadata from {tool_file}: {e}")
         
         self._last_scan = current_time
+        self.version += 1
         elapsed = time.time() - start_time
         
         self.logger.info(f"Discovered {discovered} custom tools in {elapsed*1000:.1f}ms")
@@ -337,6 +341,7 @@ class CustomToolRegistry:
             # Clear cached definition
             if metadata.name in self._definitions_cache:
                 del self._definitions_cache[metadata.name]
+            self.version += 1
             self.logger.info(f"Registered tool: {metadata.name}")
             return True
         except Exception as e:
@@ -468,6 +473,7 @@ class CustomToolRegistry:
             # Clear cached definition
             if tool_name in self._definitions_cache:
                 del self._definitions_cache[tool_name]
+            self.version += 1
             
             self.logger.info(f"Reloaded tool: {tool_name}")
             return True
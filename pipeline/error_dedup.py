@@ -40,12 +40,15 @@ def create_error_key(error: Dict) -> Tuple:
         )
 
 
-def deduplicate_errors(errors: List[Dict]) -> Dict[Tuple, Dict]:
+def deduplicate_errors(errors: List[Dict], store=None) -> Dict[Tuple, Dict]:
     """
     Deduplicate errors by grouping identical errors.
     
     Args:
         errors: List of error dicts
+        store: Optional ErrorSignatureStore; errors are then grouped by the
+            ids it has interned, and each group gets the iteration its
+            earliest signature was first seen in as ``first_seen``
         
     Returns:
         Dict mapping error_key to deduplicated error with all locations
@@ -69,13 +72,19 @@ def deduplicate_errors(errors: List[Dict]) -> Dict[Tuple, Dict]:
         }
     """
     deduplicated = {}
+    groups = {}  # Group id (or key) -> (error group, locations seen, signature ids)
+    lookups = store.lookup_all(errors) if store is not None else None
     
-    for error in errors:
-        error_key = create_error_key(error)
+    for number, error in enumerate(errors):
+        if store is not None:
+            signature_id, group_id = lookups[number]
+        else:
+            group_id = create_error_key(error)
         
-        if error_key not in deduplicated:
+        if group_id not in groups:
             pass
             # First occurrence - create entry with all error info
+            error_key = store.group_key(group_id) if store is not None else group_id
             deduplicated[error_key] = {
                 'type': error.get('type', 'Unknown'),
                 'message': error.get('message', ''),
@@ -90,6 +99,8 @@ def deduplicate_errors(errors: List[Dict]) -> Dict[Tuple, Dict]:
                 'related_files': error.get('related_files', {}),
                 'original_type': error.get('original_type', '')
             }
+            groups[group_id] = (deduplicated[error_key], set(), set())
+        error_group, seen_locations, signature_ids = groups[group_id]
         
         # Add this location to the group
         location = {
@@ -101,8 +112,18 @@ def deduplicate_errors(errors: List[Dict]) -> Dict[Tuple, Dict]:
         }
         
         # Avoid duplicate locations
-        if location not in deduplicated[error_key]['locations']:
-            deduplicated[error_key]['locations'].append(location)
+        location_key = tuple(location.values())
+        if location_key not in seen_locations:
+            seen_locations.add(location_key)
+            error_group['locations'].append(location)
+        
+        if store is not None and signature_id is not None:
+            signature_ids.add(signature_id)
+    
+    if store is not None:
+        for error_group, _, signature_ids in groups.values():
+            first_seen = [store.history(sig_id)['first_seen'] for sig_id in signature_ids]
+            error_group['first_seen'] = min(filter(None, first_seen), default=None)
     
     return deduplicated
 
@@ -1,9 +1,18 @@
 """
 Error signature tracking for detecting bug transitions and progress.
+
+``ErrorSignatureStore`` interns signatures to integer ids and keeps their
+history across iterations (and, with a store file, across runs);
+``ProgressTracker`` and ``deduplicate_errors`` read from it.
 """
-from typing import Optional, Set, Dict, Any
+from typing import Optional, Set, Dict, Any, List, Tuple
 from dataclasses import dataclass
+from pathlib import Path
 import hashlib
+import json
+
+from .error_dedup import create_error_key
+from .logging_setup import get_logger
 
 
 @dataclass
@@ -97,11 +106,256 @@ class ErrorSignature:
             return None
 
 
+# Error dict fields that signatures and deduplication keys are derived from
+_RAW_FIELDS = ('type', 'message', 'traceback', 'file', 'line', 'object_type', 'missing_attribute')
+
+# Signature history file, in the configured state directory
+ERROR_SIGNATURES_FILE = "error_signatures.jsonl"
+
+
+class ErrorSignatureStore:
+    """
+    Error signatures interned to integer ids, with their history.
+    
+    Per signature the store keeps the iterations it was first and last seen
+    in, how many iterations it was seen in, and the iteration its current
+    run of consecutive iterations began. Per iteration it logs the ids that
+    appeared and the ids that were resolved, so ``changes_since`` only
+    visits what changed after the iteration asked about. Error dicts are
+    mapped to ids through a cache of their raw fields, so a recurring error
+    is parsed once.
+    
+    The store file is a JSON-lines log with one line per iteration (the
+    signatures interned since the previous line, and the ids that appeared
+    and were resolved), so saving appends only what changed; loading
+    replays the lines.
+    """
+    
+    # Raw error dicts whose ids are cached
+    LOOKUP_CACHE_SIZE = 50000
+    
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Initialize the store.
+        
+        Args:
+            path: JSON-lines file the history is kept in (None: memory only)
+        """
+        self.path = Path(path) if path is not None else None
+        self.logger = get_logger()
+        self._reset()
+        self._groups: Dict[Tuple, int] = {}
+        self._group_keys: List[Tuple] = []
+        self._lookups: Dict[Tuple, Tuple[Optional[int], int]] = {}
+        self._recorded: Optional[Tuple[List[Dict[str, Any]], List[Tuple[Optional[int], int]]]] = None
+        # Iterations recorded since the last save, and signatures already in the file
+        self._pending: List[Dict[str, Any]] = []
+        self._saved_signatures = 0
+        if self.path is not None:
+            self._load()
+    
+    def _reset(self):
+        """Forget all signatures and their history"""
+        self.iteration = 0
+        self._ids: Dict[ErrorSignature, int] = {}
+        self._signatures: List[ErrorSignature] = []
+        self._first_seen: List[int] = []
+        self._last_seen: List[int] = []
+        self._count: List[int] = []
+        self._run_start: List[int] = []
+        self._active: Set[int] = set()
+        # Iteration -> ids that appeared / (id, run start) pairs resolved in it
+        self._appeared: Dict[int, List[int]] = {}
+        self._resolved: Dict[int, List[Tuple[int, int]]] = {}
+    
+    def _load(self):
+        """Replay the iteration log from disk"""
+        if not self.path.exists():
+            return
+        try:
+            data = self.path.read_bytes()
+            # A line cut off by a crash mid-append is dropped (and truncated away,
+            # so the next append starts on a line of its own)
+            end = data.rfind(b'\n') + 1
+            for raw in data[:end].splitlines():
+                entry = json.loads(raw)
+                for error_type, message, file, line in entry.get("signatures", ()):
+                    self.intern(ErrorSignature(error_type, message, file, line))
+                self._apply_iteration(entry["iteration"], entry["appeared"],
+                                      [tuple(pair) for pair in entry["resolved"]])
+            if end < len(data):
+                with open(self.path, 'r+b') as f:
+                    f.truncate(end)
+            self._saved_signatures = len(self._signatures)
+        except (json.JSONDecodeError, IOError, KeyError, TypeError, ValueError, IndexError) as e:
+            self.logger.warning(f"Failed to load error signatures: {e}")
+            self._reset()
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+    
+    def save(self):
+        """Append the iterations recorded since the last save to disk."""
+        if self.path is None or not self._pending:
+            return
+        pending = [dict(entry) for entry in self._pending]
+        pending[0]["signatures"] = [[sig.error_type, sig.message, sig.file, sig.line]
+                                    for sig in self._signatures[self._saved_signatures:]]
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(entry) + '\n' for entry in pending))
+            self._saved_signatures = len(self._signatures)
+            self._pending = []
+        except IOError as e:
+            self.logger.error(f"Failed to save error signatures: {e}")
+    
+    def intern(self, signature: ErrorSignature) -> int:
+        """Id of a signature (assigned on first use)."""
+        sig_id = self._ids.get(signature)
+        if sig_id is None:
+            sig_id = self._ids[signature] = len(self._signatures)
+            self._signatures.append(signature)
+            for column in (self._first_seen, self._last_seen, self._count, self._run_start):
+                column.append(0)
+        return sig_id
+    
+    def signature(self, sig_id: int) -> ErrorSignature:
+        """Signature of an id."""
+        return self._signatures[sig_id]
+    
+    def group_key(self, group_id: int) -> Tuple:
+        """Deduplication key (``create_error_key``) of a group id."""
+        return self._group_keys[group_id]
+    
+    def lookup(self, error: Dict[str, Any]) -> Tuple[Optional[int], int]:
+        """
+        Ids of an error dict's signature and deduplication group.
+        
+        Returns:
+            (signature id, or None if no signature could be parsed; group id)
+        """
+        raw = tuple(map(error.get, _RAW_FIELDS))
+        try:
+            ids = self._lookups.get(raw)
+        except TypeError:  # Unhashable field values (e.g. a traceback list)
+            raw = ids = None
+        if ids is None:
+            signature = ErrorSignature.from_error_dict(error)
+            key = create_error_key(error)
+            group_id = self._groups.get(key)
+            if group_id is None:
+                group_id = self._groups[key] = len(self._group_keys)
+                self._group_keys.append(key)
+            ids = (self.intern(signature) if signature else None, group_id)
+            if raw is not None:
+                if len(self._lookups) >= self.LOOKUP_CACHE_SIZE:
+                    self._lookups.clear()
+                self._lookups[raw] = ids
+        return ids
+    
+    def lookup_all(self, errors: List[Dict[str, Any]]) -> List[Tuple[Optional[int], int]]:
+        """``lookup`` of each error dict; the list last recorded is not looked up again."""
+        if self._recorded is not None and self._recorded[0] is errors and len(errors) == len(self._recorded[1]):
+            return self._recorded[1]
+        return [self.lookup(error) for error in errors]
+    
+    def record_iteration(self, errors: List[Dict[str, Any]]) -> Set[int]:
+        """
+        Record the errors of a new iteration.
+        
+        Returns:
+            Ids of the iteration's signatures
+        """
+        lookups = self.lookup_all(errors)
+        self._recorded = (errors, lookups)
+        current = {sig_id for sig_id, _ in lookups if sig_id is not None}
+        appeared = sorted(current - self._active)
+        resolved = sorted((sig_id, self._run_start[sig_id]) for sig_id in self._active - current)
+        
+        self._apply_iteration(self.iteration + 1, appeared, resolved)
+        self._pending.append({"iteration": self.iteration, "appeared": appeared, "resolved": resolved})
+        return set(current)
+    
+    def _apply_iteration(self, iteration: int, appeared: List[int], resolved: List[Tuple[int, int]]):
+        """
+        Advance to ``iteration``, given the ids that appeared in it and the
+        (id, run start) pairs resolved in it.
+        """
+        current = (self._active - {sig_id for sig_id, _ in resolved}) | set(appeared)
+        for sig_id in appeared:
+            if not self._first_seen[sig_id]:
+                self._first_seen[sig_id] = iteration
+            self._run_start[sig_id] = iteration
+        for sig_id in current:
+            self._last_seen[sig_id] = iteration
+            self._count[sig_id] += 1
+        if appeared:
+            self._appeared[iteration] = appeared
+        if resolved:
+            self._resolved[iteration] = resolved
+        
+        self.iteration = iteration
+        self._active = current
+    
+    def current(self) -> Set[int]:
+        """Ids of the signatures seen in the latest iteration."""
+        return set(self._active)
+    
+    def history(self, sig_id: int) -> Dict[str, int]:
+        """First and last iteration a signature was seen in, and in how many (0: never recorded)."""
+        return {
+            'first_seen': self._first_seen[sig_id],
+            'last_seen': self._last_seen[sig_id],
+            'count': self._count[sig_id]
+        }
+    
+    def changes_since(self, iteration: int) -> Dict[str, Set[int]]:
+        """
+        Compare the latest iteration with an earlier one.
+        
+        Only the appeared/resolved logs of the iterations in between are
+        visited (plus the current ids for ``persisting``).
+        
+        Args:
+            iteration: Earlier iteration number
+        
+        Returns:
+            Dict of id sets:
+            - new: seen now, not in ``iteration``
+            - persisting: seen now and in ``iteration``
+            - resolved: seen in ``iteration``, not now
+        """
+        appeared = set()
+        present_then = set()  # Resolved after ``iteration`` but present in it
+        for number in range(max(iteration, 0) + 1, self.iteration + 1):
+            appeared.update(self._appeared.get(number, ()))
+            present_then.update(sig_id for sig_id, start in self._resolved.get(number, ()) if start <= iteration)
+        
+        new = {sig_id for sig_id in appeared
+               if sig_id in self._active and self._run_start[sig_id] > iteration} - present_then
+        return {
+            'new': new,
+            'persisting': self._active - new,
+            'resolved': present_then - self._active
+        }
+    
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
 class ProgressTracker:
     """Tracks error signatures across iterations to detect progress."""
     
-    def __init__(self):
-        self.error_history: list[Set[ErrorSignature]] = []
+    def __init__(self, store: Optional[ErrorSignatureStore] = None):
+        """
+        Initialize the tracker.
+        
+        Args:
+            store: Store recording the iterations (default: a new in-memory store)
+        """
+        self.store = store if store is not None else ErrorSignatureStore()
         self.bugs_fixed_count = 0
         self.bugs_discovered_count = 0
         self.current_iteration = 0
@@ -109,15 +363,11 @@ class ProgressTracker:
     def add_iteration(self, errors: list[Dict[str, Any]]) -> None:
         """Add errors from current iteration."""
         self.current_iteration += 1
+        self.store.record_iteration(errors)
         
-        # Convert errors to signatures
-        signatures = set()
-        for error in errors:
-            sig = ErrorSignature.from_error_dict(error)
-            if sig:
-                signatures.add(sig)
-        
-        self.error_history.append(signatures)
+    def _signatures(self, ids: Set[int]) -> Set[ErrorSignature]:
+        """Signatures of ids"""
+        return {self.store.signature(sig_id) for sig_id in ids}
     
     def detect_transition(self) -> Optional[Dict[str, Any]]:
         """
@@ -130,16 +380,13 @@ class ProgressTracker:
             - new: set of new error signatures
             - persisting: set of persisting error signatures
         """
-        if len(self.error_history) < 2:
+        if self.store.iteration < 2:
             return None
         
-        previous_errors = self.error_history[-2]
-        current_errors = self.error_history[-1]
-        
-        # Calculate differences
-        fixed = previous_errors - current_errors
-        new = current_errors - previous_errors
-        persisting = previous_errors & current_errors
+        changes = self.store.changes_since(self.store.iteration - 1)
+        fixed = self._signatures(changes['resolved'])
+        new = self._signatures(changes['new'])
+        persisting = self._signatures(changes['persisting'])
         
         # Update counters
         self.bugs_fixed_count += len(fixed)
@@ -179,15 +426,14 @@ class ProgressTracker:
     
     def get_current_errors(self) -> Set[ErrorSignature]:
         """Get current error signatures."""
-        if not self.error_history:
-            return set()
-        return self.error_history[-1]
+        return self._signatures(self.store.current())
     
     def get_previous_errors(self) -> Set[ErrorSignature]:
         """Get previous error signatures."""
-        if len(self.error_history) < 2:
+        if self.store.iteration < 2:
             return set()
-        return self.error_history[-2]
+        changes = self.store.changes_since(self.store.iteration - 1)
+        return self._signatures(changes['persisting'] | changes['resolved'])
     
     def is_making_progress(self) -> bool:
         """Check if we're making progress (fixing bugs or discovering new ones)."""
@@ -11,6 +11,8 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import logging
 
+from .code_matcher import CodeMatcher
+
 
 class ModificationFailure:
     """Represents a failed modification attempt with full context"""
@@ -250,30 +252,22 @@ class FailureAnalyzer:
                                   threshold: float = 0.6) -> List[Dict]:
         """Find code blocks similar to the target"""
         
-        target_lines = [l.strip() for l in target.strip().split('\n') if l.strip()]
-        content_lines = content.split('\n')
+        matcher = CodeMatcher(content)
+        content_lines = matcher.lines
         
         matches = []
-        window_size = len(target_lines)
-        
-        for i in range(len(content_lines) - window_size + 1):
-            window_lines = content_lines[i:i + window_size]
-            window = '\n'.join(window_lines)
-            
-            # Calculate similarity
-            ratio = difflib.SequenceMatcher(None, target, window).ratio()
-            
-            if ratio >= threshold:
-                matches.append({
-                    "line_number": i + 1,
-                    "similarity": ratio,
-                    "code": window,
-                    "context_before": '\n'.join(content_lines[max(0, i-2):i]),
-                    "context_after": '\n'.join(content_lines[i+window_size:i+window_size+2])
-                })
-        
-        # Sort by similarity
-        matches.sort(key=lambda x: x["similarity"], reverse=True)
+        for match in matcher.find_similar(target, threshold=threshold, limit=10):
+            i = match.start_line - 1
+            matches.append({
+                "line_number": match.start_line,
+                "end_line": match.end_line,
+                "similarity": match.confidence,
+                "code": match.code,
+                "context_before": '\n'.join(content_lines[max(0, i-2):i]),
+                "context_after": '\n'.join(content_lines[match.end_line:match.end_line+2])
+            })
+        
+        # Already sorted by similarity
         return matches
     
     def _analyze_whitespace_differences(self, content: str, target: str) -> Optional[str]:
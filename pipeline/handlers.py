@@ -5,19 +5,24 @@ Executes tool calls and manages side effects (file creation, etc.)
 """
 
 import json
-from typing import Dict, List, Callable
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Callable
 from pathlib import Path
 from datetime import datetime
 
 from .logging_setup import get_logger
 from .utils import validate_python_syntax
 from .process_manager import ProcessBaseline, SafeProcessManager, ResourceMonitor
+from .code_matcher import CodeMatcher
 from .failure_analyzer import FailureAnalyzer, ModificationFailure, create_failure_report
 from .signature_extractor import SignatureExtractor
 from .context_investigator import ContextInvestigator
 from .import_analyzer import ImportAnalyzer
 from .syntax_validator import SyntaxValidator
 from .system_analyzer import SystemAnalyzer
+from .tool_call_planner import ToolCallPlanner
+from .tracing import get_tracer
 
 
 class ToolCallHandler:
@@ -32,6 +37,14 @@ class ToolCallHandler:
         # Refactoring manager (shared with refactoring phase)
         self._refactoring_manager = refactoring_manager
         
+        # Shared AnalysisRunner pass (set by phases that run analyzers in bulk)
+        self.analysis_run = None
+        
+        # Concurrent execution of independent read-only tool calls
+        self.max_parallel_tools = 4  # 1 = strictly sequential
+        self.tool_planner = ToolCallPlanner(normalize_path=self._normalize_filepath)
+        self._activity_lock = threading.RLock()
+        
         # Track results
         self.files_created: List[str] = []
         self.files_modified: List[str] = []
@@ -367,14 +380,35 @@ class ToolCallHandler:
                 f.write('\n')  # Blank line between entries
     
     def process_tool_calls(self, tool_calls: List[Dict]) -> List[Dict]:
-        """Process a list of tool calls and return results"""
-        results = []
+        """
+        Process a list of tool calls and return results (in call order).
         
-        for call in tool_calls:
-            result = self._execute_tool_call(call)
-            results.append(result)
-            
-            # Track errors
+        Independent read-only calls run concurrently; calls on the same path
+        keep their order and mutating calls run alone (see ToolCallPlanner).
+        """
+        stages = self.tool_planner.plan(tool_calls)
+        results: List[Dict] = [None] * len(tool_calls)
+            
+        def run_chain(chain: List[int]):
+            for index in chain:
+                results[index] = self._execute_tool_call(tool_calls[index])
+        
+        with get_tracer().span("tools.dispatch", category="tools", calls=len(tool_calls), stages=len(stages)):
+            if self.max_parallel_tools > 1 and any(len(stage) > 1 for stage in stages):
+                with ThreadPoolExecutor(max_workers=self.max_parallel_tools) as pool:
+                    for stage in stages:
+                        if len(stage) == 1:
+                            run_chain(stage[0])
+                        else:
+                            for future in [pool.submit(run_chain, chain) for chain in stage]:
+                                future.result()
+            else:
+                for stage in stages:
+                    for chain in stage:
+                        run_chain(chain)
+        
+        # Track errors
+        for result in results:
             if not result.get("success"):
                 self.errors.append({
                     "tool": result.get("tool"),
@@ -461,7 +495,8 @@ class ToolCallHandler:
                 }
         
         # Log AI activity with details
-        self._log_tool_activity(name, args)
+        with self._activity_lock:
+            self._log_tool_activity(name, args)
         
         # ENHANCED: Detailed tool execution logging
         self.logger.info(f"")
@@ -541,20 +576,22 @@ class ToolCallHandler:
             start_time = time.time()
             
             # Execute the tool
-            result = handler(args)
+            with get_tracer().span(f"tool.{name}", category="tools"):
+                result = handler(args)
             
             # INTEGRATION: Record tool usage metrics
             execution_time = time.time() - start_time
             success = result.get("success", False)
             error_type = result.get("error_type") if not success else None
             
-            self.tool_validator.record_tool_usage(
-                tool_name=name,
-                success=success,
-                execution_time=execution_time,
-                phase=None,  # Phase context not available here
-                error_type=error_type
-            )
+            with self._activity_lock:
+                self.tool_validator.record_tool_usage(
+                    tool_name=name,
+                    success=success,
+                    execution_time=execution_time,
+                    phase=None,  # Phase context not available here
+                    error_type=error_type
+                )
             
             # ENHANCED: Post-execution logging
             status_icon = "✅" if success else "❌"
@@ -575,12 +612,13 @@ class ToolCallHandler:
             self.logger.error(f"Tool execution failed: {e}")
             
             # INTEGRATION: Record tool failure
-            self.tool_validator.record_tool_usage(
-                tool_name=name,
-                success=False,
-                execution_time=0.0,
-                error_type=type(e).__name__
-            )
+            with self._activity_lock:
+                self.tool_validator.record_tool_usage(
+                    tool_name=name,
+                    success=False,
+                    execution_time=0.0,
+                    error_type=type(e).__name__
+                )
             
             return {"tool": name, "success": False, "error": str(e)}
     
@@ -790,139 +828,81 @@ class ToolCallHandler:
         content = full_path.read_text()
         
         # Try exact match first
+        match = None
         if original in content:
             new_content = content.replace(original, new_code, 1)
         else:
-            pass
-            # Try with normalized whitespace (strip leading/trailing, normalize internal)
-            original_stripped = original.strip()
+            # Same lines with different indentation / inner whitespace
+            matcher = CodeMatcher(content)
+            match = matcher.find_exact(original)
             
-            # Try to find the code with any indentation
-            found = False
-            for line_num, line in enumerate(content.split('\n'), 1):
-                if line.strip() == original_stripped:
-                    pass
-                    # Found it! Get the indentation
-                    indent = line[:len(line) - len(line.lstrip())]
-                    
-                    # CRITICAL FIX: Strip existing indentation from new_code before applying detected indentation
-                    new_code_lines_raw = new_code.split('\n')
+            if match:
+                content_lines = content.split('\n')
+                first_line = content_lines[match.start_line - 1]
+                indent = first_line[:len(first_line) - len(first_line.lstrip())]
                     
-                    # Detect minimum indentation in new_code
-                    min_indent = float('inf')
-                    for l in new_code_lines_raw:
-                        if l.strip():
-                            line_indent = len(l) - len(l.lstrip())
-                            min_indent = min(min_indent, line_indent)
+                # CRITICAL FIX: Strip existing indentation from new_code before applying detected indentation
+                # The AI often provides code with indentation already, and we were adding MORE on top!
+                new_code_lines_raw = new_code.split('\n')
                     
-                    if min_indent == float('inf'):
-                        min_indent = 0
+                # Detect minimum indentation in new_code (excluding empty lines)
+                min_indent = float('inf')
+                for line in new_code_lines_raw:
+                    if line.strip():  # Skip empty lines
+                        line_indent = len(line) - len(line.lstrip())
+                        min_indent = min(min_indent, line_indent)
                     
-                    # Strip minimum indentation, then apply target indentation
-                    new_code_lines = []
-                    for l in new_code_lines_raw:
-                        if l.strip():
-                            stripped = l[min_indent:] if len(l) >= min_indent else l.lstrip()
-                            new_code_lines.append(indent + stripped)
-                        else:
-                            new_code_lines.append(l)
+                # If new_code has no indentation, min_indent will be inf
+                if min_indent == float('inf'):
+                    min_indent = 0
                     
-                    new_code_indented = '\n'.join(new_code_lines)
+                # Strip the minimum indentation from all lines, then apply target indentation
+                new_code_lines = []
+                for line in new_code_lines_raw:
+                    if line.strip():  # Non-empty line
+                        stripped = line[min_indent:] if len(line) >= min_indent else line.lstrip()
+                        new_code_lines.append(indent + stripped)
+                    else:  # Empty line
+                        new_code_lines.append(line)
                     
-                    # Replace the line
-                    lines = content.split('\n')
-                    lines[line_num - 1] = new_code_indented
-                    new_content = '\n'.join(lines)
-                    found = True
-                    break
-            
-            if not found:
-                pass
-                # Try multi-line match with flexible whitespace
-                original_lines = [l.strip() for l in original.strip().split('\n') if l.strip()]
-                content_lines = content.split('\n')
-                
-                for i in range(len(content_lines) - len(original_lines) + 1):
-                    pass
-                    # Check if this is a match
-                    match = True
-                    for j, orig_line in enumerate(original_lines):
-                        if content_lines[i + j].strip() != orig_line:
-                            match = False
-                            break
+                # Replace the lines
+                content_lines[match.start_line - 1:match.end_line] = new_code_lines
+                new_content = '\n'.join(content_lines)
+            else:
+                # ENHANCED: Create failure analysis
+                failure = ModificationFailure(
+                    filepath=filepath,
+                    original_content=content,
+                    modified_content=None,
+                    intended_original=original,
+                    intended_replacement=new_code,
+                    error_message="Original code not found in file"
+                )
                     
-                    if match:
-                        pass
-                        # Found it! Get indentation from first line
-                        first_line = content_lines[i]
-                        indent = first_line[:len(first_line) - len(first_line.lstrip())]
-                        
-                        # CRITICAL FIX: Strip existing indentation from new_code before applying detected indentation
-                        # The AI often provides code with indentation already, and we were adding MORE on top!
-                        new_code_lines_raw = new_code.split('\n')
-                        
-                        # Detect minimum indentation in new_code (excluding empty lines)
-                        min_indent = float('inf')
-                        for line in new_code_lines_raw:
-                            if line.strip():  # Skip empty lines
-                                line_indent = len(line) - len(line.lstrip())
-                                min_indent = min(min_indent, line_indent)
-                        
-                        # If new_code has no indentation, min_indent will be inf
-                        if min_indent == float('inf'):
-                            min_indent = 0
-                        
-                        # Strip the minimum indentation from all lines, then apply target indentation
-                        new_code_lines = []
-                        for line in new_code_lines_raw:
-                            if line.strip():  # Non-empty line
-                                # Remove min_indent spaces, then add target indent
-                                stripped = line[min_indent:] if len(line) >= min_indent else line.lstrip()
-                                new_code_lines.append(indent + stripped)
-                            else:  # Empty line
-                                new_code_lines.append(line)
-                        
-                        # Replace the lines
-                        content_lines[i:i+len(original_lines)] = new_code_lines
-                        new_content = '\n'.join(content_lines)
-                        found = True
-                        break
+                analysis = self.failure_analyzer.analyze_modification_failure(failure)
+            
+                # Save detailed failure report
+                report_path = create_failure_report(failure, analysis, self.failures_dir)
                 
-                if not found:
-                    pass
+                # Report where the closest block is and how close it is
+                closest = self._find_similar_code(content, original, matcher=matcher)
+                error_msg = "Original code not found in file"
+                if closest:
+                    error_msg += (f". Closest match at {closest.location()} "
+                                  f"({closest.confidence:.0%} similar):\n{closest.code[:200]}")
                     
-                    # ENHANCED: Create failure analysis
-                    failure = ModificationFailure(
-                        filepath=filepath,
-                        original_content=content,
-                        modified_content=None,
-                        intended_original=original,
-                        intended_replacement=new_code,
-                        error_message="Original code not found in file"
-                    )
-                    
-                    analysis = self.failure_analyzer.analyze_modification_failure(failure)
-                    
-                    # Save detailed failure report
-                    report_path = create_failure_report(failure, analysis, self.failures_dir)
-                    
-                    # Try to find similar code
-                    similar = self._find_similar_code(content, original)
-                    error_msg = "Original code not found in file"
-                    if similar:
-                        error_msg += f". Did you mean:\n{similar[:200]}"
-                    
-                    return {
-                        "tool": "modify_file", 
-                        "success": False,
-                        "error": error_msg,
-                        "filepath": filepath,
-                        "original_code": original,
-                        "new_code": new_code,
-                        "failure_analysis": analysis,
-                        "failure_report": str(report_path),
-                        "ai_feedback": analysis["ai_feedback"]
-                    }
+                return {
+                    "tool": "modify_file", 
+                    "success": False,
+                    "error": error_msg,
+                    "filepath": filepath,
+                    "original_code": original,
+                    "new_code": new_code,
+                    "closest_match": closest.to_dict() if closest else None,
+                    "failure_analysis": analysis,
+                    "failure_report": str(report_path),
+                    "ai_feedback": analysis["ai_feedback"]
+                }
         
         # Validate Python syntax
         if filepath.endswith('.py'):
@@ -971,14 +951,8 @@ class ToolCallHandler:
             if patch_content:
                 pass
                 # Save the patch
-                from datetime import datetime
-                change_num = patch_manager._get_next_change_number()
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = full_path.name.replace('.py', '').replace('.', '_')
-                patch_filename = f"change_{change_num:04d}_{timestamp}_{filename}.patch"
-                patch_path = patch_manager.patches_dir / patch_filename
-                patch_path.write_text(patch_content)
-                self.logger.info(f"  💾 Saved patch: {patch_filename}")
+                patch_path = patch_manager.save_patch(patch_content, full_path)
+                self.logger.info(f"  💾 Saved patch: {patch_path.name}")
         except Exception as e:
             pass
         
@@ -1118,7 +1092,8 @@ class ToolCallHandler:
                 "failure_analysis": analysis,
                 "failure_report": str(report_path),
                 "ai_feedback": analysis["ai_feedback"],
-                "rollback_available": bool(patch_content and 'patch_path' in locals())
+                "rollback_available": bool(patch_content and 'patch_path' in locals()),
+                "match": match.to_dict() if match else None
             }
         
         self.files_modified.append(filepath)
@@ -1136,30 +1111,17 @@ class ToolCallHandler:
                 "needs_debugging": True
             }
         
-        return {"tool": "modify_file", "success": True, "filepath": filepath, "verified": True}
+        result = {"tool": "modify_file", "success": True, "filepath": filepath, "verified": True}
+        if match:
+            result["match"] = match.to_dict()
+        return result
     
-    def _find_similar_code(self, content: str, target: str, threshold: float = 0.6) -> str:
-        """Try to find similar code in content"""
-        import difflib
-        
-        target_lines = target.strip().split('\n')
-        content_lines = content.split('\n')
-        
-        # Sliding window search
-        best_match = ""
-        best_ratio = 0
-        
-        window_size = len(target_lines)
-        for i in range(len(content_lines) - window_size + 1):
-            window = '\n'.join(content_lines[i:i + window_size])
-            ratio = difflib.SequenceMatcher(None, target, window).ratio()
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_match = window
-        
-        if best_ratio >= threshold:
-            return best_match
-        return ""
+    def _find_similar_code(self, content: str, target: str, threshold: float = 0.6,
+                           matcher: CodeMatcher = None):
+        """Closest block to target in content (CodeMatch), or None"""
+        matcher = matcher or CodeMatcher(content)
+        matches = matcher.find_similar(target, threshold=threshold, limit=1)
+        return matches[0] if matches else None
     
     def _handle_report_issue(self, args: Dict) -> Dict:
         """Handle report_issue tool"""
@@ -2437,6 +2399,19 @@ class ToolCallHandler:
     # Analysis Tools Handlers (scripts/analysis/)
     # =============================================================================
     
+    def _precomputed_analysis(self, name: str, args: Dict, **options) -> Any:
+        """
+        Result of an analyzer from the shared ``analysis_run``, if it covers this call.
+        
+        Only project-wide calls made with the same analyzer options qualify.
+        """
+        run = self.analysis_run
+        if run is None or args.get('target') or not run.ran(name):
+            return None
+        if any(run.options.get(name, {}).get(key) != value for key, value in options.items()):
+            return None
+        return run.get(name)
+    
     def _handle_analyze_complexity(self, args: Dict) -> Dict:
         """Handle analyze_complexity tool."""
         try:
@@ -2445,7 +2420,7 @@ class ToolCallHandler:
             analyzer = ComplexityAnalyzer(str(self.project_dir), self.logger)
             target = args.get('target')
             
-            result = analyzer.analyze(target)
+            result = self._precomputed_analysis('complexity', args) or analyzer.analyze(target)
             
             # Generate report
             report = analyzer.generate_report(result)
@@ -2482,7 +2457,7 @@ class ToolCallHandler:
             detector = DeadCodeDetector(str(self.project_dir), self.logger)
             target = args.get('target')
             
-            result = detector.analyze(target)
+            result = self._precomputed_analysis('dead_code', args) or detector.analyze(target)
             
             # Generate report
             report = detector.generate_report(result)
@@ -2519,7 +2494,7 @@ class ToolCallHandler:
             finder = IntegrationGapFinder(str(self.project_dir), self.logger)
             target = args.get('target')
             
-            result = finder.analyze(target)
+            result = self._precomputed_analysis('integration_gaps', args) or finder.analyze(target)
             
             # Generate report
             report = finder.generate_report(result)
@@ -2594,7 +2569,7 @@ class ToolCallHandler:
             generator = CallGraphGenerator(str(self.project_dir), self.logger)
             target = args.get('target')
             
-            result = generator.analyze(target)
+            result = self._precomputed_analysis('call_graph', args) or generator.analyze(target)
             
             # Generate report
             report = generator.generate_report(result)
@@ -3475,12 +3450,19 @@ class ToolCallHandler:
             include_tests = args.get('include_tests', False)
             
             
-            detector = DuplicateDetector(self.project_dir, self.logger)
-            duplicate_sets = detector.find_duplicates(
-                similarity_threshold=similarity_threshold,
-                scope=scope,
-                include_tests=include_tests
-            )
+            duplicate_sets = None
+            if scope == 'project' and not include_tests:
+                duplicate_sets = self._precomputed_analysis(
+                    'duplicates', args, similarity_threshold=similarity_threshold
+                )
+            
+            if duplicate_sets is None:
+                detector = DuplicateDetector(self.project_dir, self.logger)
+                duplicate_sets = detector.find_duplicates(
+                    similarity_threshold=similarity_threshold,
+                    scope=scope,
+                    include_tests=include_tests
+                )
             
             # Convert to dict
             result = {
@@ -4623,9 +4605,8 @@ class ToolCallHandler:
                 self.logger.info(f"   🔄 Updating imports in {len(impact.affected_files)} files...")
                 
                 updater = ImportUpdater(str(self.project_dir), self.logger)
-                update_results = updater.update_imports_for_move(
-                    source_path,
-                    destination_path,
+                update_results = updater.update_imports_for_moves(
+                    [(source_path, destination_path)],
                     dry_run=False
                 )
                 
@@ -4700,14 +4681,13 @@ class ToolCallHandler:
             self.logger.info(f"   Reason: {reason}")
             
             results = []
-            total_updated = 0
             
-            # Process each move
+            # Process each move; imports are updated for all of them at once below
             for old_path, new_path in restructuring_plan.items():
                 result = self._handle_move_file({
                     'source_path': old_path,
                     'destination_path': new_path,
-                    'update_imports': update_imports,
+                    'update_imports': False,
                     'create_directories': True,
                     'reason': f"Part of restructuring: {reason}"
                 })
@@ -4715,21 +4695,30 @@ class ToolCallHandler:
                 results.append({
                     'old_path': old_path,
                     'new_path': new_path,
-                    'success': result['success'],
-                    'files_updated': result.get('files_updated', [])
+                    'success': result['success']
                 })
                 
-                if result['success']:
-                    total_updated += len(result.get('files_updated', []))
-            
             success_count = sum(1 for r in results if r['success'])
             
+            updated_files = []
+            moves = [(r['old_path'], r['new_path']) for r in results if r['success']]
+            if update_imports and moves:
+                from .analysis.import_updater import ImportUpdater
+                
+                updater = ImportUpdater(str(self.project_dir), self.logger)
+                update_results = updater.update_imports_for_moves(moves, dry_run=False)
+                updated_files = [result.file for result in update_results
+                                 if result.success and result.changes_made > 0]
+                self.files_modified.extend(updated_files)
+            total_updated = len(updated_files)
+            
             return {
                 "tool": "restructure_directory",
                 "success": success_count == len(restructuring_plan),
                 "files_moved": success_count,
                 "total_files": len(restructuring_plan),
                 "total_imports_updated": total_updated,
+                "files_updated": updated_files,
                 "results": results,
                 "message": f"Restructured {success_count}/{len(restructuring_plan)} files, "
                           f"updated {total_updated} import statements"
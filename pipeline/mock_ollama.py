@@ -0,0 +1,416 @@
+"""
+Mock Ollama Server
+
+A local, deterministic stand-in for the parts of the Ollama HTTP API the
+pipeline uses (``/api/tags``, ``/api/chat``, ``/api/generate`` without a
+prompt, ``/api/ps``, ``/api/version``). It lets the
+orchestration layer be exercised and benchmarked without GPU servers.
+
+Responses come from a responder:
+
+- ``ScriptedResponder``: a fixed list of assistant messages, replayed in
+  order (and cycled).
+- ``RecordedResponder``: the same, loaded from a JSON-lines recording of
+  Ollama responses.
+- ``ToolRuleResponder`` (default): answers with a plausible call to the
+  first tool it knows among the tools offered (create a task plan, create
+  the file named in the prompt, approve it, ...), so a full pipeline run
+  makes progress.
+
+Latency is simulated as a fixed per-request delay plus generation time at a
+configurable token rate. Responses carry Ollama's timing metadata
+(``prompt_eval_count``, ``eval_count``, ``*_duration`` in nanoseconds).
+
+Model residency is simulated too: a request for a model that is not loaded
+pays ``load_seconds`` (reported as ``load_duration``); loaded models expire
+after their ``keep_alive`` and, with a ``memory_gb`` budget, the least
+recently used ones are evicted to make room. A generate request without a
+prompt only loads the model, as in Ollama.
+
+Example:
+    with MockOllamaServer(latency=0.05, tokens_per_second=200) as server:
+        server.configure(config)          # point every phase at the mock
+        PhaseCoordinator(config).run()
+"""
+
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .config import PipelineConfig, ServerConfig
+from .logging_setup import get_logger
+from .model_residency import estimate_model_memory_gb, parse_keep_alive
+
+
+# Rough characters per token, used for the simulated token counts
+CHARS_PER_TOKEN = 4
+
+_PY_PATH_PATTERN = re.compile(r'[\w./-]+\.py\b')
+
+
+def _tool_call(name: str, arguments: Dict) -> Dict:
+    return {"function": {"name": name, "arguments": arguments}}
+
+
+def estimate_tokens(payload) -> int:
+    """Approximate token count of a message or list of messages."""
+    text = payload if isinstance(payload, str) else json.dumps(payload, default=str)
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class ScriptedResponder:
+    """
+    Replays a fixed list of assistant messages.
+    
+    Each entry is either a message dict (``{"content": ..., "tool_calls":
+    [...]}``) or a plain string used as content.
+    """
+    
+    def __init__(self, messages: Iterable, cycle: bool = True):
+        """
+        Initialize scripted responder.
+        
+        Args:
+            messages: Assistant messages in reply order
+            cycle: Start over after the last message (otherwise repeat it)
+        """
+        self.messages = [self._message(m) for m in messages]
+        if not self.messages:
+            raise ValueError("ScriptedResponder needs at least one message")
+        self.cycle = cycle
+        self._index = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _message(entry) -> Dict:
+        if isinstance(entry, str):
+            return {"role": "assistant", "content": entry}
+        message = dict(entry.get("message", entry))
+        message.setdefault("role", "assistant")
+        message.setdefault("content", "")
+        return message
+    
+    def __call__(self, request: Dict) -> Dict:
+        with self._lock:
+            if self._index < len(self.messages):
+                message = self.messages[self._index]
+            else:
+                message = self.messages[self._index % len(self.messages) if self.cycle else -1]
+            self._index += 1
+        return message
+
+
+class RecordedResponder(ScriptedResponder):
+    """Replays responses recorded as JSON lines (full Ollama responses or messages)."""
+    
+    @classmethod
+    def from_file(cls, path: Path, cycle: bool = True) -> "RecordedResponder":
+        """Load a recording; blank and malformed lines are skipped."""
+        messages = []
+        for line in Path(path).read_text().splitlines():
+            if not line.strip():
+                continue
+            try:
+                messages.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return cls(messages, cycle=cycle)
+
+
+class ToolRuleResponder:
+    """
+    Answers with a call to the first known tool among those offered.
+    
+    Deterministic: generated file names come from a counter and the file a
+    prompt is about is the first ``*.py`` path in the last user message.
+    """
+    
+    # Tool preference order; the first one offered is called
+    RULES = (
+        "create_task_plan",
+        "propose_expansion_tasks",
+        "create_python_file",
+        "approve_code",
+        "confirm_documentation_current",
+    )
+    
+    def __init__(self, tasks_per_plan: int = 3, file_body: str = None):
+        """
+        Initialize rule responder.
+        
+        Args:
+            tasks_per_plan: Tasks returned by planning tool calls
+            file_body: Code written by create_python_file calls
+        """
+        self.tasks_per_plan = tasks_per_plan
+        self.file_body = file_body or 'def generated():\n    """Generated by the mock server."""\n    return None\n'
+        self._counter = 0
+        self._lock = threading.Lock()
+    
+    def _next_file(self) -> str:
+        with self._lock:
+            self._counter += 1
+            return f"src/generated_{self._counter:04d}.py"
+    
+    @staticmethod
+    def _prompt_file(request: Dict) -> Optional[str]:
+        for message in reversed(request.get("messages", [])):
+            if message.get("role") == "user":
+                match = _PY_PATH_PATTERN.search(message.get("content") or "")
+                return match.group(0).lstrip("./") if match else None
+        return None
+    
+    def __call__(self, request: Dict) -> Dict:
+        offered = {tool.get("function", {}).get("name") for tool in request.get("tools") or []}
+        
+        for name in self.RULES:
+            if name not in offered:
+                continue
+            if name in ("create_task_plan", "propose_expansion_tasks"):
+                tasks = [{"description": f"Implement {path}", "target_file": path, "priority": 10 + i}
+                         for i, path in enumerate(self._next_file() for _ in range(self.tasks_per_plan))]
+                args = {"tasks": tasks}
+            elif name == "create_python_file":
+                args = {"filepath": self._prompt_file(request) or self._next_file(), "code": self.file_body}
+            elif name == "approve_code":
+                args = {"filepath": self._prompt_file(request) or ""}
+            else:
+                args = {"reason": "Documentation is current"}
+            return {"role": "assistant", "content": "", "tool_calls": [_tool_call(name, args)]}
+        
+        return {"role": "assistant", "content": "No changes needed."}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes Ollama API requests to the owning MockOllamaServer."""
+    
+    server_version = "MockOllama/1.0"
+    protocol_version = "HTTP/1.1"  # Keep-alive, like Ollama
+    
+    def log_message(self, format, *args):
+        pass  # Keep benchmark and test output clean
+    
+    def _send(self, status: int, body: Dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def do_GET(self):
+        mock = self.server.mock
+        if self.path == "/api/tags":
+            self._send(200, {"models": [{"name": model} for model in mock.models]})
+        elif self.path == "/api/ps":
+            self._send(200, {"models": mock.loaded_models()})
+        elif self.path == "/api/version":
+            self._send(200, {"version": "mock"})
+        else:
+            self._send(404, {"error": f"unknown endpoint {self.path}"})
+    
+    def do_POST(self):
+        mock = self.server.mock
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send(400, {"error": "invalid JSON"})
+            return
+        
+        if self.path == "/api/generate" and not request.get("prompt"):
+            self._send(200, mock.handle_load(request))
+        elif self.path == "/api/chat":
+            self._send(200, mock.handle_chat(request))
+        else:
+            self._send(404, {"error": f"unknown endpoint {self.path}"})
+
+
+class MockOllamaServer:
+    """
+    Threaded HTTP server speaking enough of the Ollama API for the pipeline.
+    
+    ``requests`` keeps a summary of every chat request served (model,
+    message count, offered tools and their schema bytes, timings) for tests
+    and benchmarks.
+    """
+    
+    def __init__(self, responder: Callable[[Dict], Dict] = None, models: Iterable[str] = None,
+                 host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 tokens_per_second: Optional[float] = None,
+                 prompt_tokens_per_second: Optional[float] = None,
+                 load_seconds: float = 0.0, memory_gb: Optional[float] = None):
+        """
+        Initialize mock server (call ``start`` or use as a context manager).
+        
+        Args:
+            responder: Callable mapping a chat request to an assistant message
+            models: Model names reported by /api/tags (default: every
+                model in a default PipelineConfig)
+            host: Interface to bind
+            port: Port to bind (0 = pick a free one)
+            latency: Fixed delay per chat request, seconds
+            tokens_per_second: Simulated generation rate (None = instant)
+            prompt_tokens_per_second: Simulated prompt processing rate
+            load_seconds: Simulated time to load a model that is not resident
+            memory_gb: Memory for loaded models (None = every model fits)
+        """
+        self.responder = responder or ToolRuleResponder()
+        self.models = list(models) if models is not None else self.default_models()
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.load_seconds = load_seconds
+        self.memory_gb = memory_gb
+        self.requests: List[Dict] = []
+        self.loads: List[str] = []  # Models in load order (reloads included)
+        self._loaded: "OrderedDict[str, Optional[float]]" = OrderedDict()  # model -> expiry, LRU first
+        self.logger = get_logger()
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    @staticmethod
+    def default_models() -> List[str]:
+        """Every model the default configuration assigns or falls back to."""
+        config = PipelineConfig()
+        models = {model for model, _ in config.model_assignments.values()}
+        for fallbacks in config.model_fallbacks.values():
+            models.update(fallbacks)
+        return sorted(models)
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+    
+    def start(self) -> "MockOllamaServer":
+        """Bind and serve in a daemon thread."""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-ollama", daemon=True)
+        self._thread.start()
+        self.logger.debug(f"Mock Ollama server listening on {self.base_url}")
+        return self
+    
+    def stop(self):
+        """Shut the server down."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+    
+    def __enter__(self) -> "MockOllamaServer":
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def configure(self, config: PipelineConfig) -> PipelineConfig:
+        """
+        Point a configuration at this server: one server entry and every
+        model assignment on its host.
+        """
+        config.servers = [ServerConfig(name="mock", host=self.host, port=self.port,
+                                       capabilities=sorted(config.model_assignments),
+                                       memory_gb=self.memory_gb)]
+        config.model_assignments = {task: (model, self.host)
+                                    for task, (model, _) in config.model_assignments.items()}
+        return config
+    
+    def _load(self, model: str, keep_alive) -> float:
+        """Make ``model`` resident; the simulated load time (0 if it already was)."""
+        now = time.time()
+        with self._lock:
+            for name in [name for name, expiry in self._loaded.items() if expiry is not None and expiry <= now]:
+                del self._loaded[name]
+            loaded = model not in self._loaded
+            if loaded:
+                self.loads.append(model)
+                if self.memory_gb is not None:
+                    needed = estimate_model_memory_gb(model)
+                    while self._loaded and needed + sum(map(estimate_model_memory_gb, self._loaded)) > self.memory_gb:
+                        self._loaded.popitem(last=False)
+            ttl = parse_keep_alive(keep_alive)
+            self._loaded[model] = now + ttl if ttl is not None else None
+            self._loaded.move_to_end(model)
+        return self.load_seconds if loaded else 0.0
+    
+    def loaded_models(self) -> List[Dict]:
+        """Resident models in the shape of Ollama's /api/ps."""
+        now = time.time()
+        with self._lock:
+            return [{
+                "name": name,
+                "model": name,
+                "size": int(estimate_model_memory_gb(name) * 1e9),
+                "expires_at": (time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(expiry))
+                               if expiry is not None else "2318-01-01T00:00:00Z"),
+            } for name, expiry in self._loaded.items() if expiry is None or expiry > now]
+    
+    def handle_load(self, request: Dict) -> Dict:
+        """Load a model without generating (a generate request with no prompt)."""
+        start = time.perf_counter()
+        load_seconds = self._load(request.get("model"), request.get("keep_alive"))
+        if load_seconds:
+            time.sleep(load_seconds)
+        return {
+            "model": request.get("model"),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "response": "",
+            "done": True,
+            "done_reason": "load",
+            "total_duration": int((time.perf_counter() - start) * 1e9),
+            "load_duration": int(load_seconds * 1e9),
+        }
+    
+    def handle_chat(self, request: Dict) -> Dict:
+        """Build the Ollama response for a chat request, sleeping for the simulated latency."""
+        start = time.perf_counter()
+        load_seconds = self._load(request.get("model"), request.get("keep_alive"))
+        message = dict(self.responder(request))
+        message.setdefault("role", "assistant")
+        message.setdefault("content", "")
+        
+        prompt_tokens = estimate_tokens(request.get("messages", []))
+        eval_tokens = estimate_tokens(message)
+        prompt_seconds = prompt_tokens / self.prompt_tokens_per_second if self.prompt_tokens_per_second else 0.0
+        eval_seconds = eval_tokens / self.tokens_per_second if self.tokens_per_second else 0.0
+        
+        delay = load_seconds + self.latency + prompt_seconds + eval_seconds
+        if delay > 0:
+            time.sleep(delay)
+        total = time.perf_counter() - start
+        
+        with self._lock:
+            self.requests.append({
+                "model": request.get("model"),
+                "messages": len(request.get("messages", [])),
+                "tools": [t.get("function", t).get("name") for t in request.get("tools") or []],
+                "tool_bytes": len(json.dumps(request["tools"])) if request.get("tools") else 0,
+                "prompt_tokens": prompt_tokens,
+                "eval_tokens": eval_tokens,
+                "seconds": total,
+            })
+        
+        return {
+            "model": request.get("model"),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": message,
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": int(total * 1e9),
+            "load_duration": int(load_seconds * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_seconds * 1e9),
+            "eval_count": eval_tokens,
+            "eval_duration": int(eval_seconds * 1e9),
+        }
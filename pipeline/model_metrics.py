@@ -0,0 +1,302 @@
+"""
+Model Call Metrics
+
+Ollama reports what each chat request cost in its response metadata:
+``prompt_eval_count``/``eval_count`` (prompt and generated tokens) and
+``prompt_eval_duration``/``eval_duration``/``load_duration``/
+``total_duration`` (nanoseconds). ``OllamaClient.chat`` turns these into a
+``CallMetrics`` per call and records it in a ``ModelMetricsStore``.
+
+The store aggregates calls by phase, model, host and task. Phase, model and
+host aggregates keep rolling windows (last ``WINDOW_SIZE`` calls) for
+generation rate, call latency and load time, so p50/p95 reflect recent
+behaviour; task aggregates keep totals only, as there can be thousands of
+tasks.
+
+A large ``load_duration`` means Ollama had to (re)load the model into
+memory; such calls are counted as reloads.
+
+Example:
+    with client.metrics.attribute(phase="coding", task="task_0001"):
+        client.chat(host, model, messages)
+    client.metrics.summary("model")
+"""
+
+import contextvars
+import json
+import math
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .atomic_file import atomic_write
+
+
+# Calls kept in each rolling window
+WINDOW_SIZE = 200
+
+# A load_duration above this means the model was (re)loaded for the call
+RELOAD_THRESHOLD_SECONDS = 1.0
+
+DIMENSIONS = ("phase", "model", "host", "task")
+
+# Dimensions with rolling windows (tasks keep totals only)
+_WINDOWED = ("phase", "model", "host")
+
+UNATTRIBUTED = "unattributed"
+
+# Saved under the pipeline state directory
+MODEL_METRICS_FILE = "model_metrics.json"
+
+_NS = 1e9
+
+
+@dataclass
+class CallMetrics:
+    """Token counts and timings of one model call."""
+    
+    model: str
+    host: str
+    prompt_tokens: int = 0
+    eval_tokens: int = 0
+    prompt_eval_seconds: float = 0.0
+    eval_seconds: float = 0.0
+    load_seconds: float = 0.0
+    total_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    error: bool = False
+    
+    @classmethod
+    def from_response(cls, response: Dict, model: str, host: str,
+                      wall_seconds: float = 0.0) -> "CallMetrics":
+        """Read Ollama's metadata fields (missing fields count as zero)."""
+        def ns(field_name):
+            return (response.get(field_name) or 0) / _NS
+        
+        return cls(
+            model=model,
+            host=host,
+            prompt_tokens=int(response.get("prompt_eval_count") or 0),
+            eval_tokens=int(response.get("eval_count") or 0),
+            prompt_eval_seconds=ns("prompt_eval_duration"),
+            eval_seconds=ns("eval_duration"),
+            load_seconds=ns("load_duration"),
+            total_seconds=ns("total_duration") or wall_seconds,
+            wall_seconds=wall_seconds,
+            error="error" in response,
+        )
+    
+    @property
+    def tokens(self) -> int:
+        return self.prompt_tokens + self.eval_tokens
+    
+    @property
+    def eval_rate(self) -> Optional[float]:
+        """Generated tokens per second (None without timing data)."""
+        if self.eval_seconds <= 0:
+            return None
+        return self.eval_tokens / self.eval_seconds
+    
+    @property
+    def prompt_rate(self) -> Optional[float]:
+        """Prompt tokens processed per second (None without timing data)."""
+        if self.prompt_eval_seconds <= 0:
+            return None
+        return self.prompt_tokens / self.prompt_eval_seconds
+    
+    @property
+    def reloaded(self) -> bool:
+        return self.load_seconds >= RELOAD_THRESHOLD_SECONDS
+
+
+def percentile(values, q: float) -> Optional[float]:
+    """Nearest-rank percentile of ``values`` (q in 0-100), None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+# Cumulative counters of an aggregate, in serialization order
+_COUNTERS = ("calls", "errors", "reloads", "prompt_tokens", "eval_tokens",
+             "prompt_eval_seconds", "eval_seconds", "load_seconds", "total_seconds")
+
+
+class MetricAggregate:
+    """Totals, and optionally rolling windows, over a group of calls."""
+    
+    def __init__(self, windowed: bool = True):
+        for name in _COUNTERS:
+            setattr(self, name, 0)
+        self.windows: Optional[Dict[str, deque]] = None
+        if windowed:
+            self.windows = {name: deque(maxlen=WINDOW_SIZE)
+                            for name in ("eval_rate", "total_seconds", "load_seconds")}
+    
+    def add(self, call: CallMetrics):
+        self.calls += 1
+        self.errors += int(call.error)
+        self.reloads += int(call.reloaded)
+        self.prompt_tokens += call.prompt_tokens
+        self.eval_tokens += call.eval_tokens
+        self.prompt_eval_seconds += call.prompt_eval_seconds
+        self.eval_seconds += call.eval_seconds
+        self.load_seconds += call.load_seconds
+        self.total_seconds += call.total_seconds
+        
+        if self.windows is not None and not call.error:
+            if call.eval_rate is not None:
+                self.windows["eval_rate"].append(call.eval_rate)
+            self.windows["total_seconds"].append(call.total_seconds)
+            self.windows["load_seconds"].append(call.load_seconds)
+    
+    def counters(self) -> Dict:
+        return {name: getattr(self, name) for name in _COUNTERS}
+    
+    def to_dict(self) -> Dict:
+        """Totals plus derived rates and rolling percentiles."""
+        data = self.counters()
+        data["tokens"] = self.prompt_tokens + self.eval_tokens
+        data["eval_tokens_per_second"] = (round(self.eval_tokens / self.eval_seconds, 2)
+                                          if self.eval_seconds > 0 else None)
+        data["prompt_tokens_per_second"] = (round(self.prompt_tokens / self.prompt_eval_seconds, 2)
+                                            if self.prompt_eval_seconds > 0 else None)
+        if self.windows is not None:
+            for name, window in self.windows.items():
+                for q in (50, 95):
+                    value = percentile(window, q)
+                    data[f"p{q}_{name}"] = round(value, 4) if value is not None else None
+        return data
+    
+    def dump(self) -> Dict:
+        data = self.counters()
+        if self.windows is not None:
+            data["windows"] = {name: list(window) for name, window in self.windows.items()}
+        return data
+    
+    @classmethod
+    def restore(cls, data: Dict, windowed: bool) -> "MetricAggregate":
+        aggregate = cls(windowed=windowed)
+        for name in _COUNTERS:
+            setattr(aggregate, name, data.get(name, 0))
+        if aggregate.windows is not None:
+            for name, values in (data.get("windows") or {}).items():
+                if name in aggregate.windows:
+                    aggregate.windows[name].extend(values)
+        return aggregate
+
+
+class ModelMetricsStore:
+    """
+    Thread-safe aggregation of model call metrics.
+    
+    Calls are attributed to the phase and task of the innermost
+    ``attribute()`` scope in the calling context (per thread, and per
+    asyncio task for the async client).
+    """
+    
+    def __init__(self):
+        self.groups: Dict[str, Dict[str, MetricAggregate]] = {dimension: {} for dimension in DIMENSIONS}
+        self.last_call: Optional[CallMetrics] = None
+        self._lock = threading.Lock()
+        self._attribution = contextvars.ContextVar(f"model_metrics_{id(self)}", default=(None, None))
+    
+    @contextmanager
+    def attribute(self, phase: str = None, task: str = None):
+        """Attribute calls made in this context inside the block to a phase/task."""
+        parent_phase, parent_task = self._attribution.get()
+        token = self._attribution.set((phase or parent_phase, task or parent_task))
+        try:
+            yield
+        finally:
+            self._attribution.reset(token)
+    
+    def current_attribution(self):
+        """(phase, task) of the innermost ``attribute()`` scope."""
+        return self._attribution.get()
+    
+    def replace_with(self, other: "ModelMetricsStore"):
+        """Take over another store's aggregates (e.g. loaded on resume), keeping this instance shared."""
+        with self._lock:
+            self.groups = other.groups
+    
+    def record(self, call: CallMetrics):
+        """Add a call to its phase, model, host and task aggregates."""
+        phase, task = self.current_attribution()
+        keys = {
+            "phase": phase or UNATTRIBUTED,
+            "model": call.model,
+            "host": call.host,
+            "task": task,
+        }
+        with self._lock:
+            self.last_call = call
+            for dimension, key in keys.items():
+                if key is None:
+                    continue
+                aggregate = self.groups[dimension].get(key)
+                if aggregate is None:
+                    aggregate = self.groups[dimension][key] = MetricAggregate(windowed=dimension in _WINDOWED)
+                aggregate.add(call)
+    
+    def snapshot(self, dimension: str, key: str) -> Dict:
+        """Cumulative counters of one group (zeros if it has no calls yet)."""
+        with self._lock:
+            aggregate = self.groups[dimension].get(key)
+            return aggregate.counters() if aggregate else {name: 0 for name in _COUNTERS}
+    
+    def usage_since(self, dimension: str, key: str, snapshot: Dict) -> Dict:
+        """Counters accumulated by a group since ``snapshot``."""
+        current = self.snapshot(dimension, key)
+        return {name: current[name] - snapshot.get(name, 0) for name in _COUNTERS}
+    
+    def summary(self, dimension: str) -> Dict[str, Dict]:
+        """Aggregates of one dimension, keyed by phase/model/host/task."""
+        with self._lock:
+            return {key: aggregate.to_dict() for key, aggregate in self.groups[dimension].items()}
+    
+    def format_report(self, dimensions=("phase", "model", "host")) -> List[str]:
+        """Report lines (tokens, generation rate, latency percentiles, reloads)."""
+        lines = []
+        for dimension in dimensions:
+            summary = self.summary(dimension)
+            if not summary:
+                continue
+            lines.append(f"  By {dimension}:")
+            lines.append(f"    {'':<24} {'calls':>6} {'prompt tok':>11} {'gen tok':>9} "
+                         f"{'gen tok/s':>9} {'p50 s':>7} {'p95 s':>7} {'reloads':>7}")
+            ranked = sorted(summary.items(), key=lambda item: item[1]["tokens"], reverse=True)
+            for key, data in ranked:
+                rate = data["eval_tokens_per_second"]
+                p50, p95 = data.get("p50_total_seconds"), data.get("p95_total_seconds")
+                lines.append(f"    {key[:24]:<24} {data['calls']:>6} {data['prompt_tokens']:>11} "
+                             f"{data['eval_tokens']:>9} {rate if rate is not None else '-':>9} "
+                             f"{p50 if p50 is not None else '-':>7} {p95 if p95 is not None else '-':>7} "
+                             f"{data['reloads']:>7}")
+        return lines
+    
+    def save(self, path: Path):
+        """Write all aggregates, including rolling windows, as JSON."""
+        with self._lock:
+            data = {dimension: {key: aggregate.dump() for key, aggregate in groups.items()}
+                    for dimension, groups in self.groups.items()}
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, json.dumps(data))
+    
+    @classmethod
+    def load(cls, path: Path) -> "ModelMetricsStore":
+        """Read a store written by ``save`` (empty if missing or unreadable)."""
+        store = cls()
+        try:
+            data = json.loads(Path(path).read_text())
+        except (OSError, json.JSONDecodeError):
+            return store
+        for dimension in DIMENSIONS:
+            for key, values in (data.get(dimension) or {}).items():
+                store.groups[dimension][key] = MetricAggregate.restore(values, windowed=dimension in _WINDOWED)
+        return store
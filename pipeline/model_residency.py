@@ -0,0 +1,345 @@
+"""
+Model Residency Planner
+
+Ollama keeps a bounded set of models in (GPU) memory and evicts the least
+recently used one when another model needs room; a call to an evicted
+model pays its full ``load_duration`` again. Phases switch models often
+(``qwen2.5-coder:32b`` for coding, ``qwen2.5:14b`` for prompt design,
+functiongemma for routing), mostly on one server, so the pipeline keeps
+paying for reloads.
+
+The planner tracks which models are resident on each server (from
+``/api/ps`` and from the calls it sees) and, before each phase runs:
+
+- predicts the next phases from the transitions seen in ``phase_history``
+  and the coordinator's phase graph (polytope edges),
+- pins the current and predicted models with a long ``keep_alive`` so
+  Ollama does not expire them between phases,
+- warms (pre-loads with a prompt-less generate request, in the background)
+  the predicted models that fit in the server's memory budget
+  (``ServerConfig.memory_gb``) next to the current phase's model.
+
+``OllamaClient.get_model_for_task`` also asks the planner for a host where
+the wanted model is already resident before falling back to the configured
+preferred host.
+
+Example:
+    client.residency.prepare("coding", state.phase_history, coordinator.polytope['edges'])
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import requests
+
+from .logging_setup import get_logger
+
+
+# Ollama's keep_alive for pinned (hot) models; the server default is 5m
+DEFAULT_PINNED_KEEP_ALIVE = "30m"
+
+# Seconds between /api/ps refreshes of one server
+REFRESH_SECONDS = 30.0
+
+# Predicted phases less likely than this are not warmed
+MIN_PREDICTION_PROBABILITY = 0.2
+
+# Approximate memory of a quantized (q4_K_M) model: weights plus KV cache
+GB_PER_BILLION_PARAMS = 0.6
+MODEL_OVERHEAD_GB = 1.0
+DEFAULT_MODEL_GB = 4.0
+
+# Models whose names carry no parameter count, in billions of parameters
+_KNOWN_PARAMS = {
+    "functiongemma": 0.27,
+    "phi3:mini": 3.8,
+    "phi3:medium": 14.0,
+}
+
+_PARAMS_PATTERN = re.compile(r'(?:(\d+)x)?(\d+(?:\.\d+)?)([bm])\b', re.IGNORECASE)
+
+
+def estimate_model_memory_gb(model: str) -> float:
+    """Memory a model needs when loaded, from the parameter count in its tag."""
+    name = model.lower()
+    params = _KNOWN_PARAMS.get(name, _KNOWN_PARAMS.get(name.split(":")[0]))
+    if params is None:
+        match = _PARAMS_PATTERN.search(name.split(":", 1)[-1]) or _PARAMS_PATTERN.search(name)
+        if not match:
+            return DEFAULT_MODEL_GB
+        experts, size, unit = match.groups()
+        params = float(size) / (1000 if unit.lower() == "m" else 1) * int(experts or 1)
+    return round(params * GB_PER_BILLION_PARAMS + MODEL_OVERHEAD_GB, 2)
+
+
+def same_model(name: str, requested: str) -> bool:
+    """Whether a loaded model name is the requested model (``x`` is ``x:latest``)."""
+    if ":" not in requested:
+        requested += ":latest"
+    if ":" not in name:
+        name += ":latest"
+    return name == requested
+
+
+def parse_keep_alive(value) -> Optional[float]:
+    """Seconds for an Ollama keep_alive value (None = forever, default 5m)."""
+    if value is None:
+        return 300.0
+    if isinstance(value, (int, float)):
+        return None if value < 0 else float(value)
+    match = re.fullmatch(r'(-?\d+(?:\.\d+)?)\s*(ms|s|m|h)?', str(value).strip())
+    if not match:
+        return 300.0
+    amount = float(match.group(1))
+    if amount < 0:
+        return None
+    return amount * {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}[match.group(2)]
+
+
+@dataclass
+class ResidentModel:
+    """A model loaded on a server."""
+    
+    model: str
+    size_gb: float
+    last_used: float
+    expires_at: Optional[float] = None  # time.time(); None = no expiry known
+
+
+class ResidencyPlanner:
+    """
+    Keeps the models of the current and likely next phases loaded.
+    
+    Shared through ``OllamaClient.residency``; inactive unless
+    ``config.model_residency`` is set.
+    """
+    
+    def __init__(self, client):
+        """
+        Initialize planner.
+        
+        Args:
+            client: OllamaClient whose servers and model assignments are planned
+        """
+        self.client = client
+        self.config = client.config
+        self.logger = get_logger()
+        self.enabled = getattr(self.config, 'model_residency', False)
+        self.pinned_keep_alive = getattr(self.config, 'pinned_keep_alive', DEFAULT_PINNED_KEEP_ALIVE)
+        self.resident: Dict[str, Dict[str, ResidentModel]] = {}
+        self.hot: Set[str] = set()
+        self.stats: Counter = Counter()
+        self._warming: Set[Tuple[str, str]] = set()
+        self._refreshed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def memory_budget(self, host: str) -> Optional[float]:
+        """Configured model memory of a server in GB (None = unknown)."""
+        for server in self.config.servers:
+            if server.host == host:
+                return getattr(server, 'memory_gb', None)
+        return None
+    
+    def refresh(self, host: str, force: bool = False):
+        """Read a server's loaded models from /api/ps (at most every REFRESH_SECONDS)."""
+        now = time.monotonic()
+        if not force and now - self._refreshed.get(host, float("-inf")) < REFRESH_SECONDS:
+            return
+        self._refreshed[host] = now
+        server = self.client.servers.get(host)
+        if server is None:
+            return
+        try:
+            response = requests.get(f"{server.base_url}/api/ps", timeout=5)
+            if response.status_code != 200:
+                return
+            loaded = response.json().get("models", [])
+        except (requests.RequestException, ValueError) as e:
+            self.logger.debug(f"  Could not read loaded models of {host}: {e}")
+            return
+        
+        models = {}
+        for entry in loaded:
+            name = entry.get("name") or entry.get("model")
+            if not name:
+                continue
+            size = entry.get("size_vram") or entry.get("size")
+            previous = self.resident.get(host, {}).get(name)
+            models[name] = ResidentModel(
+                model=name,
+                size_gb=size / 1e9 if size else estimate_model_memory_gb(name),
+                last_used=previous.last_used if previous else now,
+                expires_at=self._parse_expiry(entry.get("expires_at")),
+            )
+        with self._lock:
+            self.resident[host] = models
+    
+    @staticmethod
+    def _parse_expiry(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    
+    def resident_models(self, host: str) -> Dict[str, ResidentModel]:
+        """Models believed to be loaded on a server (expired ones dropped)."""
+        now = time.time()
+        with self._lock:
+            models = self.resident.get(host, {})
+            for name in [name for name, entry in models.items()
+                         if entry.expires_at is not None and entry.expires_at <= now]:
+                del models[name]
+            return dict(models)
+    
+    def is_resident(self, host: str, model: str) -> bool:
+        return any(same_model(name, model) for name in self.resident_models(host))
+    
+    def observe_call(self, host: str, model: str, load_seconds: float = 0.0, keep_alive=None):
+        """Note that a call ran ``model`` on ``host`` (so it is now resident)."""
+        now = time.monotonic()
+        ttl = parse_keep_alive(keep_alive)
+        with self._lock:
+            models = self.resident.setdefault(host, {})
+            entry = models.get(model)
+            if entry is None:
+                entry = models[model] = ResidentModel(model, estimate_model_memory_gb(model), now)
+            entry.last_used = now
+            entry.expires_at = time.time() + ttl if ttl is not None else None
+            
+            # Ollama evicts the least recently used models to make room
+            budget = self.memory_budget(host)
+            if budget is not None:
+                others = sorted((e for e in models.values() if e.model != model), key=lambda e: e.last_used)
+                while others and sum(e.size_gb for e in models.values()) > budget:
+                    del models[others.pop(0).model]
+        if load_seconds:
+            self.stats["loads"] += 1
+            self.stats["load_seconds"] += load_seconds
+    
+    def keep_alive_for(self, model: str) -> Optional[str]:
+        """keep_alive to send with a request (None = server default)."""
+        if self.enabled and model in self.hot:
+            return self.pinned_keep_alive
+        return None
+    
+    def prefer_resident_host(self, model: str, preferred_host: str) -> Optional[Tuple[str, str]]:
+        """
+        (host, model name) of a server that has ``model`` loaded, when the
+        preferred host does not; None to keep the normal selection.
+        """
+        if not self.enabled or self.is_resident(preferred_host, model):
+            return None
+        for host, models in self.client.available_models.items():
+            if host == preferred_host:
+                continue
+            for name in self.resident_models(host):
+                if name in models and same_model(name, model):
+                    return host, name
+        return None
+    
+    def predict_next_phases(self, phase: str, history: List[str], edges: Dict[str, List[str]] = None,
+                            limit: int = 2) -> List[Tuple[str, float]]:
+        """
+        Likely successors of ``phase``: transitions observed in the history,
+        with one pseudo-count per edge of the coordinator's phase graph.
+        
+        Returns:
+            Up to ``limit`` (phase, probability) pairs, most likely first
+        """
+        counts = Counter({successor: 1 for successor in (edges or {}).get(phase, [])})
+        for previous, following in zip(history, history[1:]):
+            if previous == phase:
+                counts[following] += 1
+        total = sum(counts.values())
+        if not total:
+            return []
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        return [(name, count / total) for name, count in ranked[:limit]
+                if count / total >= MIN_PREDICTION_PROBABILITY]
+    
+    def _fits(self, host: str, model: str, keep: Iterable[str]) -> bool:
+        """Whether ``model`` can be loaded on ``host`` without evicting the models in ``keep``."""
+        budget = self.memory_budget(host)
+        if budget is None:
+            return True
+        resident = self.resident_models(host)
+        needed = estimate_model_memory_gb(model)
+        for name in set(keep):
+            entry = resident.get(name)
+            needed += entry.size_gb if entry else estimate_model_memory_gb(name)
+        return needed <= budget
+    
+    def prepare(self, phase: str, history: List[str], edges: Dict[str, List[str]] = None) -> List[Tuple[str, str]]:
+        """
+        Pin the models of ``phase`` and its likely successors and warm the
+        successors' models where they fit.
+        
+        Returns:
+            (host, model) pairs being warmed
+        """
+        if not self.enabled:
+            return []
+        current = self.client.get_model_for_task(phase)
+        predicted = self.predict_next_phases(phase, history, edges)
+        for host in self.client.available_models:
+            self.refresh(host)
+        
+        selections = [(name, self.client.get_model_for_task(name)) for name, _ in predicted]
+        self.hot = {model for _, model in filter(None, [current] + [s for _, s in selections])}
+        
+        warming = []
+        for next_phase, selection in selections:
+            if not selection:
+                continue
+            host, model = selection
+            if (host, model) == current or self.is_resident(host, model):
+                self.stats["already_resident"] += 1
+                continue
+            keep = [current[1]] if current and current[0] == host else []
+            if not self._fits(host, model, keep):
+                self.stats["skipped_budget"] += 1
+                self.logger.debug(f"  Not warming {model} on {host}: would evict {keep}")
+                continue
+            if self.warm(host, model):
+                warming.append((host, model))
+                self.logger.info(f"  🔥 Warming {model} on {host} for {next_phase}")
+        return warming
+    
+    def warm(self, host: str, model: str) -> bool:
+        """Pre-load a model in the background (False if already being warmed)."""
+        with self._lock:
+            if (host, model) in self._warming:
+                return False
+            self._warming.add((host, model))
+        self.stats["warmups"] += 1
+        async_client = self.client.async_client
+        future = async_client.submit(async_client.load(host, model, keep_alive=self.pinned_keep_alive))
+        
+        def done(future):
+            with self._lock:
+                self._warming.discard((host, model))
+            if future.cancelled() or future.exception() is not None:
+                return
+            result = future.result()
+            if "error" in result:
+                self.stats["warmup_errors"] += 1
+                return
+            self.observe_call(host, model, (result.get("load_duration") or 0) / 1e9, self.pinned_keep_alive)
+        
+        future.add_done_callback(done)
+        return True
+    
+    def format_report(self) -> List[str]:
+        """Report lines: warm-ups, budget skips and model loads seen."""
+        if not self.stats:
+            return []
+        return [f"    warm-ups: {self.stats['warmups']}, already resident: {self.stats['already_resident']}, "
+                f"skipped (memory): {self.stats['skipped_budget']}, loads: {self.stats['loads']} "
+                f"({self.stats['load_seconds']:.1f}s)"]
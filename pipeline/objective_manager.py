@@ -5,6 +5,7 @@ Manages the lifecycle of objectives and provides strategic decision-making
 capabilities for the pipeline coordinator.
 """
 
+import copy
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
@@ -114,12 +115,10 @@ class Objective:
             self.completion_percentage = 0.0
             return
         
-        completed = [
-            tid for tid in self.tasks
-            if tid in state.tasks and state.tasks[tid].status == TaskStatus.COMPLETED
-        ]
-        self.completed_tasks = completed
-        self.completion_percentage = (len(completed) / len(self.tasks)) * 100
+        # Counters are maintained by the state as task statuses change
+        progress = state.progress_index.objective_progress(self.id, self.tasks)
+        self.completed_tasks = progress.completed_list()
+        self.completion_percentage = (progress.completed_count / len(self.tasks)) * 100
         
         # Update status based on progress
         # CRITICAL: Don't reset ACTIVE status - it means we're actively working on it
@@ -142,18 +141,11 @@ class Objective:
         if not self.tasks:
             return 1.0
         
-        total = 0
-        successful = 0
-        
-        for tid in self.tasks:
-            if tid not in state.tasks:
-                continue
-            task = state.tasks[tid]
-            if task.attempts > 0:
-                total += task.attempts
-                # Count successful attempts (completed without errors)
-                if task.status == TaskStatus.COMPLETED and not task.errors:
-                    successful += 1
+        # Attempts and successful (completed without errors) tasks are
+        # maintained by the state as tasks change
+        progress = state.progress_index.objective_progress(self.id, self.tasks)
+        total = progress.attempts
+        successful = progress.successful
         
         if total == 0:
             return 1.0
@@ -230,6 +222,9 @@ class ObjectiveManager:
             ObjectiveLevel.TERTIARY: self.project_dir / "TERTIARY_OBJECTIVES.md"
         }
     
+        # Parsed objective files keyed by path: ((mtime_ns, size), {id: objective dict})
+        self._parsed_files: Dict[Path, Tuple[Tuple[int, int], Dict[str, Dict]]] = {}
+    
     def load_objectives(self, state: PipelineState) -> Dict[str, Dict[str, Objective]]:
         """
         Load objectives from markdown files and merge with state data.
@@ -254,7 +249,7 @@ class ObjectiveManager:
                 self.logger.debug(f"No {level.value} objectives file found")
                 continue
             
-            level_objectives = self._parse_objective_file(filepath, level)
+            level_objectives = self._load_objective_file(filepath, level)
             
             # Merge task lists from state
             for obj_id, obj in level_objectives.items():
@@ -283,6 +278,23 @@ class ObjectiveManager:
         
         return objectives
     
+    def _load_objective_file(self, filepath: Path, level: ObjectiveLevel) -> Dict[str, Objective]:
+        """
+        Get fresh objectives for a markdown file, re-parsing only when the
+        file's mtime or size changed since the last load.
+        """
+        stat = filepath.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        
+        cached = self._parsed_files.get(filepath)
+        if cached is None or cached[0] != signature:
+            parsed = self._parse_objective_file(filepath, level)
+            cached = (signature, {obj_id: obj.to_dict() for obj_id, obj in parsed.items()})
+            self._parsed_files[filepath] = cached
+        
+        # Callers mutate the returned objectives, so hand out new instances
+        return {obj_id: Objective.from_dict(copy.deepcopy(data)) for obj_id, data in cached[1].items()}
+    
     def _parse_objective_file(self, filepath: Path, level: ObjectiveLevel) -> Dict[str, Objective]:
         """Parse objective markdown file"""
         content = filepath.read_text()
@@ -540,66 +552,62 @@ class ObjectiveManager:
                 priority=3
             )
         
-        # Get tasks needing work
-        pending_tasks = [
-            state.tasks[tid] for tid in objective.tasks
-            if tid in state.tasks and state.tasks[tid].status in [
-                TaskStatus.NEW, TaskStatus.IN_PROGRESS
-            ]
-        ]
+        # Status counters for this objective's tasks are maintained by the
+        # state, so only the winning status has to be scanned for its task
+        progress = state.progress_index.objective_progress(objective.id, objective.tasks)
+        pending_count = progress.count(TaskStatus.NEW, TaskStatus.IN_PROGRESS)
         
         # DEBUG: Log what we're checking
         self.logger.info(f"     Objective.tasks list: {len(objective.tasks)} task IDs")
         self.logger.info(f"     State.tasks dict: {len(state.tasks)} total tasks")
-        self.logger.info(f"     Found {len(pending_tasks)} pending tasks (NEW or IN_PROGRESS)")
+        self.logger.info(f"     Found {pending_count} pending tasks (NEW or IN_PROGRESS)")
         
         # DEBUG: Check if task IDs in objective actually exist in state
         if objective.tasks:
-            existing_count = sum(1 for tid in objective.tasks if tid in state.tasks)
+            existing_count = sum(progress.status_counts.values())
             self.logger.info(f"     Tasks that exist in state: {existing_count}/{len(objective.tasks)}")
-            if existing_count < len(objective.tasks):
-                missing = [tid for tid in objective.tasks if tid not in state.tasks]
             
             # Show status breakdown
-            status_counts = {}
-            for tid in objective.tasks:
-                if tid in state.tasks:
-                    status = state.tasks[tid].status
-                    status_counts[status] = status_counts.get(status, 0) + 1
+            status_counts = {status: count for status, count in progress.status_counts.items() if count}
             self.logger.info(f"     Task status breakdown: {status_counts}")
         
-        qa_pending_tasks = [
-            state.tasks[tid] for tid in objective.tasks
-            if tid in state.tasks and state.tasks[tid].status == TaskStatus.QA_PENDING
-        ]
-        
-        needs_fixes_tasks = [
-            state.tasks[tid] for tid in objective.tasks
-            if tid in state.tasks and state.tasks[tid].status == TaskStatus.NEEDS_FIXES
-        ]
+        def first_task(count: int, *statuses: TaskStatus) -> Optional[TaskState]:
+            # The counters only gate the scan; if they disagree with the tasks
+            # the scan finds nothing and the next rule applies
+            if not count:
+                return None
+            return next((
+                state.tasks[tid] for tid in objective.tasks
+                if tid in state.tasks and state.tasks[tid].status in statuses
+            ), None)
         
         # Priority: fixes > QA > coding
-        if needs_fixes_tasks:
+        needs_fixes_count = progress.count(TaskStatus.NEEDS_FIXES)
+        task = first_task(needs_fixes_count, TaskStatus.NEEDS_FIXES)
+        if task:
             return PhaseAction(
                 phase="debugging",
-                task=needs_fixes_tasks[0],
-                reason=f"{len(needs_fixes_tasks)} tasks need fixes",
+                task=task,
+                reason=f"{needs_fixes_count} tasks need fixes",
                 priority=4
             )
         
-        if qa_pending_tasks:
+        qa_pending_count = progress.count(TaskStatus.QA_PENDING)
+        task = first_task(qa_pending_count, TaskStatus.QA_PENDING)
+        if task:
             return PhaseAction(
                 phase="qa",
-                task=qa_pending_tasks[0],
-                reason=f"{len(qa_pending_tasks)} tasks awaiting QA",
+                task=task,
+                reason=f"{qa_pending_count} tasks awaiting QA",
                 priority=5
             )
         
-        if pending_tasks:
+        task = first_task(pending_count, TaskStatus.NEW, TaskStatus.IN_PROGRESS)
+        if task:
             return PhaseAction(
                 phase="coding",
-                task=pending_tasks[0],
-                reason=f"{len(pending_tasks)} tasks in progress",
+                task=task,
+                reason=f"{pending_count} tasks in progress",
                 priority=6
             )
         
@@ -87,24 +87,32 @@ class ArbiterModel:
         self.logger.info(f"📝 Arbiter User Prompt:\n{prompt}")
         self.logger.info(f"🔧 Available tools: {[t['name'] for t in tools]}")
         
-        # Call arbiter model WITHOUT tools (model can't handle them properly)
-        # Instead, we'll parse the text response
-        response = self.client.chat(
-            host=self.server,
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ],
-            tools=None,
-            temperature=0.3
-        )
-        
-        # Log the raw response
-        self.logger.info(f"📥 Arbiter Raw Response:\n{response}")
-        
-        # Parse decision from TEXT response (not tool calls)
-        decision = self._parse_text_decision(response, state, context)
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+        
+        # Speculative mode: a confident, schema-valid small-model draft decides
+        draft = self.client.drafter.draft_response(messages, tools, site="arbiter",
+                                                   large_model=self.model, allowed=None)
+        if draft is not None:
+            decision = self._parse_decision(draft)
+        else:
+            # Call arbiter model WITHOUT tools (model can't handle them properly)
+            # Instead, we'll parse the text response
+            response = self.client.chat(
+                host=self.server,
+                model=self.model,
+                messages=messages,
+                tools=None,
+                temperature=0.3
+            )
+        
+            # Log the raw response
+            self.logger.info(f"📥 Arbiter Raw Response:\n{response}")
+            
+            # Parse decision from TEXT response (not tool calls)
+            decision = self._parse_text_decision(response, state, context)
         
         # Record decision
         self.decision_history.append({
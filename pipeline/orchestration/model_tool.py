@@ -90,39 +90,81 @@ class ModelTool:
                 temperature=self.temperature
             )
             
-            # Extract tool calls
-            tool_calls = self._extract_tool_calls(response)
+            return self._consultation_result(query, response, start_time)
             
-            # Update stats
-            self.success_count += 1
-            duration = (datetime.now() - start_time).total_seconds()
+        except Exception as e:
+            return self._consultation_failure(query, e)
             
-            if tool_calls:
-                pass
+    async def consult(self, query: str, context: Optional[Dict] = None,
+                      tools: Optional[List[Dict]] = None,
+                      timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Same as calling the tool, awaiting the model on the shared async
+        client so several specialists can be consulted at once.
+        
+        Args:
+            query: The question or task for this model
+            context: Additional context (conversation history, state, etc.)
+            tools: Tools available to this model
+            timeout: Seconds to wait for the model (None = unlimited)
+        
+        Returns:
+            Dict with response, tool_calls, and metadata
+        """
+        self.call_count += 1
+        start_time = datetime.now()
+        
+        try:
+            messages = self._build_messages(query, context)
+            self.logger.info(f"🔧 Consulting {self.role} specialist ({self.model})")
             
-            return {
-                "model": self.model,
-                "role": self.role,
-                "query": query,
-                "response": response,
-                "tool_calls": tool_calls,
-                "success": True,
-                "duration": duration,
-                "timestamp": datetime.now().isoformat()
-            }
+            response = await self.client.async_client.chat(
+                host=self.server,
+                model=self.model,
+                messages=messages,
+                tools=tools,
+                temperature=self.temperature,
+                timeout=timeout
+            )
             
+            return self._consultation_result(query, response, start_time)
+        
         except Exception as e:
-            self.failure_count += 1
-            self.logger.error(f"  ✗ Model consultation failed: {e}")
-            
-            return {
-                "model": self.model,
-                "role": self.role,
-                "query": query,
-                "success": False,
-                "error": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
+            return self._consultation_failure(query, e)
+    
+    def _consultation_result(self, query: str, response: Dict, start_time: datetime) -> Dict[str, Any]:
+        """Result dict for a completed model call"""
+        # Extract tool calls
+        tool_calls = self._extract_tool_calls(response)
+        
+        # Update stats
+        self.success_count += 1
+        duration = (datetime.now() - start_time).total_seconds()
+        
+        return {
+            "model": self.model,
+            "role": self.role,
+            "query": query,
+            "response": response,
+            "tool_calls": tool_calls,
+            "success": True,
+            "duration": duration,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def _consultation_failure(self, query: str, error: Exception) -> Dict[str, Any]:
+        """Result dict for a failed consultation"""
+        self.failure_count += 1
+        self.logger.error(f"  ✗ Model consultation failed: {error}")
+        
+        return {
+            "model": self.model,
+            "role": self.role,
+            "query": query,
+            "success": False,
+            "error": str(error),
+            "timestamp": datetime.now().isoformat()
+        }
     
     def _build_messages(self, query: str, context: Optional[Dict]) -> List[Dict]:
         """
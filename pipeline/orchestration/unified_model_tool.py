@@ -142,62 +142,114 @@ class UnifiedModelTool:
         
         try:
             pass
-            # Prepare messages with system prompt
-            if system_prompt:
-                pass
-                # Add system message if not already present
-                if not messages or messages[0].get('role') != 'system':
-                    messages = [{'role': 'system', 'content': system_prompt}] + messages
-            
             # Call client using chat() method
             # Extract host and model from initialization
             response = self.client.chat(
                 host=self.host,
                 model=self.model_name,
-                messages=messages,
+                messages=self._with_system_prompt(messages, system_prompt),
                 tools=tools,
                 temperature=temperature,
                 timeout=None  # No timeout for specialist calls
             )
             
-            # Track success
-            self.usage_stats['successful_calls'] += 1
-            elapsed = time.time() - start_time
-            self.usage_stats['total_time'] += elapsed
+            return self._success_result(response, start_time)
             
-            # Parse response
-            result = self._parse_response(response)
-            result['success'] = True
-            result['elapsed_time'] = elapsed
+        except Exception as e:
+            return self._failure_result(e, start_time)
             
-            # Track token usage
-            if 'usage' in result:
-                self.usage_stats['total_tokens'] += result['usage'].get('total_tokens', 0)
+    async def execute_async(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: Optional[str] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        temperature: float = 0.7,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Same as ``execute``, awaiting the model on the shared async client so
+        several specialists can run at once.
             
-            logger.debug(
-                f"Model call successful: {self.model_name} "
-                f"({elapsed:.2f}s, {result.get('usage', {}).get('total_tokens', 0)} tokens)"
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            system_prompt: Optional system prompt
+            tools: Optional list of tool definitions
+            temperature: Sampling temperature
+            timeout: Seconds to wait for the model (None = unlimited)
+        
+        Returns:
+            Same dict as ``execute``
+        """
+        self.usage_stats['total_calls'] += 1
+        start_time = time.time()
+        
+        self.logger.info(f"🤖 Calling {self.model_name} on {self.host}")
+        
+        try:
+            response = await self.client.async_client.chat(
+                host=self.host,
+                model=self.model_name,
+                messages=self._with_system_prompt(messages, system_prompt),
+                tools=tools,
+                temperature=temperature,
+                timeout=timeout
             )
             
-            return result
+            return self._success_result(response, start_time)
             
         except Exception as e:
+            return self._failure_result(e, start_time)
+    
+    def _with_system_prompt(self, messages: List[Dict[str, str]],
+                            system_prompt: Optional[str]) -> List[Dict[str, str]]:
+        """Prepend the system prompt unless the messages already start with one"""
+        if system_prompt:
             pass
-            # Track failure
-            self.usage_stats['failed_calls'] += 1
-            elapsed = time.time() - start_time
-            self.usage_stats['total_time'] += elapsed
+            # Add system message if not already present
+            if not messages or messages[0].get('role') != 'system':
+                messages = [{'role': 'system', 'content': system_prompt}] + messages
+        return messages
             
-            logger.error(f"Model call failed: {self.model_name} - {str(e)}")
+    def _success_result(self, response: Dict[str, Any], start_time: float) -> Dict[str, Any]:
+        """Parse a completed call and update usage statistics"""
+        # Track success
+        self.usage_stats['successful_calls'] += 1
+        elapsed = time.time() - start_time
+        self.usage_stats['total_time'] += elapsed
             
-            return {
-                'success': False,
-                'error': str(e),
-                'response': '',
-                'tool_calls': [],
-                'usage': {},
-                'elapsed_time': elapsed
-            }
+        # Parse response
+        result = self._parse_response(response)
+        result['success'] = True
+        result['elapsed_time'] = elapsed
+        
+        # Track token usage
+        if 'usage' in result:
+            self.usage_stats['total_tokens'] += result['usage'].get('total_tokens', 0)
+        
+        logger.debug(
+            f"Model call successful: {self.model_name} "
+            f"({elapsed:.2f}s, {result.get('usage', {}).get('total_tokens', 0)} tokens)"
+        )
+        
+        return result
+    
+    def _failure_result(self, error: Exception, start_time: float) -> Dict[str, Any]:
+        """Failure dict for a call that raised, updating usage statistics"""
+        # Track failure
+        self.usage_stats['failed_calls'] += 1
+        elapsed = time.time() - start_time
+        self.usage_stats['total_time'] += elapsed
+        
+        logger.error(f"Model call failed: {self.model_name} - {str(error)}")
+        
+        return {
+            'success': False,
+            'error': str(error),
+            'response': '',
+            'tool_calls': [],
+            'usage': {},
+            'elapsed_time': elapsed
+        }
     
     def _parse_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -5,16 +5,414 @@ This module provides a robust way to modify files using unified diff patches,
 eliminating escape sequence issues and handling any character combinations.
 
 Patches are tracked with change numbers and stored in .patches/ directory.
+
+Patches are applied in-process. Unified-diff hunks are parsed and located
+the way GNU patch does it: an offset search around the expected line, then
+up to two lines of context fuzz. Hunks can be reverse-applied, and a file is
+only rewritten when every hunk applies. Change numbers are allocated under a
+file lock, and every saved patch is appended to ``.patches/index.jsonl`` so
+patches can be listed and looked up without scanning the directory.
 """
 
 import difflib
-import subprocess
+import json
+from bisect import insort
+import os
+import re
 import tempfile
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List
 from datetime import datetime
 import logging
 
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+
+# Context lines that may be ignored at either end of a hunk
+DEFAULT_MAX_FUZZ = 2
+
+INDEX_FILENAME = 'index.jsonl'
+
+_HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+# Serializes change-number allocation between threads (flock covers processes)
+_COUNTER_LOCK = threading.Lock()
+
+
+@dataclass
+class Hunk:
+    """One hunk of a unified diff."""
+    old_start: int
+    old_length: int
+    new_start: int
+    new_length: int
+    lines: List[Tuple[str, str]] = field(default_factory=list)  # (' ' | '-' | '+', text)
+    
+    @property
+    def old_lines(self) -> List[str]:
+        """Lines the hunk expects in the file (context and removed)."""
+        return [text for tag, text in self.lines if tag != '+']
+    
+    @property
+    def first(self) -> int:
+        """1-based line the hunk should start at."""
+        # An empty old side means "insert after old_start"
+        return self.old_start if self.old_length else self.old_start + 1
+    
+    @property
+    def prefix_context(self) -> int:
+        """Context lines before the first change."""
+        count = 0
+        for tag, _ in self.lines:
+            if tag != ' ':
+                break
+            count += 1
+        return count
+    
+    @property
+    def suffix_context(self) -> int:
+        """Context lines after the last change."""
+        count = 0
+        for tag, _ in reversed(self.lines):
+            if tag != ' ':
+                break
+            count += 1
+        return count
+    
+    def reversed(self) -> 'Hunk':
+        """The hunk that undoes this one."""
+        swap = {'-': '+', '+': '-', ' ': ' '}
+        return Hunk(self.new_start, self.new_length, self.old_start, self.old_length,
+                    [(swap[tag], text) for tag, text in self.lines])
+
+
+@dataclass
+class PatchResult:
+    """Outcome of applying hunks to a file's lines."""
+    success: bool
+    lines: List[str]
+    message: str
+    # Per applied hunk: (line it was applied at, offset from the expected line, fuzz used)
+    placements: List[Tuple[int, int, int]] = field(default_factory=list)
+
+
+def parse_unified_diff(patch_content: str) -> List[Hunk]:
+    """
+    Parse the hunks of a unified diff.
+    
+    File headers and anything else outside hunks are skipped, so all hunks
+    of the patch are returned in order.
+    
+    Raises:
+        ValueError: If a hunk's body does not match its header's line counts
+    """
+    hunks = []
+    lines = patch_content.splitlines(keepends=True)
+    index = 0
+    while index < len(lines):
+        match = _HUNK_HEADER.match(lines[index])
+        index += 1
+        if not match:
+            continue
+        old_start, old_length, new_start, new_length = (
+            int(value) if value is not None else 1 for value in match.groups())
+        hunk = Hunk(old_start, old_length, new_start, new_length)
+        old_seen = new_seen = 0
+        
+        while index < len(lines):
+            line = lines[index]
+            if line.startswith('\\'):
+                # "\ No newline at end of file" applies to the line before it
+                if hunk.lines:
+                    tag, text = hunk.lines[-1]
+                    hunk.lines[-1] = (tag, text.rstrip('\r\n'))
+                index += 1
+                continue
+            if old_seen >= old_length and new_seen >= new_length:
+                break
+            tag, text = line[:1], line[1:]
+            if line in ('\n', '\r\n'):
+                # Blank context line whose leading space was stripped
+                tag, text = ' ', line
+            if tag not in (' ', '-', '+'):
+                break
+            hunk.lines.append((tag, text))
+            old_seen += tag != '+'
+            new_seen += tag != '-'
+            index += 1
+        
+        if old_seen != old_length or new_seen != new_length:
+            raise ValueError(f"Malformed hunk '{match.group(0)}': expected -{old_length} +{new_length} "
+                             f"lines, found -{old_seen} +{new_seen}")
+        hunks.append(hunk)
+    return hunks
+
+
+def _matches(lines: List[str], hunk_lines: List[str], start: int, prefix_fuzz: int, suffix_fuzz: int) -> bool:
+    """Whether ``hunk_lines`` (less the fuzzed ends) match ``lines`` at 1-based ``start``."""
+    position = start - 1 + prefix_fuzz
+    for pattern_line in hunk_lines[prefix_fuzz:len(hunk_lines) - suffix_fuzz]:
+        if position < 0 or position >= len(lines) or lines[position] != pattern_line:
+            return False
+        position += 1
+    return True
+
+
+def _locate_hunk(lines: List[str], hunk: Hunk, fuzz: int, in_offset: int,
+                 last_frozen_line: int) -> Optional[int]:
+    """
+    Find where a hunk applies (GNU patch's locate_hunk).
+    
+    Searches outwards from the expected line, trying each offset forwards
+    before backwards. Context that is asymmetric (a hunk at the start or end
+    of the file) pins the hunk to that end until enough fuzz is allowed.
+    
+    Returns:
+        1-based line the hunk's old side starts at, or None
+    """
+    first_guess = hunk.first + in_offset
+    pattern = hunk.old_lines
+    pattern_lines = len(pattern)
+    input_lines = len(lines)
+    prefix_context = hunk.prefix_context
+    suffix_context = hunk.suffix_context
+    context = max(prefix_context, suffix_context)
+    prefix_fuzz = fuzz + prefix_context - context
+    suffix_fuzz = fuzz + suffix_context - context
+    max_where = input_lines - (pattern_lines - suffix_fuzz) + 1
+    min_where = last_frozen_line + 1
+    max_pos_offset = max_where - first_guess
+    max_neg_offset = first_guess - min_where
+    max_offset = max(max_pos_offset, max_neg_offset)
+    
+    if not pattern_lines:
+        # An empty range matches anywhere
+        return first_guess
+    
+    # Do not try lines <= 0
+    if first_guess <= max_neg_offset:
+        max_neg_offset = first_guess - 1
+    
+    if prefix_fuzz < 0 and hunk.first <= 1:
+        # Can only match the start of the file
+        if suffix_fuzz < 0 and (pattern_lines != input_lines or prefix_context < last_frozen_line):
+            return None
+        offset = 1 - first_guess
+        if (last_frozen_line <= prefix_context and offset <= max_pos_offset
+                and _matches(lines, pattern, first_guess + offset, 0, max(suffix_fuzz, 0))):
+            return first_guess + offset
+        return None
+    prefix_fuzz = max(prefix_fuzz, 0)
+    
+    if suffix_fuzz < 0:
+        # Can only match the end of the file
+        offset = first_guess - (input_lines - pattern_lines + 1)
+        if offset <= max_neg_offset and _matches(lines, pattern, first_guess - offset, prefix_fuzz, 0):
+            return first_guess - offset
+        return None
+    
+    for offset in range(max_offset + 1):
+        if offset <= max_pos_offset and _matches(lines, pattern, first_guess + offset,
+                                                 prefix_fuzz, suffix_fuzz):
+            return first_guess + offset
+        if (0 < offset <= max_neg_offset and first_guess - offset <= max_where
+                and _matches(lines, pattern, first_guess - offset, prefix_fuzz, suffix_fuzz)):
+            return first_guess - offset
+    return None
+
+
+def apply_hunks(
+    lines: List[str],
+    hunks: List[Hunk],
+    reverse: bool = False,
+    max_fuzz: int = DEFAULT_MAX_FUZZ,
+    forward: bool = True
+) -> PatchResult:
+    """
+    Apply unified-diff hunks to a file's lines, all or nothing.
+    
+    Args:
+        lines: File content as lines (with line endings)
+        hunks: Parsed hunks, in file order
+        reverse: Undo the hunks instead of applying them
+        max_fuzz: Context lines that may be ignored at each end of a hunk
+        forward: Refuse a patch whose first hunk only applies reversed
+            (i.e. one that is already applied), like ``patch --forward``
+    
+    Returns:
+        PatchResult with the patched lines when every hunk applied
+    """
+    if reverse:
+        hunks = [hunk.reversed() for hunk in hunks]
+    
+    output: List[str] = []
+    placements = []
+    in_offset = 0
+    last_frozen_line = 0
+    
+    for number, hunk in enumerate(hunks, 1):
+        max_hunk_fuzz = min(max_fuzz, max(hunk.prefix_context, hunk.suffix_context))
+        where = None
+        for fuzz in range(max_hunk_fuzz + 1):
+            where = _locate_hunk(lines, hunk, fuzz, in_offset, last_frozen_line)
+            if where is not None:
+                break
+            if number == 1 and forward and _locate_hunk(lines, hunk.reversed(), fuzz, in_offset,
+                                                        last_frozen_line) is not None:
+                return PatchResult(False, lines, "Reversed (or previously applied) patch detected")
+        if where is None:
+            return PatchResult(False, lines, f"Hunk #{number} FAILED at {hunk.first + in_offset}")
+        
+        in_offset = where - hunk.first
+        placements.append((where, in_offset, fuzz))
+        
+        # Walk the hunk. File lines are copied up to each change, so context
+        # (fuzzed or not) comes from the file, and the trailing context stays
+        # unfrozen for the next hunk to overlap.
+        old = 1
+        for tag, text in hunk.lines:
+            if tag == ' ':
+                old += 1
+                continue
+            copy_till = where + old - 2
+            if copy_till < last_frozen_line:
+                return PatchResult(False, lines, f"Hunk #{number} overlaps the previous hunk")
+            output.extend(lines[last_frozen_line:copy_till])
+            last_frozen_line = copy_till
+            if tag == '-':
+                last_frozen_line += 1
+                old += 1
+            else:
+                output.append(text)
+    
+    output.extend(lines[last_frozen_line:])
+    
+    notes = [f"hunk #{number} at {where} (offset {offset:+d}{f', fuzz {fuzz}' if fuzz else ''})"
+             for number, (where, offset, fuzz) in enumerate(placements, 1) if offset or fuzz]
+    message = f"{len(hunks)} hunk(s) {'reversed' if reverse else 'applied'}"
+    if notes:
+        message += ": " + ", ".join(notes)
+    return PatchResult(True, output, message, placements)
+
+
+class PatchIndex:
+    """
+    Append-only index of saved patches (``index.jsonl`` in the patches directory).
+    
+    One JSON line per patch. Entries are held in memory by change number and
+    by filename; lines appended by other processes are picked up by reading
+    from the last known end of the file. Shared per directory through
+    ``PatchIndex.for_directory``.
+    """
+    
+    _instances: Dict[Path, 'PatchIndex'] = {}
+    _instances_lock = threading.Lock()
+    
+    def __init__(self, patches_dir: Path):
+        self.patches_dir = patches_dir
+        self.path = patches_dir / INDEX_FILENAME
+        self.by_number: Dict[int, Dict] = {}
+        self.by_filename: Dict[str, Dict] = {}
+        self._numbers: List[int] = []  # Sorted change numbers
+        self._position = 0
+        self._lock = threading.Lock()
+        if not self.path.exists():
+            self._rebuild()
+        self.refresh()
+    
+    @classmethod
+    def for_directory(cls, patches_dir: Path) -> 'PatchIndex':
+        """The shared index of a patches directory."""
+        key = patches_dir.resolve()
+        with cls._instances_lock:
+            index = cls._instances.get(key)
+            if index is None or not index.path.exists():
+                index = cls._instances[key] = cls(patches_dir)
+            return index
+    
+    def _rebuild(self):
+        """Create the index from the patch files already in the directory."""
+        entries = []
+        for patch_path in self.patches_dir.glob('change_*.patch'):
+            try:
+                entries.append(_entry_from_filename(patch_path.name))
+            except (IndexError, ValueError):
+                continue
+        entries.sort(key=lambda entry: entry['change_number'])
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
+    
+    def refresh(self):
+        """Read entries appended since the last read."""
+        with self._lock:
+            try:
+                if self.path.stat().st_size == self._position:
+                    return
+            except OSError:
+                return
+            with open(self.path, 'rb') as f:
+                f.seek(self._position)
+                data = f.read()
+            # Only consume complete lines; a concurrent append may be mid-write
+            end = data.rfind(b'\n') + 1
+            self._position += end
+            for raw in data[:end].splitlines():
+                try:
+                    self._add(json.loads(raw))
+                except (ValueError, KeyError):
+                    continue
+    
+    def _add(self, entry: Dict):
+        number = entry['change_number']
+        if number not in self.by_number:
+            if self._numbers and number < self._numbers[-1]:
+                insort(self._numbers, number)
+            else:
+                self._numbers.append(number)
+        self.by_number[number] = entry
+        self.by_filename[entry['patch_file']] = entry
+    
+    def append(self, entry: Dict):
+        """Record a saved patch."""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        self.refresh()
+    
+    def latest(self, limit: int) -> List[Dict]:
+        """Up to ``limit`` entries, newest change number first."""
+        self.refresh()
+        with self._lock:
+            numbers = self._numbers[-limit:] if limit > 0 else []
+            return [self.by_number[number] for number in reversed(numbers)]
+    
+    def get(self, change_number: int) -> Optional[Dict]:
+        """Entry of a change number."""
+        if change_number not in self.by_number:
+            self.refresh()
+        return self.by_number.get(change_number)
+
+
+def _entry_from_filename(patch_filename: str) -> Dict:
+    """
+    Index entry parsed from a ``change_NNNN_<date>_<time>_<name>[_lineN].patch``
+    filename, for patches written before the index existed.
+    """
+    parts = patch_filename[:-len('.patch')].split('_')
+    line = parts[-1][4:] if len(parts) > 5 and re.fullmatch(r'line\d+', parts[-1]) else None
+    return {
+        'change_number': int(parts[1]),
+        'timestamp': f"{parts[2]}_{parts[3]}",
+        'filename': '_'.join(parts[4:-1]) if line is not None else '_'.join(parts[4:]),
+        'line': line,
+        'patch_file': patch_filename,
+    }
+
 
 class PatchManager:
     """Manages patch generation, application, and tracking."""
@@ -33,19 +431,66 @@ class PatchManager:
         # Track change numbers
         self.change_counter_file = self.patches_dir / '.change_counter'
         self._init_change_counter()
+        self.index = PatchIndex.for_directory(self.patches_dir)
     
     def _init_change_counter(self):
         """Initialize or read the change counter."""
         if not self.change_counter_file.exists():
-            self.change_counter_file.write_text('0')
+            # 'a' never truncates a counter another process just created
+            with open(self.change_counter_file, 'a'):
+                pass
     
     def _get_next_change_number(self) -> int:
-        """Get the next change number and increment counter."""
-        current = int(self.change_counter_file.read_text().strip())
-        next_num = current + 1
-        self.change_counter_file.write_text(str(next_num))
+        """Get the next change number and increment counter (atomic across threads and processes)."""
+        with _COUNTER_LOCK:
+            with open(self.change_counter_file, 'r+', encoding='utf-8') as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    current = int(f.read().strip() or 0)
+                    next_num = current + 1
+                    f.seek(0)
+                    f.write(str(next_num))
+                    f.truncate()
+                    f.flush()
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f, fcntl.LOCK_UN)
         return next_num
     
+    def save_patch(self, patch_content: str, filepath: Path, line_num: Optional[int] = None) -> Path:
+        """
+        Store a patch under the next change number and record it in the index.
+        
+        Args:
+            patch_content: Unified diff
+            filepath: File the patch changes
+            line_num: Changed line, for single-line patches
+        
+        Returns:
+            Path of the saved patch file
+        """
+        change_num = self._get_next_change_number()
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = filepath.name.replace('.py', '').replace('.', '_')
+        suffix = f"_line{line_num}" if line_num is not None else ""
+        patch_filename = f"change_{change_num:04d}_{timestamp}_{filename}{suffix}.patch"
+        patch_path = self.patches_dir / patch_filename
+        
+        patch_path.write_text(patch_content)
+        
+        self.index.append({
+            'change_number': change_num,
+            'timestamp': timestamp,
+            'filename': filename,
+            'line': str(line_num) if line_num is not None else None,
+            'patch_file': patch_filename,
+            'file': str(filepath),
+        })
+        
+        self.logger.info(f"Generated patch: {patch_filename}")
+        return patch_path
+    
     def generate_line_patch(
         self,
         filepath: Path,
@@ -91,15 +536,7 @@ class PatchManager:
         patch_content = ''.join(diff)
         
         # Save patch with change number
-        change_num = self._get_next_change_number()
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = filepath.name.replace('.py', '')
-        patch_filename = f"change_{change_num:04d}_{timestamp}_{filename}_line{line_num}.patch"
-        patch_path = self.patches_dir / patch_filename
-        
-        patch_path.write_text(patch_content)
-        
-        self.logger.info(f"Generated patch: {patch_filename}")
+        patch_path = self.save_patch(patch_content, filepath, line_num)
         
         return patch_content, patch_path
     
@@ -108,16 +545,23 @@ class PatchManager:
         filepath: Path,
         patch_content: str = None,
         patch_file: Path = None,
-        dry_run: bool = False
+        dry_run: bool = False,
+        reverse: bool = False,
+        max_fuzz: int = DEFAULT_MAX_FUZZ
     ) -> Tuple[bool, str]:
         """
         Apply a patch to a file.
         
+        The file is only rewritten when every hunk applies. A patch that is
+        already applied is refused (like ``patch --forward``).
+        
         Args:
             filepath: Path to the file to patch
             patch_content: Patch content as string (if not using patch_file)
             patch_file: Path to patch file (if not using patch_content)
             dry_run: If True, only test if patch would apply
+            reverse: Undo the patch instead of applying it
+            max_fuzz: Context lines that may be ignored at each end of a hunk
         
         Returns:
             Tuple of (success, message)
@@ -125,55 +569,50 @@ class PatchManager:
         if not patch_content and not patch_file:
             return False, "Either patch_content or patch_file must be provided"
         
-        # Create temporary patch file if content provided
-        if patch_content:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.patch', delete=False) as f:
-                f.write(patch_content)
-                temp_patch = Path(f.name)
-            patch_to_use = temp_patch
-        else:
-            patch_to_use = patch_file
-        
         try:
-            pass
-            # Build patch command
-            cmd = ['patch']
-            if dry_run:
-                cmd.append('--dry-run')
-            cmd.extend([
-                '--unified',
-                '--forward',  # Skip patches that appear to be already applied
-                '--reject-file=-',  # Don't create .rej files
-                str(filepath),
-                str(patch_to_use)
-            ])
-            
-            # Execute patch command
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                cwd=filepath.parent
-            )
+            if not patch_content:
+                patch_content = Path(patch_file).read_text(encoding='utf-8')
+            hunks = parse_unified_diff(patch_content)
+            if not hunks:
+                msg = "Patch failed: no hunks found"
+                self.logger.error(msg)
+                return False, msg
+        
+            with open(filepath, 'r', encoding='utf-8', newline='') as f:
+                lines = f.read().splitlines(keepends=True)
             
-            if result.returncode == 0:
-                msg = f"Patch applied successfully to {filepath.name}"
-                self.logger.info(msg)
-                return True, msg
-            else:
-                msg = f"Patch failed: {result.stderr}"
+            result = apply_hunks(lines, hunks, reverse=reverse, max_fuzz=max_fuzz)
+            if not result.success:
+                msg = f"Patch failed: {result.message}"
                 self.logger.error(msg)
                 return False, msg
+            
+            if not dry_run:
+                self._write_atomically(Path(filepath), ''.join(result.lines))
+            
+            msg = f"Patch {'reversed' if reverse else 'applied'} successfully to {Path(filepath).name}"
+            if any(offset or fuzz for _, offset, fuzz in result.placements):
+                msg += f" ({result.message})"
+            self.logger.info(msg)
+            return True, msg
         
         except Exception as e:
             msg = f"Error applying patch: {e}"
             self.logger.error(msg)
             return False, msg
         
-        finally:
-            # Clean up temporary file
-            if patch_content and temp_patch.exists():
-                temp_patch.unlink()
+    def _write_atomically(self, filepath: Path, content: str):
+        """Replace a file's content via a temporary file in the same directory."""
+        fd, temp_path = tempfile.mkstemp(dir=filepath.parent, prefix=f".{filepath.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                f.write(content)
+            os.chmod(temp_path, os.stat(filepath).st_mode & 0o7777)
+            os.replace(temp_path, filepath)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
     
     def apply_line_change(
         self,
@@ -239,12 +678,20 @@ class PatchManager:
         Returns:
             List of patch file paths, sorted by change number (newest first)
         """
-        patches = sorted(
-            self.patches_dir.glob('change_*.patch'),
-            key=lambda p: int(p.name.split('_')[1]),
-            reverse=True
-        )
-        return patches[:limit]
+        return [self.patches_dir / entry['patch_file'] for entry in self.index.latest(limit)]
+    
+    def get_patch(self, change_number: int) -> Optional[Path]:
+        """
+        Look up a patch by change number.
+        
+        Args:
+            change_number: Change number of the patch
+        
+        Returns:
+            Path of the patch file, or None if no such change was recorded
+        """
+        entry = self.index.get(change_number)
+        return self.patches_dir / entry['patch_file'] if entry else None
     
     def get_patch_info(self, patch_file: Path) -> dict:
         """
@@ -256,14 +703,15 @@ class PatchManager:
         Returns:
             Dictionary with patch information
         """
-        name = patch_file.stem
-        parts = name.split('_')
+        entry = self.index.by_filename.get(patch_file.name)
+        if entry is None:
+            entry = _entry_from_filename(patch_file.name)
         
         return {
-            'change_number': int(parts[1]),
-            'timestamp': f"{parts[2]}_{parts[3]}",
-            'filename': '_'.join(parts[4:-1]) if len(parts) > 5 else parts[4],
-            'line': parts[-1].replace('line', ''),
+            'change_number': entry['change_number'],
+            'timestamp': entry['timestamp'],
+            'filename': entry['filename'],
+            'line': entry['line'],
             'patch_file': patch_file
         }
 
@@ -47,7 +47,9 @@ class PatternDetector:
     Detects various types of infinite loops in AI behavior.
     
     Uses ActionTracker history to identify patterns that indicate
-    the system is stuck in a loop and not making progress.
+    the system is stuck in a loop and not making progress. Detectors read
+    the tracker's rolling counters and period trackers, or a bounded window
+    of recent actions, so a check costs the same however long the run is.
     """
     
     def __init__(self, action_tracker: ActionTracker):
@@ -382,17 +384,7 @@ class PatternDetector:
         
         for action in recent:
             if action.tool == 'read_file' and action.file_path:
-                pass
-                # Check if result contains imports or references
-                if action.result and 'content' in action.result:
-                    content = action.result['content']
-                    
-                    # Extract import statements
-                    imports = re.findall(r'from\s+(\S+)\s+import|import\s+(\S+)', content)
-                    for imp in imports:
-                        module = imp[0] or imp[1]
-                        if module:
-                            references[action.file_path].add(module)
+                references[action.file_path].update(self._imports_of(action))
         
         # Detect cycles in dependency graph
         def find_cycle(node: str, visited: Set[str], path: List[str]) -> Optional[List[str]]:
@@ -434,6 +426,27 @@ class PatternDetector:
         
         return detections
     
+    @staticmethod
+    def _imports_of(action: Action) -> Set[str]:
+        """Modules imported by the content a read_file action returned (parsed once per action)."""
+        cached = action.__dict__.get('_imports')
+        if cached is not None:
+            return cached
+        
+        imports = set()
+        # Check if result contains imports or references
+        if action.result and 'content' in action.result:
+            content = action.result['content']
+            
+            # Extract import statements
+            for imp in re.findall(r'from\s+(\S+)\s+import|import\s+(\S+)', content):
+                module = imp[0] or imp[1]
+                if module:
+                    imports.add(module)
+        
+        action.__dict__['_imports'] = imports
+        return imports
+    
     def detect_state_cycles(self) -> List[LoopDetection]:
         """
         Detect Type 5: State Cycles - System state cycling through same states.
@@ -443,43 +456,25 @@ class PatternDetector:
         """
         detections = []
         
-        # Track state transitions (phase changes, file states)
-        recent = self.tracker.get_recent_actions(30)
-        
-        # Build state sequence
-        states = []
-        for action in recent:
-            pass
-            # State = (phase, file_path, tool)
-            state = (action.phase, action.file_path or 'none', action.tool)
-            states.append(state)
+        # States are (phase, file_path, tool); the tracker follows repeating
+        # tails of the state sequence as actions arrive
+        cycle = self.tracker.state_periods.pattern(window=30, min_cycles=2)
         
-        # Detect repeating state sequences
-        for pattern_len in range(3, len(states) // 2 + 1):
-            pattern = states[:pattern_len]
-            
-            # Check if pattern repeats
-            cycles = 0
-            for i in range(0, len(states) - pattern_len + 1, pattern_len):
-                if states[i:i+pattern_len] == pattern:
-                    cycles += 1
-                else:
-                    break
-            
-            if cycles >= 2:
-                detections.append(LoopDetection(
-                    loop_type='state_cycle',
-                    severity='high',
-                    description=f'System cycling through same {pattern_len} states {cycles} times',
-                    evidence=[
-                        f'Pattern length: {pattern_len} states',
-                        f'Cycles: {cycles}',
-                        f'States: {" -> ".join([f"{s[0]}:{s[2]}" for s in pattern])}'
-                    ],
-                    suggestion='The system is stuck in a cycle. Try a completely different approach or ask user for guidance.',
-                    actions_involved=recent[:pattern_len * cycles]
-                ))
-                break  # Only report first detected cycle
+        if cycle:
+            pattern, cycles = cycle
+            pattern_len = len(pattern)
+            detections.append(LoopDetection(
+                loop_type='state_cycle',
+                severity='high',
+                description=f'System cycling through same {pattern_len} states {cycles} times',
+                evidence=[
+                    f'Pattern length: {pattern_len} states',
+                    f'Cycles: {cycles}',
+                    f'States: {" -> ".join([f"{s[0]}:{s[2]}" for s in pattern])}'
+                ],
+                suggestion='The system is stuck in a cycle. Try a completely different approach or ask user for guidance.',
+                actions_involved=self.tracker.get_recent_actions(pattern_len * cycles)
+            ))
         
         return detections
     
@@ -14,6 +14,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict, Counter
 import json
+import math
 import sqlite3
 import hashlib
 
@@ -54,6 +55,10 @@ class PatternOptimizer:
         self.similarity_threshold = 0.85
         self.min_success_rate = 0.2
         
+        # Merge batching
+        self.merge_fetch_size = 5000
+        self.merge_batch_size = 1000
+        
         # Statistics
         self.stats = {
             'patterns_removed': 0,
@@ -219,56 +224,49 @@ class PatternOptimizer:
         """
         Merge patterns that are very similar.
         
+        Patterns are streamed one pattern_type at a time and only pairs that
+        share an indexed key/value token are compared (see
+        ``_find_merge_pairs``). The resulting merges are written with batched
+        statements and committed in one transaction, so a crash never leaves
+        merged counts next to the rows they absorbed.
+        
         Returns:
             Number of patterns merged
         """
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        # Get all patterns grouped by type
         cursor.execute('''
-            SELECT id, pattern_type, pattern_data, confidence, occurrences
-            FROM patterns WHERE archived = 0
-            ORDER BY pattern_type, confidence DESC
+            SELECT DISTINCT pattern_type FROM patterns WHERE archived = 0
+            ORDER BY pattern_type
         ''')
-        
-        patterns_by_type = defaultdict(list)
-        for row in cursor.fetchall():
-            pattern_id, ptype, pdata, conf, occ = row
-            patterns_by_type[ptype].append({
-                'id': pattern_id,
-                'data': json.loads(pdata),
-                'confidence': conf,
-                'occurrences': occ
-            })
+        pattern_types = [row[0] for row in cursor.fetchall()]
         
         merged_count = 0
         
-        for ptype, patterns in patterns_by_type.items():
-            pass
-            # Compare each pattern with others
-            i = 0
-            while i < len(patterns):
-                j = i + 1
-                while j < len(patterns):
-                    similarity = self._calculate_similarity(
-                        patterns[i]['data'],
-                        patterns[j]['data']
-                    )
+        for ptype in pattern_types:
+            cursor.execute('''
+                SELECT id, pattern_data, confidence, occurrences
+                FROM patterns WHERE archived = 0 AND pattern_type = ?
+                ORDER BY confidence DESC, id
+            ''', (ptype,))
                     
-                    if similarity >= self.similarity_threshold:
-                        pass
-                        # Merge j into i
-                        self._merge_patterns(
-                            cursor,
-                            patterns[i]['id'],
-                            patterns[j]['id']
-                        )
-                        patterns.pop(j)
-                        merged_count += 1
-                    else:
-                        j += 1
-                i += 1
+            patterns = []
+            while True:
+                rows = cursor.fetchmany(self.merge_fetch_size)
+                if not rows:
+                    break
+                for pattern_id, pdata, conf, occ in rows:
+                    patterns.append({
+                        'id': pattern_id,
+                        'data': json.loads(pdata),
+                        'confidence': conf,
+                        'occurrences': occ
+                    })
+        
+            merge_pairs = self._find_merge_pairs(patterns)
+            self._apply_merges(conn, patterns, merge_pairs)
+            merged_count += len(merge_pairs)
         
         conn.commit()
         conn.close()
@@ -278,6 +276,154 @@ class PatternOptimizer:
             self.logger.info(f"🔗 Merged {merged_count} similar patterns")
         return merged_count
     
+    def _pattern_tokens(self, data: Any, vocabulary: Dict[Tuple, int]) -> frozenset:
+        """
+        Canonical key/value tokens for a pattern, interned to integer ids.
+        
+        Two patterns can only be similar if they share tokens, since
+        ``_calculate_similarity`` counts matching key/value pairs.
+        """
+        if not isinstance(data, dict):
+            return frozenset()
+        
+        tokens = set()
+        for key, value in data.items():
+            if isinstance(value, (int, float)):
+                # 1, 1.0 and True are equal in Python, so they share a token
+                token = (key, 0, float(value))
+            elif value is None or isinstance(value, str):
+                token = (key, 0, value)
+            else:
+                token = (key, 1, json.dumps(value, sort_keys=True, default=str))
+            tokens.add(vocabulary.setdefault(token, len(vocabulary)))
+        return frozenset(tokens)
+    
+    def _prefix_length(self, size: int) -> int:
+        """Number of rarest tokens that must be indexed for a pattern of `size` keys."""
+        # Similar patterns share at least ceil(threshold * size) tokens, so
+        # with a global token order they must share one of the first
+        # size - ceil(threshold * size) + 1 tokens.
+        required = max(1, math.ceil(self.similarity_threshold * size - 1e-9))
+        return max(1, size - required + 1)
+    
+    def _find_merge_pairs(self, patterns: List[Dict]) -> List[Tuple[int, int]]:
+        """
+        Find (keep_index, remove_index) merge pairs for one pattern type.
+        
+        Produces the same merges as comparing every pair in order: each
+        surviving pattern absorbs every later surviving pattern whose
+        similarity reaches the threshold. Identical patterns are bucketed by
+        their token signature and only bucket leaders are indexed on a prefix
+        of their rarest tokens, so only plausible pairs are scored.
+        
+        Args:
+            patterns: Patterns ordered by merge priority
+            
+        Returns:
+            Merge pairs as indexes into ``patterns``, in application order
+        """
+        vocabulary: Dict[Tuple, int] = {}
+        token_sets = [self._pattern_tokens(p['data'], vocabulary) for p in patterns]
+        
+        # Bucket exact duplicates behind their first occurrence
+        leaders: Dict[frozenset, int] = {}
+        duplicates: Dict[int, List[int]] = defaultdict(list)
+        for pos, tokens in enumerate(token_sets):
+            if not tokens:
+                continue
+            leader = leaders.setdefault(tokens, pos)
+            if leader != pos:
+                duplicates[leader].append(pos)
+        
+        # Index each leader on the prefix of its rarest tokens
+        frequency = Counter()
+        for tokens in leaders:
+            frequency.update(tokens)
+        
+        prefixes: Dict[int, List[int]] = {}
+        index: Dict[int, List[int]] = defaultdict(list)
+        for tokens, pos in leaders.items():
+            ordered = sorted(tokens, key=lambda t: (frequency[t], t))
+            prefixes[pos] = ordered[:self._prefix_length(len(ordered))]
+            for token in prefixes[pos]:
+                index[token].append(pos)
+        
+        removed = set()
+        merge_pairs = []
+        for pos in sorted(leaders.values()):
+            if pos in removed:
+                continue
+            
+            absorbed = list(duplicates.get(pos, ()))
+            candidates = set()
+            for token in prefixes[pos]:
+                for other in index[token]:
+                    if other > pos and other not in removed:
+                        candidates.add(other)
+            
+            for other in sorted(candidates):
+                similarity = self._calculate_similarity(
+                    patterns[pos]['data'],
+                    patterns[other]['data']
+                )
+                if similarity >= self.similarity_threshold:
+                    removed.add(other)
+                    absorbed.append(other)
+                    absorbed.extend(duplicates.get(other, ()))
+            
+            for other in sorted(absorbed):
+                merge_pairs.append((pos, other))
+        
+        return merge_pairs
+    
+    def _apply_merges(self, conn: sqlite3.Connection, patterns: List[Dict],
+                      merge_pairs: List[Tuple[int, int]]):
+        """
+        Apply merge pairs with batched statements (committed by the caller).
+        
+        Occurrences and confidence are folded in memory in the same order as
+        ``_merge_patterns`` would apply them, then written with one
+        executemany per statement and batch.
+        """
+        if not merge_pairs:
+            return
+        
+        survivors: Dict[int, Dict[str, Any]] = {}
+        for keep, remove in merge_pairs:
+            state = survivors.setdefault(keep, {
+                'occurrences': patterns[keep]['occurrences'] or 0,
+                'confidence': patterns[keep]['confidence']
+            })
+            state['occurrences'] += patterns[remove]['occurrences'] or 0
+            state['confidence'] = (state['confidence'] + patterns[remove]['confidence']) / 2
+        
+        updates = [
+            (state['occurrences'], state['confidence'], patterns[keep]['id'])
+            for keep, state in survivors.items()
+        ]
+        transfers = [
+            (patterns[keep]['id'], patterns[remove]['id'])
+            for keep, remove in merge_pairs
+        ]
+        
+        batch = self.merge_batch_size
+        cursor = conn.cursor()
+        for start in range(0, len(updates), batch):
+            cursor.executemany(
+                'UPDATE patterns SET occurrences = ?, confidence = ? WHERE id = ?',
+                updates[start:start + batch]
+            )
+        for start in range(0, len(transfers), batch):
+            chunk = transfers[start:start + batch]
+            cursor.executemany(
+                'UPDATE pattern_usage SET pattern_id = ? WHERE pattern_id = ?',
+                chunk
+            )
+            cursor.executemany(
+                'DELETE FROM patterns WHERE id = ?',
+                [(remove_id,) for _, remove_id in chunk]
+            )
+    
     def _calculate_similarity(self, data1: Dict, data2: Dict) -> float:
         """Calculate similarity between two pattern data dictionaries."""
         # Simple similarity based on common keys and values
@@ -18,6 +18,7 @@ from ..context.code import CodeContext
 from ..client import OllamaClient, ResponseParser
 from ..config import PipelineConfig
 from pipeline.logging_setup import get_logger
+from ..tracing import get_tracer
 
 
 @dataclass
@@ -385,7 +386,10 @@ class BasePhase(ABC):
         try:
             pass
             # Execute phase
-            result = self.execute(state, **kwargs)
+            task = kwargs.get('task')
+            with get_tracer().span(f"phase.{self.phase_name}", category="phase"), \
+                    self.client.metrics.attribute(phase=self.phase_name, task=getattr(task, 'task_id', None)):
+                result = self.execute(state, **kwargs)
             
             # Update phase state (with defensive check)
             if self.phase_name in state.phases:
@@ -757,11 +761,14 @@ class BasePhase(ABC):
         Returns:
             Dict with 'content' and optionally 'tool_calls'
         """
+        tracer = get_tracer()
+        
         # Add user message to conversation
-        self.conversation.add_message("user", user_message)
+        with tracer.span("prompt.build", category="model"):
+            self.conversation.add_message("user", user_message)
         
-        # Get conversation context (respects token limits)
-        messages = self.conversation.get_context()
+            # Get conversation context (respects token limits)
+            messages = self.conversation.get_context()
         
         # Get model and host for this phase using intelligent selection with fallbacks
         result = self.client.get_model_for_task(self.phase_name)
@@ -775,6 +782,16 @@ class BasePhase(ABC):
             host = self.config.servers[0].host if self.config.servers else "localhost"
             self.logger.warning(f"  No model found via get_model_for_task, using fallback: {model_name} on {host}")
         
+        # Offer only the relevant part of a long tool list (tool retrieval)
+        full_tools = tools
+        selection = None
+        selector = getattr(self.client, 'tool_selector', None)
+        if tools and selector is not None and selector.enabled:
+            tracker = getattr(self, 'action_tracker', None)
+            recent = [action.tool for action in tracker.get_recent_actions(20, phase=self.phase_name)] if tracker else []
+            selection = selector.select(self.phase_name, tools, user_message, recent)
+            tools = selection.tools
+        
         # ENHANCED: Detailed pre-call logging
         import time
         from ..progress_indicator import ProgressIndicator
@@ -795,14 +812,42 @@ class BasePhase(ABC):
         self.logger.info(f"{'='*70}")
         start_time = time.time()
         
+        # Let the small model draft simple tool calls first (speculative mode)
+        response = None
+        drafter = getattr(self.client, 'drafter', None)
+        if tools and drafter is not None and drafter.enabled:
+            with tracer.span("model.draft", category="model", phase=self.phase_name):
+                response = drafter.draft_response(messages, tools, site=self.phase_name,
+                                                  large_model=model_name)
+        
         # Call model with conversation history and progress indicator
-        with ProgressIndicator(self.logger, f"Model {model_name} thinking"):
-            response = self.client.chat(
-                host=host,
-                model=model_name,
-                messages=messages,
-                tools=tools
-            )
+        if response is None:
+            with ProgressIndicator(self.logger, f"Model {model_name} thinking"):
+                with tracer.span("model.call", category="model", model=model_name, host=host, phase=self.phase_name):
+                    response = self.client.chat(
+                        host=host,
+                        model=model_name,
+                        messages=messages,
+                        tools=tools
+                    )
+        
+        # The model asked for a tool the subset left out: once more with all of them
+        if selection is not None and selection.reduced:
+            called, _ = self.parser.parse_response(response, [])
+            missing = selection.outside(call.get('function', {}).get('name') for call in called)
+            if missing:
+                self.logger.info(f"  🧰 Tool(s) outside the offered subset requested ({', '.join(missing)}), "
+                                 f"retrying with all {len(full_tools)} tools")
+                selector.record_fallback(self.phase_name, full_tools)
+                tools = full_tools
+                with ProgressIndicator(self.logger, f"Model {model_name} thinking"):
+                    with tracer.span("model.call", category="model", model=model_name, host=host, phase=self.phase_name):
+                        response = self.client.chat(
+                            host=host,
+                            model=model_name,
+                            messages=messages,
+                            tools=tools
+                        )
         
         # ENHANCED: Detailed post-call logging
         duration = time.time() - start_time
@@ -850,7 +895,8 @@ class BasePhase(ABC):
                 content = f"{content}\n\n{specialist_response}"
         
         # Parse response for tool calls
-        tool_calls_parsed, _ = self.parser.parse_response(response, tools or [])
+        with tracer.span("parse", category="model"):
+            tool_calls_parsed, _ = self.parser.parse_response(response, tools or [])
         
         return {
             "content": content,
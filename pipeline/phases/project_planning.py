@@ -133,7 +133,7 @@ class ProjectPlanningPhase(LoopDetectionMixin, BasePhase):
         self._write_status({
             "status": "Starting project planning",
             "action": "start",
-            "expansion_cycle": state.metadata.get('expansion_cycles', 0)
+            "expansion_cycle": state.expansion_count
         })
         
         # INITIALIZE IPC DOCUMENTS (if first run)
@@ -74,8 +74,8 @@ class RefactoringPhase(BasePhase, LoopDetectionMixin):
         from ..analysis.complexity import ComplexityAnalyzer
         from ..analysis.integration_gaps import IntegrationGapFinder
         
-        self.duplicate_detector = DuplicateDetector(str(self.project_dir), self.logger)
-        self.file_comparator = FileComparator(str(self.project_dir), self.logger)
+        self.duplicate_detector = DuplicateDetector(str(self.project_dir), self.logger, state_dir=getattr(self.config, 'state_dir', None))
+        self.file_comparator = FileComparator(str(self.project_dir), self.logger, state_dir=getattr(self.config, 'state_dir', None))
         self.feature_extractor = FeatureExtractor(str(self.project_dir), self.logger)
         self.architecture_analyzer = RefactoringArchitectureAnalyzer(str(self.project_dir), self.logger)
         self.dead_code_detector = DeadCodeDetector(str(self.project_dir), self.logger, self.architecture_config)
@@ -92,6 +92,16 @@ class RefactoringPhase(BasePhase, LoopDetectionMixin):
         self.complexity_analyzer = ComplexityAnalyzer(str(self.project_dir), self.logger)
         self.gap_finder = IntegrationGapFinder(str(self.project_dir), self.logger)
         
+        # ANALYSIS RUNNER - One parse per file for the comprehensive analysis
+        from ..analysis.runner import AnalysisRunner
+        self.analysis_runner = AnalysisRunner(
+            str(self.project_dir), self.logger,
+            max_workers=getattr(self.config, 'analysis_workers', None),
+            options={'duplicates': {'similarity_threshold': 0.7}},
+            state_dir=getattr(self.config, 'state_dir', None)
+        )
+        self.analysis_budget = getattr(self.config, 'analysis_budget', None)
+        
         # CONTEXT BUILDER - Provides full context for informed refactoring decisions
         self.context_builder = RefactoringContextBuilder(self.project_dir, self.logger)
         
@@ -1870,36 +1880,46 @@ class RefactoringPhase(BasePhase, LoopDetectionMixin):
         if arch_result.get('success'):
             violations = arch_result.get('result', {}).get('total_violations', 0)
         
+        # Parse every file once for the project-wide analyzers of phases 2-4;
+        # the tool handlers below reuse these results.
+        analysis_run = self.analysis_runner.run(budget=self.analysis_budget)
+        handler.analysis_run = analysis_run
+        self.logger.info(analysis_run.timing_report())
+        skipped = set(analysis_run.skipped)
+        
         # ============================================================
         # PHASE 2: CODE QUALITY ANALYSIS
         # ============================================================
         
         # 2.1: Duplicate Detection
-        dup_result = handler._handle_detect_duplicate_implementations({
-            'similarity_threshold': 0.7,
-            'scope': 'project',
-            'include_tests': False
-        })
-        all_results.append(dup_result)
+        if 'duplicates' not in skipped:
+            dup_result = handler._handle_detect_duplicate_implementations({
+                'similarity_threshold': 0.7,
+                'scope': 'project',
+                'include_tests': False
+            })
+            all_results.append(dup_result)
         
-        if dup_result.get('success'):
-            dups = dup_result.get('result', {}).get('total_duplicates', 0)
+            if dup_result.get('success'):
+                dups = dup_result.get('result', {}).get('total_duplicates', 0)
         
         # 2.2: Complexity Analysis
-        complexity_result = handler._handle_analyze_complexity({})
-        all_results.append(complexity_result)
+        if 'complexity' not in skipped:
+            complexity_result = handler._handle_analyze_complexity({})
+            all_results.append(complexity_result)
         
-        if complexity_result.get('success'):
-            critical = complexity_result.get('result', {}).get('critical_count', 0)
+            if complexity_result.get('success'):
+                critical = complexity_result.get('result', {}).get('critical_count', 0)
         
         # 2.3: Dead Code Detection
-        dead_result = handler._handle_detect_dead_code({})
-        all_results.append(dead_result)
+        if 'dead_code' not in skipped:
+            dead_result = handler._handle_detect_dead_code({})
+            all_results.append(dead_result)
         
-        if dead_result.get('success'):
-            summary = dead_result.get('result', {}).get('summary', {})
-            unused_funcs = summary.get('total_unused_functions', 0)
-            unused_methods = summary.get('total_unused_methods', 0)
+            if dead_result.get('success'):
+                summary = dead_result.get('result', {}).get('summary', {})
+                unused_funcs = summary.get('total_unused_functions', 0)
+                unused_methods = summary.get('total_unused_methods', 0)
         
         # ============================================================
         # PHASE 3: INTEGRATION ANALYSIS
@@ -1907,28 +1927,32 @@ class RefactoringPhase(BasePhase, LoopDetectionMixin):
         self.logger.info("  🔗 Phase 3: Integration Analysis")
         
         # 3.1: Integration Gaps
-        gaps_result = handler._handle_find_integration_gaps({})
-        all_results.append(gaps_result)
+        if 'integration_gaps' not in skipped:
+            gaps_result = handler._handle_find_integration_gaps({})
+            all_results.append(gaps_result)
         
-        if gaps_result.get('success'):
-            gaps = len(gaps_result.get('result', {}).get('gaps', []))
+            if gaps_result.get('success'):
+                gaps = len(gaps_result.get('result', {}).get('gaps', []))
         
         # 3.2: Integration Conflicts (if available)
         try:
-            from ..analysis.integration_conflicts import IntegrationConflictDetector
-            conflict_detector = IntegrationConflictDetector(str(self.project_dir), self.logger)
-            conflict_analysis = conflict_detector.analyze()
-            
-            from dataclasses import asdict
-            conflict_result = {
-                'tool': 'detect_integration_conflicts',
-                'success': True,
-                'result': {
-                    'conflicts': [asdict(c) for c in conflict_analysis.conflicts],
-                    'total_conflicts': len(conflict_analysis.conflicts)
+            conflict_analysis = analysis_run.get('integration_conflicts')
+            if conflict_analysis is None and 'integration_conflicts' not in skipped:
+                from ..analysis.integration_conflicts import IntegrationConflictDetector
+                conflict_detector = IntegrationConflictDetector(str(self.project_dir), self.logger)
+                conflict_analysis = conflict_detector.analyze()
+            
+            if conflict_analysis is not None:
+                from dataclasses import asdict
+                conflict_result = {
+                    'tool': 'detect_integration_conflicts',
+                    'success': True,
+                    'result': {
+                        'conflicts': [asdict(c) for c in conflict_analysis.conflicts],
+                        'total_conflicts': len(conflict_analysis.conflicts)
+                    }
                 }
-            }
-            all_results.append(conflict_result)
+                all_results.append(conflict_result)
         except Exception as e:
             pass
         
@@ -1938,11 +1962,12 @@ class RefactoringPhase(BasePhase, LoopDetectionMixin):
         self.logger.info("  🏗️  Phase 4: Code Structure Analysis")
         
         # 4.1: Call Graph Generation
-        callgraph_result = handler._handle_generate_call_graph({})
-        all_results.append(callgraph_result)
+        if 'call_graph' not in skipped:
+            callgraph_result = handler._handle_generate_call_graph({})
+            all_results.append(callgraph_result)
         
-        if callgraph_result.get('success'):
-            pass
+            if callgraph_result.get('success'):
+                pass
         
         # ============================================================
         # PHASE 5: BUG DETECTION
@@ -3,14 +3,37 @@ Context builder for refactoring phase decisions.
 
 This module builds comprehensive context for AI to make informed refactoring decisions,
 including strategic documents, analysis reports, code context, and project state.
+
+The builder is shared by all tasks of a refactoring run: file contents are
+cached and re-read only when a file's mtime or size changes, related and
+test files come from a project index rescanned only when a directory
+changes, and formatted prompt sections are memoized on their inputs.
 """
 
 import os
+import re
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
 from dataclasses import dataclass
 
 
+# Directories not searched for related or test files
+SKIP_DIRS = {'.git', '.venv', 'venv', '__pycache__', 'node_modules', '.pipeline', '.autonomy'}
+
+# Formatted prompt sections kept
+SECTION_CACHE_SIZE = 128
+
+_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+
+def _mentioned_names(text: str) -> FrozenSet[str]:
+    """Identifiers in a text, plus the parts of those joined by underscores."""
+    names = set(_IDENTIFIER.findall(text))
+    names.update(part for name in list(names) if '_' in name for part in name.split('_') if part)
+    return frozenset(names)
+
+
 @dataclass
 class RefactoringContext:
     """Complete context for a refactoring decision."""
@@ -57,8 +80,23 @@ class RefactoringContextBuilder:
     """
     
     def __init__(self, project_dir: Path, logger):
-        self.project_dir = project_dir
+        self.project_dir = Path(project_dir)
         self.logger = logger
+        
+        # File contents keyed by path: ((mtime_ns, size), text)
+        self._files: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+        self.bytes_read = 0  # Read from disk, i.e. on cache misses
+        
+        # Project layout: directory mtimes at the last scan, Python files per directory, test files
+        self._dir_stamps: Optional[Dict[Path, int]] = None
+        self._modules_by_dir: Dict[Path, List[Path]] = {}
+        self._test_paths: List[Path] = []
+        
+        # Names each test file mentions: path -> ((mtime_ns, size), names), and inverted
+        self._test_names: Dict[Path, Tuple[Optional[Tuple[int, int]], FrozenSet[str]]] = {}
+        self._tests_by_name: Dict[str, List[Path]] = {}
+        
+        self._sections: "OrderedDict[Tuple, str]" = OrderedDict()
     
     def build_context(self, 
                      issue_type: str,
@@ -140,7 +178,7 @@ class RefactoringContextBuilder:
         This creates a structured prompt that guides AI through the decision process
         with all necessary information.
         """
-        prompt = f"""# Refactoring Decision Required
+        header = f"""# Refactoring Decision Required
 
 ## Project Context
 - **Current Phase**: {context.current_phase}
@@ -157,7 +195,45 @@ class RefactoringContextBuilder:
 {context.affected_code}
 ```
 
-## Strategic Documents
+"""
+        documents = self._section(
+            ('documents', context.master_plan, context.architecture, context.roadmap,
+             context.primary_objectives, context.secondary_objectives, context.tertiary_objectives,
+             context.dead_code_report, context.complexity_report, context.antipattern_report,
+             context.integration_gaps, context.bug_report, context.call_graph),
+            lambda: self._format_documents(context)
+        )
+        code = self._section(
+            ('code', context.target_file_content,
+             tuple(context.related_files.items()), tuple(context.test_files.items())),
+            lambda: self._format_code_context(context)
+        )
+        framework = self._section(
+            ('framework', context.completion_percentage),
+            lambda: self._format_decision_framework(context)
+        )
+        return header + documents + code + framework
+    
+    def _section(self, key: Tuple, build: Callable[[], str]) -> str:
+        """
+        A formatted prompt section, built once per distinct input.
+        
+        Keys hold the section's inputs (document texts come from the file
+        cache as the same objects, whose hashes Python caches).
+        """
+        section = self._sections.get(key)
+        if section is None:
+            section = build()
+            self._sections[key] = section
+            while len(self._sections) > SECTION_CACHE_SIZE:
+                self._sections.popitem(last=False)
+        else:
+            self._sections.move_to_end(key)
+        return section
+    
+    def _format_documents(self, context: RefactoringContext) -> str:
+        """Strategic documents, objectives and analysis reports."""
+        return f"""## Strategic Documents
 
 ### MASTER_PLAN.md (Project Vision & Roadmap)
 ```
@@ -211,7 +287,11 @@ class RefactoringContextBuilder:
 {self._truncate(context.call_graph, 1000)}
 ```
 
-## Code Context
+"""
+    
+    def _format_code_context(self, context: RefactoringContext) -> str:
+        """Target, related and test files."""
+        return f"""## Code Context
 
 ### Target File: {context.target_file_content[:100] if context.target_file_content else "N/A"}
 ```python
@@ -224,7 +304,11 @@ class RefactoringContextBuilder:
 ### Test Coverage ({len(context.test_files)} test files)
 {self._format_test_files(context.test_files)}
 
-## Decision Framework
+"""
+    
+    def _format_decision_framework(self, context: RefactoringContext) -> str:
+        """Decision options and instructions."""
+        return f"""## Decision Framework
 
 Based on ALL the context above, determine the appropriate action:
 
@@ -276,31 +360,109 @@ Remember: In early development ({context.completion_percentage:.1f}% complete),
 code may appear unused because features aren't fully integrated yet. Consider 
 whether code should be INTEGRATED rather than REMOVED.
 """
-        return prompt
+    
+    def _read(self, path: Path) -> Optional[str]:
+        """
+        Content of a file, read from disk only if its mtime or size changed
+        since the last read.
+        
+        Returns:
+            The content, or None if the file does not exist
+        """
+        try:
+            stat = path.stat()
+        except OSError:
+            self._files.pop(path, None)
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        
+        cached = self._files.get(path)
+        if cached is None or cached[0] != signature:
+            cached = (signature, path.read_text())
+            self._files[path] = cached
+            self.bytes_read += stat.st_size
+        return cached[1]
     
     def _load_document(self, filename: str, optional: bool = False) -> Optional[str]:
         """Load a document from project directory."""
-        filepath = self.project_dir / filename
-        if not filepath.exists():
-            if optional:
-                return None
-            return f"Document {filename} not found"
-        
         try:
-            return filepath.read_text()
+            content = self._read(self.project_dir / filename)
         except Exception as e:
             return f"Error loading {filename}: {e}"
+        
+        if content is None:
+            if optional:
+                return None
+            return f"Document {filename} not found"
+        return content
     
     def _load_file_content(self, filepath: str) -> str:
         """Load content of a specific file."""
-        full_path = self.project_dir / filepath
-        if not full_path.exists():
-            return f"File {filepath} not found"
-        
         try:
-            return full_path.read_text()
+            content = self._read(self.project_dir / filepath)
         except Exception as e:
             return f"Error loading {filepath}: {e}"
+        
+        if content is None:
+            return f"File {filepath} not found"
+        return content
+    
+    def _refresh_layout(self):
+        """Rescan the project's Python files if a directory changed since the last scan."""
+        if self._dir_stamps is not None:
+            try:
+                if all(os.stat(directory).st_mtime_ns == stamp for directory, stamp in self._dir_stamps.items()):
+                    return
+            except OSError:
+                pass
+        
+        dir_stamps = {}
+        modules_by_dir = {}
+        tests, suffix_tests = [], []
+        for root, dirs, files in os.walk(self.project_dir):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+            directory = Path(root)
+            dir_stamps[directory] = os.stat(root).st_mtime_ns
+            modules = [directory / name for name in sorted(files) if name.endswith('.py')]
+            modules_by_dir[directory] = modules
+            tests += [path for path in modules if path.name.startswith('test_')]
+            suffix_tests += [path for path in modules if path.name.endswith('_test.py')
+                             and not path.name.startswith('test_')]
+        
+        self._dir_stamps = dir_stamps
+        self._modules_by_dir = modules_by_dir
+        self._test_paths = tests + suffix_tests
+    
+    def _refresh_test_map(self):
+        """Update the names-to-test-files map for added, removed and changed test files."""
+        changed = set(self._test_names) != set(self._test_paths)
+        for path in self._test_paths:
+            try:
+                content = self._read(path)
+            except Exception:
+                content = None
+            signature = self._files[path][0] if content is not None else None
+            
+            cached = self._test_names.get(path)
+            if cached is None or cached[0] != signature:
+                self._test_names[path] = (signature, _mentioned_names(content or ""))
+                changed = True
+        
+        if changed:
+            self._test_names = {path: self._test_names[path] for path in self._test_paths}
+            tests_by_name: Dict[str, List[Path]] = {}
+            for path in self._test_paths:
+                for name in self._test_names[path][1]:
+                    tests_by_name.setdefault(name, []).append(path)
+            self._tests_by_name = tests_by_name
+    
+    def _preview(self, path: Path) -> Optional[str]:
+        """First 500 characters of a file, if it can be read."""
+        try:
+            content = self._read(path)
+        except Exception:
+            return None
+        return content[:500] if content is not None else None
     
     def _find_related_files(self, target_file: str) -> Dict[str, str]:
         """Find files that import or are imported by target file."""
@@ -309,34 +471,29 @@ whether code should be INTEGRATED rather than REMOVED.
         # Simple heuristic: files in same directory
         target_path = Path(target_file)
         if target_path.parent != Path('.'):
-            directory = self.project_dir / target_path.parent
-            if directory.exists():
-                for file in directory.glob('*.py'):
-                    if file.name != target_path.name:
-                        try:
-                            content = file.read_text()
-                            # Only include first 500 chars as preview
-                            related[str(file.relative_to(self.project_dir))] = content[:500]
-                        except:
-                            pass
+            self._refresh_layout()
+            for file in self._modules_by_dir.get(self.project_dir / target_path.parent, []):
+                if file.name != target_path.name:
+                    preview = self._preview(file)
+                    if preview is not None:
+                        related[str(file.relative_to(self.project_dir))] = preview
         
         return related
     
     def _find_test_files(self, target_file: str) -> Dict[str, str]:
-        """Find test files related to target file."""
-        tests = {}
+        """
+        Find test files related to target file: those that mention its
+        module name (all test files when there is no target).
+        """
+        self._refresh_layout()
+        self._refresh_test_map()
         
-        # Look for test files
-        test_patterns = ['test_*.py', '*_test.py']
-        for pattern in test_patterns:
-            for test_file in self.project_dir.rglob(pattern):
-                try:
-                    content = test_file.read_text()
-                    # Check if it references target file
-                    if Path(target_file).stem in content:
-                        tests[str(test_file.relative_to(self.project_dir))] = content[:500]
-                except:
-                    pass
+        stem = Path(target_file).stem
+        tests = {}
+        for test_file in self._tests_by_name.get(stem, []) if stem else self._test_paths:
+            preview = self._preview(test_file)
+            if preview is not None:
+                tests[str(test_file.relative_to(self.project_dir))] = preview
         
         return tests
     
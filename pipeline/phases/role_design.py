@@ -164,7 +164,7 @@ class RoleDesignPhase(LoopDetectionMixin, BasePhase):
         }
         
         if not any(t.get("function", {}).get("name") == "create_file" for t in tools):
-            tools.append(create_file_tool)
+            tools = tools.extended([create_file_tool])
         
         # Prepare messages
         messages = [
@@ -6,13 +6,138 @@ clustering, and trajectory analysis capabilities.
 """
 
 from typing import List, Dict, Tuple, Optional, Any
+import heapq
 import math
 from collections import defaultdict
 from datetime import datetime
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 from .polytopic_objective import PolytopicObjective
 
 
+class ObjectiveMatrix:
+    """
+    Contiguous row storage for objective vectors.
+    
+    Rows are kept in insertion order so results match iteration over the
+    objectives dict. Uses a NumPy array when available and plain lists
+    otherwise.
+    """
+    
+    def __init__(self):
+        """Initialize empty matrix."""
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.width = 0
+        self._sources: List[Any] = []  # Vector object each row was built from
+        self._data: Any = None
+        self.vectorised = NUMPY_AVAILABLE
+        
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def _fit(self, vector: List[float]) -> List[float]:
+        """Pad or truncate a vector to the matrix width."""
+        if len(vector) == self.width:
+            return list(vector)
+        return (list(vector) + [0.0] * self.width)[:self.width]
+    
+    def upsert(self, objective_id: str, vector: List[float]) -> None:
+        """
+        Insert or refresh the row for an objective.
+        
+        Args:
+            objective_id: Objective ID
+            vector: Dimensional vector
+        """
+        if not self.ids:
+            self.width = len(vector)
+            self._data = np.empty((16, self.width)) if self.vectorised else []
+        
+        row = self.rows.get(objective_id)
+        values = self._fit(vector)
+        
+        if row is None:
+            row = len(self.ids)
+            self.ids.append(objective_id)
+            self.rows[objective_id] = row
+            self._sources.append(vector)
+            if self.vectorised:
+                if row >= self._data.shape[0]:
+                    grown = np.empty((self._data.shape[0] * 2, self.width))
+                    grown[:row] = self._data[:row]
+                    self._data = grown
+                self._data[row] = values
+            else:
+                self._data.append(values)
+        else:
+            self._sources[row] = vector
+            self._data[row] = values
+    
+    def remove(self, objective_id: str) -> None:
+        """
+        Remove an objective's row, preserving the order of the others.
+        
+        Args:
+            objective_id: Objective ID
+        """
+        row = self.rows.pop(objective_id, None)
+        if row is None:
+            return
+        
+        del self.ids[row]
+        del self._sources[row]
+        if self.vectorised:
+            count = len(self.ids)
+            self._data[row:count] = self._data[row + 1:count + 1]
+        else:
+            del self._data[row]
+        for index in range(row, len(self.ids)):
+            self.rows[self.ids[index]] = index
+    
+    def sync(self, objectives: Dict[str, PolytopicObjective]) -> None:
+        """
+        Refresh rows whose objective vector has been replaced.
+        
+        Objectives replace ``polytopic_position`` whenever their profile
+        changes, so an identity check per row is enough to detect drift.
+        """
+        for row, objective_id in enumerate(self.ids):
+            vector = objectives[objective_id].get_dimensional_vector()
+            if vector is not self._sources[row]:
+                self.upsert(objective_id, vector)
+    
+    def array(self) -> Any:
+        """Get the live rows (NumPy array view or list of lists)."""
+        if self.vectorised:
+            return self._data[:len(self.ids)]
+        return self._data
+    
+    def distances_from(self, vector: List[float]) -> Any:
+        """
+        Euclidean distance from a vector to every row.
+        
+        Args:
+            vector: Reference vector
+            
+        Returns:
+            Distances in row order (NumPy array or list)
+        """
+        values = self._fit(vector)
+        if self.vectorised:
+            diff = self.array() - np.asarray(values)
+            return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+        return [
+            math.sqrt(sum((a - b) ** 2 for a, b in zip(values, row)))
+            for row in self._data
+        ]
+
+
 class DimensionalSpace:
     """
     8D hyperdimensional space for objective navigation.
@@ -38,6 +163,7 @@ class DimensionalSpace:
         self.objectives: Dict[str, PolytopicObjective] = {}
         self.adjacency_graph: Dict[str, List[str]] = defaultdict(list)
         self.clusters: Dict[str, List[str]] = {}  # cluster_id -> [objective_ids]
+        self.matrix = ObjectiveMatrix()  # Row-aligned copy of objective vectors
         
     def add_objective(self, objective: PolytopicObjective) -> None:
         """
@@ -47,6 +173,7 @@ class DimensionalSpace:
             objective: Polytopic objective to add
         """
         self.objectives[objective.id] = objective
+        self.matrix.upsert(objective.id, objective.get_dimensional_vector())
         
         # Update adjacency graph
         self._update_adjacency(objective)
@@ -60,6 +187,7 @@ class DimensionalSpace:
         """
         if objective_id in self.objectives:
             del self.objectives[objective_id]
+            self.matrix.remove(objective_id)
             
             # Clean up adjacency graph
             if objective_id in self.adjacency_graph:
@@ -80,20 +208,40 @@ class DimensionalSpace:
         objective_id = objective.id
         self.adjacency_graph[objective_id] = []
         
-        for other_id, other_obj in self.objectives.items():
+        self._sync_matrix()
+        distances = self.matrix.distances_from(objective.get_dimensional_vector())
+        
+        for row in self._rows_within(distances, threshold):
+            other_id = self.matrix.ids[row]
             if other_id == objective_id:
                 continue
                 
-            if objective.is_adjacent_to(other_obj, threshold):
-                self.adjacency_graph[objective_id].append(other_id)
+            self.adjacency_graph[objective_id].append(other_id)
                 
-                # Update reverse adjacency
-                if objective_id not in self.adjacency_graph[other_id]:
-                    self.adjacency_graph[other_id].append(objective_id)
+            # Update reverse adjacency
+            if objective_id not in self.adjacency_graph[other_id]:
+                self.adjacency_graph[other_id].append(objective_id)
         
         # Update objective's adjacent_objectives list
         objective.adjacent_objectives = self.adjacency_graph[objective_id]
     
+    def _sync_matrix(self) -> None:
+        """Make sure every objective has an up-to-date matrix row."""
+        if len(self.matrix) != len(self.objectives):
+            for objective_id in list(self.matrix.ids):
+                if objective_id not in self.objectives:
+                    self.matrix.remove(objective_id)
+            for objective_id, objective in self.objectives.items():
+                if objective_id not in self.matrix.rows:
+                    self.matrix.upsert(objective_id, objective.get_dimensional_vector())
+        self.matrix.sync(self.objectives)
+    
+    def _rows_within(self, distances: Any, max_distance: float) -> List[int]:
+        """Row indexes whose distance is at most max_distance, in row order."""
+        if self.matrix.vectorised:
+            return np.flatnonzero(distances <= max_distance).tolist()
+        return [row for row, distance in enumerate(distances) if distance <= max_distance]
+    
     def calculate_position(self, objective: PolytopicObjective) -> List[float]:
         """
         Calculate position in 8D space.
@@ -117,18 +265,34 @@ class DimensionalSpace:
         Returns:
             List of (objective, distance) tuples, sorted by distance
         """
-        distances = []
+        if k <= 0 or not self.objectives:
+            return []
         
-        for other_id, other_obj in self.objectives.items():
-            if other_id == objective.id:
-                continue
+        self._sync_matrix()
+        distances = self.matrix.distances_from(objective.get_dimensional_vector())
+        own_row = self.matrix.rows.get(objective.id)
                 
-            distance = objective.calculate_distance_to(other_obj)
-            distances.append((other_obj, distance))
-        
-        # Sort by distance and return top k
-        distances.sort(key=lambda x: x[1])
-        return distances[:k]
+        if self.matrix.vectorised:
+            distances = distances.copy()
+            if own_row is not None:
+                distances[own_row] = np.inf
+            count = min(k, len(distances) - (own_row is not None))
+            if count <= 0:
+                return []
+            # Partial sort, then take every row tied with the k-th distance
+            # and stable-sort so ties keep insertion order
+            kth = distances[np.argpartition(distances, count - 1)[:count]].max()
+            candidates = np.flatnonzero(distances <= kth)
+            ordered = candidates[np.argsort(distances[candidates], kind='stable')][:count]
+            nearest = [(int(row), float(distances[row])) for row in ordered]
+        else:
+            nearest = heapq.nsmallest(
+                k,
+                ((row, distance) for row, distance in enumerate(distances) if row != own_row),
+                key=lambda x: x[1]
+            )
+        
+        return [(self.objectives[self.matrix.ids[row]], distance) for row, distance in nearest]
     
     def find_similar_objectives(self, objective: PolytopicObjective, 
                                similarity_threshold: float = 0.7) -> List[Tuple[PolytopicObjective, float]]:
@@ -144,13 +308,18 @@ class DimensionalSpace:
         """
         similar = []
         
-        for other_id, other_obj in self.objectives.items():
+        self._sync_matrix()
+        distances = self.matrix.distances_from(objective.get_dimensional_vector())
+        max_distance = math.sqrt(7)  # Same normalisation as calculate_similarity
+        
+        for row, distance in enumerate(distances.tolist() if self.matrix.vectorised else distances):
+            other_id = self.matrix.ids[row]
             if other_id == objective.id:
                 continue
                 
-            similarity = objective.calculate_similarity(other_obj)
+            similarity = 1.0 - (distance / max_distance)
             if similarity >= similarity_threshold:
-                similar.append((other_obj, similarity))
+                similar.append((self.objectives[other_id], similarity))
         
         # Sort by similarity (descending)
         similar.sort(key=lambda x: x[1], reverse=True)
@@ -189,17 +358,21 @@ class DimensionalSpace:
         if not objective_ids:
             return [0.5] * self.dimensions
         
-        positions = [self.objectives[obj_id].get_dimensional_vector() 
-                    for obj_id in objective_ids if obj_id in self.objectives]
+        self._sync_matrix()
+        rows = [self.matrix.rows[obj_id] for obj_id in objective_ids if obj_id in self.objectives]
         
-        if not positions:
+        if not rows:
             return [0.5] * self.dimensions
         
         # Calculate mean across all dimensions
-        centroid = [sum(pos[i] for pos in positions) / len(positions) 
-                   for i in range(self.dimensions)]
-        
-        return centroid
+        if self.matrix.vectorised:
+            centroid = self.matrix.array()[rows].mean(axis=0).tolist()
+        else:
+            positions = [self.matrix.array()[row] for row in rows]
+            centroid = [sum(pos[i] for pos in positions) / len(positions)
+                       for i in range(self.matrix.width)]
+        
+        return centroid[:self.dimensions]
     
     def cluster_objectives(self, max_distance: float = 0.4) -> Dict[str, List[str]]:
         """
@@ -214,43 +387,146 @@ class DimensionalSpace:
         if not self.objectives:
             return {}
         
-        # Simple agglomerative clustering
-        clusters = {obj_id: [obj_id] for obj_id in self.objectives.keys()}
+        self._sync_matrix()
+        if self.matrix.vectorised:
+            clusters = self._cluster_vectorised(max_distance)
+        else:
+            clusters = self._cluster_python(max_distance)
         
-        while True:
-            pass
-            # Find closest pair of clusters
-            min_distance = float('inf')
-            merge_pair = None
-            
-            cluster_ids = list(clusters.keys())
-            for i, c1 in enumerate(cluster_ids):
-                for c2 in cluster_ids[i+1:]:
-                    pass
-                    # Calculate distance between cluster centroids
-                    centroid1 = self.calculate_centroid(clusters[c1])
-                    centroid2 = self.calculate_centroid(clusters[c2])
-                    
-                    distance = math.sqrt(sum((a - b) ** 2 for a, b in zip(centroid1, centroid2)))
-                    
-                    if distance < min_distance:
-                        min_distance = distance
-                        merge_pair = (c1, c2)
+        # Assign cluster IDs
+        self.clusters = {f"cluster_{i}": members 
+                        for i, members in enumerate(clusters)}
+        
+        return self.clusters
+    
+    def _cluster_vectorised(self, max_distance: float) -> List[List[str]]:
+        """
+        Centroid-linkage agglomerative clustering over the NumPy matrix.
+        
+        Each cluster caches its nearest neighbour, so a merge only rescans
+        the merged cluster and the clusters whose cached neighbour was one of
+        the pair: O(n^2) vectorised work instead of recomputing every
+        centroid pair on every step.
+        
+        Args:
+            max_distance: Maximum centroid distance to merge
             
-            # Stop if no clusters are close enough to merge
-            if min_distance > max_distance or merge_pair is None:
+        Returns:
+            Member lists of the surviving clusters, in insertion order
+        """
+        count = len(self.matrix)
+        members = [[obj_id] for obj_id in self.matrix.ids]
+        centroids = self.matrix.array().copy()
+        sizes = np.ones(count)
+        active = np.ones(count, dtype=bool)
+        indexes = np.arange(count)
+        
+        def distances_to(i: int) -> Any:
+            diff = centroids - centroids[i]
+            distances = np.sqrt(np.einsum('ij,ij->i', diff, diff))
+            distances[~active] = np.inf
+            distances[i] = np.inf
+            return distances
+        
+        nearest = np.zeros(count, dtype=int)
+        nearest_distance = np.full(count, np.inf)
+        for i in range(count):
+            distances = distances_to(i)
+            nearest[i] = int(np.argmin(distances))
+            nearest_distance[i] = distances[nearest[i]]
+        
+        while count > 1:
+            # First pair in (i, j) order at the minimum centroid distance
+            i = int(np.argmin(nearest_distance))
+            if nearest_distance[i] > max_distance:
                 break
+            j = int(nearest[i])
+            
+            # Merge j into i
+            members[i].extend(members[j])
+            centroids[i] = (centroids[i] * sizes[i] + centroids[j] * sizes[j]) / (sizes[i] + sizes[j])
+            sizes[i] += sizes[j]
+            active[j] = False
+            nearest_distance[j] = np.inf
+            count -= 1
+            
+            distances = distances_to(i)
+            nearest[i] = int(np.argmin(distances))
+            nearest_distance[i] = distances[nearest[i]]
+            
+            stale = active & ((nearest == i) | (nearest == j))
+            stale[i] = False
+            closer = active & ~stale & (
+                (distances < nearest_distance) |
+                ((distances == nearest_distance) & (i < nearest))
+            )
+            closer[i] = False
+            nearest[closer] = i
+            nearest_distance[closer] = distances[closer]
             
-            # Merge clusters
-            c1, c2 = merge_pair
-            clusters[c1].extend(clusters[c2])
-            del clusters[c2]
+            for k in indexes[stale]:
+                distances = distances_to(k)
+                nearest[k] = int(np.argmin(distances))
+                nearest_distance[k] = distances[nearest[k]]
         
-        # Assign cluster IDs
-        self.clusters = {f"cluster_{i}": members 
-                        for i, members in enumerate(clusters.values())}
+        return [members[i] for i in indexes[active]]
+    
+    def _cluster_python(self, max_distance: float) -> List[List[str]]:
+        """
+        Pure-Python fallback for ``_cluster_vectorised``.
         
-        return self.clusters
+        Args:
+            max_distance: Maximum centroid distance to merge
+            
+        Returns:
+            Member lists of the surviving clusters, in insertion order
+        """
+        count = len(self.matrix)
+        members = [[obj_id] for obj_id in self.matrix.ids]
+        centroids = [list(row) for row in self.matrix.array()]
+        sizes = [1] * count
+        active = [True] * count
+        
+        def nearest_to(i: int) -> Tuple[int, float]:
+            best, best_distance = -1, float('inf')
+            for k in range(count):
+                if k == i or not active[k]:
+                    continue
+                distance = math.sqrt(sum((a - b) ** 2 for a, b in zip(centroids[i], centroids[k])))
+                if distance < best_distance:
+                    best, best_distance = k, distance
+            return best, best_distance
+        
+        nearest = [nearest_to(i) for i in range(count)]
+        remaining = count
+        
+        while remaining > 1:
+            i = min((k for k in range(count) if active[k]), key=lambda k: nearest[k][1])
+            j, distance = nearest[i]
+            if distance > max_distance:
+                break
+            
+            # Merge j into i
+            members[i].extend(members[j])
+            total = sizes[i] + sizes[j]
+            centroids[i] = [(a * sizes[i] + b * sizes[j]) / total
+                           for a, b in zip(centroids[i], centroids[j])]
+            sizes[i] = total
+            active[j] = False
+            remaining -= 1
+            
+            nearest[i] = nearest_to(i)
+            for k in range(count):
+                if k == i or not active[k]:
+                    continue
+                if nearest[k][0] in (i, j):
+                    nearest[k] = nearest_to(k)
+                    continue
+                distance = math.sqrt(sum((a - b) ** 2 for a, b in zip(centroids[k], centroids[i])))
+                if distance < nearest[k][1] or (distance == nearest[k][1] and i < nearest[k][0]):
+                    nearest[k] = (i, distance)
+        
+        return [members[i] for i in range(count) if active[i]]
     
     def get_cluster_for_objective(self, objective_id: str) -> Optional[str]:
         """
@@ -282,14 +558,28 @@ class DimensionalSpace:
         
         stats = {}
         
-        for i, dim_name in enumerate(dimension_names):
-            values = [obj.get_dimensional_vector()[i] for obj in self.objectives.values()]
+        self._sync_matrix()
+        vectors = self.matrix.array()
+        
+        for i, dim_name in enumerate(dimension_names[:self.matrix.width]):
+            if self.matrix.vectorised:
+                column = vectors[:, i]
+                stats[dim_name] = {
+                    "mean": float(column.mean()),
+                    "min": float(column.min()),
+                    "max": float(column.max()),
+                    "std": float(column.std())
+                }
+                continue
+            
+            values = [row[i] for row in vectors]
+            mean = sum(values) / len(values)
             
             stats[dim_name] = {
-                "mean": sum(values) / len(values),
+                "mean": mean,
                 "min": min(values),
                 "max": max(values),
-                "std": math.sqrt(sum((v - sum(values)/len(values))**2 for v in values) / len(values))
+                "std": math.sqrt(sum((v - mean)**2 for v in values) / len(values))
             }
         
         return stats
@@ -51,6 +51,38 @@ class SpecialistAgent:
         - confidence: Confidence level (0-1)
         """
         
+        # Call the specialist model
+        response = self.client.chat(
+            self.config.host,
+            self.config.model,
+            self._analysis_messages(thread),
+            tools,
+            temperature=self.config.temperature,
+            timeout=None  # UNLIMITED - wait forever
+        )
+        
+        return self._analysis_from_response(response)
+    
+    async def analyze_async(self, thread: DebuggingConversationThread, tools: List[Dict],
+                            async_client, timeout: Optional[float] = None) -> Dict:
+        """
+        Same as ``analyze``, awaiting the model on an ``AsyncOllamaClient``
+        so several specialists can be consulted at once.
+        """
+        response = await async_client.chat(
+            self.config.host,
+            self.config.model,
+            self._analysis_messages(thread),
+            tools,
+            temperature=self.config.temperature,
+            timeout=timeout
+        )
+        
+        return self._analysis_from_response(response)
+    
+    def _analysis_messages(self, thread: DebuggingConversationThread) -> List[Dict]:
+        """Conversation history followed by the specialist's analysis request"""
+        
         # Build prompt with full context
         prompt = self._build_analysis_prompt(thread)
         
@@ -63,15 +95,10 @@ class SpecialistAgent:
             "content": prompt
         })
         
-        # Call the specialist model
-        response = self.client.chat(
-            self.config.host,
-            self.config.model,
-            messages,
-            tools,
-            temperature=self.config.temperature,
-            timeout=None  # UNLIMITED - wait forever
-        )
+        return messages
+    
+    def _analysis_from_response(self, response: Dict) -> Dict:
+        """Build the analysis dict from a model response"""
         
         if "error" in response:
             return {
@@ -362,6 +389,28 @@ Provide strategic, high-level analysis and recommendations."""
         
         return analysis
     
+    async def consult_specialist_async(self, specialist_name: str,
+                                       thread: DebuggingConversationThread,
+                                       tools: List[Dict], async_client,
+                                       timeout: Optional[float] = None) -> Dict:
+        """Consult a specific specialist without blocking (see ``analyze_async``)"""
+        
+        if specialist_name not in self.specialists:
+            return {
+                "error": f"Specialist '{specialist_name}' not found",
+                "available": list(self.specialists.keys())
+            }
+        
+        self.logger.info(f"  🔬 Consulting {specialist_name}...")
+        
+        specialist = self.specialists[specialist_name]
+        analysis = await specialist.analyze_async(thread, tools, async_client, timeout=timeout)
+        
+        # Add to thread
+        thread.add_specialist_analysis(specialist_name, analysis)
+        
+        return analysis
+    
     def consult_team(self, thread: DebuggingConversationThread, 
                     tools: List[Dict],
                     specialists: Optional[List[str]] = None) -> Dict:
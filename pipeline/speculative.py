@@ -0,0 +1,307 @@
+"""
+Speculative Tool-Call Drafting
+
+Many model turns end in a simple, predictable tool call (read a file, list
+a directory, pick the next phase) that the small ``routing`` model can
+produce in a fraction of the time of the 32b phase model. In speculative
+mode the small model drafts the call first, seeing the same system prompt
+and the latest turns of the conversation, and the draft is used in place
+of the large model's answer only when:
+
+- it names one of the tools allowed for the call site (``DRAFTABLE_TOOLS``
+  for phase turns, every arbiter tool for routing decisions),
+- its arguments validate against the tool's JSON schema, and
+- the draft's self-reported confidence reaches the threshold
+  (``config.draft_confidence_threshold``).
+
+Otherwise the draft is discarded and the large model is called as usual.
+Acceptance per call site, and the large-model time saved (the large
+model's median call time, from the metrics store, for each accepted draft,
+less the time spent on all drafts), are kept in ``DraftStats``.
+
+Example:
+    response = client.drafter.draft_response(messages, tools, site="qa",
+                                             large_model=model)
+    if response is None:
+        response = client.chat(host, model, messages, tools=tools)
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from .logging_setup import get_logger
+
+
+# Phase-turn tool calls the small model may answer on its own
+DRAFTABLE_TOOLS = frozenset({
+    "read_file",
+    "list_directory",
+    "search_code",
+})
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.8
+
+# Latest conversation messages (besides the system prompt) shown to the small model
+_DRAFT_HISTORY_MESSAGES = 4
+
+_JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
+
+def _tool_function(tool: Dict) -> Dict:
+    """The function definition of an Ollama tool (``{"function": ...}``) or a bare one."""
+    return tool.get("function", tool)
+
+
+def validate_tool_call(name: str, arguments, tools: Iterable[Dict]) -> Optional[str]:
+    """
+    Check a tool call against the offered tools' JSON schemas.
+    
+    Returns:
+        None when valid, else the reason it is not
+    """
+    schema = None
+    for tool in tools:
+        function = _tool_function(tool)
+        if function.get("name") == name:
+            schema = function.get("parameters") or {}
+            break
+    else:
+        return f"unknown tool '{name}'"
+    
+    if not isinstance(arguments, dict):
+        return "arguments are not an object"
+    
+    properties = schema.get("properties", {})
+    for required in schema.get("required", []):
+        if arguments.get(required) in (None, ""):
+            return f"missing required argument '{required}'"
+    
+    for arg_name, value in arguments.items():
+        spec = properties.get(arg_name)
+        if spec is None:
+            if properties:
+                return f"unknown argument '{arg_name}'"
+            continue
+        expected = _JSON_TYPES.get(spec.get("type"))
+        if expected and (not isinstance(value, expected) or
+                         (isinstance(value, bool) and spec.get("type") != "boolean")):
+            return f"argument '{arg_name}' is not {spec.get('type')}"
+        if "enum" in spec and value not in spec["enum"]:
+            return f"argument '{arg_name}' not in {spec['enum']}"
+    return None
+
+
+def _parse_draft(content: str) -> Optional[Dict]:
+    """The first JSON object in the small model's reply."""
+    content = content.strip()
+    start = content.find("{")
+    while start != -1:
+        try:
+            data, _ = json.JSONDecoder().raw_decode(content[start:])
+            if isinstance(data, dict):
+                return data
+        except json.JSONDecodeError:
+            pass
+        start = content.find("{", start + 1)
+    return None
+
+
+class DraftStats:
+    """Draft outcomes of one call site."""
+    
+    def __init__(self):
+        self.drafts = 0
+        self.accepted = 0
+        self.rejections: Counter = Counter()
+        self.draft_seconds = 0.0
+        self.saved_seconds = 0.0
+    
+    @property
+    def acceptance_rate(self) -> float:
+        return self.accepted / self.drafts if self.drafts else 0.0
+    
+    @property
+    def net_saved_seconds(self) -> float:
+        """Large-model time avoided minus time spent drafting."""
+        return self.saved_seconds - self.draft_seconds
+    
+    def to_dict(self) -> Dict:
+        return {
+            "drafts": self.drafts,
+            "accepted": self.accepted,
+            "acceptance_rate": round(self.acceptance_rate, 3),
+            "rejections": dict(self.rejections),
+            "draft_seconds": round(self.draft_seconds, 2),
+            "saved_seconds": round(self.saved_seconds, 2),
+            "net_saved_seconds": round(self.net_saved_seconds, 2),
+        }
+
+
+class SpeculativeDrafter:
+    """
+    Drafts tool calls with the small routing model before the large model.
+    
+    Shared by every phase through ``OllamaClient.drafter``; inactive unless
+    ``config.speculative_drafting`` is set.
+    """
+    
+    def __init__(self, client, threshold: float = None):
+        """
+        Initialize drafter.
+        
+        Args:
+            client: OllamaClient used for the draft calls (and its metrics)
+            threshold: Minimum draft confidence (default: from config)
+        """
+        self.client = client
+        self.logger = get_logger()
+        config = client.config
+        self.enabled = getattr(config, 'speculative_drafting', False)
+        self.threshold = threshold if threshold is not None else getattr(
+            config, 'draft_confidence_threshold', DEFAULT_CONFIDENCE_THRESHOLD)
+        self.stats: Dict[str, DraftStats] = {}
+        self._lock = threading.Lock()
+    
+    def draft_tool_call(self, messages: List[Dict], tools: List[Dict]) -> Dict:
+        """
+        Ask the small model for one tool call answering a conversation.
+        
+        Args:
+            messages: Conversation sent to the large model; its system prompt
+                and latest ``_DRAFT_HISTORY_MESSAGES`` messages are forwarded
+            tools: Tools the call may use
+        
+        Returns:
+            Dict with 'name', 'arguments' and 'confidence' (the draft), or
+            'error' when no draft could be produced
+        """
+        selection = self.client.get_model_for_task("routing")
+        if not selection:
+            return {"error": "unavailable"}
+        host, model = selection
+        
+        tool_lines = []
+        for tool in tools:
+            function = _tool_function(tool)
+            parameters = function.get("parameters", {})
+            required = set(parameters.get("required", []))
+            params = ", ".join(f"{name}{'' if name in required else '?'}"
+                               for name in parameters.get("properties", {}))
+            tool_lines.append(f"- {function.get('name')}({params}): {function.get('description', '')[:200]}")
+        
+        request = f"""Choose the single tool call that answers the last request above. Output ONLY JSON.
+
+Available tools:
+{chr(10).join(tool_lines)}
+
+Output format: {{"name": "tool_name", "arguments": {{"param": "value"}}, "confidence": 0.0-1.0}}
+Set confidence below 0.5 if the request needs more than one simple call.
+Output ONLY the JSON, nothing else:"""
+        
+        system = [m for m in messages if m.get("role") == "system"][:1]
+        history = [m for m in messages if m.get("role") != "system"][-_DRAFT_HISTORY_MESSAGES:]
+        response = self.client.chat(host, model, system + history + [{"role": "user", "content": request}],
+                                    tools=None, temperature=0.1)
+        if "error" in response:
+            return {"error": "error"}
+        draft = _parse_draft(response.get("message", {}).get("content", ""))
+        if not draft or "name" not in draft:
+            return {"error": "unparseable"}
+        draft["model"] = model
+        return draft
+    
+    def draft_response(self, messages: List[Dict], tools: List[Dict], site: str,
+                       large_model: str = None, allowed: Iterable[str] = DRAFTABLE_TOOLS) -> Optional[Dict]:
+        """
+        Draft a tool call for a conversation and return it as a chat response.
+        
+        Args:
+            messages: Conversation sent to the large model
+            tools: Tools offered to the large model
+            site: Call site for the acceptance statistics (phase name, "arbiter")
+            large_model: Model the draft stands in for (to estimate time saved)
+            allowed: Tool names a draft may call (None = any offered tool)
+        
+        Returns:
+            Response shaped like ``OllamaClient.chat`` with the draft as its
+            only tool call, or None when the large model must be called
+        """
+        if not self.enabled or not tools:
+            return None
+        offered = tools if allowed is None else [
+            tool for tool in tools if _tool_function(tool).get("name") in allowed]
+        if not offered:
+            return None
+        if not any(m.get("role") == "user" and m.get("content") for m in messages):
+            return None
+        
+        start_time = time.perf_counter()
+        draft = self.draft_tool_call(messages, tools)
+        draft_seconds = time.perf_counter() - start_time
+        
+        reason = draft.get("error")
+        if reason is None:
+            invalid = validate_tool_call(draft["name"], draft.get("arguments", {}), offered)
+            confidence = draft.get("confidence")
+            if invalid and invalid.startswith("unknown tool"):
+                reason = "not_draftable"
+            elif invalid:
+                reason = "schema"
+                self.logger.debug(f"  Draft rejected ({invalid})")
+            elif not isinstance(confidence, (int, float)) or confidence < self.threshold:
+                reason = "low_confidence"
+        if reason == "unavailable":
+            return None
+        
+        saved = 0.0
+        if reason is None and large_model:
+            saved = self.client.metrics.summary("model").get(large_model, {}).get("p50_total_seconds") or 0.0
+        
+        with self._lock:
+            stats = self.stats.setdefault(site, DraftStats())
+            stats.drafts += 1
+            stats.draft_seconds += draft_seconds
+            if reason is None:
+                stats.accepted += 1
+                stats.saved_seconds += saved
+            else:
+                stats.rejections[reason] += 1
+        
+        if reason is not None:
+            return None
+        
+        self.logger.info(f"  ⚡ Draft accepted: {draft['name']} by {draft['model']} "
+                         f"(confidence {draft['confidence']:.2f}, {draft_seconds:.1f}s)")
+        return {
+            "message": {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [{"function": {"name": draft["name"], "arguments": draft.get("arguments", {})}}],
+            },
+            "draft": {"model": draft["model"], "confidence": draft["confidence"]},
+        }
+    
+    def summary(self) -> Dict[str, Dict]:
+        """Draft statistics per call site."""
+        with self._lock:
+            return {site: stats.to_dict() for site, stats in self.stats.items()}
+    
+    def format_report(self) -> List[str]:
+        """Report lines: acceptance rate and time saved per call site."""
+        lines = []
+        for site, data in sorted(self.summary().items()):
+            rejections = ", ".join(f"{reason}={count}" for reason, count in sorted(data["rejections"].items()))
+            lines.append(f"    {site:<16} {data['accepted']}/{data['drafts']} accepted "
+                         f"({data['acceptance_rate']:.0%}), net {data['net_saved_seconds']:+.1f}s"
+                         f"{f' [{rejections}]' if rejections else ''}")
+        return lines
@@ -6,6 +6,7 @@ Tracks file hashes and timestamps to detect changes.
 
 import hashlib
 import json
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Set
@@ -26,6 +27,7 @@ class FileTracker:
         self.logger = get_logger()
         
         self._hashes: Dict[str, Dict] = {}
+        self._lock = threading.RLock()  # Concurrent task workers share the tracker
         self._load_hashes()
     
     def _load_hashes(self):
@@ -41,7 +43,8 @@ class FileTracker:
         """Save hashes to disk"""
         self.hash_file.parent.mkdir(parents=True, exist_ok=True)
         try:
-            self.hash_file.write_text(json.dumps(self._hashes, indent=2))
+            with self._lock:
+                self.hash_file.write_text(json.dumps(self._hashes, indent=2))
         except IOError as e:
             self.logger.error(f"Failed to save hashes: {e}")
     
@@ -70,20 +73,21 @@ class FileTracker:
         
         now = datetime.now().isoformat()
         
-        if filepath in self._hashes:
-            old_hash = self._hashes[filepath]["hash"]
-            if old_hash != content_hash:
-                self._hashes[filepath]["previous_hash"] = old_hash
-                self._hashes[filepath]["hash"] = content_hash
-                self._hashes[filepath]["modified"] = now
-        else:
-            self._hashes[filepath] = {
-                "hash": content_hash,
-                "created": now,
-                "modified": now,
-            }
+        with self._lock:
+            if filepath in self._hashes:
+                old_hash = self._hashes[filepath]["hash"]
+                if old_hash != content_hash:
+                    self._hashes[filepath]["previous_hash"] = old_hash
+                    self._hashes[filepath]["hash"] = content_hash
+                    self._hashes[filepath]["modified"] = now
+            else:
+                self._hashes[filepath] = {
+                    "hash": content_hash,
+                    "created": now,
+                    "modified": now,
+                }
         
-        self._save_hashes()
+            self._save_hashes()
         return content_hash
     
     def has_changed(self, filepath: str) -> bool:
@@ -14,6 +14,7 @@ from dataclasses import dataclass, field, asdict
 from enum import Enum
 
 from pipeline.logging_setup import get_logger
+from pipeline.tracing import traced
 
 
 class TaskStatus(str, Enum):
@@ -105,6 +106,24 @@ class TaskState:
             for e in self.errors
         ]
     
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in ("status", "attempts", "errors"):
+            self._notify_progress()
+    
+    def __getstate__(self):
+        # Copies are not tracked by the index that observes this task
+        state = dict(self.__dict__)
+        state.pop("_progress_observer", None)
+        state.pop("_progress_key", None)
+        return state
+    
+    def _notify_progress(self):
+        """Report a progress-relevant change to the owning state's index."""
+        observer = self.__dict__.get("_progress_observer")
+        if observer is not None:
+            observer(self)
+    
     def _sanitize_for_json(self, obj):
         """Recursively sanitize an object for JSON serialization."""
         from pathlib import Path, PosixPath, WindowsPath
@@ -145,6 +164,7 @@ class TaskState:
             phase=phase
         ))
         self.updated_at = datetime.now().isoformat()
+        self._notify_progress()
     
     def get_error_context(self, max_errors: int = 5) -> str:
         """Get formatted error context for LLM"""
@@ -400,6 +420,15 @@ class PipelineState:
             for k, v in self.phases.items()
         }
     
+        # Task counters maintained incrementally as tasks are added/updated
+        from .progress_index import TaskProgressIndex, TaskTable
+        self.tasks = TaskTable(self.tasks, TaskProgressIndex())
+    
+    @property
+    def progress_index(self):
+        """Status and objective progress counters of ``tasks``."""
+        return self.tasks.index
+    
     # Compatibility property aliases
     @property
     def run_id(self) -> str:
@@ -415,18 +444,12 @@ class PipelineState:
         """Check if all tasks are complete and ready for expansion planning"""
         if not self.tasks:
             return False
-        return all(
-            t.status in [TaskStatus.COMPLETED, TaskStatus.SKIPPED]
-            for t in self.tasks.values()
-        )
+        return self.progress_index.count(TaskStatus.COMPLETED, TaskStatus.SKIPPED) == len(self.tasks)
     
     @property
     def needs_documentation_update(self) -> bool:
         """Check if documentation needs updating after task completion"""
-        completed_count = sum(
-            1 for t in self.tasks.values()
-            if t.status == TaskStatus.COMPLETED
-        )
+        completed_count = self.progress_index.count(TaskStatus.COMPLETED)
         return completed_count > self.last_doc_update_count
     
     def calculate_completion_percentage(self) -> float:
@@ -442,7 +465,7 @@ class PipelineState:
             if not self.tasks:
                 return 0.0
             
-            completed = sum(1 for t in self.tasks.values() if t.status == TaskStatus.COMPLETED)
+            completed = self.progress_index.count(TaskStatus.COMPLETED)
             return (completed / len(self.tasks) * 100.0) if self.tasks else 0.0
         
         # Calculate based on objectives
@@ -650,6 +673,8 @@ class PipelineState:
     
     def get_tasks_by_status(self, status: TaskStatus) -> List[TaskState]:
         """Get all tasks with a specific status"""
+        if not self.progress_index.count(status):
+            return []
         return [t for t in self.tasks.values() if t.status == status]
     
     def get_tasks_by_priority(self, priority: int) -> List[TaskState]:
@@ -743,6 +768,7 @@ class StateManager:
         # Ensure state directory exists
         self.state_dir.mkdir(parents=True, exist_ok=True)
     
+    @traced("state.load", category="state")
     def load(self) -> PipelineState:
         """Load state from disk, or create new state"""
         if self.state_file.exists():
@@ -756,6 +782,7 @@ class StateManager:
         
         return PipelineState()
     
+    @traced("state.save", category="state")
     def save(self, state: PipelineState):
         """
         Save state to disk atomically.
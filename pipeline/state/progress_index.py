@@ -0,0 +1,247 @@
+"""
+Task Progress Index
+
+Keeps task status counters and per-objective progress counters up to date
+as tasks are added and change status, so completion checks don't have to
+rescan every task on every iteration.
+"""
+
+import copy
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple, Any
+
+from .manager import TaskStatus, TaskState
+
+
+class TaskTable(dict):
+    """
+    Task dict that reports inserts and removals to a progress index.
+    
+    Behaves exactly like the plain ``Dict[str, TaskState]`` it replaces.
+    Without an index (e.g. when rebuilt by ``dataclasses.asdict``) it is an
+    untracked dict. Pickled and deep-copied tables rebuild a fresh index
+    from the copied tasks.
+    """
+    
+    def __init__(self, tasks: Any = (), index: Optional["TaskProgressIndex"] = None):
+        super().__init__()
+        self._index = index
+        for task_id, task in dict(tasks).items():
+            self[task_id] = task
+    
+    @property
+    def index(self) -> Optional["TaskProgressIndex"]:
+        """The progress index this table reports to."""
+        return self._index
+    
+    def __reduce__(self):
+        index = TaskProgressIndex() if self._index is not None else None
+        return (self.__class__, (dict(self), index))
+    
+    def __deepcopy__(self, memo):
+        table = self.__class__((), TaskProgressIndex() if self._index is not None else None)
+        memo[id(self)] = table
+        for task_id, task in self.items():
+            table[copy.deepcopy(task_id, memo)] = copy.deepcopy(task, memo)
+        return table
+    
+    def __copy__(self):
+        # A shallow copy shares the task objects, which can only report to one
+        # index, so it is a plain dict (as ``dict.copy`` returns)
+        return dict(self)
+    
+    def __setitem__(self, task_id: str, task: TaskState):
+        old = self.get(task_id)
+        super().__setitem__(task_id, task)
+        if self._index is None:
+            return
+        if old is not None and old is not task:
+            self._index.task_removed(task_id, old)
+        if old is not task:
+            self._index.task_added(task_id, task)
+    
+    def __delitem__(self, task_id: str):
+        old = self[task_id]
+        super().__delitem__(task_id)
+        if self._index is not None:
+            self._index.task_removed(task_id, old)
+    
+    def pop(self, task_id: str, *default):
+        if task_id not in self:
+            return super().pop(task_id, *default)
+        old = super().pop(task_id)
+        if self._index is not None:
+            self._index.task_removed(task_id, old)
+        return old
+    
+    def popitem(self):
+        task_id, old = super().popitem()
+        if self._index is not None:
+            self._index.task_removed(task_id, old)
+        return task_id, old
+    
+    def setdefault(self, task_id: str, default: Optional[TaskState] = None):
+        if task_id not in self:
+            self[task_id] = default
+        return self[task_id]
+    
+    def update(self, *args, **kwargs):
+        for task_id, task in dict(*args, **kwargs).items():
+            self[task_id] = task
+    
+    def clear(self):
+        for task_id in list(self.keys()):
+            del self[task_id]
+
+
+class ObjectiveProgress:
+    """Progress counters for the task list of one objective."""
+    
+    def __init__(self, task_ids: List[str]):
+        self.task_ids = list(task_ids)
+        self.completed: Dict[str, int] = {}  # task_id -> occurrences in task_ids
+        self.attempts = 0
+        self.successful = 0
+        self.status_counts: Counter = Counter()  # Only tasks present in the state
+    
+    @property
+    def completed_count(self) -> int:
+        return sum(self.completed.values())
+    
+    def completed_list(self) -> List[str]:
+        """Completed task IDs (repeated as often as they appear in the objective)."""
+        return [task_id for task_id, count in self.completed.items() for _ in range(count)]
+    
+    def count(self, *statuses: Any) -> int:
+        """Number of the objective's tasks in any of the given statuses."""
+        return sum(self.status_counts.get(status, 0) for status in statuses)
+    
+    def apply(self, task_id: str, delta: Tuple[int, int, int], multiplicity: int):
+        """Apply a task contribution delta."""
+        completed, attempts, successful = delta
+        if completed:
+            count = self.completed.get(task_id, 0) + completed * multiplicity
+            if count > 0:
+                self.completed[task_id] = count
+            else:
+                self.completed.pop(task_id, None)
+        self.attempts += attempts * multiplicity
+        self.successful += successful * multiplicity
+
+
+class TaskProgressIndex:
+    """
+    Incrementally maintained task and objective progress counters.
+    
+    Tasks report changes to ``status``, ``attempts`` and ``errors`` through
+    an observer set on insert (see ``TaskState.__setattr__``), so every
+    update costs O(objectives containing the task) instead of a full rescan.
+    """
+    
+    def __init__(self):
+        self.status_counts: Counter = Counter()
+        self._contributions: Dict[str, Tuple[int, int, int]] = {}
+        self._statuses: Dict[str, Any] = {}
+        self._objectives: Dict[str, ObjectiveProgress] = {}
+        self._task_objectives: Dict[str, Counter] = defaultdict(Counter)
+    
+    @staticmethod
+    def _contribution(task: TaskState) -> Tuple[int, int, int]:
+        """(completed, attempts, successful) contribution of a task."""
+        completed = 1 if task.status == TaskStatus.COMPLETED else 0
+        attempts = task.attempts if task.attempts > 0 else 0
+        successful = 1 if attempts and completed and not task.errors else 0
+        return completed, attempts, successful
+    
+    def _apply(self, task_id: str, old: Tuple[int, int, int], new: Tuple[int, int, int]):
+        delta = (new[0] - old[0], new[1] - old[1], new[2] - old[2])
+        if delta == (0, 0, 0):
+            return
+        for objective_id, multiplicity in self._task_objectives.get(task_id, {}).items():
+            self._objectives[objective_id].apply(task_id, delta, multiplicity)
+    
+    def _move_status(self, task_id: str, old: Any, new: Any):
+        for objective_id, multiplicity in self._task_objectives.get(task_id, {}).items():
+            counts = self._objectives[objective_id].status_counts
+            if old is not None:
+                counts[old] -= multiplicity
+            if new is not None:
+                counts[new] += multiplicity
+    
+    def task_added(self, task_id: str, task: TaskState):
+        """Start tracking a task inserted into the state."""
+        object.__setattr__(task, '_progress_observer', self.task_changed)
+        object.__setattr__(task, '_progress_key', task_id)
+        self.status_counts[task.status] += 1
+        self._statuses[task_id] = task.status
+        self._move_status(task_id, None, task.status)
+        contribution = self._contribution(task)
+        self._apply(task_id, (0, 0, 0), contribution)
+        self._contributions[task_id] = contribution
+    
+    def task_removed(self, task_id: str, task: TaskState):
+        """Stop tracking a task removed from the state."""
+        if task.__dict__.get('_progress_observer') == self.task_changed:
+            object.__setattr__(task, '_progress_observer', None)
+        status = self._statuses.pop(task_id, task.status)
+        self.status_counts[status] -= 1
+        self._move_status(task_id, status, None)
+        self._apply(task_id, self._contributions.pop(task_id, (0, 0, 0)), (0, 0, 0))
+    
+    def task_changed(self, task: TaskState):
+        """Observer called when a tracked task's progress fields change."""
+        task_id = task.__dict__.get('_progress_key', task.task_id)
+        old_status = self._statuses.get(task_id)
+        if old_status != task.status:
+            self.status_counts[old_status] -= 1
+            self.status_counts[task.status] += 1
+            self._statuses[task_id] = task.status
+            self._move_status(task_id, old_status, task.status)
+        
+        contribution = self._contribution(task)
+        old = self._contributions.get(task_id, (0, 0, 0))
+        if contribution != old:
+            self._apply(task_id, old, contribution)
+            self._contributions[task_id] = contribution
+    
+    def count(self, *statuses: Any) -> int:
+        """Number of tasks currently in any of the given statuses."""
+        return sum(self.status_counts.get(status, 0) for status in statuses)
+    
+    def objective_progress(self, objective_id: str, task_ids: List[str]) -> ObjectiveProgress:
+        """
+        Get counters for an objective's task list.
+        
+        The task list is only re-indexed when it changed; appended task IDs
+        are indexed incrementally.
+        """
+        progress = self._objectives.get(objective_id)
+        if progress is not None and progress.task_ids == task_ids:
+            return progress
+        
+        known = len(progress.task_ids) if progress is not None else 0
+        if progress is None or task_ids[:known] != progress.task_ids:
+            self._forget_objective(objective_id)
+            progress = ObjectiveProgress([])
+            self._objectives[objective_id] = progress
+            known = 0
+        
+        for task_id in task_ids[known:]:
+            progress.task_ids.append(task_id)
+            self._task_objectives[task_id][objective_id] += 1
+            progress.apply(task_id, self._contributions.get(task_id, (0, 0, 0)), 1)
+            if task_id in self._statuses:
+                progress.status_counts[self._statuses[task_id]] += 1
+        
+        return progress
+    
+    def _forget_objective(self, objective_id: str):
+        progress = self._objectives.pop(objective_id, None)
+        if progress is None:
+            return
+        for task_id in set(progress.task_ids):
+            objectives = self._task_objectives.get(task_id)
+            if objectives is not None:
+                objectives.pop(objective_id, None)
+                if not objectives:
+                    del self._task_objectives[task_id]
@@ -10,15 +10,16 @@ import logging
 import time
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 
+from .async_client import AsyncOllamaClient
 from .client import OllamaClient
 from .specialist_agents import SpecialistTeam
 from .prompts.team_orchestrator import get_team_orchestrator_prompt
 from .conversation_thread import DebuggingConversationThread
+from .tracing import get_tracer
 
 
 @dataclass
@@ -113,6 +114,10 @@ class TeamOrchestrator:
         self.logger = logger
         self.max_workers = max_workers
         
+        # Concurrent specialist calls share the async transport's connections
+        self.async_client = getattr(client, 'async_client', None) or AsyncOllamaClient(client.config)
+        self.wave_timeout = getattr(client.config, 'orchestrator_timeout', None)
+        
         # Available servers
         self.servers = ["ollama01.thiscluster.net", "ollama02.thiscluster.net"]
         
@@ -209,7 +214,8 @@ class TeamOrchestrator:
             wave.start_time = time.time()
             
             # Execute tasks in wave in parallel
-            wave_results = self._execute_wave(wave, thread)
+            with get_tracer().span("orchestrator.wave", category="orchestrator", tasks=len(wave.tasks)):
+                wave_results = self._execute_wave(wave, thread)
             
             wave.end_time = time.time()
             
@@ -247,7 +253,11 @@ class TeamOrchestrator:
         thread: Optional[DebuggingConversationThread] = None
     ) -> Dict[str, Any]:
         """
-        Execute all tasks in a wave in parallel.
+        Execute all tasks in a wave concurrently.
+        
+        Requests are issued on the async client's event loop, so a wave
+        costs no thread per specialist call; at most ``max_workers`` tasks
+        run at once and each server's in-flight limit still applies.
         
         Args:
             wave: ExecutionWave to execute
@@ -258,30 +268,33 @@ class TeamOrchestrator:
         """
         results = {}
         
-        # Use ThreadPoolExecutor for parallel execution
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            pass
-            # Submit all tasks
-            future_to_task = {
-                executor.submit(self._execute_task, task, thread): task
-                for task in wave.tasks
-            }
+        async def run_wave():
+            slots = asyncio.Semaphore(self.max_workers)
             
-            # Collect results as they complete
-            for future in as_completed(future_to_task):
-                task = future_to_task[future]
-                try:
-                    result = future.result()
-                    task.result = result
-                    results[task.task_id] = result
-                except Exception as e:
-                    task.error = str(e)
-                    results[task.task_id] = {'error': str(e)}
-                    self.logger.error(f"   ✗ {task.task_id} failed: {e}")
+            async def run_task(task):
+                async with slots:
+                    return await self._execute_task(task, thread)
+            
+            return await asyncio.gather(*(run_task(task) for task in wave.tasks), return_exceptions=True)
+        
+        try:
+            outcomes = self.async_client.run(run_wave(), timeout=self.wave_timeout)
+        except TimeoutError as e:
+            outcomes = [e] * len(wave.tasks)
+        
+        # Collect results
+        for task, outcome in zip(wave.tasks, outcomes):
+            if isinstance(outcome, BaseException):
+                task.error = str(outcome) or type(outcome).__name__
+                results[task.task_id] = {'error': task.error}
+                self.logger.error(f"   ✗ {task.task_id} failed: {task.error}")
+            else:
+                task.result = outcome
+                results[task.task_id] = outcome
         
         return results
     
-    def _execute_task(
+    async def _execute_task(
         self,
         task: Task,
         thread: Optional[DebuggingConversationThread] = None
@@ -304,21 +317,19 @@ class TeamOrchestrator:
             self.server_load[task.server] += 1
             
             # Execute specialist consultation
-            result = self.specialist_team.consult_specialist(
+            result = await self.specialist_team.consult_specialist_async(
                 specialist_name=task.specialist,
                 thread=thread,
                 tools=task.input_data.get('tools', []),
-                context=task.input_data.get('context', {})
+                async_client=self.async_client,
+                timeout=task.timeout
             )
             
-            task.end_time = time.time()
-            
             return result
             
-        except Exception as e:
-            task.end_time = time.time()
-            raise
         finally:
+            task.end_time = time.time()
+            get_tracer().record("orchestrator.task", task.end_time - task.start_time)
             # Update server load
             self.server_load[task.server] -= 1
     
@@ -0,0 +1,202 @@
+"""
+Tool Call Planner
+
+Plans how a batch of tool calls from one model response can be executed
+concurrently without changing what the calls observe:
+
+- Read-only calls run concurrently with each other.
+- Read-only calls touching the same path keep their relative order.
+- Mutating (or unknown) calls are barriers: they run alone, after every
+  earlier call has finished and before any later call starts.
+"""
+
+import json
+from typing import Callable, Dict, List, Optional, Set
+
+from .logging_setup import get_logger
+
+
+# Tools whose handlers only read the project (no file writes, no handler
+# state changes). Anything not listed here is treated as mutating.
+READ_ONLY_TOOLS = frozenset({
+    # File inspection
+    "read_file",
+    "search_code",
+    "list_directory",
+    # Signatures, context and imports
+    "get_function_signature",
+    "validate_function_call",
+    "investigate_parameter_removal",
+    "investigate_data_flow",
+    "check_config_structure",
+    "analyze_missing_import",
+    "check_import_scope",
+    # Monitoring
+    "get_memory_profile",
+    "get_cpu_profile",
+    "inspect_process",
+    "get_system_resources",
+    "show_process_tree",
+    # System and on-demand analysis
+    "analyze_project_status",
+    "analyze_connectivity",
+    "analyze_integration_depth",
+    "trace_variable_flow",
+    "find_recursive_patterns",
+    "assess_code_quality",
+    "get_refactoring_suggestions",
+    "analyze_complexity",
+    "analyze_call_graph",
+    "detect_dead_code",
+    "find_integration_gaps",
+    "find_integration_conflicts",
+    # Refactoring queries
+    "list_refactoring_tasks",
+    "get_refactoring_progress",
+    "detect_duplicate_implementations",
+    "compare_file_implementations",
+    "extract_file_features",
+    "analyze_architecture_consistency",
+    "analyze_documentation_needs",
+    # Validation
+    "validate_function_calls",
+    "validate_method_existence",
+    "validate_dict_structure",
+    "validate_type_usage",
+    "validate_attribute_access",
+    "verify_import_class_match",
+    "check_abstract_methods",
+    "verify_tool_handlers",
+    "validate_syntax",
+    "detect_circular_imports",
+    "validate_all_imports",
+    "validate_dict_access",
+    "validate_imports_comprehensive",
+    # File discovery and codebase analysis
+    "find_similar_files",
+    "validate_filename",
+    "compare_files",
+    "find_all_conflicts",
+    "detect_naming_violations",
+    "analyze_file_placement",
+    "build_import_graph",
+    "analyze_import_impact",
+    "list_all_source_files",
+    "cross_reference_file",
+    "map_file_relationships",
+    "find_all_related_files",
+    "analyze_file_purpose",
+    "compare_multiple_files",
+})
+
+# Argument names that identify the file or directory a call touches
+PATH_ARGUMENTS = ("filepath", "file_path", "path", "file", "file1", "file2",
+                  "target", "directory", "source", "destination")
+
+
+class ToolCallPlanner:
+    """
+    Splits a list of tool calls into execution stages.
+    
+    ``plan`` returns a list of stages; each stage is a list of chains and
+    each chain a list of call indices. Stages run one after another, the
+    chains of a stage may run concurrently and the calls of a chain run in
+    order.
+    
+    Example:
+        planner = ToolCallPlanner()
+        for stage in planner.plan(tool_calls):
+            run_concurrently([run_in_order(chain) for chain in stage])
+    """
+    
+    def __init__(self, read_only_tools: Optional[Set[str]] = None,
+                 normalize_path: Optional[Callable[[str], str]] = None):
+        """
+        Initialize tool call planner.
+        
+        Args:
+            read_only_tools: Names of tools safe to run concurrently
+            normalize_path: Optional path normalizer (e.g. relative to project)
+        """
+        self.read_only_tools = frozenset(read_only_tools if read_only_tools is not None else READ_ONLY_TOOLS)
+        self.normalize_path = normalize_path or (lambda path: path)
+        self.logger = get_logger()
+    
+    @staticmethod
+    def call_name_and_args(call: Dict):
+        """Tool name and parsed arguments of a call ('' / {} when unusable)."""
+        func = call.get("function", {}) if isinstance(call, dict) else {}
+        name = func.get("name") or ""
+        args = func.get("arguments", {})
+        if isinstance(args, str):
+            try:
+                args = json.loads(args)
+            except json.JSONDecodeError:
+                args = {}
+        return name.strip(), args if isinstance(args, dict) else {}
+    
+    def is_read_only(self, call: Dict) -> bool:
+        """Whether a call can run concurrently with other read-only calls."""
+        name, _ = self.call_name_and_args(call)
+        return name in self.read_only_tools
+    
+    def paths(self, call: Dict) -> Set[str]:
+        """Normalized paths a call touches."""
+        _, args = self.call_name_and_args(call)
+        paths = set()
+        for key in PATH_ARGUMENTS:
+            value = args.get(key)
+            if isinstance(value, str) and value.strip():
+                paths.add(self.normalize_path(value).rstrip('/'))
+        return paths
+    
+    def plan(self, tool_calls: List[Dict]) -> List[List[List[int]]]:
+        """
+        Plan execution stages for a list of tool calls.
+        
+        Args:
+            tool_calls: Tool calls in model order
+        
+        Returns:
+            Stages of chains of call indices
+        """
+        stages: List[List[List[int]]] = []
+        pending: List[int] = []
+        
+        for index, call in enumerate(tool_calls):
+            if self.is_read_only(call):
+                pending.append(index)
+                continue
+            if pending:
+                stages.append(self._chains(tool_calls, pending))
+                pending = []
+            stages.append([[index]])
+        
+        if pending:
+            stages.append(self._chains(tool_calls, pending))
+        return stages
+    
+    def _chains(self, tool_calls: List[Dict], indices: List[int]) -> List[List[int]]:
+        """Group read-only calls sharing a path into ordered chains."""
+        parent = {index: index for index in indices}
+        
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+        
+        owner: Dict[str, int] = {}
+        for index in indices:
+            for path in self.paths(tool_calls[index]):
+                if path in owner:
+                    root, other = find(index), find(owner[path])
+                    if root != other:
+                        parent[max(root, other)] = min(root, other)
+                else:
+                    owner[path] = index
+        
+        chains: Dict[int, List[int]] = {}
+        for index in indices:
+            chains.setdefault(find(index), []).append(index)
+        return list(chains.values())
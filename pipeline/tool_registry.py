@@ -48,6 +48,9 @@ class ToolRegistry:
         self.handler = handler
         self.tools: Dict[str, Dict] = {}
         
+        # Bumped when a tool is registered or removed (keys cached tool lists)
+        self.version = 0
+        
         # Load existing tools
         self._load_tools()
         
@@ -323,6 +326,7 @@ class ToolRegistry:
         if self.handler:
             self._register_with_handler(name)
         
+        self.version += 1
         return True
     
     def _register_with_handler(self, tool_name: str):
@@ -435,6 +439,7 @@ class ToolRegistry:
         # Remove from registry
         tool_data = self.tools[name]
         del self.tools[name]
+        self.version += 1
         
         # Delete files
         impl_file = Path(tool_data['impl_file'])
@@ -0,0 +1,299 @@
+"""
+Relevance-Ranked Tool Subsets
+
+Phases offer the model every tool they might need (the refactoring phase
+more than sixty), and the full JSON schemas are re-sent as prompt tokens on
+every call. With tool retrieval on (``config.tool_retrieval``) a phase turn
+offers only:
+
+- the phase's core tools (its own tool list, see
+  ``tools.get_core_tool_names``) and ``CORE_TOOLS``, always, and
+- the ``config.tool_retrieval_top_k`` other tools ranked highest for the
+  turn: BM25 over each tool's name, description and parameters, scored
+  against the prompt, plus a bonus for the tools the phase used recently
+  (from its ActionTracker).
+
+If the model calls a tool of the full list that the subset left out, the
+turn is repeated once with the full list. Bytes of tool schema
+sent versus the full list, and fallbacks, are kept per phase.
+
+Example:
+    selection = client.tool_selector.select("qa", tools, prompt, recent_tools)
+    response = client.chat(host, model, messages, tools=selection.tools)
+    if selection.outside(called_tool_names):
+        response = client.chat(host, model, messages, tools=tools)
+"""
+
+import json
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .logging_setup import get_logger
+from .tool_schema import FrozenTools
+
+
+# Tools every phase turn keeps, when offered
+CORE_TOOLS = frozenset({
+    "read_file",
+    "list_directory",
+    "search_code",
+})
+
+DEFAULT_TOP_K = 8
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+# Bonus of the phase's most used recent tool, relative to the best lexical
+# score (other recent tools get a share by use count)
+_RECENT_WEIGHT = 1.0
+
+# Cached indexes, by the names of the tools they cover
+_MAX_CACHED_INDEXES = 64
+
+_WORD = re.compile(r'[A-Za-z][a-z]*|[0-9]+')
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or that the this "
+    "to use used was were will with you your if not no all any can do does should".split()
+)
+
+
+def _tool_function(tool: Dict) -> Dict:
+    """The function definition of an Ollama tool (``{"function": ...}``) or a bare one."""
+    return tool.get("function", tool)
+
+
+def tool_name(tool: Dict) -> str:
+    """Name of a tool definition."""
+    return _tool_function(tool).get("name", "")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word stems of a text; identifiers are split at ``_`` and camelCase."""
+    tokens = []
+    for word in _WORD.findall(text):
+        word = word.lower()
+        if word in _STOPWORDS or len(word) < 2:
+            continue
+        # Crude stemming, enough to match "imports"/"import", "files"/"file"
+        for suffix in ("ing", "es", "s", "ed"):
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[:-len(suffix)]
+                break
+        tokens.append(word)
+    return tokens
+
+
+def _tool_text(tool: Dict) -> str:
+    """Searchable text of a tool: its name (twice, to weigh it up), description and parameters."""
+    function = _tool_function(tool)
+    parts = [function.get("name", "")] * 2 + [function.get("description", "")]
+    for name, spec in (function.get("parameters") or {}).get("properties", {}).items():
+        parts.append(name)
+        if isinstance(spec, dict):
+            parts.append(str(spec.get("description", "")))
+    return " ".join(parts)
+
+
+class ToolIndex:
+    """BM25 index over tool definitions (one document per distinct tool name)."""
+    
+    def __init__(self, tools: Sequence[Dict]):
+        self.names: List[str] = []
+        self._term_counts: List[Counter] = []
+        self._lengths: List[int] = []
+        seen = set()
+        for tool in tools:
+            name = tool_name(tool)
+            if name in seen:
+                continue
+            seen.add(name)
+            tokens = tokenize(_tool_text(tool))
+            self.names.append(name)
+            self._term_counts.append(Counter(tokens))
+            self._lengths.append(len(tokens))
+        
+        documents = len(self.names)
+        self._average_length = sum(self._lengths) / documents if documents else 0.0
+        frequency: Counter = Counter()
+        for counts in self._term_counts:
+            frequency.update(counts.keys())
+        self._idf = {term: math.log(1 + (documents - count + 0.5) / (count + 0.5))
+                     for term, count in frequency.items()}
+    
+    def scores(self, query: str) -> Dict[str, float]:
+        """BM25 score of every tool for a query (0 for tools sharing no term)."""
+        terms = Counter(term for term in tokenize(query) if term in self._idf)
+        scores = {}
+        for name, counts, length in zip(self.names, self._term_counts, self._lengths):
+            score = 0.0
+            norm = _K1 * (1 - _B + _B * length / self._average_length) if self._average_length else _K1
+            for term, query_count in terms.items():
+                count = counts.get(term)
+                if count:
+                    score += self._idf[term] * count * (_K1 + 1) / (count + norm) * query_count
+            scores[name] = score
+        return scores
+
+
+@dataclass
+class ToolSelection:
+    """Tools offered for one turn, out of the phase's full list."""
+    tools: List[Dict]
+    names: Set[str]
+    full_names: Set[str]
+    scores: Dict[str, float] = field(default_factory=dict)
+    
+    @property
+    def reduced(self) -> bool:
+        """Whether some tools were left out."""
+        return self.names != self.full_names
+    
+    def outside(self, called: Iterable[str]) -> List[str]:
+        """Called tools that the full list offers but the subset left out."""
+        return [name for name in called if name in self.full_names and name not in self.names]
+
+
+class RetrievalStats:
+    """Tool-schema bytes of one phase: as sent, and as the full list would have been."""
+    
+    def __init__(self):
+        self.calls = 0
+        self.full_bytes = 0
+        self.sent_bytes = 0
+        self.fallbacks = 0
+    
+    @property
+    def saved_fraction(self) -> float:
+        return 1 - self.sent_bytes / self.full_bytes if self.full_bytes else 0.0
+    
+    def to_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "full_bytes": self.full_bytes,
+            "sent_bytes": self.sent_bytes,
+            "saved_bytes": self.full_bytes - self.sent_bytes,
+            "saved_fraction": round(self.saved_fraction, 3),
+            "fallbacks": self.fallbacks,
+        }
+
+
+def schema_bytes(tools: Sequence[Dict]) -> int:
+    """Size of tool definitions as serialized into a chat request."""
+    if isinstance(tools, FrozenTools):
+        return tools.nbytes
+    return len(json.dumps(list(tools))) if tools else 0
+
+
+class ToolSelector:
+    """
+    Picks the tools offered to the model on each phase turn.
+    
+    Shared by every phase through ``OllamaClient.tool_selector``; inactive
+    unless ``config.tool_retrieval`` is set.
+    """
+    
+    def __init__(self, config, top_k: int = None):
+        """
+        Initialize selector.
+        
+        Args:
+            config: PipelineConfig (``tool_retrieval``, ``tool_retrieval_top_k``)
+            top_k: Ranked tools offered besides the core ones (default: from config)
+        """
+        self.logger = get_logger()
+        self.enabled = getattr(config, 'tool_retrieval', False)
+        self.top_k = top_k if top_k is not None else getattr(config, 'tool_retrieval_top_k', DEFAULT_TOP_K)
+        self.stats: Dict[str, RetrievalStats] = {}
+        self._indexes: Dict[Tuple[str, ...], ToolIndex] = {}
+        self._lock = threading.Lock()
+    
+    def _index(self, tools: Sequence[Dict]) -> ToolIndex:
+        key = tuple(tool_name(tool) for tool in tools)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                if len(self._indexes) >= _MAX_CACHED_INDEXES:
+                    self._indexes.pop(next(iter(self._indexes)))
+                index = self._indexes[key] = ToolIndex(tools)
+            return index
+    
+    def select(self, phase: str, tools: Sequence[Dict], query: str,
+               recent_tools: Sequence[str] = (), core: Optional[Iterable[str]] = None) -> ToolSelection:
+        """
+        Choose the tools to offer for a turn.
+        
+        Args:
+            phase: Phase name (its core tools and statistics)
+            tools: The phase's full tool list
+            query: Task description / prompt of the turn
+            recent_tools: Names of the tools the phase called recently, oldest first
+            core: Tool names always offered (default: the phase's core tools)
+        
+        Returns:
+            ToolSelection; the tools keep the order of the full list
+        """
+        if core is None:
+            from .tools import get_core_tool_names
+            core = get_core_tool_names(phase)
+        
+        index = self._index(tools)
+        scores = index.scores(query)
+        best = max(scores.values(), default=0.0) or 1.0
+        for name in scores:
+            scores[name] /= best
+        recent = Counter(recent_tools)
+        most_used = max(recent.values(), default=1)
+        for name, uses in recent.items():
+            if name in scores:
+                scores[name] += _RECENT_WEIGHT * uses / most_used
+        
+        keep = (set(core) | CORE_TOOLS) & set(scores)
+        ranked = sorted((name for name in index.names if name not in keep and scores[name] > 0),
+                        key=lambda name: -scores[name])
+        keep.update(ranked[:self.top_k])
+        
+        positions, seen = [], set()
+        for position, tool in enumerate(tools):
+            name = tool_name(tool)
+            if name in keep and name not in seen:
+                seen.add(name)
+                positions.append(position)
+        if isinstance(tools, FrozenTools):
+            selected = tools.subset(positions)
+        else:
+            selected = [tools[position] for position in positions]
+        
+        with self._lock:
+            stats = self.stats.setdefault(phase, RetrievalStats())
+            stats.calls += 1
+            stats.full_bytes += schema_bytes(tools)
+            stats.sent_bytes += schema_bytes(selected)
+        return ToolSelection(selected, seen, set(index.names), scores)
+    
+    def record_fallback(self, phase: str, tools: Sequence[Dict]):
+        """Count a turn repeated with the full tool list (its schema bytes included)."""
+        with self._lock:
+            stats = self.stats.setdefault(phase, RetrievalStats())
+            stats.fallbacks += 1
+            stats.sent_bytes += schema_bytes(tools)
+    
+    def summary(self) -> Dict[str, Dict]:
+        """Retrieval statistics per phase."""
+        with self._lock:
+            return {phase: stats.to_dict() for phase, stats in self.stats.items()}
+    
+    def format_report(self) -> List[str]:
+        """Report lines: tool-schema bytes saved and fallbacks per phase."""
+        lines = []
+        for phase, data in sorted(self.summary().items()):
+            lines.append(f"    {phase:<16} {data['saved_bytes']:,} of {data['full_bytes']:,} bytes saved "
+                         f"({data['saved_fraction']:.0%}) over {data['calls']} calls, "
+                         f"{data['fallbacks']} fallback(s)")
+        return lines
@@ -0,0 +1,132 @@
+"""
+Tool Retrieval Benchmark
+
+Sends representative phase prompts to the mock Ollama server twice, once
+with the phase's full tool list and once with the subset ``ToolSelector``
+picks, and reports per phase the tool-schema bytes the server received
+each way (the bytes tool retrieval keeps out of every prompt) and how many
+tools were offered.
+
+Usage:
+    python -m pipeline.tool_retrieval_benchmark
+    python -m pipeline.tool_retrieval_benchmark --top-k 4 -o tool_retrieval.json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from .client import OllamaClient
+from .config import PipelineConfig
+from .mock_ollama import MockOllamaServer
+from .tool_retrieval import DEFAULT_TOP_K
+from .tools import get_tools_for_phase
+
+
+# Typical turn prompts per phase
+PHASE_PROMPTS: Dict[str, List[str]] = {
+    "planning": [
+        "Create a task plan for the REST API described in MASTER_PLAN.md",
+        "Break the authentication objective into implementation tasks with target files",
+    ],
+    "coding": [
+        "Implement src/api/users.py: a UserService with create, update and delete methods",
+        "Move src/utils/helpers.py into src/common/ and update the imports that use it",
+    ],
+    "qa": [
+        "Review src/api/users.py for bugs, missing imports and wrong method calls",
+        "Check src/models/order.py: verify the dict keys it reads exist and the syntax is valid",
+    ],
+    "debugging": [
+        "Fix the NameError in src/api/users.py line 42: name 'Session' is not defined",
+        "AttributeError: 'Order' object has no attribute 'total' in src/billing/invoice.py",
+    ],
+    "project_planning": [
+        "Analyze project status and propose the next expansion tasks for the architecture",
+    ],
+    "documentation": [
+        "Update the README installation section for the new command line options",
+    ],
+    "refactoring": [
+        "Find duplicate implementations of the config loader and merge them into one file",
+        "Detect dead code and unused imports in src/ and create refactoring tasks for them",
+        "Analyze the architecture consistency of src/services against ARCHITECTURE.md",
+    ],
+    "investigation": [
+        "Investigate why src/pipeline/runner.py keeps the process at 100% CPU",
+    ],
+}
+
+
+def run_benchmark(top_k: int = DEFAULT_TOP_K) -> Dict:
+    """
+    Run the benchmark.
+    
+    Args:
+        top_k: Ranked tools offered besides the phase's core tools
+    
+    Returns:
+        Report dict with per-phase tool-schema bytes and tool counts, full
+        list against subset, as received by the mock server
+    """
+    report = {"top_k": top_k, "phases": {}}
+    with tempfile.TemporaryDirectory() as project_dir, MockOllamaServer() as server:
+        config = server.configure(PipelineConfig(project_dir=Path(project_dir), tool_retrieval=True,
+                                                 tool_retrieval_top_k=top_k))
+        client = OllamaClient(config)
+        client.discover_servers()
+        
+        for phase, prompts in PHASE_PROMPTS.items():
+            host, model = client.get_model_for_task(phase)
+            tools = get_tools_for_phase(phase)
+            for prompt in prompts:
+                messages = [{"role": "user", "content": prompt}]
+                client.chat(host, model, messages, tools=tools)
+                selection = client.tool_selector.select(phase, tools, prompt)
+                client.chat(host, model, messages, tools=selection.tools)
+            
+            # Requests alternate full list / subset
+            requests = server.requests[-2 * len(prompts):]
+            full, subset = requests[0::2], requests[1::2]
+            full_bytes = sum(r["tool_bytes"] for r in full)
+            subset_bytes = sum(r["tool_bytes"] for r in subset)
+            report["phases"][phase] = {
+                "prompts": len(prompts),
+                "full_tools": len(full[0]["tools"]),
+                "subset_tools": round(sum(len(r["tools"]) for r in subset) / len(subset), 1),
+                "full_bytes_per_call": full_bytes // len(full),
+                "subset_bytes_per_call": subset_bytes // len(subset),
+                "saved_fraction": round(1 - subset_bytes / full_bytes, 3) if full_bytes else 0.0,
+            }
+    return report
+
+
+def format_report(report: Dict) -> str:
+    """Plain-text summary of a benchmark report."""
+    lines = [f"Tool-schema bytes per call, full list vs subset (top-k {report['top_k']})"]
+    for phase, data in report["phases"].items():
+        lines.append(f"  {phase:<17} {data['full_bytes_per_call']:>7,} -> {data['subset_bytes_per_call']:>6,} bytes "
+                     f"({data['saved_fraction']:.0%} saved), "
+                     f"{data['full_tools']} -> {data['subset_tools']:g} tools")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure tool-schema bytes saved by tool retrieval")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K,
+                        help=f"Ranked tools besides the core ones (default: {DEFAULT_TOP_K})")
+    parser.add_argument("-o", "--output", type=Path, help="Write the report as JSON")
+    args = parser.parse_args(argv)
+    
+    report = run_benchmark(args.top_k)
+    print(format_report(report))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Pre-serialized Tool Schemas
+
+The tool definitions offered with a chat request make up most of its body,
+and they rarely change: a phase offers the same tools on every call until a
+custom tool is registered or removed. ``FrozenTools`` is an immutable tool
+list that carries the JSON encoding of each definition, serialized once,
+and ``encode_request_body`` splices that encoding into the request body
+instead of re-dumping the nested dicts on every call.
+
+``tools.get_tools_for_phase`` returns FrozenTools memoized per phase and
+ToolRegistry version. Subsets (tool retrieval) and extensions reuse the
+encoded definitions.
+
+Example:
+    tools = FrozenTools(TOOLS_QA)
+    body = encode_request_body({"model": model, "messages": messages, "tools": tools})
+    requests.post(url, data=body, headers=JSON_HEADERS)
+"""
+
+import json
+from typing import Dict, Iterable, Optional, Sequence
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class FrozenTools(tuple):
+    """
+    Immutable tool list with the JSON encoding of every definition.
+    
+    The definitions are decoded from their encodings, so they are not
+    shared with (and do not follow later changes to) the dicts frozen.
+    Treat them as read-only: the encoding is what is sent.
+    """
+    
+    def __new__(cls, tools: Iterable[Dict] = (), encoded: Optional[Sequence[str]] = None):
+        """
+        Freeze tool definitions.
+        
+        Args:
+            tools: Tool definitions (ignored when ``encoded`` is given)
+            encoded: JSON encodings of the definitions, when already known
+        """
+        encoded = tuple(encoded) if encoded is not None else tuple(json.dumps(tool) for tool in tools)
+        return cls._make([json.loads(text) for text in encoded], encoded)
+    
+    @classmethod
+    def _make(cls, definitions: Iterable[Dict], encoded: tuple) -> 'FrozenTools':
+        frozen = super().__new__(cls, definitions)
+        frozen.encoded = encoded
+        frozen._json = None
+        return frozen
+    
+    @property
+    def json(self) -> str:
+        """The list's JSON encoding (as ``json.dumps`` would produce it)."""
+        if self._json is None:
+            self._json = "[" + ", ".join(self.encoded) + "]"
+        return self._json
+    
+    @property
+    def nbytes(self) -> int:
+        """Size of the encoding."""
+        return len(self.json)
+    
+    def subset(self, indices: Iterable[int]) -> 'FrozenTools':
+        """The definitions at ``indices``, in that order, without re-encoding them."""
+        indices = list(indices)
+        return FrozenTools._make([self[index] for index in indices], tuple(self.encoded[index] for index in indices))
+    
+    def extended(self, tools: Iterable[Dict]) -> 'FrozenTools':
+        """This list followed by more definitions (only those are encoded)."""
+        extra = tuple(json.dumps(tool) for tool in tools)
+        return FrozenTools._make(tuple(self) + tuple(json.loads(text) for text in extra), self.encoded + extra)
+    
+    def __reduce__(self):
+        return (FrozenTools, ((), self.encoded))
+
+
+def encode_request_body(payload: Dict) -> bytes:
+    """
+    JSON request body of a payload, splicing in the encoding of FrozenTools values.
+    
+    Equivalent to ``json.dumps(payload).encode()`` (keys may come in a
+    different order).
+    """
+    frozen = {key: value for key, value in payload.items() if isinstance(value, FrozenTools)}
+    if not frozen:
+        return json.dumps(payload).encode()
+    
+    rest = {key: value for key, value in payload.items() if key not in frozen}
+    parts = [json.dumps(rest)[:-1]] if rest else ["{"]
+    for number, (key, tools) in enumerate(frozen.items()):
+        separator = ", " if rest or number else ""
+        parts.append(f"{separator}{json.dumps(key)}: {tools.json}")
+    parts.append("}")
+    return "".join(parts).encode()
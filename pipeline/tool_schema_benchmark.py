@@ -0,0 +1,116 @@
+"""
+Tool Schema Benchmark
+
+Times building a chat request body for every phase, as a phase turn does
+it (get the phase's tools, encode the payload):
+
+- rebuilt: the tool list assembled from the tool modules and the whole
+  payload dumped to JSON, as before tool lists were memoized
+- memoized: ``get_tools_for_phase`` (cached FrozenTools) and
+  ``encode_request_body``, which splices in the pre-serialized tools
+
+and checks that both bodies decode to the same request.
+
+Usage:
+    python -m pipeline.tool_schema_benchmark
+    python -m pipeline.tool_schema_benchmark --iterations 5000 -o tool_schema.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+from .tool_schema import encode_request_body
+from .tools import PHASE_CORE_TOOLS, _build_tools_for_phase, get_tools_for_phase
+
+
+DEFAULT_ITERATIONS = 2000
+
+PHASES = [phase for phase in PHASE_CORE_TOOLS if phase != "debug"] + ["investigation"]
+
+# A short conversation, so the body is not all tools
+_MESSAGES = [
+    {"role": "system", "content": "You are the pipeline's phase model. Use the tools to do the task. " * 20},
+    {"role": "user", "content": "Review src/api/users.py and report any issues you find.\n" * 10},
+]
+
+
+def _payload(tools) -> Dict:
+    return {
+        "model": "qwen2.5-coder:32b",
+        "messages": _MESSAGES,
+        "stream": False,
+        "options": {"temperature": 0.3, "num_ctx": 16384},
+        "tools": tools,
+    }
+
+
+def _rebuilt(phase: str) -> bytes:
+    return json.dumps(_payload(_build_tools_for_phase(phase))).encode()
+
+
+def _memoized(phase: str) -> bytes:
+    return encode_request_body(_payload(get_tools_for_phase(phase)))
+
+
+def _time_per_call(build: Callable[[str], bytes], phase: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        build(phase)
+    return (time.perf_counter() - start) / iterations
+
+
+def run_benchmark(iterations: int = DEFAULT_ITERATIONS) -> Dict:
+    """
+    Run the benchmark.
+    
+    Args:
+        iterations: Request bodies built per phase and strategy
+    
+    Returns:
+        Report dict with microseconds per request body for each phase
+    """
+    report = {"iterations": iterations, "phases": {}}
+    for phase in PHASES:
+        body = _memoized(phase)
+        rebuilt_us = _time_per_call(_rebuilt, phase, iterations) * 1e6
+        memoized_us = _time_per_call(_memoized, phase, iterations) * 1e6
+        report["phases"][phase] = {
+            "body_bytes": len(body),
+            "rebuilt_us": round(rebuilt_us, 1),
+            "memoized_us": round(memoized_us, 1),
+            "speedup": round(rebuilt_us / memoized_us, 1) if memoized_us else None,
+            "identical": json.loads(body) == json.loads(_rebuilt(phase)),
+        }
+    return report
+
+
+def format_report(report: Dict) -> str:
+    """Plain-text summary of a benchmark report."""
+    lines = [f"Chat request body per phase ({report['iterations']} iterations)"]
+    for phase, data in report["phases"].items():
+        lines.append(f"  {phase:<17} {data['body_bytes']:>7,} bytes  rebuilt {data['rebuilt_us']:>8.1f}us  "
+                     f"memoized {data['memoized_us']:>7.1f}us  ({data['speedup']}x, "
+                     f"identical: {data['identical']})")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark chat request body construction per phase")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS,
+                        help=f"Bodies built per phase and strategy (default: {DEFAULT_ITERATIONS})")
+    parser.add_argument("-o", "--output", type=Path, help="Write the report as JSON")
+    args = parser.parse_args(argv)
+    
+    report = run_benchmark(args.iterations)
+    print(format_report(report))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,7 +9,11 @@ Contains all tool definitions used by pipeline phases:
 - Documentation tools: analyze_documentation_needs, update_readme_section, add_readme_section
 """
 
-from typing import List, Dict, Optional
+import threading
+import weakref
+from typing import List, Dict, Optional, Set, Tuple
+
+from .tool_schema import FrozenTools
 from .system_analyzer_tools import SYSTEM_ANALYZER_TOOLS
 from .tool_modules.tool_definitions import TOOLS_ANALYSIS, TOOLS_FILE_UPDATES
 from .tool_modules.refactoring_tools import TOOLS_REFACTORING
@@ -1045,22 +1049,82 @@ PIPELINE_TOOLS: List[Dict] = (
 # Tool Getter Function
 # =============================================================================
 
-def get_tools_for_phase(phase: str, tool_registry=None) -> List[Dict]:
+# Each phase's own tools: offered on every turn even when tool retrieval
+# narrows the rest of the list (see tool_retrieval)
+PHASE_CORE_TOOLS = {
+    "planning": TOOLS_PLANNING,
+    "coding": TOOLS_CODING,
+    "qa": TOOLS_QA,
+    "debugging": TOOLS_DEBUGGING,
+    "debug": TOOLS_DEBUGGING,
+    "project_planning": TOOLS_PROJECT_PLANNING,
+    "documentation": TOOLS_DOCUMENTATION,
+    "refactoring": TOOLS_REFACTORING,
+}
+
+
+def get_core_tool_names(phase: str) -> Set[str]:
+    """Names of the tools a phase always offers (its own tool list)."""
+    return {tool.get("function", tool).get("name") for tool in PHASE_CORE_TOOLS.get(phase, [])}
+
+
+# Frozen phase tool lists by (phase, registry version); one table per
+# registry, plus one for calls without a registry
+_PHASE_TOOLS_CACHE: Dict[Tuple[str, int], FrozenTools] = {}
+_REGISTRY_PHASE_TOOLS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_PHASE_TOOLS_LOCK = threading.Lock()
+
+
+def get_tools_for_phase(phase: str, tool_registry=None) -> FrozenTools:
     """
     Get tools appropriate for a pipeline phase.
     
     All phases get monitoring tools for resource awareness.
     Custom tools from ToolRegistry are added if registry provided.
     
+    The list is built and serialized once per phase and registry version
+    (a registry's ``version`` changes when it registers or removes a
+    custom tool) and shared: it is an immutable FrozenTools whose JSON
+    encoding the client splices into requests. Use ``extended`` to add
+    tools to it.
+    
     Args:
         phase: Name of the phase
         tool_registry: Optional ToolRegistry instance for custom tools
         
     Returns:
-        List of tool definitions for that phase
+        Tool definitions for that phase
         
     Integration Point #3: Custom tools added from registry
     """
+    version = getattr(tool_registry, 'version', None) if tool_registry else 0
+    if version is None:
+        # A registry that does not track changes cannot be cached against
+        return FrozenTools(_build_tools_for_phase(phase, tool_registry))
+    
+    with _PHASE_TOOLS_LOCK:
+        if tool_registry:
+            cache = _REGISTRY_PHASE_TOOLS.get(tool_registry)
+            if cache is None:
+                cache = _REGISTRY_PHASE_TOOLS[tool_registry] = {}
+        else:
+            cache = _PHASE_TOOLS_CACHE
+        tools = cache.get((phase, version))
+    if tools is not None:
+        return tools
+    
+    tools = FrozenTools(_build_tools_for_phase(phase, tool_registry))
+    # Building may have loaded the registry's tools (and moved its version)
+    version = tool_registry.version if tool_registry else 0
+    with _PHASE_TOOLS_LOCK:
+        stale = [key for key in cache if key[0] == phase and key[1] != version]
+        for key in stale:
+            del cache[key]
+        return cache.setdefault((phase, version), tools)
+
+
+def _build_tools_for_phase(phase: str, tool_registry=None) -> List[Dict]:
+    """Assemble a phase's tool definitions (see ``get_tools_for_phase``)."""
     # Base tools for each phase
     phase_tools = {
         "planning": TOOLS_PLANNING + TOOLS_ANALYSIS + TOOLS_FILE_DISCOVERY,  # Added file discovery
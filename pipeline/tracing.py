@@ -0,0 +1,292 @@
+"""
+Span Tracing
+
+Lightweight, nested timing spans around the pipeline's cost centres (state
+I/O, next-action decisions, phase execution, prompt building, model calls,
+response parsing, tool dispatch, analyzers).
+
+Disabled by default: ``span()`` then returns a shared no-op context manager,
+so an instrumented call costs one attribute check. When enabled, every
+finished span is appended as a Chrome trace event ("X" complete event) to
+``.pipeline/traces/<run_id>.jsonl``; ``stop()`` also writes a
+``<run_id>.trace.json`` that loads directly in chrome://tracing or Perfetto.
+Per-name totals (count, total, self time, max) are kept for the run summary.
+
+Example:
+    tracer = get_tracer()
+    with tracer.span("state.load"):
+        state = manager.load()
+    
+    @traced("parse")
+    def parse_response(...): ...
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .logging_setup import get_logger
+
+
+class _NullSpan:
+    """No-op span returned while tracing is disabled."""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def set(self, **args):
+        pass
+    
+    def end(self):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A running span; finished on context exit or ``end()``."""
+    
+    __slots__ = ("tracer", "name", "category", "args", "start", "child_seconds", "parent", "_ended")
+    
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0.0
+        self.child_seconds = 0.0
+        self.parent: Optional[Span] = None
+        self._ended = False
+    
+    def __enter__(self):
+        self.tracer._push(self)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.end()
+        return False
+    
+    def set(self, **args):
+        """Attach extra arguments (shown in the trace viewer)."""
+        self.args.update(args)
+    
+    def end(self):
+        if not self._ended:
+            self._ended = True
+            self.tracer._pop(self)
+
+
+class SpanStats:
+    """Aggregated timings of all spans sharing a name."""
+    
+    __slots__ = ("name", "count", "total", "self_total", "max")
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.self_total = 0.0
+        self.max = 0.0
+    
+    def add(self, seconds: float, self_seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.self_total += self_seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "count": self.count,
+            "total_seconds": round(self.total, 6),
+            "self_seconds": round(self.self_total, 6),
+            "mean_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+            "max_seconds": round(self.max, 6),
+        }
+
+
+class Tracer:
+    """
+    Collects spans for one pipeline run.
+    
+    Spans nest per thread; spans opened in tool or worker threads start new
+    roots on their own thread track.
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.trace_file: Optional[Path] = None
+        self.stats: Dict[str, SpanStats] = {}
+        self.logger = get_logger()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stream = None
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+    
+    def start(self, trace_dir: Path, run_id: str = None) -> Path:
+        """
+        Enable tracing and open the JSON-lines trace file.
+        
+        Args:
+            trace_dir: Directory for trace files (created if missing)
+            run_id: Name of the trace files (default: timestamp)
+        
+        Returns:
+            Path of the JSON-lines trace file
+        """
+        self.stop()
+        trace_dir = Path(trace_dir)
+        trace_dir.mkdir(parents=True, exist_ok=True)
+        run_id = run_id or time.strftime("trace_%Y%m%d_%H%M%S")
+        self.trace_file = trace_dir / f"{run_id}.jsonl"
+        self._stream = open(self.trace_file, "a", buffering=1 << 16)
+        self.stats = {}
+        self._origin = time.perf_counter()
+        self.enabled = True
+        return self.trace_file
+    
+    def stop(self) -> Optional[Path]:
+        """
+        Disable tracing, close the JSON-lines file and write the Chrome trace.
+        
+        Returns:
+            Path of the Chrome trace file, if a trace was running
+        """
+        if not self.enabled:
+            return None
+        self.enabled = False
+        with self._lock:
+            self._stream.close()
+            self._stream = None
+        
+        chrome_file = self.trace_file.with_suffix(".trace.json")
+        events = []
+        for line in self.trace_file.read_text().splitlines():
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        chrome_file.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        return chrome_file
+    
+    def span(self, name: str, category: str = "pipeline", **args):
+        """Context manager timing a block (no-op while disabled)."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, category, args)
+    
+    def begin(self, name: str, category: str = "pipeline", **args):
+        """Open a span that is closed explicitly with ``end()``."""
+        if not self.enabled:
+            return NULL_SPAN
+        span = Span(self, name, category, args)
+        self._push(span)
+        return span
+    
+    def record(self, name: str, seconds: float, **args):
+        """
+        Add an externally measured duration (e.g. summed over worker
+        processes) to the summary; it is not placed on the timeline.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._stats(name).add(seconds, seconds)
+    
+    def summary(self) -> List[Dict]:
+        """Per-name totals, largest self time first."""
+        with self._lock:
+            stats = [s.to_dict() for s in self.stats.values()]
+        return sorted(stats, key=lambda s: s["self_seconds"], reverse=True)
+    
+    def format_summary(self, limit: int = 25) -> str:
+        """Summary table for the run log."""
+        rows = self.summary()[:limit]
+        lines = [f"  {'span':<36} {'count':>7} {'total s':>10} {'self s':>10} {'mean ms':>9} {'max ms':>9}"]
+        for row in rows:
+            lines.append(f"  {row['name'][:36]:<36} {row['count']:>7} {row['total_seconds']:>10.3f} "
+                         f"{row['self_seconds']:>10.3f} {row['mean_seconds'] * 1000:>9.1f} "
+                         f"{row['max_seconds'] * 1000:>9.1f}")
+        return "\n".join(lines)
+    
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def _stats(self, name: str) -> SpanStats:
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = SpanStats(name)
+        return stats
+    
+    def _push(self, span: Span):
+        stack = self._stack()
+        span.parent = stack[-1] if stack else None
+        stack.append(span)
+        span.start = time.perf_counter()
+    
+    def _pop(self, span: Span):
+        end = time.perf_counter()
+        stack = self._stack()
+        if span in stack:
+            del stack[stack.index(span):]
+        seconds = end - span.start
+        if span.parent is not None:
+            span.parent.child_seconds += seconds
+        
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": round((span.start - self._origin) * 1e6, 1),
+            "dur": round(seconds * 1e6, 1),
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        if span.args:
+            event["args"] = span.args
+        line = json.dumps(event, default=str)
+        
+        with self._lock:
+            self._stats(span.name).add(seconds, seconds - span.child_seconds)
+            if self._stream is not None:
+                self._stream.write(line + "\n")
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer."""
+    return _tracer
+
+
+def traced(name: str = None, category: str = "pipeline"):
+    """Decorator wrapping a function in a span (checked at call time)."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            with Span(_tracer, span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
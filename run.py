@@ -21,7 +21,7 @@ from pathlib import Path
 
 # Import the pipeline module
 from pipeline import PhaseCoordinator, PipelineConfig
-from pipeline.error_signature import ErrorSignature, ProgressTracker
+from pipeline.error_signature import ERROR_SIGNATURES_FILE, ErrorSignature, ErrorSignatureStore, ProgressTracker
 from pipeline.progress_display import print_bug_transition, print_progress_stats, print_refining_fix
 from pipeline.command_detector import CommandDetector
 
@@ -102,6 +102,15 @@ def show_status(config: PipelineConfig) -> None:
             print(f"  {phase_name}: {phase_state.runs} runs, "
                   f"{phase_state.successes} success, {phase_state.failures} failed")
     
+    # Model usage (token counts and timings reported by Ollama)
+    from pipeline.model_metrics import MODEL_METRICS_FILE, ModelMetricsStore
+    metrics = ModelMetricsStore.load(config.project_dir / config.state_dir / MODEL_METRICS_FILE)
+    report = metrics.format_report()
+    if report:
+        print("\nModel Usage:")
+        for line in report:
+            print(line)
+    
     # Recent files
     print("\nRecent Files:")
     files = sorted(state.files.values(), key=lambda f: f.last_modified, reverse=True)[:5]
@@ -293,8 +302,8 @@ def run_debug_qa_mode(args) -> int:
     # Initialize runtime tester outside loop so it can be cleaned up on Ctrl-C
     tester = None
     
-    # Initialize progress tracker
-    progress_tracker = ProgressTracker()
+    # Initialize progress tracker (error signature history persists across runs)
+    progress_tracker = ProgressTracker(ErrorSignatureStore(project_dir / config.state_dir / ERROR_SIGNATURES_FILE))
     
     # Progressive test duration tracking
     consecutive_successes = 0
@@ -391,6 +400,7 @@ def run_debug_qa_mode(args) -> int:
             
             # Track errors for progress detection
             progress_tracker.add_iteration(all_errors)
+            progress_tracker.store.save()
             
             # Check for bug transitions
             if iteration > 1:
@@ -790,7 +800,7 @@ def run_debug_qa_mode(args) -> int:
             
             # Deduplicate to avoid fixing the same error multiple times
             print("🔄 Deduplicating errors...")
-            deduplicated_errors = deduplicate_errors(all_errors)
+            deduplicated_errors = deduplicate_errors(all_errors, progress_tracker.store)
             print(f"   Reduced to {len(deduplicated_errors)} unique error(s)\n")
             
             if config.verbose:
@@ -1385,6 +1395,33 @@ Examples:
         metavar="HOST",
         help="Add Ollama server (can be specified multiple times)"
     )
+    parser.add_argument(
+        "--concurrent-tasks",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run up to N independent coding/QA tasks at once across servers (default: 1)"
+    )
+    parser.add_argument(
+        "--model-residency",
+        action="store_true",
+        help="Pin and pre-load the models of the current and likely next phases"
+    )
+    parser.add_argument(
+        "--speculative-drafting",
+        action="store_true",
+        help="Let the small routing model draft simple tool calls before the large model"
+    )
+    parser.add_argument(
+        "--tool-retrieval",
+        action="store_true",
+        help="Offer each model call only the phase's own tools and the most relevant others"
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Record span timings to .pipeline/traces/ and print a summary at the end"
+    )
     
     args = parser.parse_args()
     
@@ -1402,6 +1439,11 @@ Examples:
         max_iterations=args.iterations,
         max_retries_per_task=args.max_retries,
         verbose=args.verbose,  # THIS LINE WAS MISSING!
+        concurrent_tasks=args.concurrent_tasks,
+        trace=args.trace,
+        speculative_drafting=args.speculative_drafting,
+        model_residency=args.model_residency,
+        tool_retrieval=args.tool_retrieval,
     )
     
     # Add custom servers if specified
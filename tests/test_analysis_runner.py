@@ -0,0 +1,111 @@
+"""
+Tests for the unified analysis runner.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.analysis.runner import AnalysisRunner
+from pipeline.analysis.complexity import ComplexityAnalyzer
+from pipeline.analysis.dead_code import DeadCodeDetector
+from pipeline.analysis.integration_gaps import IntegrationGapFinder
+from pipeline.analysis.integration_conflicts import IntegrationConflictDetector
+from pipeline.analysis.call_graph import CallGraphGenerator
+from pipeline.analysis.file_refactoring import DuplicateDetector
+
+
+def _normalize(value):
+    """Sort string lists built from sets, whose order depends on the hash seed."""
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [_normalize(item) for item in value]
+        return sorted(items) if all(isinstance(item, str) for item in items) else items
+    return value
+
+
+class TestAnalysisRunner(unittest.TestCase):
+    """Runner results must match running each analyzer on its own."""
+    
+    def setUp(self):
+        """Set up a project made of the analysis package plus edge cases."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.project_dir = Path(self.temp_dir)
+        source = Path(__file__).parent.parent / 'pipeline' / 'analysis'
+        shutil.copytree(source, self.project_dir / 'analysis',
+                        ignore=shutil.ignore_patterns('__pycache__'))
+        shutil.copytree(source, self.project_dir / 'backups' / 'analysis',
+                        ignore=shutil.ignore_patterns('__pycache__'))
+        (self.project_dir / 'broken.py').write_text("def broken(:\n")
+        (self.project_dir / 'test_helpers.py').write_text("def helper():\n    return 1\n")
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def _expected(self):
+        project = str(self.project_dir)
+        return _normalize({
+            'complexity': ComplexityAnalyzer(project).analyze().to_dict(),
+            'dead_code': DeadCodeDetector(project).analyze().to_dict(),
+            'integration_gaps': IntegrationGapFinder(project).analyze().to_dict(),
+            'integration_conflicts': IntegrationConflictDetector(project).analyze().to_dict(),
+            'call_graph': CallGraphGenerator(project).analyze().to_dict(),
+            'duplicates': [d.to_dict() for d in DuplicateDetector(self.project_dir).find_duplicates(0.5)],
+        })
+    
+    def _actual(self, run):
+        actual = {name: result.to_dict() for name, result in run.results.items() if name != 'duplicates'}
+        actual['duplicates'] = [d.to_dict() for d in run.get('duplicates')]
+        return _normalize(actual)
+    
+    def test_matches_individual_analyzers(self):
+        """Test serial and process-pool runs reproduce every analyzer's result."""
+        expected = self._expected()
+        
+        for workers in (1, 2):
+            runner = AnalysisRunner(str(self.project_dir), max_workers=workers, chunk_size=8,
+                                    options={'duplicates': {'similarity_threshold': 0.5}})
+            run = runner.run()
+            self.assertEqual(run.workers, workers)
+            self.assertEqual(len(run.parse_errors), 1)
+            self.assertEqual(self._actual(run), expected)
+            
+            # Reusing the runner resets analyzer state
+            self.assertEqual(self._actual(runner.run()), expected)
+    
+    def test_target_file(self):
+        """Test a single-file target runs in-process."""
+        runner = AnalysisRunner(str(self.project_dir))
+        run = runner.run(['complexity'], target='analysis/complexity.py')
+        expected = ComplexityAnalyzer(str(self.project_dir)).analyze('analysis/complexity.py')
+        
+        self.assertEqual(run.files_parsed, 1)
+        self.assertEqual(run.workers, 1)
+        self.assertEqual(run.get('complexity').to_dict(), expected.to_dict())
+    
+    def test_timing_report_and_budget(self):
+        """Test timings are reported and slow analyzers are skipped under a budget."""
+        runner = AnalysisRunner(str(self.project_dir), max_workers=1)
+        run = runner.run(['complexity', 'call_graph'])
+        report = run.timing_report()
+        self.assertIn('complexity', report)
+        self.assertGreater(run.timings['complexity'].files, 0)
+        self.assertEqual(set(runner.cost_history), {'complexity', 'call_graph'})
+        
+        # Pretend the call graph was slow last time
+        runner.cost_history['call_graph'] = 60.0
+        run = runner.run(['complexity', 'call_graph'], budget=1.0)
+        self.assertTrue(run.ran('complexity'))
+        self.assertEqual(run.skipped, ['call_graph'])
+        self.assertIn('skipped', run.timing_report())
+        self.assertEqual(run.to_dict()['skipped'], ['call_graph'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+Tests for the asyncio Ollama client and concurrent specialist fan-out.
+"""
+
+import logging
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.async_client import AsyncOllamaClient, AsyncTransport
+from pipeline.client import OllamaClient
+from pipeline.config import PipelineConfig
+from pipeline.mock_ollama import MockOllamaServer, ScriptedResponder
+from pipeline.specialist_agents import SpecialistTeam
+from pipeline.team_orchestrator import ExecutionWave, Task, TeamOrchestrator
+
+
+class _Thread:
+    """Minimal conversation thread for specialist consultations."""
+    
+    def __init__(self):
+        self.analyses = []
+    
+    def get_conversation_history(self):
+        return [{"role": "user", "content": "The patch failed to apply."}]
+    
+    def get_comprehensive_context(self):
+        return "File: example.py"
+    
+    def add_specialist_analysis(self, name, analysis):
+        self.analyses.append(name)
+
+
+class TestAsyncOllamaClient(unittest.TestCase):
+    """AsyncOllamaClient against the mock server."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = PipelineConfig(project_dir=Path(self.temp_dir))
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def _client(self, server, per_host=2):
+        server.configure(self.config)
+        self.config.max_requests_per_host = per_host
+        return AsyncOllamaClient(self.config)
+    
+    def test_fan_out_respects_per_host_limit(self):
+        """Test requests overlap up to the per-host limit over reused connections."""
+        with MockOllamaServer(responder=ScriptedResponder(["ok"]), latency=0.2) as server:
+            client = self._client(server, per_host=4)
+            requests = [{"host": server.host, "model": "m", "messages": [{"role": "user", "content": str(i)}]}
+                        for i in range(8)]
+            start = time.perf_counter()
+            results = client.chat_many(requests)
+            elapsed = time.perf_counter() - start
+            
+            self.assertEqual([r["message"]["content"] for r in results], ["ok"] * 8)
+            self.assertGreaterEqual(elapsed, 0.4)
+            self.assertLess(elapsed, 1.2)
+            
+            client.chat_many(requests[:4])
+            pool = client.transport.pools[(server.host, server.port)]
+            self.assertLessEqual(pool.opened, 4)
+            self.assertEqual(pool.in_flight, 0)
+        
+        self.assertEqual(client.metrics.summary("model")["m"]["calls"], 12)
+    
+    def test_timeout_and_cancellation(self):
+        """Test slow requests time out or can be cancelled without wedging the pool."""
+        with MockOllamaServer(responder=ScriptedResponder(["ok"]), latency=0.5) as server:
+            client = self._client(server, per_host=1)
+            messages = [{"role": "user", "content": "hi"}]
+            
+            result = client.run(client.chat(server.host, "m", messages, timeout=0.1))
+            self.assertEqual(result, {"error": "timeout"})
+            
+            future = client.submit(client.chat(server.host, "m", messages))
+            time.sleep(0.05)
+            self.assertTrue(future.cancel())
+            
+            results = client.chat_many([{"host": server.host, "model": "m", "messages": messages}] * 2,
+                                       timeout=0.8)
+            self.assertEqual(results[0]["message"]["content"], "ok")
+            self.assertEqual(results[1], {"error": "timeout"})
+            self.assertEqual(client.transport.pools[(server.host, server.port)].in_flight, 0)
+        
+        self.assertEqual(client.metrics.summary("model")["m"]["errors"], 1)
+    
+    def test_calls_keep_caller_attribution(self):
+        """Test calls scheduled on the loop are recorded under the caller's phase."""
+        with MockOllamaServer(responder=ScriptedResponder(["ok"])) as server:
+            client = self._client(server)
+            with client.metrics.attribute(phase="debugging", task="task_1"):
+                client.run(client.chat(server.host, "m", [{"role": "user", "content": "hi"}]))
+        
+        self.assertEqual(client.metrics.summary("phase")["debugging"]["calls"], 1)
+        self.assertEqual(client.metrics.summary("task")["task_1"]["calls"], 1)
+    
+    def test_https_hosts_connect_over_tls(self):
+        """Test an https:// host opens a TLS connection and other schemes are rejected."""
+        client = AsyncOllamaClient(self.config, transport=AsyncTransport())
+        self.assertEqual(client._address("https://ollama.example:8443"), ("ollama.example", 8443, True))
+        self.assertEqual(client._address("http://ollama.example"), ("ollama.example", 11434, False))
+        with self.assertRaises(ValueError):
+            client._address("ftp://ollama.example")
+        
+        connections = []
+        
+        async def open_connection(host, port, ssl=None):
+            connections.append((host, port, ssl))
+            raise ConnectionRefusedError("refused")
+        
+        with mock.patch("asyncio.open_connection", open_connection):
+            result = client.run(client.chat("https://ollama.example:8443", "m", [{"role": "user", "content": "hi"}]))
+        client.transport.close()
+        
+        self.assertIn("error", result)
+        self.assertEqual(connections, [("ollama.example", 8443, True)])
+    
+    def test_orchestrator_wave_runs_specialists_concurrently(self):
+        """Test a wave of specialist tasks overlaps instead of running one by one."""
+        responder = ScriptedResponder(["Finding: indentation differs.\nRecommendation: use spaces."])
+        with MockOllamaServer(responder=responder, latency=0.3) as server:
+            server.configure(self.config)
+            self.config.max_requests_per_host = 4
+            client = OllamaClient(self.config)
+            
+            logger = logging.getLogger("test_async_client")
+            team = SpecialistTeam(client, logger)
+            for specialist in team.specialists.values():
+                specialist.config.host = f"{server.host}:{server.port}"
+            orchestrator = TeamOrchestrator(client, team, logger, max_workers=4)
+            
+            names = list(team.specialists)[:3]
+            wave = ExecutionWave(wave_number=1, tasks=[
+                Task(task_id=f"task_{i}", specialist=name, server=server.host, input_data={})
+                for i, name in enumerate(names)
+            ])
+            thread = _Thread()
+            start = time.perf_counter()
+            results = orchestrator._execute_wave(wave, thread)
+            elapsed = time.perf_counter() - start
+        
+        self.assertTrue(wave.is_complete)
+        self.assertTrue(all("error" not in result for result in results.values()))
+        self.assertEqual(sorted(thread.analyses), sorted(names))
+        self.assertLess(elapsed, 0.3 * len(names))
+
+
+if __name__ == '__main__':
+    unittest.main()
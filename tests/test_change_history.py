@@ -0,0 +1,144 @@
+"""
+Tests for the batched, HEAD-cached change history analysis.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+from collections import Counter, defaultdict
+from pathlib import Path
+from unittest import mock
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline import change_history_analyzer
+from pipeline.change_history_analyzer import ChangeHistoryAnalyzer
+
+AUTHORS = [("Ada", "ada@example.com"), ("Brook", "brook@example.com"), ("Cruz", "cruz@example.com")]
+
+FILES = ["app.py", "config.py", "src/main.py", "src/pkg/__init__.py", "pkg/__init__.py"] + \
+        [f"src/mod_{n}.py" for n in range(7)]
+
+COMMITS = 3000
+
+
+def _data(text: str) -> str:
+    return f"data {len(text.encode())}\n{text}\n"
+
+
+def generate_repository(path: Path, commits: int = COMMITS) -> dict:
+    """
+    Create a repository with ``commits`` commits through ``git fast-import``.
+    
+    Commit ``i`` (one minute apart, ending now) by ``AUTHORS[i % 3]``
+    appends one line to ``FILES[i % len(FILES)]``; every tenth message
+    mentions a config fix. The last commit renames ``src/mod_0.py``.
+    
+    Returns:
+        Expected per-file commit counts and blame line counts per author
+    """
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+    now = int(time.time())
+    touched = Counter()
+    blame = defaultdict(Counter)
+    stream = []
+    for number in range(commits):
+        name, email = AUTHORS[number % len(AUTHORS)]
+        filepath = FILES[number % len(FILES)]
+        touched[filepath] += 1
+        blame[filepath][name] += 1
+        content = "".join(f"line_{n} = {n}\n" for n in range(touched[filepath]))
+        message = "Fix config bug" if number % 10 == 0 else f"Edit line {touched[filepath]}"
+        stamp = f"{name} <{email}> {now - (commits - number) * 60} +0000"
+        stream += ["commit refs/heads/main", f"mark :{number + 1}", f"author {stamp}", f"committer {stamp}",
+                   _data(message).rstrip("\n")]
+        if number:
+            stream.append(f"from :{number}")
+        stream += [f"M 100644 inline {filepath}", _data(content).rstrip("\n")]
+    
+    name, email = AUTHORS[0]
+    stamp = f"{name} <{email}> {now} +0000"
+    stream += ["commit refs/heads/main", f"author {stamp}", f"committer {stamp}", _data("Move module").rstrip("\n"),
+               f"from :{commits}", "R src/mod_0.py lib/mod_0.py", ""]
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, input="\n".join(stream).encode(), check=True)
+    subprocess.run(["git", "checkout", "-q", "main"], cwd=path, check=True)
+    return {"touched": touched, "blame": blame}
+
+
+class TestChangeHistoryAnalyzer(unittest.TestCase):
+    """Analysis of a generated repository."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Generate the repository once."""
+        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls.expected = generate_repository(cls.temp_dir)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the repository."""
+        shutil.rmtree(cls.temp_dir)
+    
+    def setUp(self):
+        """Start every test with an empty cache."""
+        change_history_analyzer._analysis_cache.clear()
+    
+    def test_history_from_one_log_stream(self):
+        """Test commits, status counts, churn, risky changes and blame."""
+        with mock.patch.object(subprocess, "Popen", wraps=subprocess.Popen) as popen:
+            results = ChangeHistoryAnalyzer(str(self.temp_dir)).analyze(days=7)
+        commands = Counter(call.args[0][1] for call in popen.call_args_list)
+        self.assertEqual((commands["log"], commands["blame"]), (1, 4))
+        
+        self.assertEqual(len(results["commits"]), COMMITS + 1)
+        self.assertEqual(results["commits"][0]["message"], "Move module")
+        self.assertEqual(results["commits"][-1]["author"], "Ada")
+        self.assertEqual(len(results["risky_changes"]), COMMITS // 10)
+        
+        changes = {change["path"]: change for change in results["file_changes"]}
+        self.assertEqual(set(changes), set(FILES))
+        for filepath, count in self.expected["touched"].items():
+            self.assertEqual(changes[filepath]["additions"], 1)
+            self.assertEqual(changes[filepath]["modifications"], count - 1)
+            self.assertEqual(changes[filepath]["lines_added"] - changes[filepath]["lines_deleted"], count)
+        self.assertEqual(changes["src/mod_0.py"]["renames"], 1)
+        
+        blame = {entry["file"]: entry["authors"] for entry in results["blame_analysis"]["files_analyzed"]}
+        self.assertEqual(set(blame), {"app.py", "config.py", "src/main.py", "pkg/__init__.py"})
+        for filepath, authors in blame.items():
+            self.assertEqual(authors, dict(self.expected["blame"][filepath]))
+    
+    def test_unchanged_repository_runs_no_git(self):
+        """Test repeated analysis is served from the HEAD-keyed cache until HEAD moves."""
+        subprocess.run(["git", "pack-refs", "--all"], cwd=self.temp_dir, check=True)
+        first = ChangeHistoryAnalyzer(str(self.temp_dir)).analyze(days=7)
+        analyzer = ChangeHistoryAnalyzer(str(self.temp_dir))
+        
+        with mock.patch.object(subprocess, "run", wraps=subprocess.run) as run, \
+                mock.patch.object(subprocess, "Popen", wraps=subprocess.Popen) as popen:
+            again = analyzer.analyze(days=7)
+        self.assertEqual(again, first)
+        self.assertEqual((run.call_count, popen.call_count), (0, 0))
+        
+        again["commits"].clear()  # Callers get copies
+        self.assertEqual(len(analyzer.analyze(days=7)["commits"]), COMMITS + 1)
+        
+        env = dict(os.environ, GIT_AUTHOR_NAME="Dee", GIT_AUTHOR_EMAIL="dee@example.com",
+                   GIT_COMMITTER_NAME="Dee", GIT_COMMITTER_EMAIL="dee@example.com")
+        (self.temp_dir / "app.py").write_text("rewritten = True\n")
+        subprocess.run(["git", "commit", "-q", "-am", "Rewrite app"], cwd=self.temp_dir, env=env, check=True)
+        try:
+            updated = analyzer.analyze(days=7)
+        finally:
+            subprocess.run(["git", "reset", "-q", "--hard", "HEAD~1"], cwd=self.temp_dir, check=True)
+        self.assertEqual(len(updated["commits"]), COMMITS + 2)
+        blame = {entry["file"]: entry["authors"] for entry in updated["blame_analysis"]["files_analyzed"]}
+        self.assertEqual(blame["app.py"], {"Dee": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Tests for anchor-indexed code matching in modify_file.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.code_matcher import CodeMatcher
+from pipeline.handlers import ToolCallHandler
+
+
+def _large_source(functions=300):
+    """About ten lines per function, so 300 functions is a 3,000-line file."""
+    parts = []
+    for i in range(functions):
+        parts.append(
+            f"def function_{i}(value):\n"
+            f"    \"\"\"Compute result {i}.\"\"\"\n"
+            f"    total = value * {i}\n"
+            f"    if total > {i * 10}:\n"
+            f"        total -= {i}\n"
+            f"    for item in range(3):\n"
+            f"        total += item\n"
+            f"    return total\n"
+            f"\n"
+        )
+    return "".join(parts)
+
+
+class TestCodeMatcher(unittest.TestCase):
+    """Exact and similar matching from line anchors."""
+    
+    def setUp(self):
+        """Index a 3,000-line file."""
+        self.content = _large_source()
+        self.matcher = CodeMatcher(self.content)
+    
+    def test_exact_match_ignores_indentation(self):
+        """Test a block with different indentation is found at its lines."""
+        target = "total = value * 250\nif total > 2500:\n  total -= 250"
+        match = self.matcher.find_exact(target)
+        self.assertEqual((match.start_line, match.end_line), (250 * 9 + 3, 250 * 9 + 5))
+        self.assertEqual(match.confidence, 1.0)
+        self.assertTrue(match.exact)
+    
+    def test_similar_match_reports_location_and_confidence(self):
+        """Test a drifted block is located with a confidence below one."""
+        target = ("def function_123(value):\n"
+                  "    total = value * 123 + offset\n"
+                  "    if total >= 1230:\n"
+                  "        total -= 123\n")
+        self.assertIsNone(self.matcher.find_exact(target))
+        
+        start_time = time.time()
+        matches = self.matcher.find_similar(target)
+        elapsed = time.time() - start_time
+        
+        self.assertTrue(matches)
+        self.assertLess(matches[0].confidence, 1.0)
+        self.assertGreaterEqual(matches[0].confidence, 0.6)
+        self.assertEqual(matches[0].start_line, 123 * 9 + 1)
+        self.assertLess(elapsed, 0.5)
+    
+    def test_no_anchor_no_match(self):
+        """Test unrelated code yields no candidates."""
+        self.assertEqual(self.matcher.find_similar("class Unrelated:\n    pass"), [])
+
+
+class TestModifyFileMatching(unittest.TestCase):
+    """ToolCallHandler._handle_modify_file on a large file."""
+    
+    def setUp(self):
+        """Set up a project with one large module."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir)  # PatchManager writes .patches/ to the cwd
+        self.handler = ToolCallHandler(Path(self.temp_dir))
+        self.path = Path(self.temp_dir) / "big.py"
+        self.path.write_text(_large_source())
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        os.chdir(self.cwd)
+        shutil.rmtree(self.temp_dir)
+    
+    def test_reindented_block_applied_with_location(self):
+        """Test a block quoted without indentation is replaced in place."""
+        result = self.handler._handle_modify_file({
+            "filepath": "big.py",
+            "original_code": "if total > 2990:\n    total -= 299",
+            "new_code": "if total > 0:\n    total = 0",
+        })
+        self.assertTrue(result["success"])
+        self.assertEqual(result["match"]["start_line"], 299 * 9 + 4)
+        self.assertIn("    if total > 0:\n        total = 0\n", self.path.read_text())
+    
+    def test_missing_block_reports_closest_match(self):
+        """Test a miss on a 3,000-line file reports location and confidence quickly."""
+        start_time = time.time()
+        result = self.handler._handle_modify_file({
+            "filepath": "big.py",
+            "original_code": "    total = value * 177\n    if total > 1771:\n        total -= 177",
+            "new_code": "    total = 0",
+        })
+        elapsed = time.time() - start_time
+        
+        self.assertFalse(result["success"])
+        self.assertIn(f"Closest match at lines {177 * 9 + 3}-{177 * 9 + 5}", result["error"])
+        self.assertGreaterEqual(result["closest_match"]["confidence"], 0.6)
+        self.assertLess(elapsed, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,242 @@
+"""
+Tests for concurrent execution of independent tasks.
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.client import OllamaClient
+from pipeline.config import PipelineConfig, ServerConfig
+from pipeline.concurrent_execution import ConcurrentTaskExecutor, SerializedProxy, merge_state_dicts
+from pipeline.phases.base import PhaseResult
+from pipeline.state.manager import StateManager, PhaseState, TaskStatus
+
+
+class FakeClient:
+    """Client stub that reports the host a phase would talk to."""
+    
+    def __init__(self, config):
+        self.config = config
+    
+    def get_model_for_task(self, task_type):
+        model, host = self.config.model_assignments[task_type]
+        return host, model
+    
+    def for_config(self, config):
+        return FakeClient(config)
+
+
+class FakeCodingPhase:
+    """Mimics BasePhase.run: load, update the task, record the run, save."""
+    
+    delay = 0.1
+    
+    def __init__(self, config, client, state_manager):
+        self.config = config
+        self.client = client
+        self.state_manager = state_manager
+        self.hosts = []
+    
+    def run(self, task=None, **kwargs):
+        state = self.state_manager.load()
+        time.sleep(self.delay)
+        own = state.get_task(task.task_id)
+        own.status = TaskStatus.QA_PENDING
+        own.attempts += 1
+        state.add_task(f"Test {own.target_file}", f"tests/test_{Path(own.target_file).name}", priority=90)
+        state.phases.setdefault('coding', PhaseState()).record_run(True)
+        self.state_manager.save(state)
+        self.hosts.append(self.client.get_model_for_task('coding')[0])
+        return PhaseResult(success=True, phase='coding', task_id=own.task_id,
+                           files_created=[own.target_file])
+
+
+class TestMergeStateDicts(unittest.TestCase):
+    """Three-way merge of serialized state."""
+    
+    def test_merge_rules(self):
+        """Test disjoint keys, appended lists and counters combine."""
+        base = {'tasks': {'a': 1, 'b': 1}, 'history': [1, 2, 3], 'runs': 2, 'name': 'x'}
+        ours = {'tasks': {'a': 2, 'b': 1}, 'history': [1, 2, 3, 4], 'runs': 3, 'name': 'x'}
+        theirs = {'tasks': {'a': 1, 'b': 5, 'c': 1}, 'history': [2, 3, 5], 'runs': 4, 'name': 'y'}
+        
+        self.assertEqual(merge_state_dicts(base, ours, theirs), {
+            'tasks': {'a': 2, 'b': 5, 'c': 1},
+            'history': [1, 2, 3, 4, 5],
+            'runs': 5,
+            'name': 'y',
+        })
+    
+    def test_only_counters_add_up(self):
+        """Test iteration markers changed by both sides are not summed like counters."""
+        base = {'last_planning_iteration': 5, 'last_doc_update_count': 3, 'expansion_count': 1,
+                'tasks': {'a': {'attempts': 1, 'priority': 1}}}
+        ours = {'last_planning_iteration': 10, 'last_doc_update_count': 7, 'expansion_count': 2,
+                'tasks': {'a': {'attempts': 2, 'priority': 2}}}
+        theirs = {'last_planning_iteration': 10, 'last_doc_update_count': 8, 'expansion_count': 2,
+                  'tasks': {'a': {'attempts': 3, 'priority': 3}}}
+        
+        self.assertEqual(merge_state_dicts(base, ours, theirs), {
+            'last_planning_iteration': 10,
+            'last_doc_update_count': 8,
+            'expansion_count': 3,
+            'tasks': {'a': {'attempts': 4, 'priority': 3}},
+        })
+
+
+class TestSerializedProxy(unittest.TestCase):
+    """Collaborators shared between workers."""
+    
+    def test_calls_are_serialized(self):
+        """Test read-modify-write methods called from several threads lose no updates."""
+        class Recorder:
+            count = 0
+            
+            def record(self):
+                count = self.count
+                time.sleep(0.001)
+                self.count = count + 1
+        
+        recorder = Recorder()
+        proxy = SerializedProxy(recorder)
+        threads = [threading.Thread(target=lambda: [proxy.record() for _ in range(20)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(proxy.count, 80)
+        self.assertTrue(proxy)
+
+
+class TestConcurrentTaskExecutor(unittest.TestCase):
+    """Batch selection, slot binding and single-writer merging."""
+    
+    def setUp(self):
+        """Set up a project with a mix of independent and conflicting tasks."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = PipelineConfig(project_dir=Path(self.temp_dir), concurrent_tasks=4, servers=[
+            ServerConfig(name="one", host="one.local"),
+            ServerConfig(name="two", host="two.local"),
+        ])
+        self.state_manager = StateManager(Path(self.temp_dir))
+        
+        state = self.state_manager.load()
+        state.phases['coding'] = PhaseState()
+        self.tasks = [
+            state.add_task("Write a", "src/a.py", priority=1),
+            state.add_task("Write b", "src/b.py", priority=2),
+            state.add_task("Rewrite a", "./src/a.py", priority=3),            # Same file as a
+            state.add_task("Write c", "src/c.py", priority=4, dependencies=["src/b.py"]),
+            state.add_task("Write d", "src/d.py", priority=5),
+            state.add_task("Write e", "src/e.py", priority=6),
+        ]
+        self.state_manager.save(state)
+        self.phases = []
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def _executor(self, state_manager, max_tasks=None):
+        def factory(phase_name, config, client, manager):
+            phase = FakeCodingPhase(config, client, manager)
+            self.phases.append(phase)
+            return phase
+        return ConcurrentTaskExecutor(self.config, FakeClient(self.config), state_manager,
+                                      phase_factory=factory, max_tasks=max_tasks)
+    
+    def test_select_batch_skips_overlapping_tasks(self):
+        """Test tasks sharing a target file or dependency are not batched."""
+        executor = self._executor(self.state_manager)
+        state = self.state_manager.load()
+        batch = executor.select_batch('coding', state, state.get_task(self.tasks[0].task_id))
+        self.assertEqual([t.target_file for t in batch], ["src/a.py", "src/b.py", "src/d.py", "src/e.py"])
+    
+    def test_merged_state_matches_sequential(self):
+        """Test a concurrent batch ends in the same state as running it sequentially."""
+        sequential_dir = tempfile.mkdtemp()
+        try:
+            shutil.copytree(Path(self.temp_dir) / '.pipeline', Path(sequential_dir) / '.pipeline')
+            sequential_manager = StateManager(Path(sequential_dir))
+            
+            executor = self._executor(self.state_manager)
+            state = self.state_manager.load()
+            start_time = time.time()
+            result = executor.run('coding', state, state.get_task(self.tasks[0].task_id))
+            elapsed = time.time() - start_time
+            
+            self.assertTrue(result.success)
+            self.assertEqual(result.task_id, self.tasks[0].task_id)
+            self.assertEqual(len(executor.last_batch), 4)
+            self.assertLess(elapsed, 4 * FakeCodingPhase.delay * 0.75)
+            
+            # Same tasks through one phase, one after another
+            phase = FakeCodingPhase(self.config, FakeClient(self.config), sequential_manager)
+            for outcome in executor.last_batch:
+                phase.run(task=sequential_manager.load().get_task(outcome.task_id))
+                if outcome is not executor.last_batch[0]:
+                    state = sequential_manager.load()
+                    state.phases['coding'].record_run(True, task_id=outcome.task_id)
+                    sequential_manager.save(state)
+            
+            concurrent_state = self.state_manager.load()
+            sequential_state = sequential_manager.load()
+            
+            def summary(state):
+                return sorted((t.target_file, t.status.value, t.attempts) for t in state.tasks.values())
+            
+            self.assertEqual(summary(concurrent_state), summary(sequential_state))
+            self.assertEqual(len(concurrent_state.tasks), 10)
+            self.assertEqual(concurrent_state.phases['coding'].runs, sequential_state.phases['coding'].runs)
+            self.assertEqual(concurrent_state.phases['coding'].successes, 7)
+            
+            # Workers alternate between the two servers
+            hosts = sorted(host for phase in self.phases for host in phase.hosts)
+            self.assertEqual(hosts, ["one.local", "one.local", "two.local", "two.local"])
+        finally:
+            shutil.rmtree(sequential_dir)
+    
+    def test_single_task_falls_back_to_sequential(self):
+        """Test a batch of one runs the coordinator's own phase."""
+        executor = self._executor(self.state_manager, max_tasks=4)
+        state = self.state_manager.load()
+        for task in state.tasks.values():
+            if task.task_id != self.tasks[0].task_id:
+                task.status = TaskStatus.COMPLETED
+        self.state_manager.save(state)
+        
+        result = executor.run('coding', state, state.get_task(self.tasks[0].task_id),
+                              run_phase=lambda: "sequential")
+        self.assertEqual(result, "sequential")
+        self.assertEqual(self.phases, [])
+        self.assertFalse(self._executor(self.state_manager, max_tasks=1).enabled_for('coding', self.tasks[0]))
+    
+    def test_slot_client_collaborators_use_slot_config(self):
+        """Test a slot's client helpers see the slot's server assignment, not the original's."""
+        client = OllamaClient(self.config)
+        executor = ConcurrentTaskExecutor(self.config, client, self.state_manager,
+                                          phase_factory=None, max_tasks=4)
+        slot = executor._slot(1)
+        
+        self.assertIsNot(slot.client, client)
+        self.assertIs(slot.client.metrics, client.metrics)
+        self.assertIs(slot.client.async_client.metrics, client.metrics)
+        for helper in (slot.client.residency, slot.client.drafter):
+            self.assertIs(helper.client, slot.client)
+        self.assertIs(slot.client.residency.config, slot.config)
+        self.assertIs(slot.client.async_client.config, slot.config)
+        self.assertIs(slot.client.async_client.residency, slot.client.residency)
+        self.assertEqual(slot.config.model_assignments['coding'][1], "two.local")
+        self.assertIs(client.config, self.config)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -248,5 +248,141 @@ class TestDimensionalSpace(unittest.TestCase):
         self.assertIn("objectives_by_level", summary)
 
 
+
+def _make_objectives(count, seed=0, decimals=None):
+    """Create objectives with random 8D profiles."""
+    import random
+    from pipeline.objective_manager import ObjectiveLevel, ObjectiveStatus
+    
+    rng = random.Random(seed)
+    dimensions = ["temporal", "functional", "data", "state",
+                  "error", "context", "integration", "architecture"]
+    objectives = []
+    for i in range(count):
+        obj = PolytopicObjective(
+            id=f"obj_{i:05d}",
+            level=ObjectiveLevel.PRIMARY,
+            title=f"Objective {i}",
+            description="Synthetic objective",
+            status=ObjectiveStatus.PROPOSED
+        )
+        obj.dimensional_profile = {
+            dim: rng.random() if decimals is None else round(rng.random(), decimals)
+            for dim in dimensions
+        }
+        obj.polytopic_position = obj._calculate_position()
+        objectives.append(obj)
+    return objectives
+
+
+def _naive_clusters(objectives, max_distance):
+    """Reference centroid-linkage clustering (previous implementation)."""
+    import math
+    vectors = {obj.id: obj.get_dimensional_vector() for obj in objectives}
+    
+    def centroid(ids):
+        return [sum(vectors[i][d] for i in ids) / len(ids) for d in range(8)]
+    
+    clusters = {obj.id: [obj.id] for obj in objectives}
+    while True:
+        min_distance = float('inf')
+        merge_pair = None
+        cluster_ids = list(clusters.keys())
+        for i, c1 in enumerate(cluster_ids):
+            for c2 in cluster_ids[i+1:]:
+                distance = math.sqrt(sum((a - b) ** 2 for a, b in
+                                         zip(centroid(clusters[c1]), centroid(clusters[c2]))))
+                if distance < min_distance:
+                    min_distance = distance
+                    merge_pair = (c1, c2)
+        if min_distance > max_distance or merge_pair is None:
+            break
+        c1, c2 = merge_pair
+        clusters[c1].extend(clusters[c2])
+        del clusters[c2]
+    return list(clusters.values())
+
+
+class TestDimensionalSpaceBackends(unittest.TestCase):
+    """Array-backed queries must match the pairwise reference on both backends."""
+    
+    def _check_backend(self, vectorised):
+        from unittest import mock
+        from pipeline.polytopic import dimensional_space
+        
+        if vectorised and not dimensional_space.NUMPY_AVAILABLE:
+            self.skipTest("numpy not installed")
+        
+        with mock.patch.object(dimensional_space, 'NUMPY_AVAILABLE', vectorised):
+            # A coarse grid makes exact distance ties, which must keep insertion order
+            objectives = _make_objectives(60, seed=3, decimals=1)
+            space = DimensionalSpace()
+            for obj in objectives:
+                space.add_objective(obj)
+            self.assertEqual(space.matrix.vectorised, vectorised)
+            
+            # Nearest neighbours: stable sort over insertion order
+            reference = objectives[7]
+            expected = sorted(
+                ((o.id, reference.calculate_distance_to(o)) for o in objectives if o.id != reference.id),
+                key=lambda x: x[1]
+            )[:5]
+            actual = [(o.id, d) for o, d in space.find_nearest_neighbors(reference, k=5)]
+            self.assertEqual([i for i, _ in actual], [i for i, _ in expected])
+            for (_, d1), (_, d2) in zip(actual, expected):
+                self.assertAlmostEqual(d1, d2)
+            
+            # Adjacency uses the same threshold as is_adjacent_to
+            for obj in objectives[:10]:
+                expected_adjacent = {o.id for o in objectives
+                                     if o.id != obj.id and obj.is_adjacent_to(o, 0.3)}
+                self.assertTrue(expected_adjacent <= set(space.adjacency_graph[obj.id]))
+            
+            # Centroid ties are sensitive to float rounding, so cluster off-grid points
+            cluster_space = DimensionalSpace()
+            cluster_objectives = _make_objectives(60, seed=5)
+            for obj in cluster_objectives:
+                cluster_space.add_objective(obj)
+            for max_distance in (0.3, 0.6, 1.0):
+                clusters = cluster_space.cluster_objectives(max_distance)
+                self.assertEqual(list(clusters.values()),
+                                 _naive_clusters(cluster_objectives, max_distance))
+            
+            # Profile updates are picked up without re-adding
+            objectives[0].update_dimensional_profile("temporal", 0.95)
+            self.assertAlmostEqual(
+                space.calculate_centroid([objectives[0].id])[7],
+                objectives[0].get_dimensional_vector()[7]
+            )
+            
+            space.remove_objective(objectives[1].id)
+            self.assertNotIn(objectives[1].id, space.matrix.rows)
+            self.assertEqual(space.matrix.rows[objectives[2].id], 1)
+    
+    def test_vectorised_backend(self):
+        """Test NumPy-backed queries."""
+        self._check_backend(True)
+    
+    def test_python_backend(self):
+        """Test pure-Python fallback queries."""
+        self._check_backend(False)
+    
+    def test_clustering_performance(self):
+        """Test kNN and clustering stay cheap with thousands of objectives."""
+        import time
+        space = DimensionalSpace()
+        objectives = _make_objectives(2000, seed=11)
+        
+        start_time = time.time()
+        for obj in objectives:
+            space.add_objective(obj)
+        for obj in objectives[:200]:
+            self.assertEqual(len(space.find_nearest_neighbors(obj, k=5)), 5)
+        clusters = space.cluster_objectives(max_distance=0.4)
+        elapsed = time.time() - start_time
+        
+        self.assertEqual(sum(len(m) for m in clusters.values()), 2000)
+        self.assertLess(elapsed, 60)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""
+Tests for the indexed error signature store.
+"""
+
+import random
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.error_dedup import deduplicate_errors
+from pipeline.error_signature import ERROR_SIGNATURES_FILE, ErrorSignature, ErrorSignatureStore, ProgressTracker
+
+ITERATIONS = 250
+ERRORS_PER_ITERATION = 400  # 100k errors in the replay
+SIGNATURES = 3000
+
+
+def _error(number: int, location: int) -> dict:
+    """Error dict of signature ``number`` reported from one of its locations."""
+    if number % 3:
+        return {'type': 'SyntaxError', 'message': f"invalid syntax {number}",
+                'file': f"pkg/module_{number % 40}.py", 'line': number, 'function': f"f_{location}"}
+    return {'type': 'RuntimeError', 'message': f"KeyError: 'key_{number}'", 'function': f"f_{location}",
+            'object_type': f"Type{number % 7}", 'missing_attribute': None,
+            'traceback': f'Traceback (most recent call last):\n  File "app/part_{number % 20}.py", line {number}, '
+                         f"in run\nKeyError: 'key_{number}'"}
+
+
+def replay_stream(seed: int = 0):
+    """
+    Iterations of errors: a drifting set of active signatures (some coming
+    back after being resolved), each reported from several locations.
+    """
+    rng = random.Random(seed)
+    active = set(rng.sample(range(SIGNATURES), 120))
+    for _ in range(ITERATIONS):
+        for number in rng.sample(sorted(active), rng.randint(0, 12)):
+            active.discard(number)
+        active.update(rng.randrange(SIGNATURES) for _ in range(rng.randint(0, 12)))
+        ordered = sorted(active)
+        yield [_error(rng.choice(ordered), rng.randrange(5)) if index >= len(ordered) else _error(ordered[index], 0)
+               for index in range(ERRORS_PER_ITERATION)]
+
+
+def _naive_signatures(errors) -> set:
+    return {sig for sig in map(ErrorSignature.from_error_dict, errors) if sig}
+
+
+class TestErrorSignatureStore(unittest.TestCase):
+    """Replay of 100k errors against set differences of full iterations."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_replay_matches_set_differences(self):
+        """Test transitions, changes since N, history and persistence over the replay."""
+        store = ErrorSignatureStore(self.temp_dir / ERROR_SIGNATURES_FILE)
+        tracker = ProgressTracker(store)
+        naive = []
+        with mock.patch.object(ErrorSignature, "from_error_dict", wraps=ErrorSignature.from_error_dict) as parse:
+            for errors in replay_stream():
+                tracker.add_iteration(errors)
+                naive.append(_naive_signatures(errors))
+                transition = tracker.detect_transition()
+                if len(naive) < 2:
+                    self.assertIsNone(transition)
+                    continue
+                previous, current = naive[-2], naive[-1]
+                self.assertEqual(transition['fixed'], previous - current)
+                self.assertEqual(transition['new'], current - previous)
+                self.assertEqual(transition['persisting'], previous & current)
+                self.assertEqual(tracker.get_previous_errors(), previous)
+        # The naive pass parses every error; the store parses each distinct error dict once
+        self.assertEqual(parse.call_count - ITERATIONS * ERRORS_PER_ITERATION, len(store._lookups))
+        
+        current = naive[-1]
+        for since in (1, 100, 200, ITERATIONS - 1, ITERATIONS):
+            then = naive[since - 1]
+            changes = {name: {store.signature(sig_id) for sig_id in ids}
+                       for name, ids in store.changes_since(since).items()}
+            self.assertEqual(changes, {'new': current - then, 'persisting': current & then,
+                                       'resolved': then - current})
+        
+        for signature in list(current)[:50]:
+            seen = [number for number, signatures in enumerate(naive, 1) if signature in signatures]
+            self.assertEqual(store.history(store.intern(signature)),
+                             {'first_seen': seen[0], 'last_seen': seen[-1], 'count': len(seen)})
+        
+        store.save()
+        reloaded = ErrorSignatureStore(store.path)
+        self.assertEqual((reloaded.iteration, len(reloaded), reloaded.current()),
+                         (store.iteration, len(store), store.current()))
+        self.assertEqual(reloaded.changes_since(100), store.changes_since(100))
+    
+    def test_deduplication_reads_interned_ids(self):
+        """Test grouping through the store matches grouping by raw keys."""
+        errors = next(replay_stream(seed=1))
+        store = ErrorSignatureStore()
+        store.record_iteration(errors)
+        
+        grouped = deduplicate_errors(errors, store)
+        expected = deduplicate_errors(errors)
+        self.assertEqual(list(grouped), list(expected))
+        for key, group in grouped.items():
+            self.assertEqual(group.pop('first_seen'), 1)
+            self.assertEqual(group, expected[key])
+    
+    def test_save_appends_only_new_iterations(self):
+        """Test each save appends one line per new iteration, and a cut-off line is dropped on load."""
+        store = ErrorSignatureStore(self.temp_dir / ERROR_SIGNATURES_FILE)
+        stream = replay_stream()
+        store.record_iteration(next(stream))
+        store.save()
+        size = store.path.stat().st_size
+        
+        store.record_iteration(next(stream))
+        store.record_iteration(next(stream))
+        store.save()
+        store.save()
+        with open(store.path, 'rb') as f:
+            self.assertEqual(f.read(size).count(b'\n'), 1)
+        self.assertEqual(len(store.path.read_bytes().splitlines()), 3)
+        
+        reloaded = ErrorSignatureStore(store.path)
+        self.assertEqual((reloaded.iteration, len(reloaded), reloaded.current()),
+                         (store.iteration, len(store), store.current()))
+        
+        # A crash mid-append leaves part of a line behind
+        with open(store.path, 'ab') as f:
+            f.write(b'{"iteration": 4, "appe')
+        reloaded = ErrorSignatureStore(store.path)
+        self.assertEqual(reloaded.iteration, 3)
+        reloaded.record_iteration(next(stream))
+        reloaded.save()
+        self.assertEqual(ErrorSignatureStore(store.path).iteration, 4)
+    
+    def test_unreadable_store_starts_empty(self):
+        """Test a corrupt store file is ignored."""
+        path = self.temp_dir / ERROR_SIGNATURES_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{not json\n")
+        
+        store = ErrorSignatureStore(path)
+        self.assertEqual((store.iteration, len(store)), (0, 0))
+        self.assertEqual(store.changes_since(0), {'new': set(), 'persisting': set(), 'resolved': set()})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Tests for import graph cycle detection and incremental rebuilds.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.analysis.import_graph import ImportGraphBuilder, ImportNode
+from pipeline.analysis.import_graph_benchmark import run_benchmark
+
+
+def _in_memory(graph):
+    builder = ImportGraphBuilder(tempfile.gettempdir())
+    builder.nodes = {name: ImportNode(filepath=name, imports=set(imports)) for name, imports in graph.items()}
+    builder._build_reverse_relationships()
+    builder._detect_circular_dependencies()
+    return builder
+
+
+class TestCycleDetection(unittest.TestCase):
+    """Strongly connected components with a shortest representative cycle."""
+    
+    def test_one_shortest_cycle_per_component(self):
+        """Test each SCC is reported once, with its shortest cycle and all members."""
+        builder = _in_memory({
+            "a.py": ["b.py"], "b.py": ["c.py", "a.py"], "c.py": ["a.py"],
+            "d.py": ["e.py"], "e.py": ["d.py", "a.py"],
+            "f.py": ["f.py"], "g.py": ["a.py"],
+        })
+        cycles = {tuple(dep.cycle): dep for dep in builder.get_circular_dependencies()}
+        
+        self.assertEqual(set(cycles), {("a.py", "b.py"), ("d.py", "e.py"), ("f.py",)})
+        self.assertEqual(cycles[("a.py", "b.py")].component, ["a.py", "b.py", "c.py"])
+        self.assertEqual(cycles[("a.py", "b.py")].severity, "high")
+        self.assertEqual(str(cycles[("d.py", "e.py")]), "d.py -> e.py -> d.py")
+    
+    def test_deep_chain_does_not_recurse(self):
+        """Test a chain far deeper than the recursion limit is handled."""
+        depth = sys.getrecursionlimit() * 3
+        graph = {f"m{i}.py": [f"m{i + 1}.py"] for i in range(depth)}
+        graph[f"m{depth}.py"] = ["m0.py"]
+        builder = _in_memory(graph)
+        
+        (dependency,) = builder.get_circular_dependencies()
+        self.assertEqual(len(dependency.cycle), depth + 1)
+        self.assertEqual(dependency.severity, "low")
+    
+    def test_benchmark_finds_planted_cycles(self):
+        """Test the synthetic benchmark finds exactly the planted cycles, also after an edit."""
+        report = run_benchmark(modules=600, cycles=10)
+        
+        self.assertEqual(report["found_cycles"], 10)
+        self.assertTrue(report["planted_found"])
+        self.assertTrue(report["full_build_planted_found"])
+        self.assertTrue(report["incremental_found"])
+
+
+class TestIncrementalBuild(unittest.TestCase):
+    """In-place updates of changed files."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self._write("app/__init__.py", "")
+        self._write("app/models.py", "import os\n")
+        self._write("app/views.py", "from app import models\nimport app.models\n")
+        self._write("main.py", "import app.views\n")
+        self.builder = ImportGraphBuilder(str(self.temp_dir))
+        self.builder.build_graph()
+        
+        self.parsed = []
+        parse_file = self.builder._parse_file
+        self.builder._parse_file = lambda filepath: (self.parsed.append(filepath), parse_file(filepath))
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def _write(self, filepath, source):
+        path = self.temp_dir / filepath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+    
+    def test_changed_file_updates_edges_in_place(self):
+        """Test only the named file is re-parsed and its old and new targets are updated."""
+        self.assertEqual(self.builder.get_file_importers("app/models.py"), ["app/views.py"])
+        self._write("app/models.py", "import app.views\n")
+        
+        nodes = self.builder.build_graph(changed_files=["app/models.py"])
+        
+        self.assertEqual(self.parsed, ["app/models.py"])
+        self.assertEqual(nodes["app/views.py"].imported_by, {"main.py", "app/models.py"})
+        self.assertEqual(nodes["app/models.py"].imported_by, {"app/views.py"})
+        self.assertEqual([dep.cycle for dep in self.builder.get_circular_dependencies()],
+                         [["app/models.py", "app/views.py"]])
+        
+        self._write("app/models.py", "")
+        self.builder.invalidate_cache("app/models.py")
+        self.builder.build_graph()
+        self.assertEqual(self.builder.get_circular_dependencies(), [])
+        self.assertNotIn("app/models.py", nodes["app/views.py"].imported_by)
+    
+    def test_stale_cache_reparses_files_changed_on_disk(self):
+        """Test a plain invalidation re-parses added, removed and modified files only."""
+        self._write("app/util.py", "VALUE = 1\n")
+        self._write("main.py", "import app.views\nimport app.util\nimport helpers\n")
+        (self.temp_dir / "app/views.py").unlink()
+        
+        self.builder.build_graph()
+        self.assertEqual(self.parsed, [])
+        
+        self.builder.invalidate_cache()
+        nodes = self.builder.build_graph()
+        
+        self.assertEqual(sorted(self.parsed), ["app/util.py", "main.py"])
+        self.assertNotIn("app/views.py", nodes)
+        self.assertEqual(nodes["app/models.py"].imported_by, set())
+        self.assertTrue(nodes["app/models.py"].is_entry_point)
+        self.assertEqual(nodes["app/util.py"].imported_by, {"main.py"})
+        self.assertEqual(nodes["main.py"].external_imports, {"app.views", "helpers"})
+        
+        self._write("helpers.py", "")
+        self.builder.invalidate_cache()
+        self.builder.build_graph()
+        self.assertIn("helpers.py", nodes["main.py"].imports)
+        self.assertEqual(self.builder.get_file_importers("helpers.py"), ["main.py"])
+
+
+if __name__ == '__main__':
+    unittest.main()
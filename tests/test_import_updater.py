@@ -0,0 +1,167 @@
+"""
+Tests for batched, AST-located import rewriting in ImportUpdater.
+"""
+
+import ast
+import random
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.analysis.import_updater import ImportUpdater
+
+VIEWS = """from ..models import X
+from .. import util, models as m
+from app import (
+    models,  # the models
+)
+import app.models as am
+
+
+def handler():
+    from app.models import X
+    return X
+"""
+
+
+def _write_synthetic_project(project_dir: Path, modules: int, package_size: int = 20):
+    """Packages of modules importing earlier modules in plain, aliased, relative and multi-line form."""
+    rng = random.Random(0)
+    paths = []
+    for index in range(modules):
+        package = f"pkg_{index // package_size}"
+        (project_dir / package).mkdir(parents=True, exist_ok=True)
+        (project_dir / package / "__init__.py").touch()
+        
+        lines = []
+        for number, target in enumerate(sorted(rng.sample(range(index), min(index, 3)))):
+            style = (index + number) % 4
+            target_package, name = f"pkg_{target // package_size}", f"mod_{target}"
+            if style == 0:
+                lines.append(f"import {target_package}.{name} as m_{target}")
+            elif style == 1:
+                lines.append(f"from {target_package}.{name} import VALUE as v_{target}")
+            elif style == 2 and target_package == package:
+                lines.append(f"from .{name} import VALUE as r_{target}")
+            else:
+                lines.append(f"from {target_package} import (\n    {name},\n)")
+        lines.append(f"\nVALUE = {index}\n")
+        
+        path = f"{package}/mod_{index}.py"
+        (project_dir / path).write_text("\n".join(lines))
+        paths.append(path)
+    return paths
+
+
+def _unresolved_imports(project_dir: Path):
+    """Project imports (``pkg_*`` / ``moved_*``) that no longer resolve to a file."""
+    def exists(parts) -> bool:
+        base = project_dir.joinpath(*parts)
+        return base.with_suffix(".py").is_file() or (base / "__init__.py").is_file()
+    
+    unresolved = []
+    for path in sorted(project_dir.rglob("*.py")):
+        relative = path.relative_to(project_dir)
+        package = relative.parent.parts
+        for node in ast.walk(ast.parse(path.read_text())):
+            if isinstance(node, ast.Import):
+                targets = [tuple(alias.name.split(".")) for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                module = tuple(node.module.split(".")) if node.module else ()
+                base = package[:len(package) - (node.level - 1)] + module if node.level else module
+                targets = [base] if node.module else []
+                targets += [base + (alias.name,) for alias in node.names if alias.name.startswith("mod_")]
+            else:
+                continue
+            for target in targets:
+                if target and target[0].startswith(("pkg_", "moved_")) and not exists(target):
+                    unresolved.append(f"{relative}: {'.'.join(target)}")
+    return unresolved
+
+
+class TestBatchImportUpdate(unittest.TestCase):
+    """update_imports_for_moves on small trees and a 500-move project."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        for path, source in {
+            "app/__init__.py": "",
+            "app/models.py": "X = 1\n",
+            "app/util.py": "Y = 2\n",
+            "app/sub/__init__.py": "",
+            "app/sub/views.py": VIEWS,
+            "web/__init__.py": "",
+        }.items():
+            (self.temp_dir / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.temp_dir / path).write_text(source)
+        self.updater = ImportUpdater(str(self.temp_dir))
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_rewrites_relative_multiline_and_moved_importer(self):
+        """Test all import forms are rewritten in one pass, relative to the importer's new package."""
+        (self.temp_dir / "app/models.py").rename(self.temp_dir / "web/models.py")
+        (self.temp_dir / "app/sub/views.py").chmod(0o755)
+        
+        results = self.updater.update_imports_for_moves([("app/models.py", "web/models.py"),
+                                                          ("app/sub/views.py", "web/views.py")])
+        
+        (result,) = results
+        self.assertEqual((result.file, result.success, result.changes_made), ("app/sub/views.py", True, 5))
+        content = (self.temp_dir / "app/sub/views.py").read_text()
+        self.assertEqual(content.splitlines()[:7], [
+            "from .models import X",
+            "from app import util",
+            "from . import models as m",
+            "from web import (",
+            "    models,  # the models",
+            ")",
+            "import web.models as am",
+        ])
+        self.assertIn("    from web.models import X", content)
+        self.assertEqual([edit.line for edit in result.edits], [1, 2, 3, 6, 10])
+        self.assertTrue((self.temp_dir / "app/sub/views.py.bak").exists())
+        self.assertEqual((self.temp_dir / "app/sub/views.py").stat().st_mode & 0o777, 0o755)
+        self.assertEqual(sorted(p.name for p in (self.temp_dir / "app/sub").iterdir()),
+                         ["__init__.py", "views.py", "views.py.bak"])
+    
+    def test_nothing_written_when_a_file_would_break(self):
+        """Test the batch is all or nothing when one rewritten file no longer parses."""
+        (self.temp_dir / "main.py").write_text("import app.util\n")
+        
+        results = self.updater.update_imports_for_moves([("app/models.py", "web/models.py"),
+                                                          ("app/util.py", "web/my-util.py")])
+        
+        self.assertEqual(sorted(result.file for result in results), ["app/sub/views.py", "main.py"])
+        self.assertFalse(any(result.success for result in results))
+        self.assertIn("Syntax error", next(r.error for r in results if r.file == "main.py"))
+        self.assertEqual((self.temp_dir / "app/sub/views.py").read_text(), VIEWS)
+        self.assertEqual((self.temp_dir / "main.py").read_text(), "import app.util\n")
+    
+    def test_500_simultaneous_moves(self):
+        """Test a synthetic project has no unresolved imports after 500 moves."""
+        project_dir = self.temp_dir / "synthetic"
+        paths = _write_synthetic_project(project_dir, modules=600)
+        chosen = sorted(random.Random(1).sample(paths, 500))
+        moves = [(path, f"moved_{number // 20}/{Path(path).name}") for number, path in enumerate(chosen)]
+        
+        results = ImportUpdater(str(project_dir)).update_imports_for_moves(moves)
+        self.assertTrue(all(result.success for result in results))
+        
+        for old_path, new_path in moves:
+            destination = project_dir / new_path
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            (destination.parent / "__init__.py").touch()
+            shutil.move(str(project_dir / old_path), str(destination))
+        self.assertEqual(_unresolved_imports(project_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
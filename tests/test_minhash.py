@@ -0,0 +1,237 @@
+"""
+Tests for MinHash/LSH duplicate detection.
+"""
+
+import ast
+import difflib
+import random
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.analysis import minhash
+from pipeline.analysis.file_refactoring import DuplicateDetector, FileComparator
+from pipeline.analysis.minhash import (
+    LSHIndex, MinHasher, SignatureStore, ast_tokens, estimate_similarity, lsh_params
+)
+
+
+def _module(functions, imports=("os", "json")):
+    lines = [f"import {name}" for name in imports]
+    for name in functions:
+        lines += [f"def {name}(value):", f"    return value.strip()", ""]
+    return "\n".join(lines)
+
+
+class TestMinHash(unittest.TestCase):
+    """Signatures and banding."""
+    
+    def test_estimate_tracks_jaccard(self):
+        """Test signatures estimate Jaccard similarity, identically with and without NumPy."""
+        hasher = MinHasher()
+        first = {f"name_{n}" for n in range(100)}
+        second = {f"name_{n}" for n in range(25, 125)}  # Jaccard 0.6
+        
+        signature = hasher.signature(first)
+        self.assertAlmostEqual(estimate_similarity(signature, hasher.signature(second)), 0.6, delta=0.12)
+        self.assertEqual(estimate_similarity(signature, hasher.signature(set(first))), 1.0)
+        with mock.patch.object(minhash, "NUMPY_AVAILABLE", False):
+            self.assertEqual(hasher.signature(first), signature)
+    
+    def test_banding(self):
+        """Test the banding for a threshold and the candidates it produces."""
+        self.assertEqual(lsh_params(0.75), (25, 5))
+        self.assertIsNone(lsh_params(0.0))
+        with self.assertRaises(ValueError):
+            LSHIndex(0.0)
+        
+        hasher = MinHasher()
+        index = LSHIndex(0.75)
+        base = [f"f{n}" for n in range(20)]
+        index.add("a.py", hasher.signature(base))
+        index.add("b.py", hasher.signature([f"g{n}" for n in range(20)]))
+        index.add("c.py", hasher.signature(base[:-1] + ["other"]))
+        self.assertEqual(index.candidate_pairs(), [("a.py", "c.py")])
+    
+    def test_tokens_ignore_names_and_literals(self):
+        """Test renamed copies of a function produce the same tokens."""
+        first = ast.parse("def f(a):\n    return a.get('x') + 1\n").body[0]
+        renamed = ast.parse("def g(b):\n    return b.get('y') + 2\n").body[0]
+        other_api = ast.parse("def f(a):\n    return a.pop('x') + 1\n").body[0]
+        
+        self.assertEqual(ast_tokens(first), ast_tokens(renamed))
+        self.assertNotEqual(ast_tokens(first), ast_tokens(other_api))
+
+
+class TestDuplicateDetector(unittest.TestCase):
+    """LSH candidate generation and persisted signatures."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        functions = [f"handler_{n}" for n in range(10)]
+        (self.temp_dir / "a.py").write_text(_module(functions))
+        (self.temp_dir / "b.py").write_text(_module(functions[:-1] + ["extra"]))
+        (self.temp_dir / "c.py").write_text(_module([f"other_{n}" for n in range(10)]))
+        (self.temp_dir / "broken.py").write_text("def broken(:\n")
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def _store(self):
+        return SignatureStore(self.temp_dir / minhash.SIGNATURES_FILE)
+    
+    def test_matches_exhaustive_search(self):
+        """Test LSH candidates find the same duplicate sets as comparing every pair."""
+        detector = DuplicateDetector(self.temp_dir, signatures=self._store())
+        found = detector.find_duplicates(0.75)
+        
+        self.assertEqual([sorted(ds.files) for ds in found], [["a.py", "b.py"]])
+        self.assertEqual(detector.pairs_compared, 1)
+        
+        files = detector._get_python_files("project", False)
+        features = {filepath: detector._extract_features(filepath) for filepath in files}
+        exhaustive = detector._find_duplicate_sets(files, features, 0.75, exhaustive=True)
+        self.assertEqual([(ds.files, ds.similarity_scores) for ds in exhaustive],
+                         [(ds.files, ds.similarity_scores) for ds in found])
+        self.assertEqual(detector.pairs_compared, 6)
+    
+    def test_unchanged_files_are_not_rehashed(self):
+        """Test signatures persist by content hash and only changed files are extracted again."""
+        DuplicateDetector(self.temp_dir, signatures=self._store()).find_duplicates(0.75)
+        (self.temp_dir / "c.py").write_text(_module(["changed"]))
+        
+        store = self._store()
+        with mock.patch.object(DuplicateDetector, "collect_file", wraps=DuplicateDetector.collect_file) as collect:
+            DuplicateDetector(self.temp_dir, signatures=store).find_duplicates(0.75)
+        
+        self.assertEqual((store.hits, store.misses), (3, 1))
+        self.assertEqual(collect.call_count, 1)
+        self.assertEqual(len(self._store()), 4)  # The old c.py record is pruned
+
+
+class TestFileComparator(unittest.TestCase):
+    """Function similarity gated by MinHash estimates."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "a.py").write_text(
+            "def same(x):\n    return x + 1\n\n"
+            "def close(items):\n    total = 0\n    for item in items:\n        total += item.size\n    return total\n\n"
+            "def far(path):\n    return open(path).read()\n")
+        (self.temp_dir / "b.py").write_text(
+            "def same(x):\n    return x + 1\n\n"
+            "def close(items):\n    total = 0\n    for item in items:\n        total += item.weight\n    return total\n\n"
+            "def far(data):\n    result = {}\n    for key, value in data.items():\n"
+            "        if value:\n            result[key] = sorted(value)\n    return result\n")
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_difflib_only_for_close_implementations(self):
+        """Test difflib runs only on similar implementations and function signatures are stored."""
+        store = SignatureStore(self.temp_dir / minhash.SIGNATURES_FILE)
+        comparator = FileComparator(self.temp_dir, signatures=store)
+        with mock.patch("difflib.SequenceMatcher", wraps=difflib.SequenceMatcher) as matcher:
+            comparison = comparator.compare("a.py", "b.py", "functions")
+        
+        similarity = {c.name: c.similarity for c in comparison.common_features + comparison.conflicts}
+        self.assertEqual(similarity["same"], 1.0)
+        self.assertLess(similarity["far"], 0.5)
+        self.assertGreater(similarity["close"], 0.9)
+        self.assertEqual(matcher.call_count, 1)
+        self.assertEqual(len(SignatureStore(store.path)), 2)
+
+
+class TestLSHRecall(unittest.TestCase):
+    """LSH candidates against scoring every pair on a larger project."""
+    
+    def setUp(self):
+        """Write 300 files with 20 planted clusters of near-duplicates."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        rng = random.Random(0)
+        
+        def render(imports, functions):
+            lines = [f"import lib_{number}" for number in imports]
+            for number in functions:
+                lines += ["", "", f"def handle_{number}(item, limit={number % 5}):",
+                          f"    return [value * {number % 3 + 1} for value in item if value < limit]"]
+            return "\n".join(lines) + "\n"
+        
+        self.planted = set()
+        index = 0
+        while index < 300:
+            imports = sorted(rng.sample(range(500), rng.randint(2, 5)))
+            functions = rng.sample(range(50000), rng.randint(8, 14))
+            original = f"pkg_{index // 100}/mod_{index}.py"
+            sources = {original: render(imports, functions)}
+            if index % 15 == 0:
+                # Copies that each swap out one function
+                for _ in range(rng.randint(1, 3)):
+                    copy = list(functions)
+                    copy[rng.randrange(len(copy))] = rng.randrange(50000)
+                    index += 1
+                    path = f"pkg_{index // 100}/mod_{index}.py"
+                    sources[path] = render(imports, copy)
+                    self.planted.add(frozenset((original, path)))
+            for path, source in sources.items():
+                (self.temp_dir / path).parent.mkdir(parents=True, exist_ok=True)
+                (self.temp_dir / path).write_text(source)
+            index += 1
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_full_recall(self):
+        """Test the LSH pass finds every brute-force pair with far fewer comparisons."""
+        detector = DuplicateDetector(self.temp_dir, signatures=SignatureStore(self.temp_dir / "signatures.json"))
+        files = detector._get_python_files("project", False)
+        features = {filepath: detector._extract_features(filepath) for filepath in files}
+        
+        def pairs(duplicate_sets):
+            return {frozenset(pair) for ds in duplicate_sets for pair in ds.similarity_scores}
+        
+        brute_force = pairs(detector._find_duplicate_sets(files, features, 0.75, exhaustive=True))
+        brute_force_comparisons = detector.pairs_compared
+        lsh = pairs(detector._find_duplicate_sets(files, features, 0.75))
+        
+        self.assertEqual(lsh, brute_force)
+        self.assertLessEqual(self.planted, lsh)
+        self.assertLess(detector.pairs_compared * 20, brute_force_comparisons)
+
+
+class TestSignatureStorePath(unittest.TestCase):
+    """Where and how the shared store is written."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_store_lives_in_configured_state_dir(self):
+        """Test the shared store follows the state dir and is replaced atomically."""
+        store = minhash.signature_store(self.temp_dir, "state")
+        self.assertEqual(store.path, (self.temp_dir / "state" / minhash.SIGNATURES_FILE).resolve())
+        
+        store.update(store.content_hash("x = 1\n"), features=[])
+        with mock.patch.object(minhash, "atomic_write", wraps=minhash.atomic_write) as write:
+            store.save()
+        
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(len(SignatureStore(store.path)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Tests for the mock Ollama server and the pipeline benchmark harness.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.benchmark import PipelineBenchmark, create_synthetic_project, run_benchmarks
+from pipeline.client import OllamaClient
+from pipeline.config import PipelineConfig
+from pipeline.mock_ollama import MockOllamaServer, RecordedResponder, ScriptedResponder
+
+
+class TestMockOllamaServer(unittest.TestCase):
+    """OllamaClient against the mock server."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = PipelineConfig(project_dir=Path(self.temp_dir))
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def _client(self, server):
+        server.configure(self.config)
+        client = OllamaClient(self.config)
+        client.discover_servers()
+        return client, client.get_model_for_task("coding")
+    
+    def test_scripted_responses_with_latency_and_metadata(self):
+        """Test scripted replies come back in order with Ollama timing fields."""
+        responder = ScriptedResponder(["first", {"content": "", "tool_calls": [
+            {"function": {"name": "approve_code", "arguments": {"filepath": "a.py"}}}]}])
+        with MockOllamaServer(responder, latency=0.05) as server:
+            client, (host, model) = self._client(server)
+            self.assertEqual(host, "127.0.0.1")
+            
+            start_time = time.time()
+            first = client.chat(host, model, [{"role": "user", "content": "hi"}])
+            self.assertGreaterEqual(time.time() - start_time, 0.05)
+            second = client.chat(host, model, [{"role": "user", "content": "hi"}])
+            third = client.chat(host, model, [{"role": "user", "content": "hi"}])
+        
+        self.assertEqual(first["message"]["content"], "first")
+        self.assertEqual(second["message"]["tool_calls"][0]["function"]["name"], "approve_code")
+        self.assertEqual(third["message"]["content"], "first")
+        self.assertGreater(first["eval_count"], 0)
+        self.assertGreaterEqual(first["total_duration"], 0.05 * 1e9)
+        self.assertEqual(len(server.requests), 3)
+    
+    def test_recorded_responses_and_tool_rules(self):
+        """Test recordings replay and the default responder calls an offered tool."""
+        recording = Path(self.temp_dir) / "recording.jsonl"
+        recording.write_text(json.dumps({"message": {"role": "assistant", "content": "recorded"}}) + "\n\n")
+        
+        with MockOllamaServer(RecordedResponder.from_file(recording)) as server:
+            client, (host, model) = self._client(server)
+            self.assertEqual(client.chat(host, model, [])["message"]["content"], "recorded")
+        
+        tools = [{"type": "function", "function": {"name": "create_python_file"}}]
+        with MockOllamaServer() as server:
+            client, (host, model) = self._client(server)
+            response = client.chat(host, model, [{"role": "user", "content": "Implement ./src/core/app.py"}],
+                                   tools=tools)
+        call = response["message"]["tool_calls"][0]["function"]
+        self.assertEqual(call["name"], "create_python_file")
+        self.assertEqual(call["arguments"]["filepath"], "src/core/app.py")
+
+
+def _crash(kwargs, queue):
+    """Isolated benchmark body that dies without reporting."""
+    os._exit(3)
+
+
+class TestPipelineBenchmark(unittest.TestCase):
+    """End-to-end benchmark on a small synthetic project."""
+    
+    def test_synthetic_project(self):
+        """Test the synthetic project has the requested number of modules."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            create_synthetic_project(Path(temp_dir), 30)
+            modules = list(Path(temp_dir).glob("src/pkg_*/module_*.py"))
+            self.assertEqual(len(modules), 30)
+            compile(modules[-1].read_text(), str(modules[-1]), "exec")
+        finally:
+            shutil.rmtree(temp_dir)
+    
+    def test_report(self):
+        """Test a short run reports phase overhead, state I/O and RSS."""
+        report = PipelineBenchmark(files=10, iterations=3).run()
+        
+        self.assertEqual(report["files"], 10)
+        self.assertGreater(report["model_calls"], 0)
+        self.assertEqual(report["model_calls"], report["server_requests"])
+        self.assertGreater(report["state_io"]["saves"], 0)
+        self.assertTrue(report["phases"])
+        for stats in report["phases"].values():
+            self.assertGreaterEqual(stats["overhead_seconds"], 0)
+        self.assertEqual(sum(s["runs"] for s in report["phases"].values()), 3)
+    
+    def test_isolated_failures_raise(self):
+        """Test an isolated run that raises or dies fails instead of hanging."""
+        with self.assertRaisesRegex(RuntimeError, "TypeError"):
+            run_benchmarks(sizes=(10,), no_such_option=True)
+        
+        with mock.patch("pipeline.benchmark._run_isolated", _crash):
+            with self.assertRaisesRegex(RuntimeError, "exited with code 3"):
+                run_benchmarks(sizes=(10,))
+
+
+if __name__ == '__main__':
+    unittest.main()
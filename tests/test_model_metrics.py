@@ -0,0 +1,141 @@
+"""
+Tests for model call metrics from Ollama response metadata.
+"""
+
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.analytics import OptimizationEngine, PredictiveAnalyticsEngine
+from pipeline.client import OllamaClient
+from pipeline.config import PipelineConfig
+from pipeline.mock_ollama import MockOllamaServer
+from pipeline.model_metrics import CallMetrics, ModelMetricsStore, UNATTRIBUTED
+
+
+def _response(prompt=100, generated=50, load=0.01, total=1.0):
+    return {
+        "prompt_eval_count": prompt,
+        "eval_count": generated,
+        "prompt_eval_duration": int(0.2 * 1e9),
+        "eval_duration": int(0.5 * 1e9),
+        "load_duration": int(load * 1e9),
+        "total_duration": int(total * 1e9),
+    }
+
+
+class TestModelMetricsStore(unittest.TestCase):
+    """Aggregation, attribution and persistence."""
+    
+    def test_call_metrics_from_response(self):
+        """Test Ollama's nanosecond fields become seconds and rates."""
+        call = CallMetrics.from_response(_response(load=2.5), model="m", host="h")
+        self.assertEqual(call.tokens, 150)
+        self.assertAlmostEqual(call.eval_rate, 100.0)
+        self.assertAlmostEqual(call.prompt_rate, 500.0)
+        self.assertTrue(call.reloaded)
+        
+        failed = CallMetrics.from_response({"error": "timeout"}, model="m", host="h", wall_seconds=3.0)
+        self.assertTrue(failed.error)
+        self.assertIsNone(failed.eval_rate)
+        self.assertEqual(failed.total_seconds, 3.0)
+    
+    def test_attribution_and_percentiles(self):
+        """Test calls are grouped by the innermost phase/task scope of their thread."""
+        store = ModelMetricsStore()
+        with store.attribute(phase="coding"):
+            with store.attribute(task="task_1"):
+                for total in (1.0, 2.0, 3.0, 4.0):
+                    store.record(CallMetrics.from_response(_response(total=total), model="m", host="h"))
+            before = store.snapshot("phase", "coding")
+            worker = threading.Thread(target=lambda: store.record(
+                CallMetrics.from_response(_response(load=1.5), model="m", host="h")))
+            worker.start()
+            worker.join()
+            store.record(CallMetrics.from_response(_response(), model="small", host="h"))
+        
+        phases = store.summary("phase")
+        self.assertEqual(phases["coding"]["calls"], 5)
+        self.assertEqual(phases[UNATTRIBUTED]["calls"], 1)
+        self.assertEqual(phases[UNATTRIBUTED]["reloads"], 1)
+        self.assertEqual(store.summary("task")["task_1"]["calls"], 4)
+        self.assertNotIn("p50_total_seconds", store.summary("task")["task_1"])
+        self.assertEqual(store.summary("model")["m"]["p50_total_seconds"], 2.0)
+        self.assertEqual(store.summary("host")["h"]["prompt_tokens"], 600)
+        
+        usage = store.usage_since("phase", "coding", before)
+        self.assertEqual(usage["calls"], 1)
+        self.assertEqual(usage["eval_tokens"], 50)
+    
+    def test_save_and_load(self):
+        """Test totals and rolling windows survive a round trip."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            store = ModelMetricsStore()
+            with store.attribute(phase="qa", task="task_2"):
+                store.record(CallMetrics.from_response(_response(), model="m", host="h"))
+            path = Path(temp_dir) / "model_metrics.json"
+            store.save(path)
+            
+            loaded = ModelMetricsStore.load(path)
+            self.assertEqual(loaded.summary("phase"), store.summary("phase"))
+            self.assertEqual(loaded.summary("task"), store.summary("task"))
+            self.assertTrue(any("qa" in line for line in loaded.format_report()))
+            self.assertEqual(ModelMetricsStore.load(Path(temp_dir) / "missing.json").summary("phase"), {})
+        finally:
+            shutil.rmtree(temp_dir)
+    
+    def test_client_records_calls(self):
+        """Test OllamaClient records the mock server's token counts per phase."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            config = PipelineConfig(project_dir=Path(temp_dir))
+            with MockOllamaServer(tokens_per_second=1000) as server:
+                server.configure(config)
+                client = OllamaClient(config)
+                client.discover_servers()
+                host, model = client.get_model_for_task("coding")
+                with client.metrics.attribute(phase="coding"):
+                    client.chat(host, model, [{"role": "user", "content": "hello " * 100}])
+                client.chat("127.0.0.1:1", model, [])
+            
+            coding = client.metrics.summary("phase")["coding"]
+            self.assertEqual(coding["prompt_tokens"], server.requests[0]["prompt_tokens"])
+            self.assertEqual(coding["eval_tokens"], server.requests[0]["eval_tokens"])
+            self.assertIsNotNone(coding["eval_tokens_per_second"])
+            self.assertEqual(client.metrics.summary("phase")[UNATTRIBUTED]["errors"], 1)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestModelUsageAnalytics(unittest.TestCase):
+    """Model usage in the predictive and optimization engines."""
+    
+    def test_reloads_and_token_estimates(self):
+        """Test reload-heavy phases are flagged and token spend is predicted."""
+        usage = {"calls": 2, "reloads": 1, "prompt_tokens": 900, "eval_tokens": 100,
+                 "load_seconds": 8.0, "total_seconds": 20.0}
+        optimizer = OptimizationEngine()
+        predictor = PredictiveAnalyticsEngine()
+        for _ in range(5):
+            optimizer.record_model_usage("coding", usage)
+            predictor.record_phase_execution("coding", True, 30.0, {}, model_usage=usage)
+        optimizer.record_model_usage("qa", {"calls": 0})
+        
+        ids = [o.optimization_id for o in optimizer.generate_optimization_plan().optimizations]
+        self.assertIn("model_reload_coding", ids)
+        self.assertNotIn("qa", optimizer.model_usage)
+        
+        prediction = predictor.predict_phase_success("coding", {})
+        self.assertEqual(prediction.estimated_tokens, 1000)
+        self.assertIn("Model reloads take a large share of model time", prediction.risk_factors)
+        self.assertEqual(predictor.get_statistics()["total_model_tokens"], 5000)
+
+
+if __name__ == '__main__':
+    unittest.main()
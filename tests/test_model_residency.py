@@ -0,0 +1,110 @@
+"""
+Tests for the model residency planner (warm-up, keep_alive pins, host choice).
+"""
+
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.client import OllamaClient
+from pipeline.config import PipelineConfig
+from pipeline.mock_ollama import MockOllamaServer, ScriptedResponder
+from pipeline.model_residency import estimate_model_memory_gb, parse_keep_alive
+
+CODER = "qwen2.5-coder:32b"
+DESIGNER = "qwen2.5:14b"
+
+
+class TestResidencyPlanning(unittest.TestCase):
+    """Estimates, predictions and host preference."""
+    
+    def test_estimates_and_keep_alive(self):
+        """Test memory estimates from model tags and keep_alive parsing."""
+        self.assertAlmostEqual(estimate_model_memory_gb(CODER), 20.2)
+        self.assertAlmostEqual(estimate_model_memory_gb("mixtral:8x7b"), 34.6)
+        self.assertLess(estimate_model_memory_gb("functiongemma:latest"), 2)
+        self.assertEqual(parse_keep_alive("30m"), 1800)
+        self.assertEqual(parse_keep_alive(0), 0)
+        self.assertIsNone(parse_keep_alive(-1))
+        self.assertEqual(parse_keep_alive(None), 300)
+    
+    def test_prediction_and_resident_host_preference(self):
+        """Test successors come from history plus phase-graph edges, and resident hosts win."""
+        config = PipelineConfig(model_residency=True)
+        client = OllamaClient(config)
+        planner = client.residency
+        
+        history = ["planning", "coding", "qa", "coding", "qa", "debugging", "qa"]
+        edges = {"qa": ["debugging", "documentation", "refactoring"]}
+        self.assertEqual(planner.predict_next_phases("qa", history, edges), [("debugging", 0.4), ("coding", 0.2)])
+        self.assertEqual(planner.predict_next_phases("unknown", history, edges), [])
+        
+        client.available_models = {"ollama02.thiscluster.net": [CODER], "ollama01.thiscluster.net": [CODER]}
+        self.assertEqual(client.get_model_for_task("coding"), ("ollama02.thiscluster.net", CODER))
+        planner.observe_call("ollama01.thiscluster.net", CODER)
+        self.assertEqual(client.get_model_for_task("coding"), ("ollama01.thiscluster.net", CODER))
+
+
+class TestResidencyAgainstMock(unittest.TestCase):
+    """Warm-ups against the mock server's simulated residency."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = PipelineConfig(project_dir=Path(self.temp_dir), model_residency=True)
+        self.config.model_assignments["coding"] = (CODER, "127.0.0.1")
+        self.config.model_assignments["prompt_design"] = (DESIGNER, "127.0.0.1")
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def _run(self, memory_gb):
+        server = MockOllamaServer(responder=ScriptedResponder(["ok"]), models=[CODER, DESIGNER],
+                                  load_seconds=0.2, memory_gb=memory_gb).start()
+        self.addCleanup(server.stop)
+        server.configure(self.config)
+        client = OllamaClient(self.config)
+        client.discover_servers()
+        
+        warming = client.residency.prepare("coding", ["coding", "prompt_design", "coding"], {})
+        deadline = time.time() + 5
+        while client.residency._warming and time.time() < deadline:
+            time.sleep(0.02)
+        
+        messages = [{"role": "user", "content": "hi"}]
+        client.chat(server.host, CODER, messages)
+        designer = client.chat(server.host, DESIGNER, messages)
+        return server, client, warming, designer
+    
+    def test_warms_next_model_within_budget(self):
+        """Test the predicted phase's model is pre-loaded, pinned and not reloaded."""
+        server, client, warming, designer = self._run(memory_gb=32)
+        
+        self.assertEqual(warming, [(server.host, DESIGNER)])
+        self.assertEqual(server.loads, [DESIGNER, CODER])
+        self.assertEqual(designer["load_duration"], 0)
+        
+        client.residency.refresh(server.host, force=True)
+        self.assertTrue(client.residency.is_resident(server.host, CODER))
+        pinned = {m["name"]: m["expires_at"] for m in server.loaded_models()}
+        self.assertGreater(pinned[DESIGNER], time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 1500)))
+        self.assertEqual(client.residency.stats["warmups"], 1)
+    
+    def test_skips_warm_up_that_would_evict_current_model(self):
+        """Test no warm-up is issued when the models do not fit together."""
+        server, client, warming, designer = self._run(memory_gb=25)
+        
+        self.assertEqual(warming, [])
+        self.assertEqual(client.residency.stats["skipped_budget"], 1)
+        self.assertEqual(server.loads, [CODER, DESIGNER])
+        self.assertGreater(designer["load_duration"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
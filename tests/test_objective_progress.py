@@ -0,0 +1,223 @@
+"""
+Tests for incremental objective and project progress tracking.
+"""
+
+import copy
+import dataclasses
+import pickle
+import random
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from pipeline.state.manager import PipelineState, StateManager, TaskState, TaskStatus
+from pipeline.objective_manager import (
+    Objective, ObjectiveHealth, ObjectiveHealthStatus, ObjectiveLevel, ObjectiveStatus, ObjectiveManager
+)
+
+
+def _rescan_progress(objective, state):
+    """Reference progress computed by rescanning every task."""
+    completed = [
+        tid for tid in objective.tasks
+        if tid in state.tasks and state.tasks[tid].status == TaskStatus.COMPLETED
+    ]
+    total = successful = 0
+    for tid in objective.tasks:
+        if tid not in state.tasks:
+            continue
+        task = state.tasks[tid]
+        if task.attempts > 0:
+            total += task.attempts
+            if task.status == TaskStatus.COMPLETED and not task.errors:
+                successful += 1
+    return sorted(completed), total, successful
+
+
+class TestIncrementalProgress(unittest.TestCase):
+    """Counters must match a full rescan after arbitrary task updates."""
+    
+    def test_counters_follow_random_transitions(self):
+        """Test objective counters across add, status, attempts and error changes."""
+        rng = random.Random(1)
+        state = PipelineState()
+        objectives = [
+            Objective(id=f"primary_{i:03d}", level=ObjectiveLevel.PRIMARY,
+                      title=f"Objective {i}", description="", status=ObjectiveStatus.APPROVED)
+            for i in range(5)
+        ]
+        statuses = list(TaskStatus)
+        
+        for step in range(2000):
+            action = rng.random()
+            if action < 0.2 or not state.tasks:
+                task = state.add_task(f"task {step}", f"file_{step}.py")
+                rng.choice(objectives).tasks.append(task.task_id)
+            elif action < 0.25:
+                # Tasks inserted directly, as some phases do
+                task = TaskState(task_id=f"direct_{step}", description="", target_file="x.py",
+                                 priority=5, status=TaskStatus.COMPLETED, attempts=1)
+                state.tasks[task.task_id] = task
+                rng.choice(objectives).tasks.append(task.task_id)
+            elif action < 0.3:
+                state.tasks.pop(rng.choice(list(state.tasks)))
+            else:
+                task = state.tasks[rng.choice(list(state.tasks))]
+                change = rng.random()
+                if change < 0.4:
+                    task.status = rng.choice(statuses)
+                elif change < 0.6:
+                    state.update_task_status(task.task_id, rng.choice(statuses))
+                elif change < 0.8:
+                    task.attempts += 1
+                else:
+                    task.add_error("test", "failure")
+            
+            if step % 50 == 0:
+                for objective in objectives:
+                    objective.update_progress(state)
+                    objective.calculate_success_rate(state)
+                    progress = state.progress_index.objective_progress(objective.id, objective.tasks)
+                    completed, total, successful = _rescan_progress(objective, state)
+                    self.assertEqual(sorted(objective.completed_tasks), completed)
+                    self.assertEqual(progress.attempts, total)
+                    self.assertEqual(progress.successful, successful)
+                
+                for status in statuses:
+                    self.assertEqual(
+                        state.progress_index.count(status),
+                        sum(1 for t in state.tasks.values() if t.status == status)
+                    )
+    
+    def test_completion_percentage_without_objectives(self):
+        """Test project completion uses the status counters."""
+        state = PipelineState()
+        tasks = [state.add_task(f"task {i}", f"f{i}.py") for i in range(4)]
+        tasks[0].status = TaskStatus.COMPLETED
+        state.update_task_status(tasks[1].task_id, TaskStatus.COMPLETED)
+        
+        self.assertEqual(state.calculate_completion_percentage(), 50.0)
+        self.assertFalse(state.needs_project_planning)
+        
+        tasks[2].status = TaskStatus.SKIPPED
+        tasks[3].status = TaskStatus.COMPLETED
+        self.assertTrue(state.needs_project_planning)
+    
+    def test_round_trip_rebuilds_counters(self):
+        """Test counters are rebuilt when state is loaded from disk."""
+        state = PipelineState()
+        task = state.add_task("task", "f.py")
+        task.status = TaskStatus.COMPLETED
+        
+        loaded = PipelineState.from_dict(state.to_dict())
+        self.assertEqual(loaded.progress_index.count(TaskStatus.COMPLETED), 1)
+        self.assertNotIn("_progress_observer", loaded.to_dict()["tasks"][task.task_id])
+    
+    def test_progress_scales_with_changes(self):
+        """Test repeated progress checks don't rescan unchanged tasks."""
+        state = PipelineState()
+        objective = Objective(id="primary_001", level=ObjectiveLevel.PRIMARY,
+                              title="Big", description="", status=ObjectiveStatus.APPROVED)
+        for i in range(5000):
+            objective.tasks.append(state.add_task(f"task {i}", f"f{i}.py").task_id)
+        
+        objective.update_progress(state)
+        start_time = time.time()
+        for tid in objective.tasks[:250]:
+            state.tasks[tid].status = TaskStatus.COMPLETED
+            objective.update_progress(state)
+        elapsed = time.time() - start_time
+        
+        self.assertAlmostEqual(objective.completion_percentage, 5.0)
+        self.assertLess(elapsed, 60)
+    
+    def test_asdict(self):
+        """Test ``dataclasses.asdict`` still works on a state with tasks."""
+        state = PipelineState()
+        task = state.add_task("task", "f.py")
+        
+        data = dataclasses.asdict(state)
+        self.assertEqual(data["tasks"][task.task_id]["status"], TaskStatus.NEW)
+    
+    def test_copies_rebuild_counters(self):
+        """Test deep copies and pickles count their own tasks, independently of the original."""
+        state = PipelineState()
+        tasks = [state.add_task(f"task {i}", f"f{i}.py") for i in range(3)]
+        
+        for clone in (copy.deepcopy(state), pickle.loads(pickle.dumps(state))):
+            clone.tasks[tasks[0].task_id].status = TaskStatus.COMPLETED
+            self.assertIs(clone.progress_index, clone.tasks.index)
+            self.assertEqual((clone.progress_index.count(TaskStatus.NEW),
+                              clone.progress_index.count(TaskStatus.COMPLETED)), (2, 1))
+            self.assertEqual((state.progress_index.count(TaskStatus.NEW),
+                              state.progress_index.count(TaskStatus.COMPLETED)), (3, 0))
+
+
+class TestObjectiveAction(unittest.TestCase):
+    """Next action chosen from the objective's status counters."""
+    
+    def test_stale_counters_fall_through(self):
+        """Test a status count with no matching task skips to the next rule."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            manager = ObjectiveManager(Path(temp_dir), StateManager(Path(temp_dir)))
+            state = PipelineState()
+            objective = Objective(id="primary_001", level=ObjectiveLevel.PRIMARY,
+                                  title="Objective", description="", status=ObjectiveStatus.APPROVED)
+            task = state.add_task("task", "f.py")
+            objective.tasks.append(task.task_id)
+            progress = state.progress_index.objective_progress(objective.id, objective.tasks)
+            progress.status_counts[TaskStatus.NEEDS_FIXES] += 1
+            
+            health = ObjectiveHealth(status=ObjectiveHealthStatus.HEALTHY, success_rate=1.0,
+                                     consecutive_failures=0, blocking_issues=[],
+                                     blocking_dependencies=[], recommendation="")
+            action = manager.get_objective_action(objective, state, health)
+            self.assertEqual((action.phase, action.task), ("coding", task))
+        finally:
+            import shutil
+            shutil.rmtree(temp_dir)
+
+
+class TestObjectiveFileCache(unittest.TestCase):
+    """Objective markdown files are only re-parsed when they change."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.project_dir = Path(self.temp_dir)
+        self.manager = ObjectiveManager(self.project_dir, StateManager(self.project_dir))
+        self.objective_file = self.project_dir / "PRIMARY_OBJECTIVES.md"
+        self.objective_file.write_text("## 1. First objective\n**Status**: approved\n")
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def test_reparse_only_on_change(self):
+        """Test cached objectives are reused until the file changes."""
+        state = PipelineState()
+        with mock.patch.object(self.manager, '_parse_objective_file',
+                               wraps=self.manager._parse_objective_file) as parse:
+            first = self.manager.load_objectives(state)
+            second = self.manager.load_objectives(state)
+            self.assertEqual(parse.call_count, 1)
+            
+            # Returned objectives are independent copies
+            first["primary"]["primary_001"].depends_on.append("x")
+            self.assertEqual(second["primary"]["primary_001"].depends_on, [])
+            self.assertEqual(self.manager.load_objectives(state)["primary"]["primary_001"].depends_on, [])
+            
+            self.objective_file.write_text(
+                "## 1. First objective\n**Status**: approved\n## 2. Second objective\n"
+            )
+            third = self.manager.load_objectives(state)
+            self.assertEqual(parse.call_count, 2)
+            self.assertEqual(len(third["primary"]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
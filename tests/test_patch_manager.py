@@ -0,0 +1,202 @@
+"""
+Tests for in-process patch application and the patch index.
+"""
+
+import difflib
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.patch_manager import PatchManager, apply_hunks, parse_unified_diff
+
+BASE = "".join(f"line {i}\n" for i in range(1, 21))
+
+
+def _fuzzed_case(seed):
+    """A diff between two versions of a file, and a drifted target to apply it to."""
+    rng = random.Random(seed)
+    vocab = [f"w{i}\n" for i in range(4)]
+    base = [rng.choice(vocab) if rng.random() < 0.4 else f"line {i}\n" for i in range(rng.randint(3, 40))]
+    new = base[:]
+    for _ in range(rng.randint(1, 3)):
+        op, pos = rng.random(), rng.randrange(len(new) + 1)
+        if op < 0.4 and pos < len(new):
+            new[pos] = f"changed {rng.random():.3f}\n"
+        elif op < 0.7:
+            new.insert(pos, f"added {rng.random():.3f}\n")
+        elif pos < len(new):
+            del new[pos]
+    patch = "".join(difflib.unified_diff(base, new, "a", "b", n=rng.choice([0, 1, 2, 3, 3])))
+    reverse = rng.random() < 0.2
+    target = (new if reverse else base)[:]
+    if rng.random() < 0.1:
+        # Already applied
+        target = (base if reverse else new)[:]
+    else:
+        for _ in range(rng.randint(0, 4)):
+            op, pos = rng.random(), rng.randrange(len(target) + 1)
+            if op < 0.4:
+                target.insert(pos, rng.choice(vocab + [f"noise {rng.random():.3f}\n"]))
+            elif op < 0.7 and pos < len(target):
+                del target[pos]
+            elif pos < len(target):
+                target[pos] = f"edited {rng.random():.3f}\n"
+    return patch, target, reverse
+
+
+def _gnu_patch(directory, patch, target, reverse):
+    filepath, patch_path = os.path.join(directory, "target"), os.path.join(directory, "diff")
+    Path(filepath).write_text("".join(target))
+    Path(patch_path).write_text(patch)
+    command = ["patch", "--unified", "--forward", "--reject-file=-", "--no-backup-if-mismatch",
+               "--fuzz=2", "--silent"] + (["--reverse"] if reverse else [])
+    result = subprocess.run(command + [filepath, patch_path], capture_output=True, text=True)
+    return result.returncode == 0, Path(filepath).read_text()
+
+
+class TestApplyHunks(unittest.TestCase):
+    """The pure-Python hunk engine."""
+    
+    def test_offset_fuzz_and_reverse(self):
+        """Test a hunk applies at an offset and with fuzz, and reverse-applies back."""
+        new = BASE.replace("line 10\n", "line ten\n")
+        hunks = parse_unified_diff("".join(difflib.unified_diff(
+            BASE.splitlines(True), new.splitlines(True), "a", "b")))
+        drifted = ("header\n" * 3 + BASE).replace("line 13\n", "line thirteen\n").splitlines(True)
+        
+        result = apply_hunks(drifted, hunks)
+        
+        self.assertTrue(result.success, result.message)
+        self.assertEqual(result.placements, [(10, 3, 1)])
+        self.assertEqual("".join(result.lines), ("header\n" * 3 + new).replace("line 13\n", "line thirteen\n"))
+        self.assertEqual(apply_hunks(result.lines, hunks, reverse=True).lines, drifted)
+    
+    def test_already_applied_and_all_or_nothing(self):
+        """Test an applied patch is refused and no hunk is applied unless all are."""
+        new = BASE.replace("line 2\n", "line two\n").replace("line 18\n", "line eighteen\n")
+        hunks = parse_unified_diff("".join(difflib.unified_diff(
+            BASE.splitlines(True), new.splitlines(True), "a", "b", n=1)))
+        
+        applied = apply_hunks(new.splitlines(True), hunks)
+        self.assertFalse(applied.success)
+        self.assertIn("Reversed (or previously applied)", applied.message)
+        
+        broken = BASE.replace("line 18\n", "").replace("line 17\n", "").replace("line 19\n", "")
+        partial = apply_hunks(broken.splitlines(True), hunks)
+        self.assertFalse(partial.success)
+        self.assertIn("Hunk #2 FAILED", partial.message)
+        self.assertEqual("".join(partial.lines), broken)
+    
+    def test_no_newline_at_end_of_file(self):
+        """Test the no-newline marker is honoured in both directions."""
+        patch = "--- a\n+++ b\n@@ -1,2 +1,2 @@\n a\n-b\n\\ No newline at end of file\n+c\n"
+        hunks = parse_unified_diff(patch)
+        
+        self.assertEqual(apply_hunks(["a\n", "b"], hunks).lines, ["a\n", "c\n"])
+        self.assertEqual(apply_hunks(["a\n", "c\n"], hunks, reverse=True).lines, ["a\n", "b"])
+    
+    @unittest.skipUnless(shutil.which("patch"), "GNU patch is not installed")
+    def test_matches_gnu_patch_on_fuzzed_hunks(self):
+        """Test success and output agree with GNU patch on a corpus of fuzzed hunks."""
+        directory = tempfile.mkdtemp()
+        try:
+            for seed in range(400):
+                patch, target, reverse = _fuzzed_case(seed)
+                if not patch:
+                    continue
+                with self.subTest(seed=seed):
+                    success, output = _gnu_patch(directory, patch, target, reverse)
+                    result = apply_hunks(target, parse_unified_diff(patch), reverse=reverse)
+                    self.assertEqual(result.success, success, result.message)
+                    if success:
+                        self.assertEqual("".join(result.lines), output)
+        finally:
+            shutil.rmtree(directory)
+
+
+class TestPatchManager(unittest.TestCase):
+    """Applying files, the patch index and change numbers."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.target = self.temp_dir / "module.py"
+        self.target.write_text(BASE)
+        self.manager = PatchManager(self.temp_dir / ".patches")
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_apply_and_reverse_file(self):
+        """Test a saved patch applies in place, is refused twice, and reverses."""
+        content, patch_file = self.manager.generate_line_patch(self.target, 5, "line 5", "line five")
+        
+        self.assertEqual(self.manager.apply_patch(self.target, patch_file=patch_file, dry_run=True)[0], True)
+        self.assertEqual(self.target.read_text(), BASE)
+        self.assertTrue(self.manager.apply_patch(self.target, patch_content=content)[0])
+        self.assertIn("line five\n", self.target.read_text())
+        
+        success, message = self.manager.apply_patch(self.target, patch_content=content)
+        self.assertFalse(success)
+        self.assertIn("previously applied", message)
+        
+        self.assertTrue(self.manager.apply_patch(self.target, patch_content=content, reverse=True)[0])
+        self.assertEqual(self.target.read_text(), BASE)
+    
+    def test_index_lists_and_looks_up_patches(self):
+        """Test patches are listed newest first and found by number, also from a fresh manager."""
+        for line in (3, 4, 5):
+            self.manager.generate_line_patch(self.target, line, f"line {line}", f"line #{line}")
+        
+        patches = self.manager.list_patches(limit=2)
+        self.assertEqual([self.manager.get_patch_info(p)["change_number"] for p in patches], [3, 2])
+        self.assertEqual(self.manager.get_patch_info(patches[0])["line"], "5")
+        self.assertEqual(self.manager.get_patch(1).name.split("_")[1], "0001")
+        self.assertIsNone(self.manager.get_patch(4))
+        
+        (self.temp_dir / ".patches" / "index.jsonl").unlink()
+        rebuilt = PatchManager(self.temp_dir / ".patches")
+        self.assertEqual(len(rebuilt.list_patches()), 3)
+        self.assertEqual(rebuilt.get_patch(2), self.manager.get_patch(2))
+    
+    def test_index_entry_of_name_resembling_line_suffix(self):
+        """Test a file named like a line suffix is recorded with its real name and line."""
+        linear = self.temp_dir / "foo_linear.py"
+        linear.write_text(BASE)
+        plain = self.manager.save_patch("", linear)
+        numbered = self.manager.save_patch("", linear, line_num=7)
+        
+        self.assertEqual(self.manager.get_patch_info(plain)["filename"], "foo_linear")
+        self.assertIsNone(self.manager.get_patch_info(plain)["line"])
+        self.assertEqual(self.manager.get_patch_info(numbered)["filename"], "foo_linear")
+        self.assertEqual(self.manager.get_patch_info(numbered)["line"], "7")
+    
+    def test_concurrent_change_numbers_are_unique(self):
+        """Test change numbers allocated from many threads never repeat."""
+        numbers = []
+        
+        def allocate():
+            manager = PatchManager(self.temp_dir / ".patches")
+            for _ in range(25):
+                numbers.append(manager._get_next_change_number())
+        
+        threads = [threading.Thread(target=allocate) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(sorted(numbers), list(range(1, 201)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -346,5 +346,175 @@ class TestPatternOptimizer(unittest.TestCase):
         self.assertGreater(total_patterns, 0)
 
 
+
+def _brute_force_merge_pairs(optimizer, patterns):
+    """Reference pairwise merge order used before index-assisted merging."""
+    remaining = list(range(len(patterns)))
+    pairs = []
+    i = 0
+    while i < len(remaining):
+        j = i + 1
+        while j < len(remaining):
+            similarity = optimizer._calculate_similarity(
+                patterns[remaining[i]]['data'],
+                patterns[remaining[j]]['data']
+            )
+            if similarity >= optimizer.similarity_threshold:
+                pairs.append((remaining[i], remaining[j]))
+                remaining.pop(j)
+            else:
+                j += 1
+        i += 1
+    return pairs
+
+
+def _synthetic_pattern_data(rng, num_keys):
+    """Random pattern data drawn from a small vocabulary so near-duplicates occur."""
+    return {
+        f'key{k}': rng.choice(['a', 'b', 'c', 1, 2.0, True])
+        for k in rng.sample(range(10), num_keys)
+    }
+
+
+class TestIndexedPatternMerging(unittest.TestCase):
+    """Index-assisted merging must match the pairwise reference."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.optimizer = PatternOptimizer(Path(self.temp_dir))
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def test_merge_pairs_match_brute_force(self):
+        """Test candidate generation finds exactly the pairwise merges."""
+        import random
+        rng = random.Random(42)
+        
+        for threshold in (0.5, 0.85, 1.0):
+            self.optimizer.similarity_threshold = threshold
+            for _ in range(20):
+                patterns = [
+                    {'data': _synthetic_pattern_data(rng, rng.randint(0, 6))}
+                    for _ in range(60)
+                ]
+                self.assertEqual(
+                    self.optimizer._find_merge_pairs(patterns),
+                    _brute_force_merge_pairs(self.optimizer, patterns)
+                )
+    
+    def test_merge_folds_counts_and_usage(self):
+        """Test batched merges fold occurrences, confidence and usage rows."""
+        conn = sqlite3.connect(self.optimizer.db_path)
+        cursor = conn.cursor()
+        now = datetime.now().isoformat()
+        patterns = [
+            ('tool_usage', 'h1', '{"tool": "read_file", "ok": true}', 0.9, 4, now, now),
+            ('tool_usage', 'h2', '{"tool": "read_file", "ok": true}', 0.7, 3, now, now),
+            ('tool_usage', 'h3', '{"tool": "read_file", "ok": true}', 0.5, 1, now, now),
+            ('tool_usage', 'h4', '{"tool": "write_file", "ok": false}', 0.8, 2, now, now),
+        ]
+        cursor.executemany('''
+            INSERT INTO patterns (pattern_type, pattern_hash, pattern_data, confidence, occurrences, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', patterns)
+        cursor.execute('''
+            INSERT INTO pattern_usage (pattern_id, timestamp, success)
+            VALUES ((SELECT id FROM patterns WHERE pattern_hash = 'h3'), ?, 1)
+        ''', (now,))
+        conn.commit()
+        conn.close()
+        
+        merged = self.optimizer.merge_similar_patterns()
+        self.assertEqual(merged, 2)
+        
+        conn = sqlite3.connect(self.optimizer.db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, occurrences, confidence FROM patterns WHERE pattern_hash = 'h1'")
+        keep_id, occurrences, confidence = cursor.fetchone()
+        self.assertEqual(occurrences, 8)
+        self.assertAlmostEqual(confidence, ((0.9 + 0.7) / 2 + 0.5) / 2)
+        cursor.execute('SELECT pattern_id FROM pattern_usage')
+        self.assertEqual(cursor.fetchone()[0], keep_id)
+        cursor.execute('SELECT COUNT(*) FROM patterns')
+        self.assertEqual(cursor.fetchone()[0], 2)
+        conn.close()
+    
+    def test_failed_merge_leaves_database_unchanged(self):
+        """Test survivor counts are not committed when the usage transfer fails."""
+        conn = sqlite3.connect(self.optimizer.db_path)
+        now = datetime.now().isoformat()
+        conn.executemany('''
+            INSERT INTO patterns (pattern_type, pattern_hash, pattern_data, confidence, occurrences, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [('tool_usage', f'h{i}', '{"tool": "read_file", "ok": true}', 0.9, 4, now, now) for i in range(3)])
+        conn.execute('ALTER TABLE pattern_usage RENAME TO pattern_usage_moved')
+        conn.commit()
+        conn.close()
+        
+        with self.assertRaises(sqlite3.OperationalError):
+            self.optimizer.merge_similar_patterns()
+        
+        conn = sqlite3.connect(self.optimizer.db_path)
+        self.assertEqual(conn.execute('SELECT COUNT(*), SUM(occurrences) FROM patterns').fetchone(), (3, 12))
+        conn.close()
+
+
+class TestPatternMergePerformance(unittest.TestCase):
+    """Benchmark merging on a synthetic 100k-pattern database."""
+    
+    NUM_PATTERNS = 100_000
+    
+    def setUp(self):
+        """Populate a synthetic pattern database."""
+        import random
+        rng = random.Random(7)
+        self.temp_dir = tempfile.mkdtemp()
+        self.optimizer = PatternOptimizer(Path(self.temp_dir))
+        
+        now = datetime.now().isoformat()
+        tools = [f'tool_{i}' for i in range(2000)]
+        rows = []
+        for i in range(self.NUM_PATTERNS):
+            data = {
+                'tool': rng.choice(tools),
+                'phase': rng.choice(['coding', 'qa', 'debugging', 'planning']),
+                'args': rng.randint(0, 50),
+                'success': rng.random() < 0.8,
+            }
+            rows.append((
+                f'type_{i % 5}', f'hash{i}', json.dumps(data),
+                rng.uniform(0.3, 1.0), rng.randint(1, 20), now, now
+            ))
+        
+        conn = sqlite3.connect(self.optimizer.db_path)
+        conn.executemany('''
+            INSERT INTO patterns (pattern_type, pattern_hash, pattern_data, confidence, occurrences, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+        conn.close()
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def test_merge_100k_patterns(self):
+        """Test merging 100k patterns completes quickly."""
+        import time
+        start_time = time.time()
+        merged = self.optimizer.merge_similar_patterns()
+        elapsed = time.time() - start_time
+        
+        stats = self.optimizer.get_statistics()
+        self.assertGreater(merged, 0)
+        self.assertEqual(stats['active_patterns'] + merged, self.NUM_PATTERNS)
+        # Pairwise comparison would need ~10^9 similarity calls here
+        self.assertLess(elapsed, 60)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+Tests for batched multi-file QA review.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.config import PipelineConfig
+from pipeline.client import OllamaClient
+from pipeline.messaging import MessageType
+from pipeline.phases.qa import QAPhase
+from pipeline.state.manager import TaskStatus, FileStatus
+
+
+def _call(name, **args):
+    return {"function": {"name": name, "arguments": args}}
+
+
+class TestQABatchReview(unittest.TestCase):
+    """QAPhase.review_multiple in batched mode."""
+    
+    def setUp(self):
+        """Set up a project with a handful of small files."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.project_dir = Path(self.temp_dir)
+        (self.project_dir / 'src').mkdir()
+        self.files = []
+        for i in range(5):
+            path = f"src/module_{i}.py"
+            (self.project_dir / path).write_text(f"def function_{i}():\n    return {i}\n")
+            self.files.append(path)
+        
+        config = PipelineConfig(project_dir=self.project_dir)
+        self.phase = QAPhase(config, OllamaClient(config))
+        self.phase.BATCH_MAX_FILES = 3
+        
+        self.requests = []
+        
+        def chat(message, tools=None, task_context=None):
+            self.requests.append(message)
+            files = [f for f in self.files if f"## File: {f}" in message]
+            calls = []
+            for path in files:
+                if path.endswith("module_1.py"):
+                    calls.append(_call("report_issue", filepath="./" + path, issue_type="logic_error",
+                                       description="Returns the wrong value", line_number=2))
+                else:
+                    calls.append(_call("approve_code", filepath=path))
+            return {"tool_calls": calls, "content": ""}
+        
+        self.phase.chat_with_history = chat
+        
+        self.state = self.phase.state_manager.load()
+        self.tasks = {}
+        for path in self.files:
+            self.state.update_file(path, "hash", 10)
+            task = self.state.add_task(f"Implement {path}", path, priority=5)
+            task.status = TaskStatus.QA_PENDING
+            self.tasks[path] = task
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_batched_review_verdicts(self):
+        """Test five files take two model calls and get per-file verdicts."""
+        analysis_runs = []
+        run_analysis = self.phase.analysis_runner.run
+        self.phase.analysis_runner.run = lambda *a, **k: analysis_runs.append(k) or run_analysis(*a, **k)
+        
+        result = self.phase.review_multiple(self.state, list(self.files))
+        
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(len(analysis_runs), 1)
+        self.assertEqual(analysis_runs[0]['files'], self.files)
+        self.assertEqual(result.data['model_calls'], 2)
+        self.assertEqual(result.data['approved'], 4)
+        self.assertEqual(result.data['rejected'], 1)
+        self.assertEqual(result.next_phase, "debugging")
+        
+        for path, task in self.tasks.items():
+            if path.endswith("module_1.py"):
+                self.assertEqual(task.status, TaskStatus.NEEDS_FIXES)
+                self.assertEqual(self.state.files[path].qa_status, FileStatus.REJECTED)
+                self.assertEqual(task.errors[0].line_number, 2)
+            else:
+                self.assertEqual(task.status, TaskStatus.COMPLETED)
+                self.assertEqual(self.state.files[path].qa_status, FileStatus.APPROVED)
+    
+    def test_large_files_reviewed_individually(self):
+        """Test files over the character budget fall back to execute."""
+        self.phase.BATCH_MAX_CHARS = 60
+        big = self.files[0]
+        (self.project_dir / big).write_text("x = 1\n" * 20)
+        
+        reviewed = []
+        self.phase.execute = lambda state, filepath=None, task=None, **kwargs: reviewed.append(filepath) or \
+            QAPhase.execute(self.phase, state, filepath=filepath, task=task)
+        
+        result = self.phase.review_multiple(self.state, list(self.files))
+        
+        self.assertEqual(reviewed, [big])
+        self.assertEqual(result.data['reviewed'], 5)
+        self.assertEqual(self.tasks[big].status, TaskStatus.COMPLETED)
+    
+    def test_loop_intervention_keeps_earlier_verdicts(self):
+        """Test files of packs reviewed before a loop intervention are marked reviewed."""
+        checks = iter([None, {'requires_user_input': True}])
+        self.phase.check_for_loops = lambda: next(checks)
+        
+        result = self.phase.review_multiple(self.state, list(self.files))
+        
+        self.assertFalse(result.success)
+        self.assertIn('intervention', result.data)
+        self.assertEqual(result.data['reviewed'], 3)
+        self.assertEqual(self.tasks[self.files[1]].status, TaskStatus.NEEDS_FIXES)
+        for path in (self.files[0], self.files[2]):
+            self.assertEqual(self.state.files[path].qa_status, FileStatus.APPROVED)
+        for path in self.files[3:]:
+            self.assertEqual(self.tasks[path].status, TaskStatus.QA_PENDING)
+    
+    def test_batched_rejection_reports_issues_like_execute(self):
+        """Test a file rejected in a batch goes through the same issue handling as execute."""
+        created = []
+        self.phase.coordinator = SimpleNamespace(issue_tracker=SimpleNamespace(
+            create_issue=lambda issue, state: created.append(issue) or f"issue-{len(created)}"))
+        published = []
+        self.phase._publish_message = lambda *args, **kwargs: published.append(kwargs.get('message_type', args[0] if args else None))
+        documented = []
+        self.phase.doc_updater.add_new_issue = lambda document, *args: documented.append(document)
+        
+        self.phase.review_multiple(self.state, list(self.files))
+        
+        self.assertEqual([issue.file for issue in created], [self.files[1]])
+        self.assertIn(MessageType.ISSUE_FOUND, published)
+        self.assertEqual(published.count('PHASE_COMPLETED'), 5)
+        self.assertEqual(documented, ['SECONDARY_OBJECTIVES.md'])
+    
+    def test_batched_approval_wins_over_issues(self):
+        """Test an explicit approve_code for a file outweighs issues reported for it, as in execute."""
+        def chat(message, tools=None, task_context=None):
+            files = [f for f in self.files if f"## File: {f}" in message]
+            calls = [_call("report_issue", filepath=path, issue_type="style_violation",
+                           description="Naming") for path in files]
+            calls += [_call("approve_code", filepath=path) for path in files]
+            return {"tool_calls": calls, "content": ""}
+        self.phase.chat_with_history = chat
+        
+        result = self.phase.review_multiple(self.state, list(self.files))
+        
+        self.assertEqual(result.data['approved'], 5)
+        for path, task in self.tasks.items():
+            self.assertEqual(task.status, TaskStatus.COMPLETED)
+            self.assertEqual(self.state.files[path].qa_status, FileStatus.APPROVED)
+
+
+if __name__ == '__main__':
+    unittest.main()
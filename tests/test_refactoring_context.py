@@ -0,0 +1,87 @@
+"""
+Tests for cached refactoring context assembly.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.phases.refactoring_context_builder import RefactoringContextBuilder
+
+
+def _bump_mtime(path: Path):
+    """Move a path's mtime forward (file timestamps can be coarser than the test)."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class TestRefactoringContextBuilder(unittest.TestCase):
+    """Shared builder across tasks."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "MASTER_PLAN.md").write_text("# Plan\n" * 200)
+        (self.temp_dir / "ARCHITECTURE.md").write_text("# Architecture\n" * 100)
+        (self.temp_dir / "src").mkdir()
+        (self.temp_dir / "tests").mkdir()
+        for number in (1, 10):
+            (self.temp_dir / "src" / f"module_{number}.py").write_text(f"def run_{number}():\n    pass\n")
+            (self.temp_dir / "tests" / f"test_module_{number}.py").write_text(
+                f"from src.module_{number} import run_{number}\n")
+        self.builder = RefactoringContextBuilder(self.temp_dir, logging.getLogger("test"))
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def _prompt(self, target_file="src/module_1.py"):
+        context = self.builder.build_context("dead_code", "Unused function", target_file, "def run_1(): pass",
+                                             {'phase': 'refactoring', 'completion': 10.0})
+        return self.builder.format_context_for_prompt(context)
+    
+    def test_unchanged_inputs_read_nothing(self):
+        """Test a second task reads no files and gets a byte-identical prompt."""
+        first = self._prompt()
+        read = self.builder.bytes_read
+        self.assertGreater(read, 0)
+        
+        self.assertEqual(self._prompt(), first)
+        self.assertEqual(self.builder.bytes_read, read)
+        
+        fresh = RefactoringContextBuilder(self.temp_dir, logging.getLogger("test"))
+        context = fresh.build_context("dead_code", "Unused function", "src/module_1.py", "def run_1(): pass",
+                                      {'phase': 'refactoring', 'completion': 10.0})
+        self.assertEqual(fresh.format_context_for_prompt(context), first)
+    
+    def test_changed_document_is_reread(self):
+        """Test a changed document is read again, alone, and shows up in the prompt."""
+        self._prompt()
+        read = self.builder.bytes_read
+        (self.temp_dir / "ARCHITECTURE.md").write_text("# Layers changed\n")
+        
+        self.assertIn("# Layers changed", self._prompt())
+        self.assertEqual(self.builder.bytes_read - read, len("# Layers changed\n"))
+    
+    def test_test_files_by_module_name(self):
+        """Test lookups match whole module names, and new test files are found."""
+        context = self.builder.build_context("dead_code", "", "src/module_1.py", "", {})
+        self.assertEqual(list(context.test_files), ["tests/test_module_1.py"])
+        self.assertEqual(list(context.related_files), ["src/module_10.py"])
+        
+        (self.temp_dir / "tests" / "test_integration.py").write_text("import src.module_1\n")
+        _bump_mtime(self.temp_dir / "tests")
+        context = self.builder.build_context("dead_code", "", "src/module_1.py", "", {})
+        self.assertEqual(list(context.test_files), ["tests/test_integration.py", "tests/test_module_1.py"])
+        
+        self.assertEqual(len(self.builder.build_context("dead_code", "", "", "", {}).test_files), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Tests for speculative small-model drafting of tool calls.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.client import OllamaClient
+from pipeline.config import PipelineConfig
+from pipeline.mock_ollama import MockOllamaServer, ScriptedResponder
+from pipeline.speculative import validate_tool_call
+from pipeline.tools import TOOLS_QA
+
+
+def _draft(name, arguments, confidence):
+    return json.dumps({"name": name, "arguments": arguments, "confidence": confidence})
+
+
+class TestValidateToolCall(unittest.TestCase):
+    """Schema checks of drafted calls."""
+    
+    def test_schema_violations(self):
+        """Test unknown tools, missing/unknown arguments, types and enums are reported."""
+        tools = TOOLS_QA + [{"name": "change_phase", "parameters": {
+            "type": "object", "required": ["phase"],
+            "properties": {"phase": {"type": "string", "enum": ["coding", "qa"]}}}}]
+        self.assertIsNone(validate_tool_call("read_file", {"filepath": "a.py"}, tools))
+        self.assertIsNone(validate_tool_call("change_phase", {"phase": "qa"}, tools))
+        self.assertIn("unknown tool", validate_tool_call("run_shell", {}, tools))
+        self.assertIn("missing", validate_tool_call("read_file", {}, tools))
+        self.assertIn("unknown argument", validate_tool_call("read_file", {"filepath": "a", "mode": "r"}, tools))
+        self.assertIn("is not string", validate_tool_call("read_file", {"filepath": 3}, tools))
+        self.assertIn("not in", validate_tool_call("change_phase", {"phase": "deploy"}, tools))
+
+
+class TestSpeculativeDrafter(unittest.TestCase):
+    """Drafting against the mock server."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = PipelineConfig(project_dir=Path(self.temp_dir), speculative_drafting=True)
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_accepts_only_confident_valid_drafts(self):
+        """Test drafts are accepted or rejected by tool, schema and confidence, and counted."""
+        responder = ScriptedResponder([
+            "Sure: " + _draft("read_file", {"filepath": "app/main.py"}, 0.95),
+            _draft("read_file", {"filepath": "app/main.py"}, 0.4),
+            _draft("report_issue", {"filepath": "a.py", "issue_type": "bug"}, 0.99),
+            _draft("read_file", {"path": "app/main.py"}, 0.9),
+            "I am not sure.",
+        ], cycle=False)
+        with MockOllamaServer(responder=responder) as server:
+            server.configure(self.config)
+            client = OllamaClient(self.config)
+            client.discover_servers()
+            messages = [{"role": "user", "content": "Review app/main.py"}]
+            
+            results = [client.drafter.draft_response(messages, TOOLS_QA, site="qa", large_model="big")
+                       for _ in range(5)]
+            self.assertEqual(client.drafter.draft_response(messages, [], site="qa"), None)
+        
+        accepted = results[0]
+        self.assertEqual(accepted["message"]["tool_calls"][0]["function"],
+                         {"name": "read_file", "arguments": {"filepath": "app/main.py"}})
+        self.assertTrue(all(result is None for result in results[1:]))
+        
+        stats = client.drafter.summary()["qa"]
+        self.assertEqual((stats["drafts"], stats["accepted"]), (5, 1))
+        self.assertAlmostEqual(stats["acceptance_rate"], 0.2)
+        self.assertEqual(stats["rejections"], {"low_confidence": 1, "not_draftable": 1,
+                                               "schema": 1, "unparseable": 1})
+        self.assertTrue(client.drafter.format_report()[0].strip().startswith("qa"))
+    
+    def test_draft_sees_system_prompt_and_history(self):
+        """Test the small model gets the phase system prompt and recent turns, not just the last message."""
+        client = OllamaClient(self.config)
+        client.get_model_for_task = lambda task_type: ("localhost", "small")
+        sent = []
+        client.chat = lambda host, model, messages, **kwargs: sent.append(messages) or {
+            "message": {"content": _draft("read_file", {"filepath": "a.py"}, 0.9)}}
+        messages = [{"role": "system", "content": "You are the coding phase."}]
+        messages += [{"role": "user" if i % 2 == 0 else "assistant", "content": f"turn {i}"} for i in range(6)]
+        
+        client.drafter.draft_response(messages, TOOLS_QA, site="coding")
+        
+        draft_messages = sent[0]
+        self.assertEqual(draft_messages[0], messages[0])
+        self.assertEqual(draft_messages[1:-1], messages[-4:])
+        self.assertIn("Available tools", draft_messages[-1]["content"])
+    
+    def test_disabled_by_default(self):
+        """Test no draft request is sent unless speculative drafting is enabled."""
+        with MockOllamaServer(responder=ScriptedResponder([_draft("read_file", {"filepath": "a"}, 1.0)])) as server:
+            config = server.configure(PipelineConfig(project_dir=Path(self.temp_dir)))
+            client = OllamaClient(config)
+            client.discover_servers()
+            result = client.drafter.draft_response([{"role": "user", "content": "x"}], TOOLS_QA, site="qa")
+        
+        self.assertIsNone(result)
+        self.assertEqual(server.requests, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
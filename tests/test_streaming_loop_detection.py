@@ -0,0 +1,128 @@
+"""
+Tests for streaming loop detection.
+"""
+
+import json
+import random
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.action_tracker import ActionTracker, PeriodTracker
+from pipeline.pattern_detector import PatternDetector
+
+
+def _tail_pattern(sequence, window, min_period, max_period, min_cycles):
+    """Brute-force reference: shortest pattern repeating at the end of the window."""
+    tail = sequence[-window:]
+    for period in range(min_period, min(max_period, window // 2) + 1):
+        span = period
+        while span < len(tail) and tail[len(tail) - 1 - span] == tail[len(tail) - 1 - span + period]:
+            span += 1
+        cycles = min(span, len(tail)) // period
+        if cycles >= min_cycles:
+            return tail[-period:], cycles
+    return None
+
+
+class TestPeriodTracker(unittest.TestCase):
+    """Incremental cycle detection."""
+    
+    def test_matches_brute_force(self):
+        """Test streaming results match a rescan after every key."""
+        rng = random.Random(7)
+        tracker = PeriodTracker(2, 15)
+        sequence = []
+        for step in range(3000):
+            # Mostly repeating chunks with occasional noise
+            key = "ABCDE"[step % rng.choice([2, 3, 5])] if rng.random() < 0.8 else rng.choice("XYZ")
+            tracker.push(key)
+            sequence.append(key)
+            for window, cycles in ((20, 2), (10, 3), (30, 2)):
+                self.assertEqual(tracker.pattern(window, cycles),
+                                 _tail_pattern(sequence, window, 2, 15, cycles))
+
+
+class TestActionTracker(unittest.TestCase):
+    """Bounded history, rolling counters and tail loading."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.history_file = Path(self.temp_dir) / "action_history.jsonl"
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_rolling_counters(self):
+        """Test repeats, frequency, patterns and statistics."""
+        tracker = ActionTracker(max_actions=50)
+        for i in range(200):
+            tracker.track_action("coding", "main", "read_file", {}, file_path=f"f{i % 2}.py", success=i % 4 != 0)
+        
+        self.assertEqual(len(tracker.actions), 50)
+        self.assertIsNone(tracker.detect_immediate_repeat(3))
+        self.assertEqual(tracker.detect_alternating_pattern(window_size=20),
+                         (["read_file(file:f0.py)", "read_file(file:f1.py)"], 10))
+        self.assertEqual(tracker.get_action_frequency(),
+                         {"read_file(file:f0.py)": 100, "read_file(file:f1.py)": 100})
+        self.assertEqual(tracker.get_action_frequency(time_window=60.0),
+                         {"read_file(file:f0.py)": 25, "read_file(file:f1.py)": 25})
+        
+        stats = tracker.get_statistics()
+        self.assertEqual(stats['total_actions'], 200)
+        self.assertEqual(stats['by_file'], {"f0.py": 100, "f1.py": 100})
+        self.assertEqual(stats['success_rate'], 0.75)
+        
+        for _ in range(4):
+            tracker.track_action("coding", "main", "str_replace", {"old_str": "x"}, file_path="f0.py")
+        self.assertEqual(tracker.detect_immediate_repeat(3), ("str_replace(file:f0.py,old:x)", 3))
+        self.assertEqual([a.tool for a in tracker.get_recent_actions(3, tool="read_file")], ["read_file"] * 3)
+        self.assertEqual(tracker.get_recent_actions(2, file_path="f1.py")[-1].file_path, "f1.py")
+    
+    def test_loads_history_tail_and_expires_old_actions(self):
+        """Test only the last max_actions lines are loaded and old ones leave the window."""
+        now = time.time()
+        with open(self.history_file, 'w') as f:
+            for i in range(5000):
+                f.write(json.dumps({
+                    'timestamp': now - 5000 + i, 'phase': 'qa', 'agent': 'main', 'tool': 'read_file',
+                    'args': {}, 'result': None, 'file_path': f"f{i}.py", 'success': True,
+                }) + '\n')
+        
+        tracker = ActionTracker(history_file=self.history_file, max_actions=100)
+        self.assertEqual(len(tracker.actions), 100)
+        self.assertEqual(tracker.actions[0].file_path, "f4900.py")
+        self.assertEqual(tracker.actions[-1].file_path, "f4999.py")
+        
+        # Only actions from the last 300 seconds are counted
+        self.assertEqual(len(tracker.get_action_frequency()), 100)
+        tracker.frequency_window = 49.5
+        self.assertEqual(len(tracker.get_action_frequency()), 49)
+    
+    def test_detector_on_long_run(self):
+        """Test detection stays bounded after a long run and finds the current loop."""
+        tracker = ActionTracker(max_actions=200)
+        detector = PatternDetector(tracker)
+        for i in range(20000):
+            tracker.track_action("coding", "main", "create_file", {}, file_path=f"f{i}.py")
+        self.assertEqual(detector.detect_state_cycles(), [])
+        
+        for i in range(12):
+            tracker.track_action("debugging", "main", ["read_file", "str_replace", "run_tests"][i % 3],
+                                 {}, file_path="broken.py")
+        
+        loop_types = {d.loop_type for d in detector.detect_all_loops()}
+        self.assertIn('state_cycle', loop_types)
+        self.assertIn('pattern_repetition', loop_types)
+        self.assertEqual(len(tracker.actions), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Tests for planned, concurrent tool call execution.
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.handlers import ToolCallHandler
+from pipeline.tool_call_planner import ToolCallPlanner
+
+
+def _call(name, **args):
+    return {"function": {"name": name, "arguments": args}}
+
+
+class TestToolCallPlanner(unittest.TestCase):
+    """Stage and chain construction."""
+    
+    def test_reads_grouped_and_writes_are_barriers(self):
+        """Test read-only calls share a stage until a mutating call."""
+        planner = ToolCallPlanner()
+        calls = [
+            _call("read_file", filepath="a.py"),
+            _call("search_code", pattern="x"),
+            _call("read_file", filepath="./a.py"),
+            _call("modify_python_file", filepath="a.py"),
+            _call("read_file", filepath="a.py"),
+            _call("list_directory", directory="src"),
+            _call("unknown_tool"),
+            _call("", arguments={}),
+        ]
+        planner.normalize_path = lambda path: path[2:] if path.startswith("./") else path
+        
+        self.assertEqual(planner.plan(calls), [
+            [[0, 2], [1]],
+            [[3]],
+            [[4], [5]],
+            [[6]],
+            [[7]],
+        ])
+    
+    def test_multi_path_calls_join_chains(self):
+        """Test a call touching two paths orders both chains."""
+        planner = ToolCallPlanner()
+        calls = [
+            _call("read_file", filepath="a.py"),
+            _call("read_file", filepath="b.py"),
+            _call("compare_files", file1="a.py", file2="b.py"),
+            _call("read_file", filepath="c.py"),
+        ]
+        self.assertEqual(planner.plan(calls), [[[0, 1, 2], [3]]])
+    
+    def test_string_arguments(self):
+        """Test JSON string arguments are parsed for path keys."""
+        planner = ToolCallPlanner()
+        calls = [
+            {"function": {"name": "read_file", "arguments": '{"filepath": "a.py"}'}},
+            {"function": {"name": "read_file", "arguments": '{"filepath": "a.py"}'}},
+        ]
+        self.assertEqual(planner.plan(calls), [[[0, 1]]])
+
+
+class TestConcurrentToolExecution(unittest.TestCase):
+    """ToolCallHandler.process_tool_calls with the planner."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.handler = ToolCallHandler(Path(self.temp_dir))
+        self.events = []
+        self.lock = threading.Lock()
+        
+        def slow(tool):
+            def handle(args):
+                with self.lock:
+                    self.events.append(("start", tool, args.get("filepath")))
+                time.sleep(0.05)
+                with self.lock:
+                    self.events.append(("end", tool, args.get("filepath")))
+                return {"tool": tool, "success": True, "filepath": args.get("filepath")}
+            return handle
+        
+        self.handler._handlers["read_file"] = slow("read_file")
+        self.handler._handlers["modify_python_file"] = slow("modify_python_file")
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_results_in_call_order_and_faster(self):
+        """Test independent reads overlap and results keep call order."""
+        calls = [_call("read_file", filepath=f"f{i}.py") for i in range(8)]
+        
+        start_time = time.time()
+        results = self.handler.process_tool_calls(calls)
+        elapsed = time.time() - start_time
+        
+        self.assertEqual([r["filepath"] for r in results], [f"f{i}.py" for i in range(8)])
+        self.assertLess(elapsed, 8 * 0.05 * 0.75)
+    
+    def test_writes_serialized_and_same_path_ordered(self):
+        """Test a write waits for earlier reads and later reads wait for it."""
+        calls = [
+            _call("read_file", filepath="a.py"),
+            _call("read_file", filepath="a.py"),
+            _call("read_file", filepath="b.py"),
+            _call("modify_python_file", filepath="a.py"),
+            _call("read_file", filepath="a.py"),
+        ]
+        self.handler.process_tool_calls(calls)
+        
+        events = self.events
+        write_start = events.index(("start", "modify_python_file", "a.py"))
+        write_end = events.index(("end", "modify_python_file", "a.py"))
+        self.assertEqual(write_end, write_start + 1)
+        self.assertEqual(sum(1 for e in events[:write_start] if e[0] == "end"), 3)
+        
+        a_reads = [e for e in events[:write_start] if e[2] == "a.py"]
+        self.assertEqual([e[0] for e in a_reads], ["start", "end", "start", "end"])
+    
+    def test_sequential_mode(self):
+        """Test max_parallel_tools=1 runs calls strictly one after another."""
+        self.handler.max_parallel_tools = 1
+        calls = [_call("read_file", filepath=f"f{i}.py") for i in range(3)]
+        self.handler.process_tool_calls(calls)
+        self.assertEqual([e[0] for e in self.events], ["start", "end"] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
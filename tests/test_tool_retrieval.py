@@ -0,0 +1,106 @@
+"""
+Tests for relevance-ranked tool subsets.
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.client import OllamaClient
+from pipeline.config import PipelineConfig
+from pipeline.mock_ollama import MockOllamaServer, ScriptedResponder
+from pipeline.phases.qa import QAPhase
+from pipeline.tool_retrieval import ToolSelector, tool_name
+from pipeline.tool_retrieval_benchmark import run_benchmark
+from pipeline.tools import get_core_tool_names, get_tools_for_phase
+
+
+def _call(name, **args):
+    return {"role": "assistant", "content": "", "tool_calls": [{"function": {"name": name, "arguments": args}}]}
+
+
+class TestToolSelector(unittest.TestCase):
+    """Ranking of tools for a turn."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.selector = ToolSelector(PipelineConfig(tool_retrieval=True), top_k=4)
+    
+    def test_core_tools_plus_ranked(self):
+        """Test the subset is the phase's own tools plus the best matches, in list order, without duplicates."""
+        tools = get_tools_for_phase("refactoring")
+        selection = self.selector.select("refactoring", tools,
+                                         "Move src/utils/helpers.py into src/common/ and update its imports")
+        
+        names = [tool_name(tool) for tool in selection.tools]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertTrue(get_core_tool_names("refactoring") <= set(names))
+        self.assertEqual(len(set(names) - get_core_tool_names("refactoring")), 4)
+        self.assertIn("move_file", names)
+        self.assertEqual(names, [name for name in dict.fromkeys(map(tool_name, tools)) if name in selection.names])
+        self.assertEqual(selection.outside(["move_file", "get_cpu_profile", "no_such_tool"]), ["get_cpu_profile"])
+        
+        stats = self.selector.summary()["refactoring"]
+        self.assertEqual(stats["calls"], 1)
+        self.assertGreater(stats["saved_fraction"], 0.5)
+    
+    def test_recent_tools_are_kept(self):
+        """Test a tool the phase keeps using is offered even when the prompt does not mention it."""
+        tools = get_tools_for_phase("qa")
+        prompt = "Review src/api/users.py for wrong method calls"
+        
+        self.assertNotIn("get_cpu_profile", self.selector.select("qa", tools, prompt).names)
+        recent = ["read_file", "get_cpu_profile", "get_cpu_profile"]
+        self.assertIn("get_cpu_profile", self.selector.select("qa", tools, prompt, recent).names)
+    
+    def test_benchmark_saves_bytes_in_every_phase(self):
+        """Test the mock-server benchmark receives fewer tool-schema bytes in every phase."""
+        report = run_benchmark(top_k=4)
+        
+        for phase, data in report["phases"].items():
+            self.assertLess(data["subset_bytes_per_call"], data["full_bytes_per_call"], phase)
+
+
+class TestFallbackToFullList(unittest.TestCase):
+    """Phase turns against the mock server."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_retries_once_with_all_tools(self):
+        """Test a call to a tool left out of the subset repeats the turn once with the full list."""
+        responder = ScriptedResponder([
+            _call("get_cpu_profile"),
+            _call("get_cpu_profile"),
+            _call("approve_code", filepath="src/a.py"),
+        ], cycle=False)
+        with MockOllamaServer(responder=responder) as server:
+            config = server.configure(PipelineConfig(project_dir=Path(self.temp_dir), tool_retrieval=True))
+            phase = QAPhase(config, OllamaClient(config))
+            phase.client.discover_servers()
+            tools = get_tools_for_phase("qa")
+            
+            result = phase.chat_with_history("Review src/a.py and approve it if it is correct", tools=tools)
+            self.assertEqual(result["tool_calls"][0]["function"]["name"], "get_cpu_profile")
+            result = phase.chat_with_history("Approve src/a.py", tools=tools)
+            self.assertEqual(result["tool_calls"][0]["function"]["name"], "approve_code")
+        
+        offered = [len(request["tools"]) for request in server.requests]
+        self.assertEqual(offered[1], len(tools))
+        self.assertLess(offered[0], len(tools))
+        self.assertLess(offered[2], len(tools))
+        self.assertEqual(len(offered), 3)
+        self.assertEqual(phase.client.tool_selector.summary()["qa"]["fallbacks"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
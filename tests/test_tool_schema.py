@@ -0,0 +1,120 @@
+"""
+Tests for memoized, pre-serialized phase tool lists.
+"""
+
+import json
+import pickle
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.client import OllamaClient
+from pipeline.config import PipelineConfig
+from pipeline.mock_ollama import MockOllamaServer, ScriptedResponder
+from pipeline.tool_registry import ToolRegistry
+from pipeline.tool_schema import FrozenTools, encode_request_body
+from pipeline.tool_schema_benchmark import run_benchmark
+from pipeline.tools import TOOLS_QA, get_tools_for_phase
+
+SPEC = {
+    "name": "count_lines",
+    "description": "Count the lines of a file",
+    "parameters": {"type": "object", "properties": {"filepath": {"type": "string"}}},
+}
+
+IMPLEMENTATION = '''
+def count_lines(filepath: str) -> dict:
+    try:
+        if not filepath:
+            raise ValueError("filepath is required")
+        with open(filepath) as f:
+            return {"success": True, "lines": len(f.readlines())}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+'''
+
+
+class TestFrozenTools(unittest.TestCase):
+    """Encoding of frozen tool lists."""
+    
+    def test_body_matches_plain_json(self):
+        """Test spliced bodies decode to the same request, for subsets and extensions too."""
+        tools = FrozenTools(TOOLS_QA)
+        extra = {"type": "function", "function": {"name": "create_file", "parameters": {}}}
+        for frozen in (tools, tools.subset([2, 0]), tools.extended([extra])):
+            payload = {"model": "m", "messages": [{"role": "user", "content": "é"}], "tools": frozen}
+            expected = dict(payload, tools=list(frozen))
+            self.assertEqual(json.loads(encode_request_body(payload)), expected)
+            self.assertEqual(json.loads(encode_request_body({"tools": frozen})), {"tools": list(frozen)})
+        
+        self.assertEqual([t["function"]["name"] for t in tools.subset([2, 0])], ["read_file", "report_issue"])
+        self.assertEqual(tools.extended([extra])[-1], extra)
+        self.assertEqual(tools.nbytes, len(json.dumps(TOOLS_QA)))
+        self.assertEqual(pickle.loads(pickle.dumps(tools)).json, tools.json)
+    
+    def test_definitions_are_copies(self):
+        """Test changing the frozen dicts' source does not change the frozen list."""
+        source = [{"type": "function", "function": {"name": "a", "description": "x"}}]
+        tools = FrozenTools(source)
+        source[0]["function"]["description"] = "changed"
+        
+        self.assertEqual(tools[0]["function"]["description"], "x")
+        self.assertIn('"x"', tools.json)
+    
+    def test_client_sends_spliced_body(self):
+        """Test the mock server receives every tool of a frozen list."""
+        with MockOllamaServer(responder=ScriptedResponder(["ok"])) as server:
+            config = server.configure(PipelineConfig())
+            client = OllamaClient(config)
+            client.discover_servers()
+            tools = get_tools_for_phase("qa")
+            
+            result = client.chat("127.0.0.1", "qwen2.5:14b", [{"role": "user", "content": "hi"}], tools=tools)
+        
+        self.assertEqual(result["message"]["content"], "ok")
+        self.assertEqual(server.requests[0]["tools"], [t.get("function", t)["name"] for t in tools])
+        self.assertEqual(server.requests[0]["tool_bytes"], tools.nbytes)
+
+
+class TestPhaseToolCache(unittest.TestCase):
+    """get_tools_for_phase memoization."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_cached_until_registry_changes(self):
+        """Test the list is shared per phase and rebuilt only when a custom tool is registered or removed."""
+        self.assertIs(get_tools_for_phase("coding"), get_tools_for_phase("coding"))
+        
+        registry = ToolRegistry(self.temp_dir)
+        before = get_tools_for_phase("coding", registry)
+        self.assertIs(get_tools_for_phase("coding", registry), before)
+        self.assertEqual(before, get_tools_for_phase("coding"))
+        
+        self.assertTrue(registry.register_tool(dict(SPEC), IMPLEMENTATION))
+        registered = get_tools_for_phase("coding", registry)
+        self.assertEqual(len(registered), len(before) + 1)
+        self.assertEqual(registered[-1]["function"]["name"], "count_lines")
+        self.assertIs(get_tools_for_phase("coding", registry), registered)
+        
+        self.assertTrue(registry.delete_tool("count_lines"))
+        self.assertEqual(get_tools_for_phase("coding", registry), before)
+    
+    def test_benchmark_bodies_identical(self):
+        """Test memoized request bodies decode to the rebuilt ones for every phase."""
+        report = run_benchmark(iterations=5)
+        
+        self.assertTrue(all(data["identical"] for data in report["phases"].values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Tests for span tracing.
+"""
+
+import json
+import logging
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.benchmark import create_synthetic_project
+from pipeline.config import PipelineConfig
+from pipeline.mock_ollama import MockOllamaServer
+from pipeline.tracing import NULL_SPAN, Tracer, get_tracer
+
+
+class TestTracer(unittest.TestCase):
+    """Span nesting, trace files and the disabled fast path."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.tracer = Tracer()
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        self.tracer.stop()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_disabled_spans_are_free(self):
+        """Test a disabled tracer hands out the shared no-op span."""
+        self.assertIs(self.tracer.span("state.load"), NULL_SPAN)
+        self.assertIs(self.tracer.begin("iteration"), NULL_SPAN)
+        
+        start_time = time.perf_counter()
+        for _ in range(100000):
+            with self.tracer.span("state.load"):
+                pass
+        self.assertLess(time.perf_counter() - start_time, 0.5)
+        self.assertEqual(self.tracer.summary(), [])
+    
+    def test_nested_spans_and_trace_files(self):
+        """Test self time excludes children and both trace formats are written."""
+        trace_file = self.tracer.start(Path(self.temp_dir) / "traces", run_id="run_1")
+        
+        iteration = self.tracer.begin("iteration", iteration=1)
+        with self.tracer.span("phase.coding", category="phase"):
+            time.sleep(0.02)
+            with self.tracer.span("model.call", model="m"):
+                time.sleep(0.05)
+        worker = threading.Thread(target=lambda: self.tracer.span("tool.read_file").__enter__().end())
+        worker.start()
+        worker.join()
+        iteration.end()
+        self.tracer.record("analyzer.dead_code.collect", 0.5)
+        chrome_file = self.tracer.stop()
+        
+        stats = {row["name"]: row for row in self.tracer.summary()}
+        self.assertGreaterEqual(stats["model.call"]["self_seconds"], 0.05)
+        self.assertLess(stats["phase.coding"]["self_seconds"], stats["phase.coding"]["total_seconds"] - 0.04)
+        self.assertLess(stats["iteration"]["self_seconds"], 0.02)
+        self.assertEqual(stats["tool.read_file"]["count"], 1)
+        self.assertEqual(self.tracer.summary()[0]["name"], "analyzer.dead_code.collect")
+        
+        events = [json.loads(line) for line in trace_file.read_text().splitlines()]
+        self.assertEqual([e["name"] for e in events], ["model.call", "phase.coding", "tool.read_file", "iteration"])
+        self.assertEqual(events[0]["args"], {"model": "m"})
+        self.assertTrue(all(e["ph"] == "X" for e in events))
+        self.assertNotEqual(events[2]["tid"], events[3]["tid"])
+        
+        chrome = json.loads(chrome_file.read_text())
+        self.assertEqual(len(chrome["traceEvents"]), 4)
+        self.assertIn("model.call", self.tracer.format_summary())
+
+
+class TestCoordinatorTracing(unittest.TestCase):
+    """A traced coordinator run against the mock server."""
+    
+    def test_traced_run(self):
+        """Test the main cost centres show up in the run's trace."""
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            create_synthetic_project(temp_dir, 5)
+            with MockOllamaServer() as server:
+                config = server.configure(PipelineConfig(project_dir=temp_dir, max_iterations=3,
+                                                         git_enabled=False, trace=True))
+                from pipeline.coordinator import PhaseCoordinator
+                logging.disable(logging.WARNING)
+                try:
+                    PhaseCoordinator(config).run(resume=False)
+                finally:
+                    logging.disable(logging.NOTSET)
+            
+            self.assertFalse(get_tracer().enabled)
+            traces = list((temp_dir / ".pipeline" / "traces").glob("*.trace.json"))
+            self.assertEqual(len(traces), 1)
+            names = {e["name"] for e in json.loads(traces[0].read_text())["traceEvents"]}
+            for name in ("iteration", "decision", "state.load", "state.save",
+                         "prompt.build", "model.call", "parse"):
+                self.assertIn(name, names)
+            self.assertTrue(any(name.startswith("phase.") for name in names))
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Tests for shared per-file traversal of analyzers.
+"""
+
+import ast
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.analysis.complexity import ComplexityVisitor
+from pipeline.analysis.dataflow import DataFlowAnalyzer
+from pipeline.analysis.runner import AnalysisRunner
+from pipeline.analysis.visitor import FileVisitor, MultiVisitor
+
+SOURCE = Path(__file__).parent.parent / 'pipeline' / 'analysis' / 'dead_code.py'
+
+
+def _walk_complexity(node: ast.AST) -> int:
+    """Cyclomatic complexity of a function counted by walking its whole subtree."""
+    complexity = 1
+    for child in ast.walk(node):
+        if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor, ast.ExceptHandler,
+                              ast.With, ast.AsyncWith, ast.Assert,
+                              ast.ListComp, ast.DictComp, ast.SetComp, ast.GeneratorExp)):
+            complexity += 1
+        elif isinstance(child, ast.BoolOp):
+            complexity += len(child.values) - 1
+    return complexity
+
+
+class _OrderVisitor(FileVisitor):
+    """Records the order nodes are entered and left."""
+    
+    def __init__(self):
+        self.events = []
+    
+    def enter_FunctionDef(self, node):
+        self.events.append(('enter', node.name))
+    
+    def leave_FunctionDef(self, node):
+        self.events.append(('leave', node.name))
+    
+    def enter_Name(self, node):
+        self.events.append(('name', node.id))
+
+
+class _NodeVisitorOrder(ast.NodeVisitor):
+    """The same events from ``ast.NodeVisitor``."""
+    
+    def __init__(self):
+        self.events = []
+    
+    def visit_FunctionDef(self, node):
+        self.events.append(('enter', node.name))
+        self.generic_visit(node)
+        self.events.append(('leave', node.name))
+    
+    def visit_Name(self, node):
+        self.events.append(('name', node.id))
+
+
+class TestMultiVisitor(unittest.TestCase):
+    """One traversal, dispatched to several visitors."""
+    
+    def test_order_matches_node_visitor(self):
+        """Test enter/leave callbacks run in ``ast.NodeVisitor`` order for every visitor."""
+        tree = ast.parse(SOURCE.read_text())
+        expected = _NodeVisitorOrder()
+        expected.visit(tree)
+        
+        first, second = _OrderVisitor(), _OrderVisitor()
+        MultiVisitor([first, second]).walk(tree)
+        self.assertEqual(first.events, expected.events)
+        self.assertEqual(second.events, expected.events)
+    
+    def test_complexity_counted_in_one_pass(self):
+        """Test incremental decision counting matches walking each function."""
+        tree = ast.parse(SOURCE.read_text() + "\n\ndef outer(x):\n    def inner(y):\n"
+                         "        return [z for z in y if z and x]\n    return inner if x else None\n")
+        visitor = ComplexityVisitor('dead_code.py')
+        visitor.visit(tree)
+        
+        functions = [node for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]
+        expected = {node.lineno: _walk_complexity(node) for node in functions}
+        self.assertEqual({result.line: result.complexity for result in visitor.results}, expected)
+        self.assertEqual([r.complexity for r in visitor.results if r.name in ('outer', 'inner')], [3, 3])
+
+
+class TestRunnerSharedTraversal(unittest.TestCase):
+    """Runner analyzers with visitors share one walk per file."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        for name in ('dead_code.py', 'dataflow.py', 'complexity.py'):
+            shutil.copy(SOURCE.parent / name, self.temp_dir / name)
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+    
+    def test_one_walk_per_file(self):
+        """Test five analyzers cost one traversal per file and data flow matches ``analyze``."""
+        runner = AnalysisRunner(str(self.temp_dir), max_workers=1)
+        names = ['complexity', 'dead_code', 'integration_gaps', 'call_graph', 'dataflow']
+        with mock.patch.object(MultiVisitor, 'walk', autospec=True, side_effect=MultiVisitor.walk) as walk:
+            run = runner.run(names)
+        
+        self.assertEqual(walk.call_count, 3)
+        self.assertEqual(set(run.results), set(names))
+        reports = run.get('dataflow')
+        for path, report in reports.items():
+            expected = DataFlowAnalyzer(str(self.temp_dir)).analyze(path)
+            self.assertEqual((report.variables, report.unused_assignments),
+                             (expected.variables, expected.unused_assignments))
+    
+    def test_failing_visitor_is_isolated(self):
+        """Test a failing shared traversal falls back to one analyzer at a time."""
+        runner = AnalysisRunner(str(self.temp_dir), max_workers=1)
+        with mock.patch.object(ComplexityVisitor, 'enter_ClassDef', side_effect=RuntimeError("boom")):
+            run = runner.run(['complexity', 'call_graph'])
+        
+        self.assertEqual(run.parse_errors, [])
+        self.assertEqual((run.timings['complexity'].files, run.timings['call_graph'].files), (0, 3))
+        self.assertGreater(run.get('call_graph').total_functions, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()